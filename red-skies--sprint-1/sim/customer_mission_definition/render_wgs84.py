@@ -7,13 +7,28 @@ from typing import Any, Dict, List, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[misc]
 
-def _deg_per_meter_lat() -> float:
-    return 1.0 / 111_000.0
+# WGS84 ellipsoid; scalar versions of the sprint-2 ``sim/geodesy.py`` helpers, so the live view
+# (which imports this renderer) and these static renders project identically.
+_WGS84_A = 6_378_137.0
+_WGS84_F = 1.0 / 298.257223563
+_WGS84_E2 = _WGS84_F * (2.0 - _WGS84_F)
+
+
+def _deg_per_meter_lat(lat_deg: float) -> float:
+    s = math.sin(math.radians(lat_deg))
+    meridian_m = _WGS84_A * (1.0 - _WGS84_E2) / (1.0 - _WGS84_E2 * s * s) ** 1.5
+    return 1.0 / math.radians(meridian_m)
 
 
 def _deg_per_meter_lon(lat_deg: float) -> float:
-    return 1.0 / (111_000.0 * max(1e-6, abs(math.cos(math.radians(lat_deg)))))
+    s = math.sin(math.radians(lat_deg))
+    normal_m = _WGS84_A / math.sqrt(1.0 - _WGS84_E2 * s * s)
+    return 1.0 / math.radians(normal_m * max(1e-12, abs(math.cos(math.radians(lat_deg)))))
 
 
 def _bearing_deg(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -27,7 +42,7 @@ def _bearing_deg(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
 
 def _load_yaml(path: Path) -> Dict[str, Any]:
     with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_YamlLoader)
     if not isinstance(data, dict):
         raise ValueError(f"YAML root must be a mapping: {path}")
     return data
@@ -68,17 +83,13 @@ def _svg_escape(s: str) -> str:
     )
 
 
-def _render_html(
-    playground: Tuple[str, float, float, float],
-    nfzs: List[Tuple[str, float, float, float]],
-    aircraft: Tuple[float, float, float],
-    out_html: Path,
-    size_px: int = 1200,
-) -> None:
-    pg_id, pg_lat, pg_lon, pg_r_m = playground
-    ac_lat, ac_lon, ac_heading = aircraft
+def _view_bounds(
+    playground: Tuple[str, float, float, float], nfzs: List[Tuple[str, float, float, float]], pad: float = 0.05
+) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) framing the playground and every NFZ circle, padded by ``pad``."""
+    _, pg_lat, pg_lon, pg_r_m = playground
 
-    deg_lat = _deg_per_meter_lat()
+    deg_lat = _deg_per_meter_lat(pg_lat)
     deg_lon = _deg_per_meter_lon(pg_lat)
 
     min_lat = pg_lat - pg_r_m * deg_lat
@@ -87,20 +98,29 @@ def _render_html(
     max_lon = pg_lon + pg_r_m * deg_lon
 
     for _, lat, lon, r_m in nfzs:
-        dlat = r_m * deg_lat
+        dlat = r_m * _deg_per_meter_lat(lat)
         dlon = r_m * _deg_per_meter_lon(lat)
         min_lat = min(min_lat, lat - dlat)
         max_lat = max(max_lat, lat + dlat)
         min_lon = min(min_lon, lon - dlon)
         max_lon = max(max_lon, lon + dlon)
 
-    pad = 0.05
     lat_span = max(1e-9, max_lat - min_lat)
     lon_span = max(1e-9, max_lon - min_lon)
-    min_lat -= lat_span * pad
-    max_lat += lat_span * pad
-    min_lon -= lon_span * pad
-    max_lon += lon_span * pad
+    return min_lat - lat_span * pad, max_lat + lat_span * pad, min_lon - lon_span * pad, max_lon + lon_span * pad
+
+
+def _render_html(
+    playground: Tuple[str, float, float, float],
+    nfzs: List[Tuple[str, float, float, float]],
+    aircraft: Tuple[float, float, float],
+    out_html: Path,
+    size_px: int = 1200,
+) -> None:
+    pg_id, pg_lat, pg_lon, pg_r_m = playground
+    ac_lat, ac_lon, ac_heading = aircraft
+
+    min_lat, max_lat, min_lon, max_lon = _view_bounds(playground, nfzs)
 
     def xy(lat: float, lon: float) -> Tuple[float, float]:
         x = (lon - min_lon) / (max_lon - min_lon) * size_px
@@ -110,7 +130,7 @@ def _render_html(
     def circle_px(lat: float, lon: float, r_m: float) -> Tuple[float, float, float, float]:
         cx, cy = xy(lat, lon)
         rx = r_m * _deg_per_meter_lon(lat) / (max_lon - min_lon) * size_px
-        ry = r_m * deg_lat / (max_lat - min_lat) * size_px
+        ry = r_m * _deg_per_meter_lat(lat) / (max_lat - min_lat) * size_px
         return cx, cy, rx, ry
 
     pg_cx, pg_cy, pg_rx, pg_ry = circle_px(pg_lat, pg_lon, pg_r_m)
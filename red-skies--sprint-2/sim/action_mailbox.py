@@ -0,0 +1,366 @@
+import argparse
+import multiprocessing as mp
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from state_codec import UID_BYTES
+
+
+MAILBOX_MAGIC = b"RSMBOX01"
+_HEADER = struct.Struct("<8sI")
+_HEADER_BYTES = 64
+SLOT_WORDS = 8  # 8 x 8 bytes = one 64-byte cache line per entity
+READ_TIMEOUT_S = 0.05
+"""How long a reader waits on a slot that stays mid-write (e.g. its writer died) before giving up."""
+
+# Slot columns. Writer-owned: SEQ, VERSION, HEADING, OBS_FRAME, PUBLISH_TIME, OVERWRITTEN.
+# Reader-owned: TAKEN, STALE. Each column has exactly one writing side, so no locks are needed.
+SEQ = 0
+VERSION = 1
+HEADING = 2
+OBS_FRAME = 3
+PUBLISH_TIME = 4
+TAKEN = 5
+OVERWRITTEN = 6
+STALE = 7
+
+
+@dataclass(frozen=True)
+class MailboxAction:
+    entity_id: str
+    heading_change_deg: float
+    version: int
+    """Per-entity sequence number of this publish (1, 2, ...)."""
+    obs_frame: int
+    """Simulation frame the agent acted on, or -1 when unknown."""
+    publish_time: float
+    """``time.monotonic()`` at publish (system-wide on Linux, so comparable across processes)."""
+
+
+def _layout_size(n: int) -> int:
+    uid_bytes = n * UID_BYTES
+    slots_at = _HEADER_BYTES + ((uid_bytes + 63) // 64) * 64
+    return slots_at + n * SLOT_WORDS * 8
+
+
+def attach_untracked(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        pass
+    # Python < 3.13 registers attached segments with the resource tracker, which would unlink
+    # (or, with a shared tracker, double-unregister) the owner's segment. Skip registration.
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None  # type: ignore[assignment]
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register  # type: ignore[assignment]
+
+
+class ActionMailbox:
+    """Per-entity latest-value action slots over shared memory.
+
+    Each entity has one slot guarded by a seqlock: a publish overwrites the previous
+    action instead of queueing behind it, and the sim thread's ``take`` never blocks on
+    the agent. Exactly one publisher per entity (its agent) and one consumer (the sim
+    adapter) are assumed; that is what keeps every slot column single-writer.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        magic, n = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAILBOX_MAGIC:
+            raise ValueError(f"not an action mailbox: {shm.name}")
+        self.entity_ids: List[str] = [
+            bytes(shm.buf[_HEADER_BYTES + i * UID_BYTES : _HEADER_BYTES + (i + 1) * UID_BYTES]).rstrip(b"\x00").decode("utf-8")
+            for i in range(n)
+        ]
+        self._index: Dict[str, int] = {uid: i for i, uid in enumerate(self.entity_ids)}
+        slots_at = _layout_size(n) - n * SLOT_WORDS * 8
+        # Three views over the same bytes; each element access is one aligned 8-byte load/store.
+        self._u = np.ndarray((n, SLOT_WORDS), dtype=np.uint64, buffer=shm.buf, offset=slots_at)
+        self._i = np.ndarray((n, SLOT_WORDS), dtype=np.int64, buffer=shm.buf, offset=slots_at)
+        self._f = np.ndarray((n, SLOT_WORDS), dtype=np.float64, buffer=shm.buf, offset=slots_at)
+        self.read_retries = 0
+        self.read_timeouts = 0
+        self.read_timeout_s = READ_TIMEOUT_S
+        # Last consistent copy of each slot, served while a slot stays torn past ``read_timeout_s``.
+        self._last_rows = np.zeros((n, SLOT_WORDS), dtype=np.uint64)
+        self._has_last = np.zeros(n, dtype=bool)
+        # Slots that timed out, and the SEQ they were stuck at; skipped without spinning until SEQ moves.
+        self._stuck = np.zeros(n, dtype=bool)
+        self._stuck_seq = np.zeros(n, dtype=np.uint64)
+
+    @classmethod
+    def create(cls, entity_ids: Sequence[str], name: Optional[str] = None) -> "ActionMailbox":
+        ids = list(entity_ids)
+        if len(set(ids)) != len(ids):
+            raise ValueError("entity_ids must be unique")
+        shm = shared_memory.SharedMemory(name=name, create=True, size=_layout_size(len(ids)))
+        shm.buf[: _layout_size(len(ids))] = bytes(_layout_size(len(ids)))
+        _HEADER.pack_into(shm.buf, 0, MAILBOX_MAGIC, len(ids))
+        for i, uid in enumerate(ids):
+            raw = uid.encode("utf-8")
+            if len(raw) > UID_BYTES:
+                raise ValueError(f"uid longer than {UID_BYTES} bytes: {uid!r}")
+            start = _HEADER_BYTES + i * UID_BYTES
+            shm.buf[start : start + len(raw)] = raw
+        mb = cls(shm, owner=True)
+        mb._i[:, OBS_FRAME] = -1
+        return mb
+
+    @classmethod
+    def attach(cls, name: str) -> "ActionMailbox":
+        return cls(attach_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def slot(self, entity_id: str) -> int:
+        try:
+            return self._index[entity_id]
+        except KeyError:
+            raise KeyError(f"entity_id not found: {entity_id}") from None
+
+    def publish(self, entity_id: str, heading_change_deg: float, obs_frame: int = -1) -> int:
+        """Overwrites the entity's slot; returns the new per-entity version."""
+        i = self.slot(entity_id)
+        u = self._u
+        seq = int(u[i, SEQ])
+        version = int(u[i, VERSION]) + 1
+        if version - 1 > int(u[i, TAKEN]):
+            u[i, OVERWRITTEN] += np.uint64(1)
+        u[i, SEQ] = seq + 1  # odd: write in progress
+        self._f[i, HEADING] = heading_change_deg
+        self._i[i, OBS_FRAME] = obs_frame
+        self._f[i, PUBLISH_TIME] = time.monotonic()
+        u[i, VERSION] = version
+        u[i, SEQ] = seq + 2
+        return version
+
+    def _action(self, i: int, row: np.ndarray) -> MailboxAction:
+        f, ii = row.view(np.float64), row.view(np.int64)
+        return MailboxAction(self.entity_ids[i], float(f[HEADING]), int(row[VERSION]), int(ii[OBS_FRAME]), float(f[PUBLISH_TIME]))
+
+    def _last_good(self, i: int) -> Optional[MailboxAction]:
+        return self._action(i, self._last_rows[i]) if self._has_last[i] else None
+
+    def _read(self, i: int) -> Optional[MailboxAction]:
+        """Consistent read of slot ``i``; the last good copy (or None) if its writer died mid-write."""
+        u = self._u
+        if self._stuck[i]:
+            if u[i, SEQ] == self._stuck_seq[i]:
+                return self._last_good(i)
+            self._stuck[i] = False
+        deadline: Optional[float] = None
+        while True:
+            s1 = int(u[i, SEQ])
+            if not s1 & 1:
+                row = u[i].copy()
+                if int(u[i, SEQ]) == s1 == int(row[SEQ]):
+                    self._last_rows[i] = row
+                    self._has_last[i] = True
+                    return self._action(i, row)
+            self.read_retries += 1
+            if deadline is None:
+                deadline = time.monotonic() + self.read_timeout_s
+            elif time.monotonic() > deadline:
+                # The writer died or stalled mid-write; later reads skip the slot until SEQ moves.
+                self.read_timeouts += 1
+                self._stuck[i] = True
+                self._stuck_seq[i] = u[i, SEQ]
+                return self._last_good(i)
+            time.sleep(0)  # let a preempted writer thread finish
+
+    def peek(self, entity_id: str) -> Optional[MailboxAction]:
+        a = self._read(self.slot(entity_id))
+        return a if a is not None and a.version else None
+
+    def take(
+        self,
+        entity_id: str,
+        current_frame: Optional[int] = None,
+        max_age_frames: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+    ) -> Optional[MailboxAction]:
+        """Returns the latest action not taken before, or None.
+
+        Actions computed from an observation older than ``max_age_frames`` (or published more
+        than ``max_age_s`` ago) are consumed and counted as stale instead of returned.
+        """
+        i = self.slot(entity_id)
+        return self._take(i, current_frame, max_age_frames, max_age_s)
+
+    def _take(
+        self,
+        i: int,
+        current_frame: Optional[int],
+        max_age_frames: Optional[int],
+        max_age_s: Optional[float],
+    ) -> Optional[MailboxAction]:
+        if int(self._u[i, VERSION]) <= int(self._u[i, TAKEN]):
+            return None
+        a = self._read(i)
+        if a is None or a.version <= int(self._u[i, TAKEN]):
+            return None  # stuck slot: nothing consistent, or only an action already taken
+        self._u[i, TAKEN] = a.version
+        stale = (
+            max_age_frames is not None
+            and current_frame is not None
+            and a.obs_frame >= 0
+            and current_frame - a.obs_frame > max_age_frames
+        ) or (max_age_s is not None and time.monotonic() - a.publish_time > max_age_s)
+        if stale:
+            self._u[i, STALE] += np.uint64(1)
+            return None
+        return a
+
+    def take_all(
+        self,
+        current_frame: Optional[int] = None,
+        max_age_frames: Optional[int] = None,
+        max_age_s: Optional[float] = None,
+    ) -> List[MailboxAction]:
+        u = self._u
+        idx = np.flatnonzero(u[:, VERSION] > u[:, TAKEN])
+        if not idx.size:
+            return []
+
+        # Vectorized seqlock read: snapshot the fresh rows between two reads of their SEQ words;
+        # rows that changed (or were mid-write) fall back to the per-slot retry loop.
+        s1 = u[idx, SEQ]
+        rows = u[idx].copy()
+        s2 = u[idx, SEQ]
+        rows_f = rows.view(np.float64)
+        rows_i = rows.view(np.int64)
+        torn = (s1 != s2) | ((s1 & np.uint64(1)) == 1)
+        ok = idx[~torn]
+        self._last_rows[ok] = rows[~torn]
+        self._has_last[ok] = True
+        for k in np.flatnonzero(torn):
+            a = self._read(int(idx[k]))
+            if a is None:
+                rows[k, VERSION] = 0  # stuck with no good copy yet: not fresh, skipped below
+                continue
+            rows[k, VERSION] = a.version
+            rows_f[k, HEADING] = a.heading_change_deg
+            rows_i[k, OBS_FRAME] = a.obs_frame
+            rows_f[k, PUBLISH_TIME] = a.publish_time
+
+        versions = rows[:, VERSION]
+        headings = rows_f[:, HEADING]
+        frames = rows_i[:, OBS_FRAME]
+        published = rows_f[:, PUBLISH_TIME]
+
+        stale = np.zeros(idx.size, dtype=bool)
+        if max_age_frames is not None and current_frame is not None:
+            stale |= (frames >= 0) & (current_frame - frames > max_age_frames)
+        if max_age_s is not None:
+            stale |= time.monotonic() - published > max_age_s
+
+        # A stuck slot's fallback can be an action that was already taken.
+        taken = u[idx, TAKEN]
+        fresh = versions > taken
+        u[idx, TAKEN] = np.maximum(versions, taken)
+        stale &= fresh
+        if stale.any():
+            u[idx[stale], STALE] += np.uint64(1)
+        stale |= ~fresh
+
+        ids = self.entity_ids
+        return [
+            MailboxAction(ids[i], h, v, fr, t)
+            for i, h, v, fr, t in zip(
+                idx[~stale].tolist(),
+                headings[~stale].tolist(),
+                versions[~stale].tolist(),
+                frames[~stale].tolist(),
+                published[~stale].tolist(),
+            )
+        ]
+
+    # Drop-in for the ActionQueue used by stepping_harness (04_inference_mode_async).
+    def enqueue(self, action: Any) -> None:
+        self.publish(action.entity_id, action.heading_change_deg, getattr(action, "obs_frame", -1))
+
+    def dequeue_latest_if_any(self) -> List[MailboxAction]:
+        return self.take_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "published": int(self._u[:, VERSION].sum()),
+            "overwritten": int(self._u[:, OVERWRITTEN].sum()),
+            "stale_dropped": int(self._u[:, STALE].sum()),
+            "pending": int((self._u[:, VERSION] > self._u[:, TAKEN]).sum()),
+            "read_retries": self.read_retries,
+            "read_timeouts": self.read_timeouts,
+        }
+
+    def close(self) -> None:
+        # Release numpy views before closing the mapping.
+        self._u = self._i = self._f = None  # type: ignore[assignment]
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "ActionMailbox":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _publisher(name: str, entity_ids: List[str], rate_hz: float, duration_s: float) -> None:
+    mb = ActionMailbox.attach(name)
+    period = 1.0 / rate_hz
+    end = time.monotonic() + duration_s
+    k = 0
+    next_t = time.monotonic()
+    while time.monotonic() < end:
+        for uid in entity_ids:
+            mb.publish(uid, float((k % 61) - 30), obs_frame=k)
+        k += 1
+        next_t += period
+        delay = next_t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    mb.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--aircraft", type=int, default=64)
+    ap.add_argument("--agent-hz", type=float, default=200.0, help="Publish rate per entity (agent process)")
+    ap.add_argument("--sim-hz", type=float, default=20.0)
+    ap.add_argument("--seconds", type=float, default=3.0)
+    args = ap.parse_args()
+
+    ids = [f"aircraft-{i + 1}" for i in range(args.aircraft)]
+    with ActionMailbox.create(ids) as mb:
+        proc = mp.get_context("spawn").Process(target=_publisher, args=(mb.name, ids, args.agent_hz, args.seconds))
+        proc.start()
+        period = 1.0 / args.sim_hz
+        take_s: List[float] = []
+        applied = 0
+        end = time.monotonic() + args.seconds
+        while time.monotonic() < end:
+            t0 = time.perf_counter()
+            applied += len(mb.take_all())
+            take_s.append(time.perf_counter() - t0)
+            time.sleep(period)
+        proc.join()
+        take = np.asarray(take_s) * 1e6
+        print(f"ticks={len(take_s)} applied={applied} stats={mb.stats()}")
+        print(f"take_all latency: p50={np.percentile(take, 50):.1f} us p99={np.percentile(take, 99):.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,425 @@
+import argparse
+import copy
+import fnmatch
+import json
+import math
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config_loader import Scenario, default_cache_dir, load_scenario
+from dynamic_zones import DynamicZoneSchedule
+from geodesy import to_local_equirect
+from lidar import cast_rays, cast_rays_reference, inside_any
+from scenario_generator import ComplexityTarget, GeneratorConfig, dump_yaml, generate_scenario
+from schema import Attitude, Detection, DetectionReport, EntityState, EntityType, LocalVelocity, Position, SimulationState
+from state_codec import decode_state, encode_state, state_from_dict, state_to_dict
+
+_REPO = Path(__file__).resolve().parents[2]
+_RENDERER = _REPO / "red-skies--sprint-1" / "sim" / "customer_mission_definition"
+_COMPLIANCE = _REPO / "survey" / "code-compliance"
+for _p in (_RENDERER, _COMPLIANCE):
+    if str(_p) not in sys.path:
+        sys.path.append(str(_p))
+
+import enrich_sbom  # noqa: E402
+import render_wgs84  # noqa: E402
+
+DEFAULT_HISTORY = default_cache_dir().parent / "bench_history.jsonl"
+"""Outside the source tree, next to the config cache; pass ``--history`` to keep a shared file."""
+NFZ_COUNTS = (18, 100, 500)
+
+Setup = Callable[[], Callable[[], Any]]
+BENCHMARKS: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """Registers a setup function; it builds the fixtures and returns the zero-argument callable that is timed."""
+
+    def register(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"duplicate benchmark: {name}")
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _state(n_entities: int, n_detections: int, seed: int = 0) -> SimulationState:
+    rng = random.Random(seed)
+    uids = [f"aircraft-{i}" for i in range(n_entities)]
+    entities = {}
+    for uid in uids:
+        report = DetectionReport(
+            {d: Detection(uid=d, distance=rng.uniform(0, 5e4), azimuth=rng.uniform(0, 360)) for d in rng.sample(uids, min(n_detections, n_entities))}
+        )
+        entities[uid] = EntityState(
+            uid=uid,
+            type=EntityType.AIRCRAFT,
+            position=Position(30.0 + rng.uniform(-1, 1), -40.0 + rng.uniform(-1, 1), 1500.0),
+            attitude=Attitude(yaw=rng.uniform(0, 360)),
+            local_velocity=LocalVelocity(north=rng.uniform(-90, 90), east=rng.uniform(-90, 90), down=0.0),
+            speed=90.0,
+            report=report,
+        )
+    return SimulationState(time=12.5, frame=250, entities=entities)
+
+
+_SCENARIOS: Dict[int, Tuple[Scenario, str]] = {}
+_TMP: Optional[tempfile.TemporaryDirectory] = None
+
+
+def _tmp_path(name: str) -> Path:
+    """A path in one per-process scratch directory, removed when the interpreter exits."""
+    global _TMP
+    if _TMP is None:
+        _TMP = tempfile.TemporaryDirectory(prefix="bench-")
+    return Path(_TMP.name) / name
+
+
+def _scenario(n_nfzs: int) -> Tuple[Scenario, str]:
+    """Generated scenario with ~``n_nfzs`` NFZs (a quarter dynamic), loaded back through ``config_loader``."""
+    if n_nfzs not in _SCENARIOS:
+        # Grow the playground with the zone count so placement does not saturate.
+        km = max(400.0, 30.0 * math.sqrt(n_nfzs) * 2.0)
+        cfg = GeneratorConfig(
+            target=ComplexityTarget(mean_fixed_nfzs=0.75 * n_nfzs, mean_dynamic_nfzs=0.25 * n_nfzs, mean_aircraft=4.0),
+            playground_km=km,
+            suppression_km=0.0,
+            polygon_fraction=0.0,
+        )
+        doc, _ = generate_scenario(cfg, seed=0, index=n_nfzs)
+        text = dump_yaml(doc)
+        path = _tmp_path(f"scenario-{n_nfzs}.yaml")
+        path.write_text(text, encoding="utf-8")
+        _SCENARIOS[n_nfzs] = (load_scenario(path), text)
+    return _SCENARIOS[n_nfzs]
+
+
+def _circles(n_nfzs: int) -> Tuple[np.ndarray, Tuple[float, float]]:
+    """(N, 3) NFZ circles in local east/north metres around the first aircraft, and that origin."""
+    scenario, _ = _scenario(n_nfzs)
+    nfzs = [(o.center(), o.radius_m()) for o in scenario.objects if o.behavior == "no_fly_zone"]
+    lat = np.array([c[0] for c, _ in nfzs])
+    lon = np.array([c[1] for c, _ in nfzs])
+    origin = next(o.center() for o in scenario.objects if o.type == "aircraft")
+    east, north = to_local_equirect(lat, lon, *origin)
+    return np.stack([east, north, [r for _, r in nfzs]], axis=1), origin
+
+
+def _fleet(n_aircraft: int, spread_m: float, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-spread_m, spread_m, n_aircraft), rng.uniform(-spread_m, spread_m, n_aircraft), rng.uniform(0, 360, n_aircraft)
+
+
+def _pypi_payload(name: str) -> Dict[str, Any]:
+    return {
+        "info": {
+            "name": name,
+            "version": "2.1.0",
+            "license": "MIT",
+            "project_urls": {"Homepage": f"https://example.org/{name}", "Source": f"https://github.com/example/{name}"},
+            "author": "Example Maintainers",
+            "author_email": "maintainers@example.de",
+        },
+        "releases": {f"{major}.{minor}.0": [{"upload_time_iso_8601": f"20{10 + major}-0{1 + minor}-15T10:00:00.000000Z"}] for major in range(1, 10) for minor in range(5)},
+    }
+
+
+def _npm_payload(name: str) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "license": "Apache-2.0",
+        "homepage": f"https://example.org/{name}",
+        "repository": {"type": "git", "url": f"git+https://github.com/example/{name}.git"},
+        "author": {"name": "Example", "email": "dev@example.fr"},
+        "time": {f"{major}.{minor}.0": f"20{10 + major}-0{1 + minor}-15T10:00:00.000Z" for major in range(1, 10) for minor in range(5)},
+        "dist-tags": {"latest": "9.4.0"},
+    }
+
+
+def _stub_registry(url: str, timeout_s: float = 15.0) -> Optional[Dict[str, Any]]:
+    """Stand-in for ``enrich_sbom._http_get_json``: canned PyPI / npm documents, no network."""
+    if url.startswith("https://pypi.org/pypi/"):
+        return _pypi_payload(url.split("/")[4])
+    if url.startswith("https://registry.npmjs.org/"):
+        return _npm_payload(url[len("https://registry.npmjs.org/") :])
+    return None
+
+
+def _sbom(n_components: int) -> Dict[str, Any]:
+    """The survey SBOMs' components, renamed and repeated up to ``n_components``."""
+    base = []
+    for path in sorted(_COMPLIANCE.glob("*-sbom-cyclonedx.json")):
+        base.extend(json.loads(path.read_text(encoding="utf-8")).get("components") or [])
+    if not base:
+        raise ValueError(f"no SBOMs found in {_COMPLIANCE}")
+    components = []
+    for i in range(n_components):
+        c = dict(base[i % len(base)])
+        if i >= len(base):
+            c["name"] = f"{c.get('name', '')}-{i}" if not str(c.get("name", "")).startswith("@") else f"{c['name']}{i}"
+        components.append(c)
+    return {"bomFormat": "CycloneDX", "specVersion": "1.5", "components": components}
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+@benchmark("state.build[entities=200,detections=8]")
+def _bench_state_build() -> Callable[[], Any]:
+    return lambda: _state(200, 8)
+
+
+@benchmark("state.to_dict+json[entities=200,detections=8]")
+def _bench_state_to_json() -> Callable[[], Any]:
+    state = _state(200, 8)
+    return lambda: json.dumps(state_to_dict(state))
+
+
+@benchmark("state.json+from_dict[entities=200,detections=8]")
+def _bench_state_from_json() -> Callable[[], Any]:
+    text = json.dumps(state_to_dict(_state(200, 8)))
+    return lambda: state_from_dict(json.loads(text))
+
+
+@benchmark("state.encode[entities=200,detections=8]")
+def _bench_state_encode() -> Callable[[], Any]:
+    state = _state(200, 8)
+    return lambda: encode_state(state)
+
+
+@benchmark("state.decode[entities=200,detections=8]")
+def _bench_state_decode() -> Callable[[], Any]:
+    blob = encode_state(_state(200, 8))
+    return lambda: decode_state(blob)
+
+
+def _register_nfz_benchmarks(n: int) -> None:
+    @benchmark(f"scenario.load[nfz={n}]")
+    def _load() -> Callable[[], Any]:
+        _, text = _scenario(n)
+        path = _tmp_path(f"load-{n}.yaml")
+        path.write_text(text, encoding="utf-8")
+        return lambda: load_scenario(path)
+
+    @benchmark(f"lidar.cast[nfz={n},aircraft=1,rays=24]")
+    def _cast() -> Callable[[], Any]:
+        circles, _ = _circles(n)
+        return lambda: cast_rays(0.0, 0.0, 45.0, circles)
+
+    @benchmark(f"lidar.cast_reference[nfz={n},aircraft=1,rays=24]")
+    def _cast_reference() -> Callable[[], Any]:
+        circles = [tuple(row) for row in _circles(n)[0].tolist()]
+        return lambda: cast_rays_reference(0.0, 0.0, 45.0, circles)
+
+    @benchmark(f"lidar.cast[nfz={n},aircraft=100,rays=24]")
+    def _cast_fleet() -> Callable[[], Any]:
+        circles, _ = _circles(n)
+        x, y, hdg = _fleet(100, 50_000.0)
+        return lambda: cast_rays(x, y, hdg, circles)
+
+    @benchmark(f"nfz.inside_any[nfz={n},points=1000]")
+    def _inside() -> Callable[[], Any]:
+        circles, _ = _circles(n)
+        x, y, _ = _fleet(1000, 200_000.0)
+        return lambda: inside_any(x, y, circles)
+
+    @benchmark(f"nfz.schedule_active_at[nfz={n},times=100]")
+    def _active() -> Callable[[], Any]:
+        scenario, _ = _scenario(n)
+        schedule = DynamicZoneSchedule.from_objects(scenario.objects, seed=0)
+        times = np.linspace(0.0, scenario.duration_s or 1800.0, 100).tolist()
+        return lambda: [schedule.active_at(t) for t in times]
+
+    @benchmark(f"render_wgs84.render_html[nfz={n}]")
+    def _render() -> Callable[[], Any]:
+        scenario, _ = _scenario(n)
+        nfzs = [(o.id, *o.center(), o.radius_m()) for o in scenario.objects if o.behavior == "no_fly_zone"]
+        lat, lon = next(o.center() for o in scenario.objects if o.type == "aircraft")
+        out = _tmp_path(f"render-{n}.html")
+        return lambda: render_wgs84._render_html(
+            playground=("playground", lat, lon, 200_000.0), nfzs=nfzs, aircraft=(lat, lon, 45.0), out_html=out, size_px=1200
+        )
+
+
+for _n in NFZ_COUNTS:
+    _register_nfz_benchmarks(_n)
+
+
+@benchmark("enrich_sbom[components=500,stub_registry]")
+def _bench_enrich_sbom() -> Callable[[], Any]:
+    sbom = _sbom(500)
+
+    def run() -> Any:
+        original = enrich_sbom._http_get_json
+        enrich_sbom._http_get_json = _stub_registry
+        try:
+            # enrich_sbom edits components in place; the copy is part of every sample.
+            return enrich_sbom.enrich_sbom(copy.deepcopy(sbom))
+        finally:
+            enrich_sbom._http_get_json = original
+
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Running, history, comparison
+# ---------------------------------------------------------------------------
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=_REPO, capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, min_time_s: float = 0.2) -> Dict[str, Any]:
+    """Per-call seconds over ``repeat`` samples; each sample loops enough calls to last ``min_time_s``."""
+    timer = timeit.Timer(fn)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time_s or number >= 1_000_000:
+            break
+        number *= 2 if number < 8 else 4
+    samples = sorted(t / number for t in timer.repeat(repeat, number))
+    return {
+        "median_s": statistics.median(samples),
+        "min_s": samples[0],
+        "max_s": samples[-1],
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(patterns: Optional[List[str]] = None, repeat: int = 5, min_time_s: float = 0.2, verbose: bool = True) -> Dict[str, Dict[str, Any]]:
+    names = [n for n in BENCHMARKS if not patterns or any(p in n or fnmatch.fnmatchcase(n, p) for p in patterns)]
+    if not names:
+        raise ValueError(f"no benchmark matches {patterns}")
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in names:
+        fn = BENCHMARKS[name]()
+        results[name] = measure(fn, repeat=repeat, min_time_s=min_time_s)
+        if verbose:
+            print(f"{name:<58} {_fmt(results[name]['median_s'])}", file=sys.stderr)
+    return results
+
+
+def load_history(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    entries = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn last line of an interrupted run
+    return entries
+
+
+def find_baseline(history: List[Dict[str, Any]], commit: Optional[str], baseline: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Most recent entry for ``baseline`` (a commit prefix), else the most recent one from a different commit."""
+    for entry in reversed(history):
+        sha = entry.get("commit") or ""
+        if baseline is not None:
+            if sha.startswith(baseline):
+                return entry
+        elif sha != commit or entry.get("dirty"):
+            return entry
+    return None
+
+
+def compare(current: Dict[str, Dict[str, Any]], previous: Dict[str, Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Median ratio per benchmark present in both runs; ``status`` is regression / improvement / ok."""
+    rows = []
+    for name, res in current.items():
+        old = previous.get(name)
+        if not old or not old.get("median_s"):
+            continue
+        ratio = res["median_s"] / old["median_s"]
+        status = "regression" if ratio > 1.0 + threshold else "improvement" if ratio < 1.0 / (1.0 + threshold) else "ok"
+        rows.append({"name": name, "old_s": old["median_s"], "new_s": res["median_s"], "ratio": ratio, "status": status})
+    return rows
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.1f} ns"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Times the sim / renderer / SBOM hot paths and tracks them per commit.")
+    ap.add_argument("-k", "--filter", action="append", default=None, help="Substring or fnmatch pattern on benchmark names (repeatable)")
+    ap.add_argument("--list", action="store_true", help="Print benchmark names and exit")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--min-time", type=float, default=0.2, help="Seconds per sample")
+    ap.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    ap.add_argument("--no-save", action="store_true", help="Do not append this run to the history")
+    ap.add_argument("--baseline", default=None, help="Commit (prefix) to compare against; default: latest other commit")
+    ap.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown of the median flagged as a regression")
+    ap.add_argument("--check", action="store_true", help="Exit 1 when any regression is flagged")
+    args = ap.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+
+    commit = _git("rev-parse", "HEAD")
+    entry = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "node": platform.node(),
+        "results": run(args.filter, repeat=args.repeat, min_time_s=args.min_time),
+    }
+
+    history = load_history(args.history)
+    base = find_baseline(history, commit, args.baseline)
+    rows = compare(entry["results"], base["results"], args.threshold) if base else []
+    if not args.no_save:
+        args.history.parent.mkdir(parents=True, exist_ok=True)
+        with args.history.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+    report = {
+        "commit": commit,
+        "baseline": (base or {}).get("commit"),
+        "threshold": args.threshold,
+        "regressions": [r for r in rows if r["status"] == "regression"],
+        "improvements": [r for r in rows if r["status"] == "improvement"],
+    }
+    if base and (base.get("machine"), base.get("node")) != (entry["machine"], entry["node"]):
+        report["warning"] = "baseline was recorded on a different machine"
+    print(json.dumps(report, indent=2))
+    if args.check and report["regressions"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
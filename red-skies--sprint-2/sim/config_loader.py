@@ -0,0 +1,728 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import pickle
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+
+CACHE_VERSION = 2
+CACHE_DIR_ENV = "RED_SKIES_CONFIG_CACHE"
+
+
+@dataclass(frozen=True)
+class AutonomousTask:
+    unique_id: str
+    name: str
+    agent_ref: str
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    id: str
+    title: str
+    object_type: str
+    artifact_path: Optional[str]
+    weights_path: Optional[str]
+    version: Optional[str]
+    validation_set_size: int
+    hyperparameters: Dict[str, Any]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+
+@dataclass(frozen=True)
+class SimModel:
+    id: str
+    simulator: str
+    type: str
+    file_path: Optional[str]
+    autonomous_tasks: Tuple[AutonomousTask, ...]
+
+
+@dataclass(frozen=True)
+class SimulatorSpec:
+    name: str
+    version: str
+    models: Tuple[SimModel, ...]
+
+
+# Bulky GeoJSON members of scenario objects; their YAML nodes are kept and constructed on first access.
+LAZY_GEOMETRY_KEYS = frozenset({"geolocation", "centroid", "region", "initial_position", "polygon"})
+
+
+class LazyValue:
+    """A geometry member of a scenario object that has not been constructed yet.
+
+    Holds either its raw YAML text (split out of the file before parsing) or its composed node.
+    """
+
+    __slots__ = ("key", "text", "node")
+
+    def __init__(self, key: str, text: Optional[str] = None, node: Any = None) -> None:
+        self.key = key
+        self.text = text
+        self.node = node
+
+    def resolve(self) -> Any:
+        if self.text is not None:
+            return yaml.load(self.text, Loader=_YamlLoader)[self.key]
+        return SafeConstructor().construct_document(self.node)
+
+
+class _LazyGeometryLoader(_YamlLoader):  # type: ignore[misc, valid-type]
+    def construct_mapping(self, node: MappingNode, deep: bool = False) -> Dict[Any, Any]:
+        # Expand ``<<`` first so geometry pulled in from an anchor is deferred like a local one.
+        self.flatten_mapping(node)
+        lazy: Dict[str, LazyValue] = {}
+        eager = []
+        for key_node, value_node in node.value:
+            key = key_node.value if isinstance(key_node, ScalarNode) else None
+            if key in LAZY_GEOMETRY_KEYS and isinstance(value_node, (MappingNode, SequenceNode)):
+                lazy[key] = LazyValue(key, node=value_node)
+            else:
+                if key in LAZY_GEOMETRY_KEYS:
+                    lazy.pop(key, None)  # a later scalar overrides a merged geometry
+                eager.append((key_node, value_node))
+        # Construct from a copy: the node may be an anchor that other mappings still merge from.
+        shallow = MappingNode(node.tag, eager, node.start_mark, node.end_mark, flow_style=node.flow_style)
+        mapping = super().construct_mapping(shallow, deep=deep)
+        mapping.update(lazy)
+        return mapping
+
+
+_OBJECTS_RE = re.compile(r"^(\s*)objects:\s*(#.*)?$")
+_MEMBER_RE = re.compile(r"^([A-Za-z_][\w-]*)\s*:")
+_ANCHOR_RE = re.compile(r"(^|[\s\[{,:-])[&*][^\s,\]}]+")
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def _split_geometry_text(text: str) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+    """Cuts the geometry members out of each block-style ``objects[]`` item before parsing.
+
+    Returns (text without geometry, per-object {key: member text}) or None when the layout is
+    not the plain block style the C2 exporter writes (anchors, flow-style lists, ...), in which
+    case the caller falls back to node-level laziness.
+    """
+    if _ANCHOR_RE.search(text):
+        return None
+    lines = text.splitlines(keepends=True)
+    start = next((i for i, ln in enumerate(lines) if _OBJECTS_RE.match(ln)), None)
+    if start is None:
+        return None
+    parent_indent = _indent(lines[start])
+    first = next((i for i in range(start + 1, len(lines)) if lines[i].strip() and not lines[i].lstrip().startswith("#")), None)
+    if first is None or not lines[first].lstrip(" ").startswith("- "):
+        return None
+    item_indent = _indent(lines[first])
+    if item_indent < parent_indent:
+        return None
+    key_indent = item_indent + 2
+
+    out: List[str] = lines[: start + 1]
+    geometry: List[Dict[str, str]] = []
+    i = first
+    while i < len(lines):
+        ln = lines[i]
+        if ln.strip() and not ln.lstrip().startswith("#"):
+            ind = _indent(ln)
+            if ind < item_indent or (ind == item_indent and not ln.lstrip(" ").startswith("- ")):
+                break  # end of the objects list
+        if not (ln.strip() and _indent(ln) == item_indent and ln.lstrip(" ").startswith("- ")):
+            if ln.strip():
+                return None  # content outside an item: not the layout we understand
+            i += 1
+            continue
+
+        # One object: its first member sits on the "- " line.
+        item_lines = [" " * key_indent + ln[item_indent + 2 :]]
+        i += 1
+        while i < len(lines):
+            nxt = lines[i]
+            if nxt.strip() and not nxt.lstrip().startswith("#") and _indent(nxt) <= item_indent:
+                break
+            item_lines.append(nxt)
+            i += 1
+
+        members: List[Tuple[Optional[str], List[str]]] = []
+        for m in item_lines:
+            body = m[key_indent:] if _indent(m) >= key_indent else m.lstrip(" ")
+            if m.strip() and _indent(m) == key_indent and not body.startswith("- ") and not body.startswith("#"):
+                km = _MEMBER_RE.match(body)
+                if not km:
+                    return None
+                members.append((km.group(1), [m]))
+            elif members:
+                members[-1][1].append(m)
+            elif m.strip():
+                return None
+
+        lazy: Dict[str, str] = {}
+        eager: List[str] = []
+        for key, member_lines in members:
+            if key in LAZY_GEOMETRY_KEYS and len(member_lines) > 1:
+                lazy[key] = "".join(x[key_indent:] if _indent(x) >= key_indent else x.lstrip(" ") for x in member_lines)
+            else:
+                eager.extend(member_lines)
+        if eager:
+            eager[0] = " " * item_indent + "- " + eager[0][key_indent:]
+        else:
+            eager = [" " * item_indent + "- {}\n"]
+        out.extend(eager)
+        geometry.append(lazy)
+
+    out.extend(lines[i:])
+    return "".join(out), geometry
+
+
+@dataclass(frozen=True)
+class ScenarioObject:
+    id: str
+    type: str
+    behavior: str
+    description: str
+    parameters: Dict[str, Any]
+    autonomous_tasks: Tuple[AutonomousTask, ...]
+    raw: Dict[str, Any] = field(repr=False, compare=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Member of the raw object; lazily loaded geometry is constructed here, once."""
+        value = self.raw.get(key, default)
+        if isinstance(value, LazyValue):
+            value = value.resolve()
+            self.raw[key] = value
+        return value
+
+    def center(self) -> Optional[Tuple[float, float]]:
+        """(lat, lon) of the object's point geometry: geolocation, then centroid, then initial_position."""
+        geos = self.get("geolocation")
+        if isinstance(geos, list) and geos and isinstance(geos[0], dict):
+            g = geos[0]
+            if "lat" in g and "lon" in g:
+                return float(g["lat"]), float(g["lon"])
+            coords = (g.get("geometry") or {}).get("coordinates")
+            if isinstance(coords, list) and len(coords) >= 2:
+                return float(coords[1]), float(coords[0])
+        for key in ("centroid", "initial_position"):
+            coords = ((self.get(key) or {}).get("geometry") or {}).get("coordinates")
+            if isinstance(coords, list) and len(coords) >= 2:
+                return float(coords[1]), float(coords[0])
+        return None
+
+    def radius_m(self) -> Optional[float]:
+        radius = self.raw.get("radius")
+        if isinstance(radius, list) and radius and isinstance(radius[0], (int, float)):
+            return float(radius[0])
+        return None
+
+    def rings(self) -> List[List[Tuple[float, float]]]:
+        """Outer rings of every polygon in ``region`` / ``polygon`` as (lat, lon) lists."""
+        out: List[List[Tuple[float, float]]] = []
+        for key in ("region", "polygon"):
+            value = self.get(key)
+            features = value if isinstance(value, list) else [value]
+            for feat in features:
+                if not isinstance(feat, dict):
+                    continue
+                geoms = [f.get("geometry") for f in feat.get("features") or []] or [feat.get("geometry", feat)]
+                for geom in geoms:
+                    if not isinstance(geom, dict):
+                        continue
+                    coords = geom.get("coordinates")
+                    if geom.get("type") == "Polygon" and coords:
+                        polys = [coords]
+                    elif geom.get("type") == "MultiPolygon" and coords:
+                        polys = coords
+                    else:
+                        continue
+                    for poly in polys:
+                        out.append([(float(p[1]), float(p[0])) for p in poly[0]])
+        return out
+
+
+@dataclass(frozen=True)
+class Scenario:
+    id: str
+    description: str
+    duration_s: float
+    objects: Tuple[ScenarioObject, ...]
+
+
+@dataclass(frozen=True)
+class Experiment:
+    id: str
+    title: str
+    description: str
+    path: str
+    scenario_file: str
+    agents_file: str
+    platform_file: str
+    entrypoint: Optional[str]
+    runtime: Dict[str, Any]
+    outputs: Dict[str, Any]
+
+
+@dataclass
+class ResolvedConfig:
+    """The experiment -> scenario -> platform -> agents graph with O(1) lookups."""
+
+    experiment: Experiment
+    scenario: Scenario
+    simulators: Dict[str, SimulatorSpec]
+    agents: Dict[str, AgentSpec]
+    objects: Dict[str, ScenarioObject]
+    """Scenario objects by ``id``."""
+    models: Dict[str, SimModel]
+    """Simulator models by ``id`` across all simulators."""
+    tasks: Dict[str, Tuple[str, AutonomousTask]]
+    """Every task by ``unique_id`` -> (owner id: model or scenario object, task)."""
+    tasks_by_agent: Dict[str, List[str]]
+    """``agent_ref`` -> task ``unique_id`` values that use it."""
+
+    def agent(self, agent_ref: str) -> AgentSpec:
+        try:
+            return self.agents[agent_ref]
+        except KeyError:
+            raise KeyError(f"unknown agent_ref: {agent_ref}") from None
+
+    def object(self, object_id: str) -> ScenarioObject:
+        try:
+            return self.objects[object_id]
+        except KeyError:
+            raise KeyError(f"unknown scenario object: {object_id}") from None
+
+    def task(self, unique_id: str) -> AutonomousTask:
+        try:
+            return self.tasks[unique_id][1]
+        except KeyError:
+            raise KeyError(f"unknown task unique_id: {unique_id}") from None
+
+
+def _load_yaml(path: Path, lazy_geometry: bool = False) -> Dict[str, Any]:
+    loader = _LazyGeometryLoader if lazy_geometry else _YamlLoader
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=loader)
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a mapping: {path}")
+    return data
+
+
+def _section(data: Dict[str, Any], key: str, path: Path) -> Dict[str, Any]:
+    value = data.get(key)
+    if not isinstance(value, dict):
+        raise ValueError(f"{path}: missing '{key}' mapping")
+    return value
+
+
+def _tasks(items: Any) -> Tuple[AutonomousTask, ...]:
+    out: List[AutonomousTask] = []
+    for t in items or []:
+        if isinstance(t, dict):
+            out.append(AutonomousTask(str(t.get("unique_id", "")), str(t.get("name", "")), str(t.get("agent_ref", ""))))
+    return tuple(out)
+
+
+def _parse_experiment(path: Path) -> Experiment:
+    exp = _section(_load_yaml(path), "experiment", path)
+
+    def file_of(key: str) -> str:
+        ref = exp.get(key)
+        if not (isinstance(ref, dict) and ref.get("file")):
+            raise ValueError(f"{path}: experiment.{key}.file is required")
+        return str((path.parent / str(ref["file"])).resolve())
+
+    return Experiment(
+        id=str(exp.get("id", "")),
+        title=str(exp.get("title", "")),
+        description=str(exp.get("description", "")),
+        path=str(path.resolve()),
+        scenario_file=file_of("scenario"),
+        agents_file=file_of("agents"),
+        platform_file=file_of("platform"),
+        entrypoint=(exp.get("agents") or {}).get("entrypoint"),
+        runtime=dict(exp.get("runtime") or {}),
+        outputs=dict(exp.get("outputs") or {}),
+    )
+
+
+def _parse_scenario(data: Dict[str, Any], path: Path) -> Scenario:
+    sc = _section(data, "scenario", path)
+    objs: List[ScenarioObject] = []
+    for o in sc.get("objects") or []:
+        if not isinstance(o, dict):
+            continue
+        objs.append(
+            ScenarioObject(
+                id=str(o.get("id", "")),
+                type=str(o.get("type", "")),
+                behavior=str(o.get("behavior") or ""),
+                description=str(o.get("description") or ""),
+                parameters=dict(o.get("parameters") or {}),
+                autonomous_tasks=_tasks(o.get("autonomous_tasks")),
+                raw=o,
+            )
+        )
+    return Scenario(
+        id=str(sc.get("id", "")),
+        description=str(sc.get("description", "")),
+        duration_s=float(sc.get("duration_s", 0.0)),
+        objects=tuple(objs),
+    )
+
+
+def load_scenario(path: Path, lazy_geometry: bool = True) -> Scenario:
+    """Parses a config-v2 scenario file; geometry members are constructed on first ``ScenarioObject.get``."""
+    path = Path(path)
+    if not lazy_geometry:
+        return _parse_scenario(_load_yaml(path), path)
+
+    split = _split_geometry_text(path.read_text(encoding="utf-8"))
+    if split is None:
+        return _parse_scenario(_load_yaml(path, lazy_geometry=True), path)
+
+    text, geometry = split
+    data = yaml.load(text, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a mapping: {path}")
+    objs = (data.get("scenario") or {}).get("objects")
+    if not isinstance(objs, list) or len(objs) != len(geometry):
+        return _parse_scenario(_load_yaml(path, lazy_geometry=True), path)
+    for o, members in zip(objs, geometry):
+        for key, member_text in members.items():
+            o[key] = LazyValue(key, text=member_text)
+    return _parse_scenario(data, path)
+
+
+def _parse_platform(data: Dict[str, Any], path: Path) -> Dict[str, SimulatorSpec]:
+    sims = _section(data, "simulators", path)
+    out: Dict[str, SimulatorSpec] = {}
+    for name, spec in sims.items():
+        spec = spec or {}
+        models = tuple(
+            SimModel(
+                id=str(m.get("id", "")),
+                simulator=str(name),
+                type=str(m.get("type", "")),
+                file_path=m.get("file_path"),
+                autonomous_tasks=_tasks(m.get("autonomous_tasks")),
+            )
+            for m in spec.get("models") or []
+            if isinstance(m, dict)
+        )
+        out[str(name)] = SimulatorSpec(name=str(name), version=str(spec.get("version", "")), models=models)
+    return out
+
+
+def _parse_agents(data: Dict[str, Any], path: Path) -> List[AgentSpec]:
+    items = data.get("agents")
+    if not isinstance(items, list):
+        raise ValueError(f"{path}: missing 'agents' list")
+    out: List[AgentSpec] = []
+    for a in items:
+        if not isinstance(a, dict):
+            continue
+        training = a.get("training_info") or {}
+        inference = a.get("inference_info") or {}
+        out.append(
+            AgentSpec(
+                id=str(a.get("id", "")),
+                title=str(a.get("title", "")),
+                object_type=str(a.get("object_type", "")),
+                artifact_path=(a.get("artifact") or {}).get("path"),
+                weights_path=inference.get("weights_path"),
+                version=None if inference.get("version") is None else str(inference.get("version")),
+                validation_set_size=int((training.get("validation_set") or {}).get("size", 0)),
+                hyperparameters=dict(a.get("hyperparameters") or {}),
+                raw=a,
+            )
+        )
+    return out
+
+
+def load_agents(path: Path) -> List[AgentSpec]:
+    """Parses ``spec/agents.yaml`` on its own (no cross-file validation)."""
+    path = Path(path)
+    return _parse_agents(_load_yaml(path), path)
+
+
+def _index(problems: List[str], what: str, pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for key, value in pairs:
+        if not key:
+            problems.append(f"{what} with empty id")
+        elif key in out:
+            problems.append(f"duplicate {what} id: {key}")
+        else:
+            out[key] = value
+    return out
+
+
+def resolve(experiment_path: Path) -> ResolvedConfig:
+    """Parses and cross-links the whole graph; raises ValueError listing every dangling or duplicate reference."""
+    experiment = _parse_experiment(Path(experiment_path))
+    scenario_path = Path(experiment.scenario_file)
+    platform_path = Path(experiment.platform_file)
+    agents_path = Path(experiment.agents_file)
+
+    scenario = load_scenario(scenario_path)
+    simulators = _parse_platform(_load_yaml(platform_path), platform_path)
+    agent_list = _parse_agents(_load_yaml(agents_path), agents_path)
+
+    problems: List[str] = []
+    agents = _index(problems, "agent", [(a.id, a) for a in agent_list])
+    objects = _index(problems, "scenario object", [(o.id, o) for o in scenario.objects])
+    models = _index(problems, "model", [(m.id, m) for s in simulators.values() for m in s.models])
+
+    owned: List[Tuple[str, Tuple[str, AutonomousTask]]] = []
+    for m in models.values():
+        owned.extend((t.unique_id, (m.id, t)) for t in m.autonomous_tasks)
+    for o in scenario.objects:
+        owned.extend((t.unique_id, (o.id, t)) for t in o.autonomous_tasks)
+    tasks = _index(problems, "task", owned)
+
+    tasks_by_agent: Dict[str, List[str]] = {}
+    for uid, (owner, t) in tasks.items():
+        if t.agent_ref not in agents:
+            problems.append(f"{owner}: task {uid} references unknown agent_ref {t.agent_ref!r}")
+        tasks_by_agent.setdefault(t.agent_ref, []).append(uid)
+
+    # Agents used by this scenario must point at a region that exists in it.
+    scenario_agents = {t.agent_ref for o in scenario.objects for t in o.autonomous_tasks}
+    for ref in sorted(scenario_agents & agents.keys()):
+        pg = agents[ref].hyperparameters.get("playground_uid")
+        if pg and pg not in objects:
+            problems.append(f"agent {ref}: playground_uid {pg!r} is not a scenario object")
+
+    if problems:
+        raise ValueError("config-v2 validation failed:\n  - " + "\n  - ".join(problems))
+
+    return ResolvedConfig(
+        experiment=experiment,
+        scenario=scenario,
+        simulators=simulators,
+        agents=agents,
+        objects=objects,
+        models=models,
+        tasks=tasks,
+        tasks_by_agent=tasks_by_agent,
+    )
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _fingerprint(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    return {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": _sha256(path)}
+
+
+def _check(fp: Dict[str, Any]) -> str:
+    """Returns "same" (size+mtime match), "touched" (content hash matches) or "changed"."""
+    path = Path(fp["path"])
+    try:
+        st = path.stat()
+    except OSError:
+        return "changed"
+    if st.st_size == fp["size"] and st.st_mtime_ns == fp["mtime_ns"]:
+        return "same"
+    # Touched but maybe not changed (checkout, copy): a hash is still far cheaper than YAML parsing.
+    if st.st_size == fp["size"] and _sha256(path) == fp["sha256"]:
+        return "touched"
+    return "changed"
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "red-skies" / "config-v2"
+
+
+def _cache_file(cache_dir: Path, experiment_path: Path) -> Path:
+    key = hashlib.sha256(str(experiment_path.resolve()).encode("utf-8")).hexdigest()[:32]
+    return cache_dir / f"{key}.pkl"
+
+
+def load_experiment(
+    experiment_path: Path,
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+) -> ResolvedConfig:
+    """``resolve`` with an on-disk cache keyed by each input file's size, mtime and sha256.
+
+    Parallel workers launched on the same experiment hit the cache after the first parse.
+    """
+    experiment_path = Path(experiment_path)
+    if not use_cache:
+        return resolve(experiment_path)
+
+    cache_file = _cache_file(cache_dir or default_cache_dir(), experiment_path)
+    try:
+        with cache_file.open("rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") == CACHE_VERSION:
+            states = [_check(fp) for fp in payload["inputs"]]
+            if "changed" not in states:
+                config = payload["config"]
+                if "touched" in states:
+                    _write_cache(cache_file, config)
+                return config
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError, TypeError):
+        pass
+
+    config = resolve(experiment_path)
+    _write_cache(cache_file, config)
+    return config
+
+
+def _write_cache(cache_file: Path, config: ResolvedConfig) -> None:
+    inputs = [
+        _fingerprint(Path(p))
+        for p in (
+            config.experiment.path,
+            config.experiment.scenario_file,
+            config.experiment.platform_file,
+            config.experiment.agents_file,
+        )
+    ]
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "inputs": inputs, "config": config}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def _synthetic_scenario(n_objects: int, seed: int = 0) -> Dict[str, Any]:
+    import random
+
+    rng = random.Random(seed)
+    objs: List[Dict[str, Any]] = []
+    for i in range(n_objects):
+        lat, lon = 28.5 + rng.random() * 3.0, -42.0 + rng.random() * 4.0
+
+        def point() -> Dict[str, Any]:
+            return {"type": "Feature", "properties": {}, "geometry": {"type": "Point", "coordinates": [lon, lat, 1500.0]}}
+
+        params = {"initial_state": 1, "probability": 0.0, "time": float("inf")}
+        if i % 2:
+            ring = [[lon + 0.05 * math.cos(a / 4 * math.pi), lat + 0.05 * math.sin(a / 4 * math.pi)] for a in range(8)]
+            ring.append(ring[0])
+            polygon = {"type": "FeatureCollection", "features": [{"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [ring]}}]}
+            objs.append({"id": f"nfz-{i}", "type": "polygon", "centroid": point(), "polygon": polygon, "behavior": "no_fly_zone", "parameters": params})
+        else:
+            objs.append(
+                {
+                    "id": f"nfz-{i}",
+                    "type": "circle",
+                    "geolocation": [point()],
+                    "centroid": point(),
+                    "radius": [rng.choice([6000.0, 15000.0, 20000.0])],
+                    "behavior": "no_fly_zone",
+                    "parameters": params,
+                }
+            )
+    return {"scenario": {"id": f"synthetic-{n_objects}", "description": "", "duration_s": 7200, "objects": objs}}
+
+
+def benchmark_scenario_load(n_objects: int = 10_000, repeat: int = 1) -> Dict[str, float]:
+    """Seconds to load a synthetic ``n_objects`` scenario with each loader path."""
+    import tempfile
+
+    dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "scenario.yaml"
+        with path.open("w", encoding="utf-8") as f:
+            yaml.dump(_synthetic_scenario(n_objects), f, Dumper=dumper, sort_keys=False)
+
+        def timed(fn: Any) -> float:
+            best = float("inf")
+            for _ in range(repeat):
+                t0 = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - t0)
+            return best
+
+        def pure() -> None:
+            with path.open("r", encoding="utf-8") as f:
+                yaml.load(f, Loader=yaml.SafeLoader)
+
+        def lazy_all_centers() -> None:
+            for o in load_scenario(path).objects:
+                o.center()
+
+        return {
+            "objects": float(n_objects),
+            "file_mb": path.stat().st_size / 1e6,
+            "pure_python_safe_loader_s": timed(pure),
+            "c_safe_loader_s": timed(lambda: _load_yaml(path)),
+            "c_loader_lazy_geometry_s": timed(lambda: load_scenario(path)),
+            "c_loader_lazy_then_all_centers_s": timed(lazy_all_centers),
+        }
+
+
+def _summary(config: ResolvedConfig) -> Dict[str, Any]:
+    return {
+        "experiment": config.experiment.id,
+        "scenario": config.scenario.id,
+        "objects": len(config.objects),
+        "simulators": sorted(config.simulators),
+        "models": len(config.models),
+        "agents": sorted(config.agents),
+        "tasks": len(config.tasks),
+        "tasks_by_agent": {k: len(v) for k, v in sorted(config.tasks_by_agent.items())},
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("experiment", nargs="?", help="config-v2 instance/experiment-*.yaml")
+    ap.add_argument("--cache-dir", default=None)
+    ap.add_argument("--no-cache", action="store_true")
+    ap.add_argument("--bench-objects", type=int, default=None, help="Benchmark loading a synthetic N-object scenario")
+    args = ap.parse_args()
+
+    if args.bench_objects:
+        print(json.dumps(benchmark_scenario_load(args.bench_objects), indent=2))
+        return
+    if not args.experiment:
+        ap.error("experiment is required unless --bench-objects is given")
+
+    t0 = time.perf_counter()
+    config = load_experiment(
+        Path(args.experiment),
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
+        use_cache=not args.no_cache,
+    )
+    elapsed_ms = (time.perf_counter() - t0) * 1e3
+
+    out = _summary(config)
+    out["load_ms"] = round(elapsed_ms, 3)
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
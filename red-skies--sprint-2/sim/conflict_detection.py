@@ -0,0 +1,415 @@
+import argparse
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geodesy import to_local_equirect
+from schema import EntityType, SimulationState
+
+
+EVENT_KINDS = ("detected", "loss", "resolved")
+
+
+@dataclass(frozen=True)
+class ConflictConfig:
+    horizontal_sep_m: float = 1_000.0
+    vertical_sep_m: float = 300.0
+    """A conflict is a predicted time at which both separations are lost together."""
+    lookahead_s: float = 120.0
+    max_pairs_per_chunk: int = 2_000_000
+    """Broadphase candidate pairs materialized at once; bounds memory when traffic is dense."""
+    broadphase: str = "grid"
+    """``grid`` (uniform spatial hash) or ``sap`` (sweep-and-prune on one axis)."""
+
+    def validate(self) -> None:
+        if self.horizontal_sep_m <= 0 or self.vertical_sep_m <= 0 or self.lookahead_s < 0:
+            raise ValueError("horizontal_sep_m and vertical_sep_m must be positive and lookahead_s >= 0")
+        if self.max_pairs_per_chunk < 1:
+            raise ValueError("max_pairs_per_chunk must be >= 1")
+        if self.broadphase not in BROADPHASES:
+            raise ValueError(f"broadphase must be one of {sorted(BROADPHASES)}, got {self.broadphase!r}")
+
+
+@dataclass(frozen=True)
+class Conflict:
+    a: str
+    b: str
+    t_cpa_s: float
+    """Time of horizontal closest approach from now, clipped to the look-ahead."""
+    d_cpa_m: float
+    """Horizontal miss distance at ``t_cpa_s``."""
+    dz_cpa_m: float
+    """Vertical separation at ``t_cpa_s``."""
+    t_los_s: float
+    """First time both separations are lost (0 = already lost)."""
+
+
+@dataclass(frozen=True)
+class ConflictEvent:
+    time: float
+    kind: str
+    """``detected`` (new predicted conflict), ``loss`` (separation lost now) or ``resolved``."""
+    conflict: Conflict
+
+
+# ---------------------------------------------------------------------------
+# Narrowphase
+# ---------------------------------------------------------------------------
+
+
+def cpa(
+    dp: np.ndarray, dv: np.ndarray, config: ConflictConfig
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized closest point of approach for relative states ``dp``/``dv`` of shape (K, 3), ENU.
+
+    Returns (conflict mask, t_cpa, horizontal d_cpa, vertical sep at t_cpa, t_los). Horizontal loss
+    of separation is the interval where ``|dp_xy + dv_xy t| < H`` (a quadratic in t), vertical the
+    interval where ``|dz + dvz t| < V``; a conflict is a non-empty overlap of both inside [0, T].
+    """
+    h, v, horizon = config.horizontal_sep_m, config.vertical_sep_m, config.lookahead_s
+    px, py, pz = dp[:, 0], dp[:, 1], dp[:, 2]
+    vx, vy, vz = dv[:, 0], dv[:, 1], dv[:, 2]
+    a = vx * vx + vy * vy
+    b = px * vx + py * vy
+    c = px * px + py * py - h * h
+    moving = a > 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_cpa = np.where(moving, np.clip(-b / a, 0.0, horizon), 0.0)
+        disc = b * b - a * c
+        root = np.sqrt(np.maximum(disc, 0.0))
+        h_lo = np.where(moving, (-b - root) / a, -np.inf)
+        h_hi = np.where(moving, (-b + root) / a, np.inf)
+        h_ok = np.where(moving, disc > 0.0, c < 0.0)
+
+        climbing = np.abs(vz) > 1e-9
+        z1 = (-v - pz) / vz
+        z2 = (v - pz) / vz
+        z_lo = np.where(climbing, np.minimum(z1, z2), -np.inf)
+        z_hi = np.where(climbing, np.maximum(z1, z2), np.inf)
+        z_ok = climbing | (np.abs(pz) < v)
+
+    lo = np.maximum(np.maximum(h_lo, z_lo), 0.0)
+    hi = np.minimum(np.minimum(h_hi, z_hi), horizon)
+    hit = h_ok & z_ok & (lo < hi)
+    d_cpa = np.hypot(px + vx * t_cpa, py + vy * t_cpa)
+    dz_cpa = np.abs(pz + vz * t_cpa)
+    return hit, t_cpa, d_cpa, dz_cpa, lo
+
+
+# ---------------------------------------------------------------------------
+# Broadphase
+# ---------------------------------------------------------------------------
+
+
+def swept_boxes(pos: np.ndarray, vel: np.ndarray, config: ConflictConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """(N, 3) lower and upper corners of each aircraft's path over the look-ahead, padded by half the separation.
+
+    Two aircraft that lose separation at some t share a point within half the separation of both
+    positions at t, so their boxes overlap: culling on box overlap never drops a conflict.
+    """
+    end = pos + vel * config.lookahead_s
+    pad = np.array([config.horizontal_sep_m, config.horizontal_sep_m, config.vertical_sep_m]) / 2.0
+    return np.minimum(pos, end) - pad, np.maximum(pos, end) + pad
+
+
+class SweepAndPrune:
+    """Sort-and-sweep along the widest horizontal axis, then box tests on the other two, all vectorized.
+
+    The sort order of the previous tick seeds the next one; ``kind="stable"`` (timsort) is close to
+    linear on the nearly sorted keys that slowly moving traffic produces.
+    """
+
+    def __init__(self) -> None:
+        self._order: Optional[np.ndarray] = None
+        self._axis = 0
+
+    def reset(self) -> None:
+        self._order = None
+
+    def _sorted(self, keys: np.ndarray) -> np.ndarray:
+        n = keys.size
+        if self._order is not None and self._order.size == n:
+            order = self._order[np.argsort(keys[self._order], kind="stable")]
+        else:
+            order = np.argsort(keys, kind="stable")
+        self._order = order
+        return order
+
+    def pairs(self, lo: np.ndarray, hi: np.ndarray, max_pairs: int = 2_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yields chunks of index pairs (i, j), i != j, whose boxes overlap; each pair once."""
+        n = lo.shape[0]
+        if n < 2:
+            return
+        centers = (lo + hi) / 2.0
+        axis = int(np.argmax(centers[:, :2].std(axis=0)))
+        if axis != self._axis:
+            self._axis = axis
+            self._order = None
+        order = self._sorted(lo[:, axis])
+        s_lo = lo[order, axis]
+        s_hi = hi[order, axis]
+        # Sorted position k overlaps k+1 .. end[k]-1 on the sweep axis.
+        end = np.searchsorted(s_lo, s_hi, side="right")
+        counts = np.maximum(end - np.arange(n) - 1, 0)
+        cum = np.cumsum(counts)
+        start_k = 0
+        while start_k < n:
+            base = cum[start_k - 1] if start_k else 0
+            stop_k = int(np.searchsorted(cum, base + max_pairs, side="right"))
+            stop_k = max(stop_k, start_k + 1)
+            c = counts[start_k:stop_k]
+            total = int(c.sum())
+            if total:
+                first = np.repeat(np.arange(start_k, stop_k), c)
+                offs = np.arange(total) - np.repeat(np.cumsum(c) - c, c)
+                i = order[first]
+                j = order[first + 1 + offs]
+                other = [ax for ax in range(3) if ax != axis]
+                keep = np.ones(total, dtype=bool)
+                for ax in other:
+                    keep &= (lo[i, ax] <= hi[j, ax]) & (lo[j, ax] <= hi[i, ax])
+                if keep.any():
+                    yield i[keep], j[keep]
+            start_k = stop_k
+
+
+class UniformGrid:
+    """Spatial hash of the swept boxes on the horizontal plane, vectorized with sorts instead of dicts.
+
+    Every box is listed in each cell it overlaps; pairs are formed within a cell and kept only in the
+    cell holding the lower-left corner of the two boxes' overlap, so each pair comes out once. The
+    cell edge defaults to the median box extent, which keeps a box in about four cells.
+    """
+
+    def __init__(self, cell_m: Optional[float] = None) -> None:
+        self.cell_m = cell_m
+
+    def reset(self) -> None:
+        pass
+
+    def pairs(self, lo: np.ndarray, hi: np.ndarray, max_pairs: int = 2_000_000) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        n = lo.shape[0]
+        if n < 2:
+            return
+        cell = self.cell_m or max(float(np.median((hi[:, :2] - lo[:, :2]).max(axis=1))), 1.0)
+        base = np.floor(lo[:, :2].min(axis=0) / cell)
+        c0 = (np.floor(lo[:, :2] / cell) - base).astype(np.int64)
+        c1 = (np.floor(hi[:, :2] / cell) - base).astype(np.int64)
+        nx = c1[:, 0] - c0[:, 0] + 1
+        per_box = nx * (c1[:, 1] - c0[:, 1] + 1)
+        box = np.repeat(np.arange(n), per_box)
+        local = np.arange(box.size) - np.repeat(np.cumsum(per_box) - per_box, per_box)
+        cx = c0[box, 0] + local % nx[box]
+        cy = c0[box, 1] + local // nx[box]
+        key = cx * (int(c1[:, 1].max()) + 1) + cy
+        order = np.argsort(key, kind="stable")
+        key, box, cx, cy = key[order], box[order], cx[order], cy[order]
+        lx, ly, lz = (np.ascontiguousarray(lo[:, ax]) for ax in range(3))
+        hx, hy, hz = (np.ascontiguousarray(hi[:, ax]) for ax in range(3))
+
+        # Entry p pairs with the entries after it in the same cell: p+1 .. group_end[p]-1.
+        change = np.flatnonzero(np.diff(key)) + 1
+        ends = np.append(change, key.size)
+        group_end = np.repeat(ends, np.diff(np.concatenate([[0], ends])))
+        counts = group_end - np.arange(key.size) - 1
+        cum = np.cumsum(counts)
+        start = 0
+        while start < key.size:
+            done = cum[start - 1] if start else 0
+            stop = max(int(np.searchsorted(cum, done + max_pairs, side="right")), start + 1)
+            c = counts[start:stop]
+            total = int(c.sum())
+            if total:
+                first = np.repeat(np.arange(start, stop), c)
+                second = first + 1 + np.arange(total) - np.repeat(np.cumsum(c) - c, c)
+                i, j = box[first], box[second]
+                # Cheap 1-D overlap tests first, then the once-per-pair cell check on the survivors.
+                keep = (lx[i] <= hx[j]) & (lx[j] <= hx[i]) & (ly[i] <= hy[j]) & (ly[j] <= hy[i])
+                i, j, first = i[keep], j[keep], first[keep]
+                keep = (lz[i] <= hz[j]) & (lz[j] <= hz[i])
+                keep &= np.floor(np.maximum(lx[i], lx[j]) / cell) - base[0] == cx[first]
+                keep &= np.floor(np.maximum(ly[i], ly[j]) / cell) - base[1] == cy[first]
+                if keep.any():
+                    yield i[keep], j[keep]
+            start = stop
+
+
+BROADPHASES = {"grid": UniformGrid, "sap": SweepAndPrune}
+
+
+# ---------------------------------------------------------------------------
+# Detector
+# ---------------------------------------------------------------------------
+
+
+def state_arrays(
+    state: SimulationState, origin: Optional[Tuple[float, float]] = None, aircraft_only: bool = True
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(ids, (N, 3) east/north/up metres, (N, 3) velocity) from ``position`` and NED ``local_velocity``."""
+    ents = [e for e in state.entities.values() if not aircraft_only or e.type == EntityType.AIRCRAFT]
+    n = len(ents)
+    lat, lon = np.empty(n), np.empty(n)
+    pos, vel = np.empty((n, 3)), np.empty((n, 3))
+    for k, e in enumerate(ents):
+        p, v = e.position, e.local_velocity
+        lat[k], lon[k] = p.latitude, p.longitude
+        pos[k, 2] = p.altitude
+        vel[k] = (v.east, v.north, -v.down)
+    if n:
+        lat0, lon0 = origin if origin is not None else (float(lat.mean()), float(lon.mean()))
+        pos[:, 0], pos[:, 1] = to_local_equirect(lat, lon, lat0, lon0)
+    return [e.uid for e in ents], pos, vel
+
+
+class ConflictDetector:
+    """Per-tick predicted conflicts between all aircraft, with detected / loss / resolved events.
+
+    ``update`` culls pairs on swept boxes (``UniformGrid`` or ``SweepAndPrune``) and runs ``cpa`` on
+    the survivors, so a tick costs O(N log N + candidates) instead of O(N^2). Conflicts are keyed by the sorted id
+    pair, so events are stable while aircraft join or leave.
+    """
+
+    def __init__(self, config: Optional[ConflictConfig] = None) -> None:
+        self.config = config or ConflictConfig()
+        self.config.validate()
+        self.broadphase = BROADPHASES[self.config.broadphase]()
+        self.active: Dict[Tuple[str, str], Conflict] = {}
+        self._ids: Optional[List[str]] = None
+        self.last_candidates = 0
+        self.ticks = 0
+
+    def update(self, t: float, ids: Sequence[str], pos: np.ndarray, vel: np.ndarray) -> List[ConflictEvent]:
+        """``pos``/``vel`` are (N, 3) local east/north/up metres and m/s, rows matching ``ids``."""
+        ids = list(ids)
+        if ids != self._ids:
+            self.broadphase.reset()
+            self._ids = ids
+        pos = np.asarray(pos, dtype=np.float64)
+        vel = np.asarray(vel, dtype=np.float64)
+        lo, hi = swept_boxes(pos, vel, self.config)
+
+        current: Dict[Tuple[str, str], Conflict] = {}
+        candidates = 0
+        for i, j in self.broadphase.pairs(lo, hi, self.config.max_pairs_per_chunk):
+            candidates += i.size
+            hit, t_cpa, d_cpa, dz_cpa, t_los = cpa(pos[j] - pos[i], vel[j] - vel[i], self.config)
+            for k in np.flatnonzero(hit).tolist():
+                a, b = ids[i[k]], ids[j[k]]
+                if b < a:
+                    a, b = b, a
+                current[(a, b)] = Conflict(a, b, float(t_cpa[k]), float(d_cpa[k]), float(dz_cpa[k]), float(t_los[k]))
+        self.last_candidates = candidates
+        self.ticks += 1
+
+        events: List[ConflictEvent] = []
+        for key, c in current.items():
+            prev = self.active.get(key)
+            if prev is None:
+                events.append(ConflictEvent(t, "detected", c))
+            if c.t_los_s <= 0.0 and (prev is None or prev.t_los_s > 0.0):
+                events.append(ConflictEvent(t, "loss", c))
+        for key, c in self.active.items():
+            if key not in current:
+                events.append(ConflictEvent(t, "resolved", c))
+        self.active = current
+        return events
+
+    def update_state(self, state: SimulationState, origin: Optional[Tuple[float, float]] = None) -> List[ConflictEvent]:
+        ids, pos, vel = state_arrays(state, origin)
+        return self.update(float(state.time), ids, pos, vel)
+
+
+def all_pairs(ids: Sequence[str], pos: np.ndarray, vel: np.ndarray, config: ConflictConfig) -> Dict[Tuple[str, str], Conflict]:
+    """O(N^2) reference: ``cpa`` on every pair, no culling."""
+    n = len(ids)
+    i, j = np.triu_indices(n, k=1)
+    out: Dict[Tuple[str, str], Conflict] = {}
+    hit, t_cpa, d_cpa, dz_cpa, t_los = cpa(pos[j] - pos[i], vel[j] - vel[i], config)
+    for k in np.flatnonzero(hit).tolist():
+        a, b = sorted((ids[i[k]], ids[j[k]]))
+        out[(a, b)] = Conflict(a, b, float(t_cpa[k]), float(d_cpa[k]), float(dz_cpa[k]), float(t_los[k]))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def synthetic_traffic(n: int, density_per_km2: float = 0.04, seed: int = 0) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """``n`` aircraft at constant density: random headings at 60-250 m/s, 500-3500 m, a few climbing."""
+    rng = np.random.default_rng(seed)
+    half = np.sqrt(n / density_per_km2) * 500.0
+    pos = np.column_stack([rng.uniform(-half, half, (n, 2)), rng.uniform(500.0, 3500.0, n)])
+    hdg = rng.uniform(0.0, 2 * np.pi, n)
+    speed = rng.uniform(60.0, 250.0, n)
+    climb = np.where(rng.random(n) < 0.2, rng.uniform(-10.0, 10.0, n), 0.0)
+    vel = np.column_stack([speed * np.sin(hdg), speed * np.cos(hdg), climb])
+    return [f"ac-{k}" for k in range(n)], pos, vel
+
+
+def benchmark(sizes: Sequence[int] = (100, 1000, 5000, 20000), ticks: int = 20, dt: float = 0.05, brute_max: int = 3000) -> Dict[str, Any]:
+    """Per-tick cost at 20 Hz steps for both broadphases against the all-pairs reference, with an exact-match check."""
+    out: Dict[str, Any] = {}
+    for n in sizes:
+        ids, pos0, vel = synthetic_traffic(n)
+        row: Dict[str, Any] = {"pairs": n * (n - 1) // 2}
+        for name in sorted(BROADPHASES):
+            config = ConflictConfig(broadphase=name)
+            det = ConflictDetector(config)
+            det.update(0.0, ids, pos0, vel)  # first tick pays the full sort
+            pos = pos0
+            events = 0
+            t0 = time.perf_counter()
+            for k in range(1, ticks + 1):
+                pos = pos + vel * dt
+                events += len(det.update(k * dt, ids, pos, vel))
+            row[f"{name}_tick_ms"] = (time.perf_counter() - t0) / ticks * 1e3
+            row[f"{name}_candidates"] = det.last_candidates
+        row["conflicts"] = len(det.active)
+        row["events"] = events
+        if n <= brute_max:
+            t0 = time.perf_counter()
+            ref = all_pairs(ids, pos, vel, config)
+            row["all_pairs_ms"] = (time.perf_counter() - t0) * 1e3
+            row["matches_all_pairs"] = set(ref) == set(det.active)
+        out[str(n)] = row
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--recording", default=None, help="Run the detector over a recording (telemetry.jsonl, frame log or chunked telemetry)")
+    ap.add_argument("--horizontal", type=float, default=ConflictConfig.horizontal_sep_m)
+    ap.add_argument("--vertical", type=float, default=ConflictConfig.vertical_sep_m)
+    ap.add_argument("--lookahead", type=float, default=ConflictConfig.lookahead_s)
+    ap.add_argument("--bench", type=int, nargs="*", default=None, metavar="N", help="Aircraft counts (default 100 1000 5000 20000)")
+    args = ap.parse_args()
+
+    if args.bench is not None:
+        print(json.dumps(benchmark(args.bench or (100, 1000, 5000, 20000)), indent=2))
+        return
+    if not args.recording:
+        ap.error("--recording or --bench is required")
+
+    from replay import open_recording
+
+    config = ConflictConfig(args.horizontal, args.vertical, args.lookahead)
+    det = ConflictDetector(config)
+    reader = open_recording(args.recording)
+    origin: Optional[Tuple[float, float]] = None
+    for state in reader.window():
+        if origin is None and state.entities:
+            e = next(iter(state.entities.values()))
+            origin = (e.position.latitude, e.position.longitude)
+        for ev in det.update_state(state, origin):
+            c = ev.conflict
+            print(json.dumps({"time": ev.time, "kind": ev.kind, "a": c.a, "b": c.b, "t_cpa_s": c.t_cpa_s, "d_cpa_m": c.d_cpa_m, "dz_cpa_m": c.dz_cpa_m, "t_los_s": c.t_los_s}))
+    reader.close()
+
+
+if __name__ == "__main__":
+    main()
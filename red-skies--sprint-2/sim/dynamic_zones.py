@@ -0,0 +1,275 @@
+import argparse
+import bisect
+import json
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[misc]
+
+
+INF = math.inf
+
+
+def parse_parameters(params: Optional[Dict[str, Any]]) -> Tuple[bool, float, Tuple[float, ...]]:
+    """(initially active, toggle probability, toggle times) from an object's ``parameters``.
+
+    ``time`` may be a number or a list; ``.inf`` (the static default) means the zone never toggles.
+    """
+    params = params or {}
+    state = params.get("initial_state", 1)
+    initial = bool(state) if isinstance(state, (bool, int, float)) else True
+    probability = float(params.get("probability", 0.0) or 0.0)
+    if not 0.0 <= probability <= 1.0:
+        raise ValueError(f"parameters.probability must be in [0, 1], got {probability}")
+    raw = params.get("time", INF)
+    times = raw if isinstance(raw, list) else [raw]
+    out = sorted(float(t) for t in times if t is not None and math.isfinite(float(t)))
+    return initial, probability, tuple(out)
+
+
+def may_toggle(params: Optional[Dict[str, Any]]) -> bool:
+    """False for zones that are active for the whole run under every realization."""
+    initial, probability, times = parse_parameters(params)
+    return not (initial and (probability <= 0.0 or not times))
+
+
+def compile_intervals(
+    initial: bool, probability: float, times: Sequence[float], rng: random.Random
+) -> List[Tuple[float, float]]:
+    """Half-open ``[start, end)`` activity intervals of one zone.
+
+    At each toggle time the zone flips state with ``probability``; the draws are made once, here,
+    so every query against the compiled schedule sees the same realization.
+    """
+    out: List[Tuple[float, float]] = []
+    active, since = initial, -INF
+    for t in times:
+        if probability <= 0.0 or (probability < 1.0 and rng.random() >= probability):
+            continue
+        if active and t > since:
+            out.append((since, t))
+        active, since = not active, t
+    if active:
+        out.append((since, INF))
+    return out
+
+
+class IntervalTree:
+    """Static centered interval tree over half-open intervals; ``stab(t)`` is O(log n + k)."""
+
+    __slots__ = ("center", "by_start", "starts", "by_end", "ends", "left", "right")
+
+    def __init__(self, intervals: List[Tuple[float, float, int]]) -> None:
+        # A point inside every interval; its median is contained by at least one interval, so each
+        # level makes progress even with open-ended (+-inf) intervals.
+        reps = sorted(_inside(s, e) for s, e, _ in intervals)
+        center = reps[(len(reps) - 1) // 2] if reps else 0.0
+        here = [iv for iv in intervals if iv[0] <= center < iv[1]]
+        lo = [iv for iv in intervals if iv[1] <= center]
+        hi = [iv for iv in intervals if iv[0] > center]
+
+        self.center = center
+        here_s = sorted(here, key=lambda iv: iv[0])
+        here_e = sorted(here, key=lambda iv: -iv[1])
+        self.starts = [iv[0] for iv in here_s]
+        self.by_start = [iv[2] for iv in here_s]
+        self.ends = [iv[1] for iv in here_e]
+        self.by_end = [iv[2] for iv in here_e]
+        self.left = IntervalTree(lo) if lo else None
+        self.right = IntervalTree(hi) if hi else None
+
+    def stab(self, t: float) -> List[int]:
+        out: List[int] = []
+        node: Optional[IntervalTree] = self
+        while node is not None:
+            if t < node.center:
+                # Every interval here ends after center > t; it is active iff it started by t.
+                for s, v in zip(node.starts, node.by_start):
+                    if s > t:
+                        break
+                    out.append(v)
+                node = node.left
+            else:
+                # Every interval here started at or before center <= t; active iff it ends after t.
+                for e, v in zip(node.ends, node.by_end):
+                    if e <= t:
+                        break
+                    out.append(v)
+                node = node.right
+        return out
+
+
+def _inside(start: float, end: float) -> float:
+    if math.isfinite(start) and math.isfinite(end):
+        return (start + end) / 2.0
+    if math.isfinite(start):
+        return start
+    if math.isfinite(end):
+        return end - 1.0
+    return 0.0
+
+
+@dataclass(frozen=True)
+class ZoneEvent:
+    time: float
+    zone_id: str
+    active: bool
+
+
+class DynamicZoneSchedule:
+    """Activation schedule of scenario zones (NFZs by default), compiled from their ``parameters``."""
+
+    def __init__(self, zone_ids: List[str], intervals: List[List[Tuple[float, float]]], objects: Optional[List[Any]] = None) -> None:
+        if len(zone_ids) != len(intervals):
+            raise ValueError("zone_ids and intervals must have the same length")
+        self.zone_ids = list(zone_ids)
+        self.objects = list(objects) if objects is not None else [None] * len(zone_ids)
+        self.index = {zid: i for i, zid in enumerate(self.zone_ids)}
+        self.intervals = [list(ivs) for ivs in intervals]
+        self._starts = [np.array([s for s, _ in ivs], dtype=np.float64) for ivs in self.intervals]
+        self._ends = [np.array([e for _, e in ivs], dtype=np.float64) for ivs in self.intervals]
+        # Plain-list copy of the starts for scalar ``bisect`` in ``is_active`` (cheaper than numpy for one value).
+        self._start_lists = [[s for s, _ in ivs] for ivs in self.intervals]
+        self.tree = IntervalTree([(s, e, z) for z, ivs in enumerate(self.intervals) for s, e in ivs])
+
+        events = []
+        for z, ivs in enumerate(self.intervals):
+            for s, e in ivs:
+                if math.isfinite(s):
+                    events.append((s, 1, z))
+                if math.isfinite(e):
+                    events.append((e, 0, z))
+        # Off before on at the same instant, so a zone re-activated at t is active at t.
+        events.sort()
+        self.event_times = [t for t, _, _ in events]
+        self.events = [ZoneEvent(t, self.zone_ids[z], bool(on)) for t, on, z in events]
+
+    @classmethod
+    def from_objects(
+        cls, objects: Iterable[Any], seed: int = 0, behavior: Optional[str] = "no_fly_zone"
+    ) -> "DynamicZoneSchedule":
+        """Accepts raw object dicts (``objects.yaml`` / scenario ``objects[]``) or ``config_loader.ScenarioObject``."""
+        ids: List[str] = []
+        intervals: List[List[Tuple[float, float]]] = []
+        kept: List[Any] = []
+        for o in objects:
+            if behavior is not None and o.get("behavior") != behavior:
+                continue
+            zid = str(o.get("id", ""))
+            # Per-zone stream: adding a zone does not change the realization of the others.
+            rng = random.Random(f"{seed}/{zid}")
+            intervals.append(compile_intervals(*parse_parameters(o.get("parameters")), rng=rng))
+            ids.append(zid)
+            kept.append(o)
+        return cls(ids, intervals, kept)
+
+    def __len__(self) -> int:
+        return len(self.zone_ids)
+
+    def active_at(self, t: float) -> List[int]:
+        """Indices of the zones active at time ``t`` (seconds since scenario start)."""
+        return self.tree.stab(float(t))
+
+    def active_ids(self, t: float) -> List[str]:
+        return [self.zone_ids[i] for i in self.active_at(t)]
+
+    def active_objects(self, t: float) -> List[Any]:
+        return [self.objects[i] for i in self.active_at(t)]
+
+    def is_active(self, zone_id: str, t: float) -> bool:
+        z = self.index[zone_id]
+        ivs = self.intervals[z]
+        i = bisect.bisect_right(self._start_lists[z], t) - 1
+        return i >= 0 and t < ivs[i][1]
+
+    def events_between(self, t0: float, t1: float) -> List[ZoneEvent]:
+        """Activations/deactivations with ``t0 < time <= t1``, in time order."""
+        return self.events[bisect.bisect_right(self.event_times, t0) : bisect.bisect_right(self.event_times, t1)]
+
+    def active_matrix(self, times: np.ndarray, zone_ids: Optional[List[str]] = None) -> np.ndarray:
+        """Boolean ``(len(times), len(zone_ids))`` activity for many sample times at once."""
+        times = np.asarray(times, dtype=np.float64)
+        cols = [self.index[z] for z in zone_ids] if zone_ids is not None else range(len(self.zone_ids))
+        out = np.zeros((times.size, len(cols)), dtype=bool)
+        for j, z in enumerate(cols):
+            starts, ends = self._starts[z], self._ends[z]
+            if starts.size == 0:
+                continue
+            i = np.searchsorted(starts, times, side="right") - 1
+            out[:, j] = (i >= 0) & (times < ends[np.maximum(i, 0)])
+        return out
+
+    def cursor(self, t: float = 0.0) -> "ActiveZoneCursor":
+        return ActiveZoneCursor(self, t)
+
+
+class ActiveZoneCursor:
+    """Active set for a monotonically advancing sim clock; each ``advance`` costs O(changes)."""
+
+    def __init__(self, schedule: DynamicZoneSchedule, t: float = 0.0) -> None:
+        self.schedule = schedule
+        self.time = float(t)
+        self.active: Set[str] = set(schedule.active_ids(t))
+
+    def advance(self, t: float) -> Tuple[List[str], List[str]]:
+        """Moves the clock to ``t``; returns (activated ids, deactivated ids)."""
+        if t < self.time:
+            raise ValueError(f"cursor cannot move backwards: {t} < {self.time}")
+        on: List[str] = []
+        off: List[str] = []
+        for ev in self.schedule.events_between(self.time, t):
+            if ev.active:
+                self.active.add(ev.zone_id)
+                on.append(ev.zone_id)
+            else:
+                self.active.discard(ev.zone_id)
+                off.append(ev.zone_id)
+        self.time = float(t)
+        return on, off
+
+
+def _load_objects(path: Path) -> List[Dict[str, Any]]:
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a mapping: {path}")
+    objs = data.get("objects")
+    if objs is None and isinstance(data.get("scenario"), dict):
+        objs = data["scenario"].get("objects")
+    if not isinstance(objs, list):
+        raise ValueError(f"{path}: missing 'objects' list")
+    return [o for o in objs if isinstance(o, dict)]
+
+
+def load_schedule(path: Path, seed: int = 0, behavior: Optional[str] = "no_fly_zone") -> DynamicZoneSchedule:
+    """Schedule of an ``objects.yaml`` or config-v2 ``scenario-*.yaml``."""
+    return DynamicZoneSchedule.from_objects(_load_objects(Path(path)), seed=seed, behavior=behavior)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("scenario", help="objects.yaml or config-v2 scenario-*.yaml")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--time", type=float, nargs="*", default=[0.0], help="Print the active zones at these times")
+    args = ap.parse_args()
+
+    schedule = load_schedule(Path(args.scenario), seed=args.seed)
+    out = {
+        "zones": len(schedule),
+        "events": [{"time": e.time, "zone": e.zone_id, "active": e.active} for e in schedule.events],
+        "active": {str(t): schedule.active_ids(t) for t in args.time},
+    }
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
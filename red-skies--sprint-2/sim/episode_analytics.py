@@ -0,0 +1,431 @@
+import argparse
+import glob
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[misc]
+
+from dynamic_zones import DynamicZoneSchedule, load_schedule
+from geodesy import haversine_m
+
+
+_EPISODE_KEY_RE = re.compile(r"(\d+)$")
+_ORDER_FILE_RE = re.compile(r"path_Episode(\d+)_agentOrder\.json$")
+
+
+@dataclass
+class EpisodeBatch:
+    """Episode logs packed into padded arrays (episodes x steps)."""
+
+    names: List[str]
+    """Episode keys, e.g. ``Episode_0``, in episode-index order."""
+    logged_total_reward: np.ndarray
+    """``total_reward`` as written by the environment, shape (E,)."""
+    lengths: np.ndarray
+    """Number of valid steps per episode, shape (E,)."""
+    mask: np.ndarray
+    """True where a step exists, shape (E, T)."""
+    rewards: np.ndarray
+    """Per-step reward, zero-padded, shape (E, T)."""
+    done: np.ndarray
+    """Per-step ``isDone`` flag, shape (E, T)."""
+    actions: np.ndarray
+    """Per-step action vector, NaN-padded, shape (E, T, A)."""
+    positions: np.ndarray
+    """Per-step ``Agent_position`` as (lat, lon, alt), NaN-padded, shape (E, T, 3)."""
+
+
+@dataclass
+class CircleZones:
+    """Circular zones as parallel arrays."""
+
+    ids: List[str]
+    lat: np.ndarray
+    lon: np.ndarray
+    radius_m: np.ndarray
+
+
+def _episode_sort_key(name: str) -> Tuple[int, str]:
+    m = _EPISODE_KEY_RE.search(name)
+    return (int(m.group(1)) if m else -1, name)
+
+
+def load_episode_log(path: Path) -> EpisodeBatch:
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"episode log root must be a mapping: {path}")
+
+    names = sorted((k for k, v in data.items() if isinstance(v, dict)), key=_episode_sort_key)
+    if not names:
+        raise ValueError(f"episode log has no episodes: {path}")
+
+    steps_per_ep = []
+    for name in names:
+        steps = data[name].get("steps")
+        if not isinstance(steps, list):
+            raise ValueError(f"{name}: missing 'steps' list")
+        steps_per_ep.append(steps)
+
+    n_eps = len(names)
+    max_t = max(len(s) for s in steps_per_ep)
+    n_act = max((len(st.get("Action") or []) for s in steps_per_ep for st in s), default=0)
+
+    lengths = np.array([len(s) for s in steps_per_ep], dtype=np.int64)
+    mask = np.arange(max_t)[None, :] < lengths[:, None]
+    rewards = np.zeros((n_eps, max_t), dtype=np.float64)
+    done = np.zeros((n_eps, max_t), dtype=bool)
+    actions = np.full((n_eps, max_t, n_act), np.nan, dtype=np.float64)
+    positions = np.full((n_eps, max_t, 3), np.nan, dtype=np.float64)
+
+    # Filling is the only per-step Python work; every metric below runs on the packed arrays.
+    for i, steps in enumerate(steps_per_ep):
+        n = len(steps)
+        if n == 0:
+            continue
+        rewards[i, :n] = [float(st.get("Reward", 0.0)) for st in steps]
+        done[i, :n] = [bool(st.get("isDone", 0)) for st in steps]
+        acts = [st.get("Action") or [] for st in steps]
+        if n_act and all(len(a) == n_act for a in acts):
+            actions[i, :n, :] = acts
+        else:
+            for t, a in enumerate(acts):
+                actions[i, t, : len(a)] = a
+        pos = [st.get("Agent_position") or [np.nan, np.nan, np.nan] for st in steps]
+        positions[i, :n, :] = [list(p[:3]) + [0.0] * (3 - len(p[:3])) for p in pos]
+
+    logged_total = np.array([float(data[n].get("total_reward", np.nan)) for n in names], dtype=np.float64)
+
+    return EpisodeBatch(
+        names=names,
+        logged_total_reward=logged_total,
+        lengths=lengths,
+        mask=mask,
+        rewards=rewards,
+        done=done,
+        actions=actions,
+        positions=positions,
+    )
+
+
+def concat_batches(batches: List[EpisodeBatch]) -> EpisodeBatch:
+    if len(batches) == 1:
+        return batches[0]
+
+    max_t = max(b.mask.shape[1] for b in batches)
+    n_act = max(b.actions.shape[2] for b in batches)
+
+    def pad(a: np.ndarray, fill: Any, width: Optional[int] = None) -> np.ndarray:
+        widths = [(0, 0), (0, max_t - a.shape[1])] + [(0, 0)] * (a.ndim - 2)
+        if width is not None:
+            widths[2] = (0, width - a.shape[2])
+        return np.pad(a, widths, constant_values=fill)
+
+    return EpisodeBatch(
+        names=[n for b in batches for n in b.names],
+        logged_total_reward=np.concatenate([b.logged_total_reward for b in batches]),
+        lengths=np.concatenate([b.lengths for b in batches]),
+        mask=np.concatenate([pad(b.mask, False) for b in batches]),
+        rewards=np.concatenate([pad(b.rewards, 0.0) for b in batches]),
+        done=np.concatenate([pad(b.done, False) for b in batches]),
+        actions=np.concatenate([pad(b.actions, np.nan, n_act) for b in batches]),
+        positions=np.concatenate([pad(b.positions, np.nan) for b in batches]),
+    )
+
+
+def _load_yaml(path: Path) -> Dict[str, Any]:
+    with path.open("r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a mapping: {path}")
+    return data
+
+
+def _object_center(o: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    geos = o.get("geolocation")
+    if isinstance(geos, list) and geos and isinstance(geos[0], dict):
+        g = geos[0]
+        if "lat" in g and "lon" in g:
+            return float(g["lat"]), float(g["lon"])
+        coords = (g.get("geometry") or {}).get("coordinates")
+        if isinstance(coords, list) and len(coords) >= 2:
+            return float(coords[1]), float(coords[0])
+    coords = ((o.get("centroid") or {}).get("geometry") or {}).get("coordinates")
+    if isinstance(coords, list) and len(coords) >= 2:
+        return float(coords[1]), float(coords[0])
+    return None
+
+
+def _object_polygon(o: Dict[str, Any]) -> Optional[np.ndarray]:
+    region = o.get("region")
+    if not (isinstance(region, list) and region and isinstance(region[0], dict)):
+        return None
+    geom = region[0].get("geometry") or {}
+    if geom.get("type") != "Polygon":
+        return None
+    rings = geom.get("coordinates")
+    if not (isinstance(rings, list) and rings):
+        return None
+    # GeoJSON rings are [lon, lat]; store as (lat, lon).
+    ring = np.asarray(rings[0], dtype=np.float64)[:, :2]
+    return ring[:, ::-1]
+
+
+def load_scenario_zones(path: Path) -> Tuple[CircleZones, Optional[CircleZones], Optional[np.ndarray]]:
+    """Returns (nfz circles, playground circle, playground polygon) from objects.yaml or a config-v2 scenario."""
+    data = _load_yaml(path)
+    objs = data.get("objects")
+    if objs is None and isinstance(data.get("scenario"), dict):
+        objs = data["scenario"].get("objects")
+    if not isinstance(objs, list):
+        raise ValueError(f"{path}: missing 'objects' list")
+
+    nfz_ids: List[str] = []
+    nfz_rows: List[Tuple[float, float, float]] = []
+    pg_circle: Optional[CircleZones] = None
+    pg_polygon: Optional[np.ndarray] = None
+
+    for o in objs:
+        if not isinstance(o, dict):
+            continue
+        oid = str(o.get("id", ""))
+        is_playground = oid == "playground" or oid.startswith("playground-")
+        radius = o.get("radius")
+        center = _object_center(o)
+        if o.get("type") == "circle" and center and isinstance(radius, list) and radius:
+            if o.get("behavior") == "no_fly_zone":
+                nfz_ids.append(oid)
+                nfz_rows.append((center[0], center[1], float(radius[0])))
+            elif is_playground:
+                pg_circle = CircleZones(
+                    ids=[oid],
+                    lat=np.array([center[0]]),
+                    lon=np.array([center[1]]),
+                    radius_m=np.array([float(radius[0])]),
+                )
+        elif is_playground:
+            pg_polygon = _object_polygon(o)
+
+    rows = np.asarray(nfz_rows, dtype=np.float64).reshape(-1, 3)
+    nfzs = CircleZones(ids=nfz_ids, lat=rows[:, 0], lon=rows[:, 1], radius_m=rows[:, 2])
+    return nfzs, pg_circle, pg_polygon
+
+
+def points_in_polygon(lat: np.ndarray, lon: np.ndarray, ring: np.ndarray) -> np.ndarray:
+    """Even-odd ray casting of points against one (lat, lon) ring, broadcast over the points."""
+    inside = np.zeros(lat.shape, dtype=bool)
+    y0, x0 = ring[:-1, 0], ring[:-1, 1]
+    y1, x1 = ring[1:, 0], ring[1:, 1]
+    for ya, xa, yb, xb in zip(y0, x0, y1, x1):
+        crosses = (ya > lat) != (yb > lat)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_at = xa + (lat - ya) * (xb - xa) / (yb - ya)
+        inside ^= crosses & (lon < x_at)
+    return inside
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    if x.size < window:
+        return np.empty(0)
+    c = np.cumsum(np.insert(x, 0, 0.0))
+    return (c[window:] - c[:-window]) / window
+
+
+def compute_metrics(
+    batch: EpisodeBatch,
+    nfzs: Optional[CircleZones] = None,
+    playground_circle: Optional[CircleZones] = None,
+    playground_polygon: Optional[np.ndarray] = None,
+    nfz_schedule: Optional[DynamicZoneSchedule] = None,
+    dt_s: float = 1.0,
+    action_bins: int = 18,
+    convergence_window: int = 10,
+    convergence_cv: float = 0.05,
+) -> Dict[str, Any]:
+    mask = batch.mask
+    lat = batch.positions[:, :, 0]
+    lon = batch.positions[:, :, 1]
+
+    total_reward = batch.rewards.sum(axis=1)
+    cum_reward = np.where(mask, np.cumsum(batch.rewards, axis=1), np.nan)
+
+    seg_valid = mask[:, 1:] & mask[:, :-1]
+    seg_m = haversine_m(lat[:, :-1], lon[:, :-1], lat[:, 1:], lon[:, 1:])
+    path_length_m = np.where(seg_valid, seg_m, 0.0).sum(axis=1)
+
+    any_done = (batch.done & mask).any(axis=1)
+    first_done = np.argmax(batch.done & mask, axis=1)
+    time_to_goal_s = np.where(any_done, (first_done + 1) * dt_s, np.nan)
+
+    valid_actions = batch.actions[mask]
+    valid_actions = valid_actions[~np.isnan(valid_actions).any(axis=1)] if valid_actions.size else valid_actions
+    histograms = []
+    for dim in range(batch.actions.shape[2]):
+        counts, edges = np.histogram(valid_actions[:, dim], bins=action_bins)
+        histograms.append({"dim": dim, "counts": counts.tolist(), "edges": edges.tolist()})
+
+    nfz_steps = np.zeros(len(batch.names), dtype=np.int64)
+    nfz_entries = np.zeros(len(batch.names), dtype=np.int64)
+    if nfzs is not None and nfzs.radius_m.size:
+        # (E, T, N) distances; one broadcast covers every step of every episode against every zone.
+        d = haversine_m(lat[:, :, None], lon[:, :, None], nfzs.lat[None, None, :], nfzs.lon[None, None, :])
+        within = (d <= nfzs.radius_m[None, None, :]) & mask[:, :, None]
+        if nfz_schedule is not None:
+            # Step i is at t = i * dt; a zone only counts while it is active.
+            within &= nfz_schedule.active_matrix(np.arange(mask.shape[1]) * dt_s, nfzs.ids)[None, :, :]
+        inside = within.any(axis=2)
+        nfz_steps = inside.sum(axis=1)
+        nfz_entries = (inside[:, 1:] & ~inside[:, :-1]).sum(axis=1) + inside[:, 0]
+
+    boundary_steps = np.zeros(len(batch.names), dtype=np.int64)
+    if playground_polygon is not None:
+        outside = ~points_in_polygon(lat, lon, playground_polygon) & mask
+        boundary_steps = outside.sum(axis=1)
+    elif playground_circle is not None:
+        d = haversine_m(lat, lon, playground_circle.lat[0], playground_circle.lon[0])
+        boundary_steps = ((d > playground_circle.radius_m[0]) & mask).sum(axis=1)
+
+    t_max = mask.shape[1]
+    counts_per_step = mask.sum(axis=0)
+    curve_mean = np.nanmean(cum_reward, axis=0)
+    curve_min = np.nanmin(cum_reward, axis=0)
+    curve_max = np.nanmax(cum_reward, axis=0)
+
+    window = max(1, min(convergence_window, total_reward.size))
+    rolling = _rolling_mean(total_reward, window)
+    last = total_reward[-window:]
+    last_mean = float(last.mean())
+    last_std = float(last.std())
+    slope = float(np.polyfit(np.arange(total_reward.size), total_reward, 1)[0]) if total_reward.size > 1 else 0.0
+    cv = last_std / abs(last_mean) if last_mean else float("inf")
+
+    episodes = []
+    for i, name in enumerate(batch.names):
+        episodes.append(
+            {
+                "episode": name,
+                "steps": int(batch.lengths[i]),
+                "total_reward": float(total_reward[i]),
+                "logged_total_reward": float(batch.logged_total_reward[i]),
+                "path_length_m": float(path_length_m[i]),
+                "done": bool(any_done[i]),
+                "time_to_goal_s": None if np.isnan(time_to_goal_s[i]) else float(time_to_goal_s[i]),
+                "nfz_violation_steps": int(nfz_steps[i]),
+                "nfz_entries": int(nfz_entries[i]),
+                "boundary_violation_steps": int(boundary_steps[i]),
+            }
+        )
+
+    reached = time_to_goal_s[~np.isnan(time_to_goal_s)]
+    return {
+        "summary": {
+            "episodes": len(batch.names),
+            "steps": int(batch.lengths.sum()),
+            "success_rate": float(any_done.mean()),
+            "total_reward_mean": float(total_reward.mean()),
+            "total_reward_std": float(total_reward.std()),
+            "path_length_m_mean": float(path_length_m.mean()),
+            "time_to_goal_s_mean": float(reached.mean()) if reached.size else None,
+            "nfz_violation_steps": int(nfz_steps.sum()),
+            "boundary_violation_steps": int(boundary_steps.sum()),
+            "logged_reward_mismatches": int((~np.isclose(total_reward, batch.logged_total_reward)).sum()),
+        },
+        "reward_curve": {
+            "step": list(range(t_max)),
+            "episodes_alive": counts_per_step.tolist(),
+            "cumulative_mean": curve_mean.tolist(),
+            "cumulative_min": curve_min.tolist(),
+            "cumulative_max": curve_max.tolist(),
+        },
+        "action_histograms": histograms,
+        "convergence": {
+            "window": window,
+            "rolling_mean_total_reward": rolling.tolist(),
+            "trend_slope_per_episode": slope,
+            "last_window_mean": last_mean,
+            "last_window_std": last_std,
+            "converged": bool(cv <= convergence_cv),
+        },
+        "episodes": episodes,
+    }
+
+
+def waypoint_order_metrics(paths: List[Path]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for p in sorted(paths, key=lambda x: _episode_sort_key(x.stem.replace("_agentOrder", ""))):
+        with p.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        keys = sorted(data.keys(), key=int)
+        pts = np.array([[data[k]["lat"], data[k]["lon"]] for k in keys], dtype=np.float64).reshape(-1, 2)
+        legs = haversine_m(pts[:-1, 0], pts[:-1, 1], pts[1:, 0], pts[1:, 1])
+        m = _ORDER_FILE_RE.search(p.name)
+        out.append(
+            {
+                "episode": f"Episode_{m.group(1)}" if m else p.stem,
+                "waypoints": int(pts.shape[0]),
+                "route_length_m": float(legs.sum()),
+            }
+        )
+    return out
+
+
+def _expand(patterns: List[str]) -> List[Path]:
+    out: List[Path] = []
+    for pat in patterns:
+        matches = sorted(glob.glob(pat))
+        out.extend(Path(m) for m in (matches or [pat]))
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--logs", nargs="+", required=True, help="PlanWaypointEnv-v0_*.json files or globs")
+    ap.add_argument("--orders", nargs="*", default=[], help="path_Episode*_agentOrder.json files or globs")
+    ap.add_argument("--scenario", default=None, help="objects.yaml or config-v2 scenario-*.yaml")
+    ap.add_argument("--schedule-seed", type=int, default=0, help="Seed for probabilistic NFZ activations")
+    ap.add_argument("--dt", type=float, default=1.0, help="Seconds per logged step")
+    ap.add_argument("--bins", type=int, default=18)
+    ap.add_argument("--window", type=int, default=10)
+    ap.add_argument("--out", default="episode_summary.json")
+    args = ap.parse_args()
+
+    batch = concat_batches([load_episode_log(p) for p in _expand(args.logs)])
+
+    nfzs = pg_circle = pg_polygon = schedule = None
+    if args.scenario:
+        nfzs, pg_circle, pg_polygon = load_scenario_zones(Path(args.scenario))
+        schedule = load_schedule(Path(args.scenario), seed=args.schedule_seed)
+
+    report = compute_metrics(
+        batch,
+        nfzs=nfzs,
+        playground_circle=pg_circle,
+        playground_polygon=pg_polygon,
+        nfz_schedule=schedule,
+        dt_s=args.dt,
+        action_bins=args.bins,
+        convergence_window=args.window,
+    )
+    if args.orders:
+        report["waypoint_orders"] = waypoint_order_metrics(_expand(args.orders))
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with out.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+    print(str(out))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,604 @@
+import argparse
+import importlib
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config_loader import AgentSpec, ResolvedConfig, Scenario, ScenarioObject, load_experiment, load_scenario
+from dynamic_zones import DynamicZoneSchedule
+from episode_analytics import points_in_polygon
+from geodesy import bearing_deg, haversine_m, to_local_equirect
+from kinematic_sim import KinematicSimulator
+from profiling import NULL_PROFILER, ProfilingConfig, make_profiler
+from scenario_generator import GeneratorConfig, generate_set, target_from_agent
+from schema import Position, SimulationState
+from stepping_harness import MAX_HEADING_CHANGE_DEG, Action, StubSimulator
+from telemetry_sink import TelemetryConfig, TelemetryWriter
+
+
+RESULTS_FILE = "episodes.jsonl"
+RUN_FILE = "run.json"
+REPORT_FILE = "report.json"
+
+
+@dataclass
+class EpisodeContext:
+    """Everything a simulator and a policy need for one scenario, in plain arrays."""
+
+    scenario: Scenario
+    agent: AgentSpec
+    aircraft: Dict[str, Tuple[Position, float, float]]
+    """Aircraft under evaluation -> (position, heading deg, speed m/s)."""
+    center: Tuple[float, float]
+    """Playground center (lat, lon)."""
+    playground_ring: Optional[np.ndarray]
+    """Playground outer ring as (lat, lon) rows, if the playground is a polygon."""
+    playground_radius_m: Optional[float]
+    nfz_ids: List[str]
+    nfz_lat: np.ndarray
+    nfz_lon: np.ndarray
+    nfz_radius_m: np.ndarray
+    """Circle radius, or the bounding-circle radius of polygon NFZs."""
+    schedule: DynamicZoneSchedule
+    dt: float
+    steps: int
+
+
+# ---------------------------------------------------------------------------
+# Episode setup
+# ---------------------------------------------------------------------------
+
+
+def _bounding_circle(o: ScenarioObject) -> Optional[Tuple[float, float, float]]:
+    center = o.center()
+    if center is None:
+        return None
+    radius = o.radius_m()
+    if radius is None:
+        rings = o.rings()
+        if not rings:
+            return None
+        pts = np.asarray([p for ring in rings for p in ring], dtype=np.float64)
+        radius = float(haversine_m(center[0], center[1], pts[:, 0], pts[:, 1]).max())
+    return center[0], center[1], radius
+
+
+def _initial_state(o: ScenarioObject) -> Tuple[Position, float, float]:
+    init = (o.parameters or {}).get("initial_state")
+    init = init if isinstance(init, dict) else {}
+    coords = (((init.get("position") or {}).get("geometry") or {}).get("coordinates")) or (
+        ((o.get("initial_position") or {}).get("geometry") or {}).get("coordinates")
+    )
+    if not (isinstance(coords, list) and len(coords) >= 2):
+        raise ValueError(f"aircraft {o.id}: no initial position")
+    alt = float(coords[2]) if len(coords) > 2 else 0.0
+    return Position(float(coords[1]), float(coords[0]), alt), float(init.get("heading", 0.0)), float(init.get("speed", 90.0))
+
+
+def build_context(scenario: Scenario, agent: AgentSpec, dt: float, max_duration_s: Optional[float], seed: int = 0) -> EpisodeContext:
+    objects = {o.id: o for o in scenario.objects}
+
+    aircraft = [o for o in scenario.objects if o.type == "aircraft"]
+    assigned = [o for o in aircraft if any(t.agent_ref == agent.id for t in o.autonomous_tasks)]
+    # Scenarios authored for another agent still evaluate this one on all their aircraft.
+    aircraft = assigned or aircraft
+    if not aircraft:
+        raise ValueError(f"{scenario.id}: no aircraft to evaluate")
+
+    pg_uid = agent.hyperparameters.get("playground_uid")
+    playground = objects.get(pg_uid) if pg_uid else None
+    if playground is None:
+        playground = next((o for o in scenario.objects if o.id == "playground" or o.id.startswith("playground-")), None)
+    if playground is None or playground.center() is None:
+        raise ValueError(f"{scenario.id}: no playground region")
+    rings = playground.rings()
+    ring = np.asarray(rings[0], dtype=np.float64) if rings else None
+
+    nfzs = [(o.id, _bounding_circle(o)) for o in scenario.objects if o.behavior == "no_fly_zone"]
+    nfzs = [(oid, c) for oid, c in nfzs if c is not None]
+    rows = np.asarray([c for _, c in nfzs], dtype=np.float64).reshape(-1, 3)
+
+    duration = scenario.duration_s or (max_duration_s or 0.0)
+    if max_duration_s:
+        duration = min(duration, max_duration_s)
+    return EpisodeContext(
+        scenario=scenario,
+        agent=agent,
+        aircraft={o.id: _initial_state(o) for o in aircraft},
+        center=playground.center(),
+        playground_ring=ring,
+        playground_radius_m=playground.radius_m(),
+        nfz_ids=[oid for oid, _ in nfzs],
+        nfz_lat=rows[:, 0],
+        nfz_lon=rows[:, 1],
+        nfz_radius_m=rows[:, 2],
+        schedule=DynamicZoneSchedule.from_objects([o for o in scenario.objects if o.behavior == "no_fly_zone"], seed=seed),
+        dt=dt,
+        steps=max(1, int(round(duration / dt))),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Simulators and policies
+# ---------------------------------------------------------------------------
+
+
+def _stub_simulator(ctx: EpisodeContext) -> Any:
+    return StubSimulator(initial=ctx.aircraft, turn_rate_deg_s=float(ctx.agent.hyperparameters.get("turn_rate_deg_s", 30.0)))
+
+
+def _kinematic_simulator(ctx: EpisodeContext) -> Any:
+    sim = KinematicSimulator(turn_rate_deg_s=float(ctx.agent.hyperparameters.get("turn_rate_deg_s", 30.0)), dt=ctx.dt)
+    sim.load_fleet(
+        {"id": uid, "lat": p.latitude, "lon": p.longitude, "alt": p.altitude, "heading": hdg, "speed": spd}
+        for uid, (p, hdg, spd) in ctx.aircraft.items()
+    )
+    return sim
+
+
+SIMULATORS: Dict[str, Callable[[EpisodeContext], Any]] = {"stub": _stub_simulator, "kinematic": _kinematic_simulator}
+"""Name -> factory(ctx) of objects with ``apply_action(Action)``, ``step(dt)`` and ``world_state()``."""
+
+
+class HoldingStubPolicy:
+    """Stand-in for a trained holding agent: attracted to the playground center, repelled by NFZs in lidar range."""
+
+    def __init__(self, agent: AgentSpec, ctx: EpisodeContext) -> None:
+        self.ctx = ctx
+        self.range_m = float(agent.hyperparameters.get("max_lidar_range", 2000.0))
+
+    def act(self, state: SimulationState, active: np.ndarray) -> List[Action]:
+        ctx = self.ctx
+        actions: List[Action] = []
+        for uid, e in state.entities.items():
+            lat, lon = e.position.latitude, e.position.longitude
+            to_center = math.radians(float(bearing_deg(lat, lon, ctx.center[0], ctx.center[1])))
+            east, north = math.sin(to_center), math.cos(to_center)
+            if active.any():
+                ze, zn = to_local_equirect(ctx.nfz_lat[active], ctx.nfz_lon[active], lat, lon)
+                dist = np.hypot(ze, zn)
+                edge = dist - ctx.nfz_radius_m[active]
+                near = edge < self.range_m
+                if near.any():
+                    w = 3.0 * (1.0 - np.clip(edge[near], 0.0, None) / self.range_m) / np.maximum(dist[near], 1.0)
+                    east -= float((w * ze[near]).sum())
+                    north -= float((w * zn[near]).sum())
+            desired = math.degrees(math.atan2(east, north)) % 360.0
+            err = (desired - e.attitude.yaw + 180.0) % 360.0 - 180.0
+            actions.append(Action(uid, max(-MAX_HEADING_CHANGE_DEG, min(MAX_HEADING_CHANGE_DEG, err))))
+        return actions
+
+
+def load_policy_factory(spec: str, config: ResolvedConfig) -> Callable[[AgentSpec, EpisodeContext], Any]:
+    """``stub``, ``experiment`` (the experiment's ``agents.entrypoint``) or ``module:attr``.
+
+    The factory is called as ``factory(agent, ctx)`` per episode and returns an object with
+    ``act(state, active_nfz_mask) -> List[Action]``.
+    """
+    if spec == "stub":
+        return HoldingStubPolicy
+    if spec == "experiment":
+        if not config.experiment.entrypoint:
+            raise ValueError(f"{config.experiment.path}: experiment.agents.entrypoint is not set")
+        spec = config.experiment.entrypoint
+    module, _, attr = spec.partition(":")
+    if not module or not attr:
+        raise ValueError(f"policy entrypoint must look like 'module:attr', got {spec!r}")
+    return getattr(importlib.import_module(module), attr)
+
+
+# ---------------------------------------------------------------------------
+# Rollout
+# ---------------------------------------------------------------------------
+
+
+def run_episode(
+    ctx: EpisodeContext,
+    policy_factory: Callable[[AgentSpec, EpisodeContext], Any],
+    simulator: str = "stub",
+    profiler: Any = NULL_PROFILER,
+    telemetry: Optional[TelemetryWriter] = None,
+    sim: Any = None,
+) -> Dict[str, Any]:
+    """Rolls one scenario out and scores it with the holding-env reward (README-michal.md).
+
+    ``profiler`` (``profiling.py``) gets one tick per step, split into the spans below;
+    ``telemetry`` receives the post-step state of every tick. ``sim`` is an already reset
+    simulator (e.g. restored from ``snapshot_pool.py``); by default one is built from ``ctx``.
+    """
+    t0 = time.perf_counter()
+    prof = profiler
+    span_state, span_action, span_apply, span_step, span_zones, span_reward, span_telemetry = (
+        prof.span(name) for name in ("state_build", "action", "action_apply", "step", "zones", "reward", "telemetry_write")
+    )
+    if sim is None:
+        sim = SIMULATORS[simulator](ctx)
+    policy = policy_factory(ctx.agent, ctx)
+    lidar_range = float(ctx.agent.hyperparameters.get("max_lidar_range", 2000.0))
+    ids = list(ctx.aircraft)
+    n = len(ids)
+
+    cursor = ctx.schedule.cursor(0.0)
+    col = {zid: j for j, zid in enumerate(ctx.nfz_ids)}
+    active = np.zeros(len(ctx.nfz_ids), dtype=bool)
+    for zid in cursor.active:
+        active[col[zid]] = True
+
+    reward = np.zeros(n)
+    nfz_steps = np.zeros(n, dtype=np.int64)
+    boundary_steps = np.zeros(n, dtype=np.int64)
+    path_m = np.zeros(n)
+    min_edge_m = np.full(n, np.inf)
+    prev = None
+
+    t = 0.0
+    for _ in range(ctx.steps):
+        prof.begin_tick()
+        with span_state:
+            state = sim.world_state()
+        with span_action:
+            actions = list(policy.act(state, active))
+        with span_apply:
+            for a in actions:
+                sim.apply_action(a)
+        with span_step:
+            sim.step(ctx.dt)
+        t += ctx.dt
+        with span_zones:
+            on, off = cursor.advance(t)
+            for zid in on:
+                active[col[zid]] = True
+            for zid in off:
+                active[col[zid]] = False
+
+        with span_state:
+            after = sim.world_state()
+            ents = after.entities
+        if telemetry is not None:
+            with span_telemetry:
+                telemetry.write(after)
+        with span_reward:
+            lat = np.array([ents[i].position.latitude for i in ids])
+            lon = np.array([ents[i].position.longitude for i in ids])
+            if prev is not None:
+                path_m += haversine_m(prev[0], prev[1], lat, lon)
+            prev = (lat, lon)
+
+            step_reward = np.full(n, 0.1)
+            if active.any():
+                edge = (haversine_m(lat[:, None], lon[:, None], ctx.nfz_lat[None, active], ctx.nfz_lon[None, active]) - ctx.nfz_radius_m[None, active]).min(axis=1)
+                min_edge_m = np.minimum(min_edge_m, edge)
+                inside = edge <= 0.0
+                close = ~inside & (edge < 0.1 * lidar_range)
+                step_reward[close] -= (0.1 - edge[close] / lidar_range) * 10.0
+                step_reward[inside] = -10.0
+                nfz_steps += inside
+            if ctx.playground_ring is not None:
+                outside = ~points_in_polygon(lat, lon, ctx.playground_ring)
+            elif ctx.playground_radius_m is not None:
+                outside = haversine_m(lat, lon, ctx.center[0], ctx.center[1]) > ctx.playground_radius_m
+            else:
+                outside = np.zeros(n, dtype=bool)
+            step_reward[outside] = -100.0
+            boundary_steps += outside
+            reward += step_reward
+        prof.count("actions", len(actions))
+        prof.end_tick(t)
+
+    return {
+        "scenario": ctx.scenario.id,
+        "agent": ctx.agent.id,
+        "aircraft": n,
+        "steps": ctx.steps,
+        "sim_time_s": round(t, 6),
+        "reward_mean": float(reward.mean()),
+        "nfz_violation_steps": int(nfz_steps.sum()),
+        "boundary_violation_steps": int(boundary_steps.sum()),
+        "success": bool(nfz_steps.sum() == 0 and boundary_steps.sum() == 0),
+        "min_nfz_edge_m": None if not np.isfinite(min_edge_m).any() else float(min_edge_m.min()),
+        "path_length_m_mean": float(path_m.mean()),
+        "wall_s": round(time.perf_counter() - t0, 4),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Parallel runner
+# ---------------------------------------------------------------------------
+
+_WORKER: Dict[str, Any] = {}
+
+
+def _init_worker(
+    config: ResolvedConfig,
+    agent_id: str,
+    policy: str,
+    simulator: str,
+    dt: float,
+    max_duration_s: Optional[float],
+    seed: int,
+    profiling: ProfilingConfig = ProfilingConfig(),
+    pooled: bool = False,
+    telemetry_dir: Optional[str] = None,
+    telemetry: TelemetryConfig = TelemetryConfig(),
+) -> None:
+    # Workers keep their own per-tick JSONL (one file per process) and ship histograms to the
+    # parent after every episode; only the parent writes the Prometheus file.
+    jsonl = profiling.jsonl_path
+    if jsonl and pooled:
+        jsonl = str(Path(jsonl).with_suffix(f".{os.getpid()}.jsonl"))
+    profiler = make_profiler(replace(profiling, prometheus_path=None, jsonl_path=jsonl), {"agent": agent_id})
+    # The resolved graph is shipped once per worker, not once per episode.
+    _WORKER.update(
+        profiler=profiler,
+        telemetry_dir=telemetry_dir,
+        telemetry=telemetry,
+        config=config,
+        agent=config.agent(agent_id),
+        policy=load_policy_factory(policy, config),
+        simulator=simulator,
+        dt=dt,
+        max_duration_s=max_duration_s,
+        seed=seed,
+    )
+
+
+def _evaluate(path: str) -> Dict[str, Any]:
+    prof = _WORKER["profiler"]
+    try:
+        with prof.span("scenario_load"):
+            scenario = load_scenario(Path(path))
+        with prof.span("context_build"):
+            ctx = build_context(scenario, _WORKER["agent"], _WORKER["dt"], _WORKER["max_duration_s"], _WORKER["seed"])
+        if prof.enabled:
+            prof.labels["scenario"] = ctx.scenario.id
+        recorder = None
+        if _WORKER["telemetry_dir"]:
+            recorder = TelemetryWriter(Path(_WORKER["telemetry_dir"]) / f"{Path(path).stem}.rstl", _WORKER["telemetry"])
+        try:
+            row = run_episode(ctx, _WORKER["policy"], _WORKER["simulator"], prof, recorder)
+        finally:
+            if recorder is not None:
+                stats = recorder.close()
+        if recorder is not None:
+            row["telemetry"] = {"file": recorder.path.name, "frames": stats["frames_written"], "dropped": stats["frames_dropped"]}
+    except Exception as exc:  # one broken scenario must not take the whole evaluation down
+        row = {"error": f"{type(exc).__name__}: {exc}"}
+        prof.count("episode_errors")
+    row["file"] = Path(path).name
+    row["worker"] = os.getpid()
+    if prof.enabled:
+        prof.flush()
+        snap = prof.drain()
+        tick = snap["tick"]
+        row["profile"] = {
+            "tick_p99_ms": round(tick.percentile(99) * 1e3, 4),
+            "budget_misses": snap["budget_misses"],
+            "spans_mean_ms": {k: round(h.total_s / h.count * 1e3, 4) for k, h in snap["spans"].items()},
+        }
+        row["_profile"] = snap  # merged by the parent, not written
+    return row
+
+
+def _completed(results: Path) -> Dict[str, Dict[str, Any]]:
+    """Rows already written; a torn last line from a crash is cut off so appends stay valid JSONL."""
+    if not results.exists():
+        return {}
+    raw = results.read_bytes()
+    if raw and not raw.endswith(b"\n"):
+        raw = raw[: raw.rfind(b"\n") + 1]
+        with results.open("r+b") as f:
+            f.truncate(len(raw))
+    done: Dict[str, Dict[str, Any]] = {}
+    for line in raw.decode("utf-8").splitlines():
+        if line.strip():
+            row = json.loads(line)
+            if "error" not in row:
+                done[row["file"]] = row
+    return done
+
+
+def aggregate(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [r for r in rows if "error" not in r]
+    if not ok:
+        return {"episodes": 0, "errors": len(rows)}
+    rewards = np.array([r["reward_mean"] for r in ok])
+    return {
+        "episodes": len(ok),
+        "errors": len(rows) - len(ok),
+        "success_rate": float(np.mean([r["success"] for r in ok])),
+        "reward_mean": float(rewards.mean()),
+        "reward_std": float(rewards.std()),
+        "reward_p05": float(np.percentile(rewards, 5)),
+        "nfz_violation_episodes": sum(1 for r in ok if r["nfz_violation_steps"]),
+        "boundary_violation_episodes": sum(1 for r in ok if r["boundary_violation_steps"]),
+        "steps_total": int(sum(r["steps"] * r["aircraft"] for r in ok)),
+        "episode_wall_s_mean": float(np.mean([r["wall_s"] for r in ok])),
+    }
+
+
+def evaluate(
+    experiment: Path,
+    out_dir: Path,
+    agent_id: Optional[str] = None,
+    scenarios: Optional[Path] = None,
+    count: Optional[int] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    policy: str = "stub",
+    simulator: str = "stub",
+    dt: Optional[float] = None,
+    max_duration_s: Optional[float] = None,
+    telemetry: bool = False,
+) -> Dict[str, Any]:
+    """Evaluates one agent over a validation set; re-running with the same ``out_dir`` resumes.
+
+    ``runtime.profiling`` of the experiment turns on per-tick spans; exports land in ``out_dir``.
+    With ``telemetry`` every episode is recorded to ``out_dir/telemetry/<scenario>.rstl``
+    (``telemetry_sink.py``, options from ``runtime.telemetry``).
+    """
+    t_load = time.perf_counter()
+    config = load_experiment(experiment)
+    t_load = time.perf_counter() - t_load
+    if agent_id is None:
+        refs = [t.agent_ref for o in config.scenario.objects for t in o.autonomous_tasks]
+        if not refs:
+            raise ValueError(f"{experiment}: scenario assigns no agent; pass agent_id")
+        agent_id = refs[0]
+    agent = config.agent(agent_id)
+    if simulator not in SIMULATORS:
+        raise ValueError(f"unknown simulator {simulator!r}; expected one of {sorted(SIMULATORS)}")
+    runtime = config.experiment.runtime
+    dt = dt or 1.0 / float(runtime.get("step_hz", 20))
+    max_duration_s = max_duration_s or runtime.get("max_duration_sec")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    profiling = ProfilingConfig.from_runtime(runtime, out_dir)
+    prof = make_profiler(profiling, {"experiment": config.experiment.id, "agent": agent_id})
+    prof.record("config_load", t_load)
+    if scenarios is None:
+        # The agent's validation set, generated once into the run folder and reused on resume.
+        scenarios = out_dir / "scenarios"
+        count = count or agent.validation_set_size or 100
+        if len(list(scenarios.glob("scenario-*.yaml"))) < count:
+            target, hyper = target_from_agent(Path(config.experiment.agents_file), agent_id)
+            cfg = GeneratorConfig(target=target, agent_ref=agent_id, playground_uid=hyper.get("playground_uid"))
+            generate_set(cfg, count, scenarios, seed=seed, workers=workers)
+    files = sorted(str(p) for p in Path(scenarios).glob("scenario-*.yaml"))
+    if count:
+        files = files[:count]
+
+    run = {
+        "experiment": config.experiment.id,
+        "agent": agent_id,
+        "scenarios": str(Path(scenarios).resolve()),
+        "policy": policy,
+        "simulator": simulator,
+        "dt": dt,
+        "max_duration_s": max_duration_s,
+        "seed": seed,
+    }
+    run_file = out_dir / RUN_FILE
+    if run_file.exists():
+        previous = json.loads(run_file.read_text(encoding="utf-8"))
+        changed = sorted(k for k in run if previous.get(k) != run[k])
+        if changed:
+            raise ValueError(f"{out_dir} holds a run with different settings ({', '.join(changed)}); use a new --out")
+    run_file.write_text(json.dumps(run, indent=2) + "\n", encoding="utf-8")
+
+    results = out_dir / RESULTS_FILE
+    done = _completed(results)
+    todo = [f for f in files if Path(f).name not in done]
+    workers = workers or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    telemetry_dir = str(out_dir / "telemetry") if telemetry else None
+    init = (
+        config,
+        agent_id,
+        policy,
+        simulator,
+        dt,
+        max_duration_s,
+        seed,
+        profiling,
+        workers > 1,
+        telemetry_dir,
+        TelemetryConfig.from_runtime(runtime),
+    )
+    with results.open("a", encoding="utf-8") as sink:
+
+        def record(row: Dict[str, Any]) -> None:
+            snap = row.pop("_profile", None)
+            if snap is not None:
+                prof.merge(snap)
+            # One line per episode as soon as it finishes: a crash loses at most the in-flight episodes.
+            with prof.span("results_write"):
+                sink.write(json.dumps(row) + "\n")
+                sink.flush()
+            prof.count("episodes")
+            prof.flush()
+            if "error" not in row:
+                done[row["file"]] = row
+
+        if workers == 1:
+            _init_worker(*init)
+            for f in todo:
+                record(_evaluate(f))
+        elif todo:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init) as ex:
+                pending = set()
+                queue = list(reversed(todo))
+                while queue or pending:
+                    # Bounded in-flight window so results stream back in roughly file order.
+                    while queue and len(pending) < 2 * workers:
+                        pending.add(ex.submit(_evaluate, queue.pop()))
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        record(fut.result())
+    elapsed = time.perf_counter() - t0
+    if workers == 1:
+        _WORKER["profiler"].close()
+    prof.close()
+
+    rows = [done[Path(f).name] for f in files if Path(f).name in done]
+    report = dict(run)
+    report.update(aggregate(rows))
+    report.update(
+        {
+            "scenarios_total": len(files),
+            "evaluated_this_run": len(todo),
+            "resumed": len(files) - len(todo),
+            "workers": workers,
+            "wall_s": round(elapsed, 3),
+            "episodes_per_s": round(len(todo) / elapsed, 3) if elapsed > 0 and todo else None,
+        }
+    )
+    if prof.enabled:
+        report["profile"] = prof.summary()
+    (out_dir / REPORT_FILE).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("experiment", help="config-v2 instance/experiment-*.yaml")
+    ap.add_argument("--out", required=True, help="Run folder (episodes.jsonl, report.json); re-run to resume")
+    ap.add_argument("--agent", default=None, help="Agent id; defaults to the first agent the scenario assigns")
+    ap.add_argument("--scenarios", default=None, help="Folder of scenario-*.yaml; defaults to generating the agent's validation set")
+    ap.add_argument("--count", type=int, default=None)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--policy", default="stub", help="stub | experiment | module:attr")
+    ap.add_argument("--sim", default="stub", choices=sorted(SIMULATORS))
+    ap.add_argument("--dt", type=float, default=None, help="Seconds per step; defaults to 1 / runtime.step_hz")
+    ap.add_argument("--max-duration", type=float, default=None, help="Cap per episode; defaults to runtime.max_duration_sec")
+    ap.add_argument("--telemetry", action="store_true", help="Record every episode to <out>/telemetry/<scenario>.rstl")
+    args = ap.parse_args()
+
+    report = evaluate(
+        Path(args.experiment),
+        Path(args.out),
+        agent_id=args.agent,
+        scenarios=Path(args.scenarios) if args.scenarios else None,
+        count=args.count,
+        seed=args.seed,
+        workers=args.workers,
+        policy=args.policy,
+        simulator=args.sim,
+        dt=args.dt,
+        max_duration_s=args.max_duration,
+        telemetry=args.telemetry,
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
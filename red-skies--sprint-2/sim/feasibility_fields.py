@@ -0,0 +1,454 @@
+import argparse
+import hashlib
+import json
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[misc]
+
+from config_loader import default_cache_dir
+from geodesy import from_local_equirect, to_local_equirect
+
+FIELD_VERSION = 1
+_SEGMENT_BLOCK = 250_000
+"""Hold segments per planner.blocked call."""
+
+
+@dataclass(frozen=True)
+class Material:
+    id: str
+    hold_duration_s: float
+    min_range_m: float
+    max_range_m: float
+    heading_at_target: bool = False
+    """Nose must point at the fire, within [heading_min_deg, heading_max_deg] of the inbound bearing."""
+    heading_min_deg: float = -180.0
+    heading_max_deg: float = 180.0
+    radial_min_deg: Optional[float] = None
+    """``target_heading_radials``: allowed bearings from the fire to the aircraft (clockwise from north)."""
+    radial_max_deg: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Material":
+        dist = d.get("distance_from_target") or {}
+        heading = d.get("heading_deg") or {}
+        radials = d.get("target_heading_radials") or {}
+        m = cls(
+            id=str(d["id"]),
+            hold_duration_s=float(d.get("hold_duration_s", 0.0)),
+            min_range_m=float(dist.get("min_km", 0.0)) * 1000.0,
+            max_range_m=float(dist.get("max_km", 0.0)) * 1000.0,
+            heading_at_target=bool(d.get("heading_at_target", False)),
+            heading_min_deg=float(heading.get("min_deg", -180.0)),
+            heading_max_deg=float(heading.get("max_deg", 180.0)),
+            radial_min_deg=float(radials["min_rad"]) if "min_rad" in radials else None,
+            radial_max_deg=float(radials["max_rad"]) if "max_rad" in radials else None,
+        )
+        if not 0.0 <= m.min_range_m < m.max_range_m:
+            raise ValueError(f"material {m.id}: distance_from_target needs 0 <= min_km < max_km")
+        return m
+
+
+def load_materials(path: Path) -> Dict[str, Material]:
+    """``suppression_materials`` of ``environment_parameters.yaml``.
+
+    The file repeats the ``material:`` key per entry (and its ``sim_definition`` block is not valid
+    YAML), so only that section is read, with the repeated keys turned into list items.
+    """
+    text = Path(path).read_text(encoding="utf-8")
+    start = text.find("suppression_materials:")
+    if start < 0:
+        raise ValueError(f"{path}: no suppression_materials section")
+    section = re.sub(r"(?m)^(\s+)material:\s*$", r"\1-", text[start:])
+    items = (yaml.load(section, Loader=_YamlLoader) or {}).get("suppression_materials") or []
+    if isinstance(items, dict):
+        items = [items.get("material", items)]
+    return {m.id: m for m in (Material.from_dict(d) for d in items)}
+
+
+def load_fires(path: Path) -> Dict[str, Tuple[float, float]]:
+    """Fire id -> (lat, lon) from a sprint-0 mission yaml (``fires[].initial_position``)."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        doc = yaml.load(f, Loader=_YamlLoader) or {}
+    return {str(f["id"]): (float(f["initial_position"]["lat"]), float(f["initial_position"]["lon"])) for f in doc.get("fires") or []}
+
+
+@dataclass(frozen=True)
+class FieldConfig:
+    range_bins: int = 32
+    bearing_step_deg: float = 2.0
+    heading_step_deg: float = 5.0
+    speed_ms: float = 90.0
+    """Ground speed during the hold; the hold segment is ``speed_ms * hold_duration_s`` long."""
+
+
+def _wrap180(deg: Any) -> Any:
+    return (np.asarray(deg) + 180.0) % 360.0 - 180.0
+
+
+def _in_arc(deg: Any, lo: float, hi: float) -> Any:
+    """``deg`` within the clockwise arc lo -> hi (both in degrees, wrapping past 360)."""
+    return ((np.asarray(deg) - lo) % 360.0) <= ((hi - lo) % 360.0)
+
+
+class FeasibilityField:
+    """Approach feasibility for one fire and one material on a polar (range, bearing, heading) grid.
+
+    The raster holds the expensive part, NFZ clearance: the approach point and the hold segment
+    flown along the heading must stay out of every active NFZ. Range, radial and nose-on-target
+    rules are exact closed-form checks at query time, so a query is a few arithmetic operations
+    and one array lookup.
+    """
+
+    def __init__(self, fire_id: str, fire_xy: Tuple[float, float], material: Material, config: FieldConfig, clear: np.ndarray) -> None:
+        self.fire_id = fire_id
+        self.fire_xy = (float(fire_xy[0]), float(fire_xy[1]))
+        self.material = material
+        self.config = config
+        self.clear = clear  # (R, B, H): approach point and hold segment clear of active NFZs (False where no rule can pass)
+        self._r_step = (material.max_range_m - material.min_range_m) / config.range_bins
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return tuple(self.clear.shape)  # type: ignore[return-value]
+
+    # -- grid ------------------------------------------------------------------------
+
+    @staticmethod
+    def grid(material: Material, config: FieldConfig) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bin centers: ranges (m), bearings from the fire (deg), aircraft headings (deg)."""
+        r_step = (material.max_range_m - material.min_range_m) / config.range_bins
+        ranges = material.min_range_m + (np.arange(config.range_bins) + 0.5) * r_step
+        bearings = np.arange(0.0, 360.0, config.bearing_step_deg) + config.bearing_step_deg / 2.0
+        headings = np.arange(0.0, 360.0, config.heading_step_deg) + config.heading_step_deg / 2.0
+        return ranges, bearings, headings
+
+    @classmethod
+    def build(cls, fire_id: str, fire_xy: Tuple[float, float], material: Material, config: FieldConfig, planner: Optional[Any] = None) -> "FeasibilityField":
+        ranges, bearings, headings = cls.grid(material, config)
+        shape = (ranges.size, bearings.size, headings.size)
+        if planner is None:
+            return cls(fire_id, fire_xy, material, config, np.ones(shape, dtype=bool))
+        b = np.radians(bearings)
+        px = fire_xy[0] + ranges[:, None] * np.sin(b)[None, :]
+        py = fire_xy[1] + ranges[:, None] * np.cos(b)[None, :]
+        # Only cells the closed-form rules can accept need a segment test.
+        ok = np.ones(shape, dtype=bool)
+        if material.radial_min_deg is not None and material.radial_max_deg is not None:
+            ok &= _in_arc(bearings, material.radial_min_deg, material.radial_max_deg)[None, :, None]
+        if material.heading_at_target:
+            off = _wrap180(headings[None, :] - (bearings[:, None] + 180.0))
+            half = (config.heading_step_deg + config.bearing_step_deg) / 2.0  # any point of the cell, any heading of the bin
+            ok &= ((off >= material.heading_min_deg - half) & (off <= material.heading_max_deg + half))[None, :, :]
+        length = max(config.speed_ms * material.hold_duration_s, 1.0)  # a segment inside a zone is caught by its midpoint
+        h = np.radians(headings)
+        ri, bi, hi = np.nonzero(ok)
+        ax, ay = px[ri, bi], py[ri, bi]
+        bx, by = ax + length * np.sin(h[hi]), ay + length * np.cos(h[hi])
+        hit = np.zeros(ri.size, dtype=bool)
+        for s in range(0, ri.size, _SEGMENT_BLOCK):
+            sl = slice(s, s + _SEGMENT_BLOCK)
+            hit[sl] = planner.blocked(ax[sl], ay[sl], bx[sl], by[sl])
+        clear = np.zeros(shape, dtype=bool)
+        clear[ri, bi, hi] = ~hit
+        return cls(fire_id, fire_xy, material, config, clear)
+
+    # -- queries -----------------------------------------------------------------------
+
+    def feasible_xy(self, x: float, y: float, heading_deg: float) -> bool:
+        """O(1): point (planner-frame metres) and heading valid for a drop on this fire."""
+        m, cfg = self.material, self.config
+        dx, dy = x - self.fire_xy[0], y - self.fire_xy[1]
+        r = math.hypot(dx, dy)
+        if not m.min_range_m <= r <= m.max_range_m:
+            return False
+        bearing = math.degrees(math.atan2(dx, dy)) % 360.0
+        if m.radial_min_deg is not None and m.radial_max_deg is not None and not _in_arc(bearing, m.radial_min_deg, m.radial_max_deg):
+            return False
+        heading = heading_deg % 360.0
+        if m.heading_at_target:
+            off = (heading - bearing - 180.0 + 180.0) % 360.0 - 180.0
+            if not m.heading_min_deg <= off <= m.heading_max_deg:
+                return False
+        ri = min(int((r - m.min_range_m) / self._r_step), cfg.range_bins - 1)
+        bi = int(bearing / cfg.bearing_step_deg) % self.clear.shape[1]
+        hi = int(heading / cfg.heading_step_deg) % self.clear.shape[2]
+        return bool(self.clear[ri, bi, hi])
+
+    def feasible_many(self, x: np.ndarray, y: np.ndarray, heading_deg: np.ndarray) -> np.ndarray:
+        """Vectorized ``feasible_xy`` (e.g. every aircraft of a batch, every step)."""
+        m, cfg = self.material, self.config
+        dx, dy = np.asarray(x, dtype=np.float64) - self.fire_xy[0], np.asarray(y, dtype=np.float64) - self.fire_xy[1]
+        r = np.hypot(dx, dy)
+        bearing = np.degrees(np.arctan2(dx, dy)) % 360.0
+        heading = np.asarray(heading_deg, dtype=np.float64) % 360.0
+        ok = (r >= m.min_range_m) & (r <= m.max_range_m)
+        if m.radial_min_deg is not None and m.radial_max_deg is not None:
+            ok &= _in_arc(bearing, m.radial_min_deg, m.radial_max_deg)
+        if m.heading_at_target:
+            off = _wrap180(heading - bearing - 180.0)
+            ok &= (off >= m.heading_min_deg) & (off <= m.heading_max_deg)
+        ri = np.clip(((r - m.min_range_m) / self._r_step).astype(np.int64), 0, cfg.range_bins - 1)
+        bi = (bearing / cfg.bearing_step_deg).astype(np.int64) % self.clear.shape[1]
+        hi = (heading / cfg.heading_step_deg).astype(np.int64) % self.clear.shape[2]
+        return ok & self.clear[ri, bi, hi]
+
+    def entry_points(self) -> np.ndarray:
+        """(K, 3) x, y, heading of every feasible cell center; nose-on materials fly the inbound course."""
+        m = self.material
+        ranges, bearings, headings = self.grid(m, self.config)
+        if m.heading_at_target:
+            aim = 0.0 if m.heading_min_deg <= 0.0 <= m.heading_max_deg else (m.heading_min_deg + m.heading_max_deg) / 2.0
+            ri, bi = (a.ravel() for a in np.indices(self.clear.shape[:2]))
+            h = (bearings[bi] + 180.0 + aim) % 360.0
+            hi = (h / self.config.heading_step_deg).astype(np.int64) % self.clear.shape[2]
+            keep = self.clear[ri, bi, hi]
+            ri, bi, h = ri[keep], bi[keep], h[keep]
+        else:
+            ri, bi, hi = np.nonzero(self.clear)
+            h = headings[hi]
+        b = np.radians(bearings[bi])
+        x = self.fire_xy[0] + ranges[ri] * np.sin(b)
+        y = self.fire_xy[1] + ranges[ri] * np.cos(b)
+        ok = self.feasible_many(x, y, h)
+        return np.stack([x[ok], y[ok], h[ok]], axis=1)
+
+    def nearest_entry(self, x: float, y: float) -> Optional[Tuple[float, float, float]]:
+        """Closest feasible approach point (straight-line) from an aircraft position, with its heading."""
+        pts = self.entry_points()
+        if pts.shape[0] == 0:
+            return None
+        k = int(np.argmin(np.hypot(pts[:, 0] - x, pts[:, 1] - y)))
+        return float(pts[k, 0]), float(pts[k, 1]), float(pts[k, 2])
+
+
+# ---------------------------------------------------------------------------
+# Per-scenario cache
+# ---------------------------------------------------------------------------
+
+
+class FeasibilityFields:
+    """Every (fire, material) field of a scenario, built once per NFZ state and cached.
+
+    Coordinates are the planner's frame when a ``route_planner.RoutePlanner`` is given (its zones'
+    current activation is part of the cache key), else a local frame around the fires' mean.
+    """
+
+    def __init__(
+        self,
+        fires: Dict[str, Tuple[float, float]],
+        materials: Dict[str, Material],
+        planner: Optional[Any] = None,
+        config: FieldConfig = FieldConfig(),
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        if not fires:
+            raise ValueError("no fires")
+        self.fires = dict(fires)
+        self.materials = dict(materials)
+        self.planner = planner
+        self.config = config
+        lat = np.array([p[0] for p in self.fires.values()])
+        lon = np.array([p[1] for p in self.fires.values()])
+        self.origin = planner.origin if planner is not None else (float(lat.mean()), float(lon.mean()))
+        x, y = to_local_equirect(lat, lon, *self.origin)
+        self.fire_xy = {f: (float(a), float(b)) for f, a, b in zip(self.fires, np.atleast_1d(x), np.atleast_1d(y))}
+        self.key = self._key()
+        self.source = "built"
+        self.fields = self._load_or_build(cache_dir)
+
+    def _key(self) -> str:
+        h = hashlib.sha256()
+        nfz: Any = None
+        if self.planner is not None:
+            nfz = [self.planner.key, sorted(z for z, on in zip(self.planner.graph.zones, self.planner.active.tolist()) if not on)]
+        doc = {
+            "v": FIELD_VERSION,
+            "config": asdict(self.config),
+            "origin": [round(v, 9) for v in self.origin],
+            "fires": {f: [round(v, 9) for v in p] for f, p in sorted(self.fires.items())},
+            "materials": {k: asdict(m) for k, m in sorted(self.materials.items())},
+            "nfz": nfz,
+        }
+        h.update(json.dumps(doc, sort_keys=True).encode())
+        return h.hexdigest()[:32]
+
+    def _load_or_build(self, cache_dir: Optional[Path]) -> Dict[Tuple[str, str], FeasibilityField]:
+        if self.key in _FIELDS:
+            _FIELDS.move_to_end(self.key)
+            self.source = "memory"
+            return _FIELDS[self.key]
+        path = Path(cache_dir) / f"{self.key}.npz" if cache_dir is not None else None
+        fields: Dict[Tuple[str, str], FeasibilityField] = {}
+        if path is not None and path.exists():
+            try:
+                with np.load(path) as z:
+                    for f in self.fires:
+                        for m in self.materials:
+                            fields[(f, m)] = FeasibilityField(f, self.fire_xy[f], self.materials[m], self.config, np.unpackbits(z[f"{f}|{m}"], count=self._cells(m)).astype(bool).reshape(self._shape(m)))
+                self.source = "disk"
+            except (OSError, ValueError, KeyError):
+                fields = {}
+        if not fields:
+            for f in self.fires:
+                for m, material in self.materials.items():
+                    fields[(f, m)] = FeasibilityField.build(f, self.fire_xy[f], material, self.config, self.planner)
+            if path is not None:
+                try:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_name(path.name + ".tmp")
+                    with tmp.open("wb") as fh:
+                        np.savez_compressed(fh, **{f"{f}|{m}": np.packbits(fld.clear) for (f, m), fld in fields.items()})
+                    tmp.replace(path)
+                except OSError:
+                    pass  # read-only cache: rebuilt next process
+        _FIELDS[self.key] = fields
+        while len(_FIELDS) > _FIELDS_MAX:
+            _FIELDS.popitem(last=False)
+        return fields
+
+    def _shape(self, material: str) -> Tuple[int, int, int]:
+        r, b, h = FeasibilityField.grid(self.materials[material], self.config)
+        return r.size, b.size, h.size
+
+    def _cells(self, material: str) -> int:
+        return int(np.prod(self._shape(material)))
+
+    def field(self, fire_id: str, material: str) -> FeasibilityField:
+        return self.fields[(fire_id, material)]
+
+    def to_xy(self, lat: Any, lon: Any) -> Tuple[Any, Any]:
+        return to_local_equirect(lat, lon, *self.origin)
+
+    def feasible(self, fire_id: str, material: str, lat: float, lon: float, heading_deg: float) -> bool:
+        x, y = self.to_xy(lat, lon)
+        return self.fields[(fire_id, material)].feasible_xy(float(x), float(y), heading_deg)
+
+    def nearest_entry(self, fire_id: str, material: str, lat: float, lon: float) -> Optional[Dict[str, float]]:
+        x, y = self.to_xy(lat, lon)
+        best = self.fields[(fire_id, material)].nearest_entry(float(x), float(y))
+        if best is None:
+            return None
+        elat, elon = from_local_equirect(best[0], best[1], *self.origin)
+        return {"lat": float(elat), "lon": float(elon), "heading_deg": best[2]}
+
+
+_FIELDS: "OrderedDict[str, Dict[Tuple[str, str], FeasibilityField]]" = OrderedDict()
+_FIELDS_MAX = 8
+
+
+def default_field_cache_dir() -> Path:
+    return default_cache_dir().parent / "feasibility"
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def benchmark(n_fires: int = 4, n_nfzs: int = 40, queries: int = 100_000, seed: int = 0) -> Dict[str, Any]:
+    """Build time, cached reload, and per-query cost vs the direct geometric test."""
+    from route_planner import RoutePlanner, _free_point, benchmark_scenario
+
+    scenario, half = benchmark_scenario(n_nfzs, seed)
+    planner = RoutePlanner(scenario, use_cache=False)
+    rng = np.random.default_rng(seed)
+    fires = {}
+    for k in range(n_fires):
+        x, y = _free_point(planner, rng, half * 0.6)
+        lat, lon = from_local_equirect(x, y, *planner.origin)
+        fires[f"fire_{k}"] = (float(lat), float(lon))
+    materials = {
+        "water": Material("water", 3.0, 20_000.0, 30_000.0, heading_at_target=True, heading_min_deg=-5.0, heading_max_deg=5.0),
+        "substance": Material("substance", 12.0, 1_000.0, 4_000.0, radial_min_deg=150.0, radial_max_deg=210.0),
+    }
+    t0 = time.perf_counter()
+    fields = FeasibilityFields(fires, materials, planner, cache_dir=None)
+    build_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    FeasibilityFields(fires, materials, planner, cache_dir=None)
+    cached_ms = (time.perf_counter() - t0) * 1e3
+
+    out: Dict[str, Any] = {"fires": n_fires, "nfzs": len(planner.graph.zones), "build_s": round(build_s, 3), "cached_ms": round(cached_ms, 3)}
+    for m, material in materials.items():
+        fld = fields.field("fire_0", m)
+        fx, fy = fld.fire_xy
+        r = rng.uniform(material.min_range_m, material.max_range_m, queries)
+        b = rng.uniform(0.0, 2.0 * math.pi, queries)
+        x, y = fx + r * np.sin(b), fy + r * np.cos(b)
+        h = (np.degrees(b) + 180.0 + rng.normal(0.0, 4.0, queries)) % 360.0
+        t0 = time.perf_counter()
+        for k in range(min(queries, 20_000)):
+            fld.feasible_xy(x[k], y[k], h[k])
+        scalar_us = (time.perf_counter() - t0) / min(queries, 20_000) * 1e6
+        t0 = time.perf_counter()
+        got = fld.feasible_many(x, y, h)
+        batch_ns = (time.perf_counter() - t0) / queries * 1e9
+        # Direct test: the same rules, with the point and hold segment checked against the NFZs.
+        n = min(queries, 2000)
+        length = fields.config.speed_ms * material.hold_duration_s
+        t0 = time.perf_counter()
+        hr = np.radians(h[:n])
+        for k in range(n):
+            planner.blocked(x[k : k + 1], y[k : k + 1], x[k : k + 1] + length * np.sin(hr[k : k + 1]), y[k : k + 1] + length * np.cos(hr[k : k + 1]))
+        direct_us = (time.perf_counter() - t0) / n * 1e6
+        out[m] = {
+            "cells": int(fld.clear.size),
+            "feasible_share": round(float(got.mean()), 4),
+            "query_us": round(scalar_us, 2),
+            "batch_query_ns": round(batch_ns, 1),
+            "direct_geometric_us": round(direct_us, 1),
+        }
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Precomputed suppression-approach feasibility fields.")
+    ap.add_argument("--mission", default=None, help="sprint-0 mission yaml with fires[] (e.g. scenario_1_open_area.yaml)")
+    ap.add_argument("--materials", default=None, help="environment_parameters.yaml")
+    ap.add_argument("--scenario", default=None, help="config-v2 scenario-*.yaml whose NFZs are excluded")
+    ap.add_argument("--fire", action="append", default=[], metavar="ID=LAT,LON", help="Extra fire (repeatable)")
+    ap.add_argument("--from", dest="start", default=None, help="lat,lon: report each field's nearest entry point from here")
+    ap.add_argument("--bench", action="store_true")
+    args = ap.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark(), indent=2))
+        return
+    if not args.materials:
+        ap.error("--materials is required (or --bench)")
+    fires = load_fires(Path(args.mission)) if args.mission else {}
+    for spec in args.fire:
+        fid, _, pos = spec.partition("=")
+        lat, lon = (float(v) for v in pos.split(","))
+        fires[fid] = (lat, lon)
+    planner = None
+    if args.scenario:
+        from config_loader import load_scenario
+        from route_planner import RoutePlanner
+
+        planner = RoutePlanner(load_scenario(Path(args.scenario)))
+    fields = FeasibilityFields(fires, load_materials(Path(args.materials)), planner, cache_dir=default_field_cache_dir())
+    report: Dict[str, Any] = {"key": fields.key, "source": fields.source, "fields": []}
+    for (f, m), fld in fields.fields.items():
+        row: Dict[str, Any] = {"fire": f, "material": m, "shape": list(fld.shape), "clear_share": round(float(fld.clear.mean()), 4)}
+        if args.start:
+            lat, lon = (float(v) for v in args.start.split(","))
+            row["nearest_entry"] = fields.nearest_entry(f, m, lat, lon)
+        report["fields"].append(row)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,586 @@
+import argparse
+import heapq
+import json
+import math
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[misc]
+
+from config_loader import load_experiment
+from dynamic_zones import DynamicZoneSchedule
+from geodesy import to_local_equirect
+
+EVENT_TYPES = ("fire_activated", "fire_suppressed", "fire_expired", "nfz_changed", "deviation")
+"""Events that may trigger a replan; ``ReplanConfig.events`` selects which ones do."""
+
+PENDING, ACTIVE, SUPPRESSED, EXPIRED = 0, 1, 2, 3
+
+_RATE_BUCKETS = 9
+_RATE_STEP = 1.5
+
+
+@dataclass(frozen=True)
+class ReplanConfig:
+    replan_every_x_steps: int = 1
+    """Periodic replans as in the sprint-0 mission (1 = every step); 0 = event-driven only."""
+    events: Tuple[str, ...] = EVENT_TYPES
+    weight_on_window: float = 0.7
+    """``planning_logic.fire_on_window``: how far the fire's active window has run (0 at start, 1 at its end)."""
+    weight_distance: float = 0.3
+    """``planning_logic.fire_distance``: 1 at the aircraft, 0 at ``distance_scale_m`` and beyond."""
+    distance_scale_m: float = 200_000.0
+    deviation_m: float = 2_000.0
+    """Cross-track distance from the planned route that counts as a ``deviation`` event."""
+
+    @classmethod
+    def from_mission(cls, mission: Dict[str, Any]) -> "ReplanConfig":
+        """From a sprint-0 ``mission_definition`` block (``replan_every_x_steps``, ``planning_logic``)."""
+        logic = mission.get("planning_logic") or {}
+        default = cls()
+        config = cls(
+            replan_every_x_steps=int(mission.get("replan_every_x_steps", default.replan_every_x_steps)),
+            weight_on_window=float((logic.get("fire_on_window") or {}).get("weight", default.weight_on_window)),
+            weight_distance=float((logic.get("fire_distance") or {}).get("weight", default.weight_distance)),
+        )
+        config.validate()
+        return config
+
+    @classmethod
+    def from_runtime(cls, runtime: Dict[str, Any], base: Optional["ReplanConfig"] = None) -> "ReplanConfig":
+        """``base`` (code defaults if None) overridden by an experiment's ``runtime.replanning`` block."""
+        block = dict(runtime.get("replanning") or {})
+        unknown = sorted(set(block) - set(cls.__dataclass_fields__))
+        if unknown:
+            raise ValueError(f"runtime.replanning: unknown key(s) {unknown}")
+        if "events" in block:
+            block["events"] = tuple(block["events"] or ())
+        config = replace(base or cls(), **block)
+        config.validate()
+        return config
+
+    def validate(self) -> None:
+        unknown = sorted(set(self.events) - set(EVENT_TYPES))
+        if unknown:
+            raise ValueError(f"unknown replan events {unknown}; expected any of {list(EVENT_TYPES)}")
+        if self.replan_every_x_steps < 0:
+            raise ValueError(f"replan_every_x_steps must be >= 0, got {self.replan_every_x_steps}")
+        if self.distance_scale_m <= 0:
+            raise ValueError(f"distance_scale_m must be > 0, got {self.distance_scale_m}")
+        if self.weight_on_window < 0 or self.weight_distance < 0:
+            raise ValueError("planning_logic weights must be >= 0")
+
+
+@dataclass
+class Assignment:
+    target: Optional[str]
+    score: float
+    route: np.ndarray
+    """(W, 2) planned east/north metres from the aircraft to the fire."""
+    planned_at: float
+    reason: str
+
+
+@dataclass(frozen=True)
+class ReplanEvent:
+    kind: str
+    subject: str
+    """Fire, zone or aircraft id."""
+    time: float
+
+
+def _polyline_distance(route: np.ndarray, x: float, y: float) -> float:
+    a, b = route[:-1], route[1:]
+    if a.shape[0] == 0:
+        return float(math.hypot(x - route[0, 0], y - route[0, 1]))
+    seg = b - a
+    t = np.clip(((x - a[:, 0]) * seg[:, 0] + (y - a[:, 1]) * seg[:, 1]) / np.maximum((seg**2).sum(axis=1), 1e-12), 0.0, 1.0)
+    return float(np.hypot(a[:, 0] + t * seg[:, 0] - x, a[:, 1] + t * seg[:, 1] - y).min())
+
+
+# ---------------------------------------------------------------------------
+# Lazy target queue
+# ---------------------------------------------------------------------------
+
+
+class _TargetQueue:
+    """One aircraft's fires, ordered by an upper bound of their current score.
+
+    An entry scored ``s`` when the aircraft's odometer read ``o`` at time ``t`` can have gained at
+    most ``c * (odo - o) + k * (now - t)`` since: the distance term is ``c``-Lipschitz in aircraft
+    travel and the window term grows at most ``k`` per second. A heap stores the potential
+    ``s - c * o - k * t``, so its top has the largest bound and ``best`` only re-scores the few
+    entries whose bound beats the best exact score found so far. Fires are split into heaps by
+    window rate, each with its own ``k``, so long windows are not bounded by the shortest one.
+    """
+
+    def __init__(self, n: int, c: float, ks: Sequence[float]) -> None:
+        self.c = c
+        self.ks = list(ks)
+        self.version = np.zeros(n, dtype=np.int64)
+        self.heaps: List[List[Tuple[float, int, int]]] = [[] for _ in self.ks]
+        self.odometer = 0.0
+        self.evaluations = 0
+
+    def push(self, i: int, score: float, t: float, bucket: int) -> None:
+        self.version[i] += 1
+        pot = -(score - self.c * self.odometer - self.ks[bucket] * t)
+        heapq.heappush(self.heaps[bucket], (pot, i, int(self.version[i])))
+
+    def rebuild(self, idx: np.ndarray, bounds: np.ndarray, buckets: np.ndarray, t: float) -> None:
+        """Drops every entry and heapifies fresh bounds for ``idx`` (O(n))."""
+        self.version[idx] += 1
+        for b, k in enumerate(self.ks):
+            sel = buckets == b
+            pot = -(bounds[sel] - self.c * self.odometer - k * t)
+            self.heaps[b] = list(zip(pot.tolist(), idx[sel].tolist(), self.version[idx[sel]].tolist()))
+            heapq.heapify(self.heaps[b])
+
+    def best(self, score: Any, status: np.ndarray, buckets: np.ndarray, t: float, exclude: Set[int]) -> Tuple[int, float]:
+        """Exact best (index, score) among active, non-excluded fires; (-1, -inf) if none."""
+        best_i, best_s = -1, -math.inf
+        shifts = [self.c * self.odometer + k * t for k in self.ks]
+        aside: List[Tuple[int, Tuple[float, int, int]]] = []
+        scored: Set[int] = set()
+        version = self.version
+        while True:
+            top_b, top_ub = -1, -math.inf
+            for b, heap in enumerate(self.heaps):
+                while heap and (heap[0][2] != version[heap[0][1]] or status[heap[0][1]] != ACTIVE):
+                    heapq.heappop(heap)
+                if heap and -heap[0][0] + shifts[b] > top_ub:
+                    top_b, top_ub = b, -heap[0][0] + shifts[b]
+            if top_b < 0 or top_ub <= best_s or self.heaps[top_b][0][1] in scored:
+                break  # a just-scored top is exact: nothing left can beat it
+            entry = heapq.heappop(self.heaps[top_b])
+            i = entry[1]
+            if i in exclude:
+                aside.append((top_b, entry))
+                continue
+            s = score(i)
+            scored.add(i)
+            self.evaluations += 1
+            self.push(i, s, t, int(buckets[i]))
+            if s > best_s:
+                best_i, best_s = i, s
+        for b, entry in aside:
+            heapq.heappush(self.heaps[b], entry)
+        return best_i, best_s
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+class ReplanningEngine:
+    """Fire-target assignment for a fleet with event-driven replans.
+
+    Per step, position updates are O(1) (an odometer), fire windows advance through a
+    ``DynamicZoneSchedule`` cursor in O(changes), and a replan pops only the queue entries whose
+    score bound can still win, so its amortized cost is O(log n) heap operations instead of
+    re-scoring all n fires. Full O(n) re-keying happens only when an NFZ change invalidates
+    route distances. Coordinates are east/north metres of one local frame (see ``from_mission``).
+    """
+
+    def __init__(
+        self,
+        fire_ids: Sequence[str],
+        fire_xy: np.ndarray,
+        windows: Sequence[Sequence[Tuple[float, float]]],
+        aircraft_xy: Dict[str, Tuple[float, float]],
+        config: ReplanConfig = ReplanConfig(),
+        planner: Optional[Any] = None,
+        t0: float = 0.0,
+    ) -> None:
+        config.validate()
+        self.config = config
+        self.planner = planner
+        self.fire_ids = list(fire_ids)
+        self.fire_index = {f: i for i, f in enumerate(self.fire_ids)}
+        self.fire_xy = np.asarray(fire_xy, dtype=np.float64).reshape(-1, 2).copy()
+        self.schedule = DynamicZoneSchedule(self.fire_ids, [list(w) for w in windows])
+        self._cursor = self.schedule.cursor(t0)
+        n = len(self.fire_ids)
+        self.status = np.full(n, PENDING, dtype=np.int8)
+        self.win_start = np.zeros(n)
+        self.win_len = np.full(n, math.inf)
+        lengths = [e - s for ivs in self.schedule.intervals for s, e in ivs if math.isfinite(e - s) and e > s]
+        # Window-rate buckets: b = 0 holds the shortest windows, each next one rates / 1.5; the last is "never ends".
+        self._max_rate = 1.0 / min(lengths) if lengths else 0.0
+        rates = [self._max_rate / _RATE_STEP**b for b in range(_RATE_BUCKETS - 1)] + [0.0]
+        self.bucket = np.full(n, _RATE_BUCKETS - 1, dtype=np.int64)
+        c = config.weight_distance / config.distance_scale_m
+        ks = [config.weight_on_window * r for r in rates]
+        self.aircraft = list(aircraft_xy)
+        self.position = {a: (float(p[0]), float(p[1])) for a, p in aircraft_xy.items()}
+        self.queues = {a: _TargetQueue(n, c, ks) for a in self.aircraft}
+        self.assignments: Dict[str, Assignment] = {}
+        self.time = float(t0)
+        self.steps = 0
+        self._events: List[ReplanEvent] = []
+        self.stats: Dict[str, int] = {"replans": 0, "rekeys": 0, "events": 0}
+        self.origin: Optional[Tuple[float, float]] = None  # (lat, lon) of the local frame, set by from_mission
+        for f in self._cursor.active:
+            self._activate(self.fire_index[f], t0)
+        self._rekey_all(t0)
+        self._replan(dict.fromkeys(self.aircraft, "initial"), t0)
+
+    @classmethod
+    def from_mission(
+        cls,
+        path: Path,
+        planner: Optional[Any] = None,
+        config: Optional[ReplanConfig] = None,
+        runtime: Optional[Dict[str, Any]] = None,
+    ) -> "ReplanningEngine":
+        """Sprint-0 mission yaml (``scenario_1_open_area.yaml``): fires, their ``schedule_on`` windows, aircraft with a manual position.
+
+        Without ``config``, the mission's settings are overridden by ``runtime.replanning`` of a sprint-2 experiment.
+        """
+        with Path(path).open("r", encoding="utf-8") as f:
+            doc = yaml.load(f, Loader=_YamlLoader) or {}
+        mission = doc.get("mission_definition") or {}
+        duration = float(mission.get("duration", math.inf))
+        fires = doc.get("fires") or []
+        if not fires:
+            raise ValueError(f"{path}: no fires")
+        latlon = np.array([[f["initial_position"]["lat"], f["initial_position"]["lon"]] for f in fires], dtype=np.float64)
+        origin = planner.origin if planner is not None else (float(latlon[:, 0].mean()), float(latlon[:, 1].mean()))
+        x, y = to_local_equirect(latlon[:, 0], latlon[:, 1], *origin)
+        windows = []
+        for f in fires:
+            spans = f.get("schedule_on") or [{}]
+            windows.append([(float(s.get("from_s", 0.0)), float(s.get("to_s", duration))) for s in spans])
+        aircraft = {}
+        for ac in doc.get("aircraft") or []:
+            pos = ac.get("initial_position") or {}
+            if "lat" in pos and "lon" in pos:
+                ax, ay = to_local_equirect(pos["lat"], pos["lon"], *origin)
+                aircraft[str(ac["id"])] = (float(ax), float(ay))
+        engine = cls(
+            [str(f["id"]) for f in fires],
+            np.stack([x, y], axis=1),
+            windows,
+            aircraft,
+            config or ReplanConfig.from_runtime(runtime or {}, ReplanConfig.from_mission(mission)),
+            planner,
+        )
+        engine.origin = origin
+        return engine
+
+    # -- scoring -------------------------------------------------------------------
+
+    def _window_term(self, i: int, t: float) -> float:
+        span = self.win_len[i]
+        return min(1.0, max(0.0, (t - self.win_start[i]) / span)) if math.isfinite(span) else 0.0
+
+    def _distance(self, aircraft: str, i: int) -> float:
+        x, y = self.position[aircraft]
+        fx, fy = self.fire_xy[i]
+        if self.planner is None:
+            return math.hypot(fx - x, fy - y)
+        try:
+            plan = self.planner.plan_xy((x, y), (fx, fy))
+        except ValueError:  # aircraft or fire inside an active NFZ: fall back to the straight line
+            return math.hypot(fx - x, fy - y)
+        return plan.length_m if plan is not None else math.inf
+
+    def score(self, aircraft: str, i: int, t: float, straight: bool = False) -> float:
+        """``planning_logic`` score; with ``straight`` (or no planner) an upper bound of the route-distance score."""
+        cfg = self.config
+        if straight or self.planner is None:
+            x, y = self.position[aircraft]
+            d = math.hypot(self.fire_xy[i, 0] - x, self.fire_xy[i, 1] - y)
+        else:
+            d = self._distance(aircraft, i)
+        return cfg.weight_on_window * self._window_term(i, t) + cfg.weight_distance * max(0.0, 1.0 - d / cfg.distance_scale_m)
+
+    def scores(self, aircraft: str, t: float, straight: bool = False) -> np.ndarray:
+        """All fires' scores at once (``-inf`` if not active); straight-line distances when ``straight``."""
+        cfg = self.config
+        x, y = self.position[aircraft]
+        if straight or self.planner is None:
+            d = np.hypot(self.fire_xy[:, 0] - x, self.fire_xy[:, 1] - y)
+        else:
+            d = np.array([self._distance(aircraft, i) for i in range(len(self.fire_ids))])
+        finite = np.isfinite(self.win_len)
+        window = np.where(finite, np.clip((t - self.win_start) / np.where(finite, self.win_len, 1.0), 0.0, 1.0), 0.0)
+        s = cfg.weight_on_window * window + cfg.weight_distance * np.maximum(0.0, 1.0 - d / cfg.distance_scale_m)
+        return np.where(self.status == ACTIVE, s, -np.inf)
+
+    # -- state changes -------------------------------------------------------------
+
+    def _activate(self, i: int, t: float) -> None:
+        start, end = next(((s, e) for s, e in self.schedule.intervals[i] if s <= t < e), (t, math.inf))
+        self.status[i] = ACTIVE
+        self.win_start[i], self.win_len[i] = start, end - start
+        if math.isfinite(end - start) and end > start:
+            self.bucket[i] = min(_RATE_BUCKETS - 2, int(math.log(self._max_rate * (end - start)) / math.log(_RATE_STEP) - 1e-9))
+        else:
+            self.bucket[i] = _RATE_BUCKETS - 1
+
+    def _rekey_all(self, t: float) -> None:
+        """Straight-line scores bound route-distance scores from above, so they are valid fresh keys."""
+        idx = np.nonzero(self.status == ACTIVE)[0]
+        for a in self.aircraft:
+            self.queues[a].rebuild(idx, self.scores(a, t, straight=True)[idx], self.bucket[idx], t)
+        self.stats["rekeys"] += 1
+
+    def update_aircraft(self, aircraft: str, x: float, y: float) -> None:
+        """O(1): keys stay valid bounds through the odometer."""
+        px, py = self.position[aircraft]
+        self.queues[aircraft].odometer += math.hypot(x - px, y - py)
+        self.position[aircraft] = (float(x), float(y))
+
+    def update_fire(self, fire_id: str, x: float, y: float) -> None:
+        """A fire moved (e.g. spread with the wind): O(aircraft * log n) re-keys, no replan."""
+        i = self.fire_index[fire_id]
+        self.fire_xy[i] = (x, y)
+        if self.status[i] == ACTIVE:
+            for a in self.aircraft:
+                self.queues[a].push(i, self.score(a, i, self.time, straight=True), self.time, int(self.bucket[i]))
+
+    def suppress(self, fire_id: str, t: Optional[float] = None) -> None:
+        i = self.fire_index[fire_id]
+        if self.status[i] == ACTIVE:
+            self.status[i] = SUPPRESSED
+            self._events.append(ReplanEvent("fire_suppressed", fire_id, self.time if t is None else t))
+
+    def set_zone(self, zone_id: str, active: bool, t: Optional[float] = None) -> None:
+        """NFZ toggled: switches it in the planner (if any) and queues an ``nfz_changed`` event."""
+        if self.planner is not None and not self.planner.set_active(zone_id, active):
+            return
+        self._events.append(ReplanEvent("nfz_changed", zone_id, self.time if t is None else t))
+
+    # -- stepping ------------------------------------------------------------------
+
+    def step(self, t: float, positions: Optional[Dict[str, Tuple[float, float]]] = None) -> Dict[str, Optional[str]]:
+        """Advances to ``t``; replans whoever a registered event (or the periodic rule) affects. Returns targets."""
+        for a, (x, y) in (positions or {}).items():
+            self.update_aircraft(a, x, y)
+        self.time = float(t)
+        self.steps += 1
+        events, self._events = self._events, []
+        on, off = self._cursor.advance(t)
+        for f in on:
+            i = self.fire_index[f]
+            if self.status[i] == SUPPRESSED:
+                continue
+            self._activate(i, t)
+            for a in self.aircraft:
+                self.queues[a].push(i, self.score(a, i, t, straight=True), t, int(self.bucket[i]))
+            events.append(ReplanEvent("fire_activated", f, t))
+        for f in off:
+            i = self.fire_index[f]
+            if self.status[i] == ACTIVE:
+                self.status[i] = EXPIRED
+                events.append(ReplanEvent("fire_expired", f, t))
+        for a in self.aircraft:
+            plan = self.assignments.get(a)
+            if plan is not None and plan.target is not None and _polyline_distance(plan.route, *self.position[a]) > self.config.deviation_m:
+                events.append(ReplanEvent("deviation", a, t))
+        self.stats["events"] += len(events)
+
+        if any(e.kind == "nfz_changed" for e in events) and self.planner is not None:
+            self._rekey_all(t)  # route distances changed arbitrarily: old keys are no longer bounds
+        registered = set(self.config.events)
+        due: Dict[str, str] = {}
+        every = self.config.replan_every_x_steps
+        if every and self.steps % every == 0:
+            due.update(dict.fromkeys(self.aircraft, "periodic"))
+        for e in events:
+            if e.kind in registered:
+                due.update(dict.fromkeys(self._affected(e, t), e.kind))
+        for a, plan in self.assignments.items():  # a vanished target is always replanned
+            if plan.target is not None and self.status[self.fire_index[plan.target]] != ACTIVE:
+                due.setdefault(a, "target_lost")
+        if due:
+            self._replan({a: due[a] for a in self.aircraft if a in due}, t)
+        return self.targets()
+
+    def _affected(self, event: ReplanEvent, t: float) -> List[str]:
+        """Aircraft a registered event replans.
+
+        A deviation replans that aircraft, an expired fire its holder, a new fire whoever it would
+        outrank; suppressions and NFZ changes replan the whole fleet.
+        """
+        if event.kind == "deviation":
+            return [event.subject]
+        if event.kind == "fire_expired":
+            return [a for a, p in self.assignments.items() if p.target == event.subject]
+        if event.kind != "fire_activated":
+            return self.aircraft
+        i = self.fire_index[event.subject]
+        out = []
+        for a in self.aircraft:
+            plan = self.assignments.get(a)
+            if plan is None or plan.target is None or self.score(a, i, t) > self.score(a, self.fire_index[plan.target], t):
+                out.append(a)
+        return out
+
+    def _replan(self, reasons: Dict[str, str], t: float) -> None:
+        """Greedy in fleet order: each replanned aircraft takes its best fire not held by another aircraft."""
+        taken = {self.fire_index[p.target] for a, p in self.assignments.items() if p.target is not None and a not in reasons}
+        for a, reason in reasons.items():
+            i, s = self.queues[a].best(lambda j, a=a: self.score(a, j, t), self.status, self.bucket, t, taken)
+            x, y = self.position[a]
+            if i < 0:
+                self.assignments[a] = Assignment(None, -math.inf, np.array([[x, y]]), t, reason)
+                continue
+            taken.add(i)
+            fx, fy = self.fire_xy[i]
+            route = None
+            if self.planner is not None:
+                try:
+                    plan = self.planner.plan_xy((x, y), (fx, fy))
+                    route = plan.xy if plan is not None else None
+                except ValueError:
+                    route = None
+            if route is None:
+                route = np.array([[x, y], [fx, fy]])
+            self.assignments[a] = Assignment(self.fire_ids[i], s, route, t, reason)
+        self.stats["replans"] += 1
+
+    def targets(self) -> Dict[str, Optional[str]]:
+        return {a: (self.assignments[a].target if a in self.assignments else None) for a in self.aircraft}
+
+    @property
+    def evaluations(self) -> int:
+        return sum(q.evaluations for q in self.queues.values())
+
+
+def greedy_full_rescore(engine: ReplanningEngine, t: float) -> Dict[str, Tuple[Optional[str], float]]:
+    """Baseline: every aircraft re-scores every fire (O(n) each), greedy in fleet order."""
+    taken: Set[int] = set()
+    out: Dict[str, Tuple[Optional[str], float]] = {}
+    for a in engine.aircraft:
+        s = engine.scores(a, t)
+        if taken:
+            s[list(taken)] = -np.inf
+        i = int(np.argmax(s)) if s.size else -1
+        if i < 0 or not np.isfinite(s[i]):
+            out[a] = (None, -math.inf)
+            continue
+        taken.add(i)
+        out[a] = (engine.fire_ids[i], float(s[i]))
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _bench_world(n: int, n_aircraft: int, duration: float, seed: int) -> Tuple[List[str], np.ndarray, List[List[Tuple[float, float]]], Dict[str, Tuple[float, float]]]:
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(-100_000.0, 100_000.0, (n, 2))
+    start = rng.uniform(-duration / 2.0, duration, n)  # about a third already burning at t = 0
+    length = rng.uniform(600.0, 3600.0, n)
+    windows = [[(float(s), float(s + d))] for s, d in zip(start, length)]
+    aircraft = {f"ac_{k + 1}": tuple(rng.uniform(-20_000.0, 20_000.0, 2).tolist()) for k in range(n_aircraft)}
+    return [f"fire_{i}" for i in range(n)], xy, windows, aircraft  # type: ignore[return-value]
+
+
+def simulate(
+    engine: ReplanningEngine,
+    steps: int,
+    dt: float = 1.0,
+    speed: float = 100.0,
+    seed: int = 0,
+    check: bool = False,
+    log: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Flies each aircraft straight at its target and suppresses it on arrival (p = 0.5 per step).
+
+    With ``check`` every step is compared with ``greedy_full_rescore``; ``log`` collects target changes.
+    """
+    rng = np.random.default_rng(seed + 1)
+    mismatches = 0
+    last = engine.targets()
+    t0 = time.perf_counter()
+    for k in range(1, steps + 1):
+        t = k * dt
+        positions = {}
+        for a in engine.aircraft:
+            x, y = engine.position[a]
+            target = engine.assignments[a].target
+            if target is None:
+                continue
+            fx, fy = engine.fire_xy[engine.fire_index[target]]
+            d = math.hypot(fx - x, fy - y)
+            if d <= 500.0:
+                if rng.random() < 0.5:
+                    engine.suppress(target, t)
+                continue
+            f = min(1.0, speed * dt / d)
+            positions[a] = (x + f * (fx - x), y + f * (fy - y))
+        targets = engine.step(t, positions)
+        if log is not None and targets != last:
+            log.append({"t": t, "targets": targets, "reasons": {a: engine.assignments[a].reason for a in engine.aircraft}})
+        last = targets
+        if check:
+            want = greedy_full_rescore(engine, t)
+            got = {a: engine.assignments[a].score for a in engine.aircraft}
+            mismatches += sum(int(abs(got[a] - want[a][1]) > 1e-9) for a in engine.aircraft if want[a][0] is not None)
+    elapsed = time.perf_counter() - t0
+    return {"elapsed_s": elapsed, "mismatches": mismatches}
+
+
+def benchmark(n: int = 5000, n_aircraft: int = 4, steps: int = 1800, seed: int = 0) -> Dict[str, Any]:
+    """Per-step planning cost: full re-score every step vs the lazy queue (periodic, then event-driven)."""
+    world = _bench_world(n, n_aircraft, float(steps), seed)
+
+    base = ReplanningEngine(*world, config=ReplanConfig(replan_every_x_steps=0, events=()))
+    t0 = time.perf_counter()
+    for k in range(1, steps + 1):
+        greedy_full_rescore(base, float(k))
+    full_us = (time.perf_counter() - t0) / steps * 1e6
+
+    out: Dict[str, Any] = {"fires": n, "aircraft": n_aircraft, "steps": steps, "full_rescore_us_per_step": round(full_us, 1)}
+    for name, cfg in (("every_step", ReplanConfig(replan_every_x_steps=1)), ("event_driven", ReplanConfig(replan_every_x_steps=0))):
+        engine = ReplanningEngine(*world, config=cfg)
+        evals0 = engine.evaluations
+        run = simulate(engine, steps, seed=seed)
+        out[name] = {
+            "us_per_step": round(run["elapsed_s"] / steps * 1e6, 1),
+            "replans": engine.stats["replans"],
+            "score_evaluations_per_step": round((engine.evaluations - evals0) / steps, 2),
+            "suppressed": int((engine.status == SUPPRESSED).sum()),
+        }
+    check = ReplanningEngine(*_bench_world(min(n, 500), n_aircraft, float(steps), seed), config=ReplanConfig(replan_every_x_steps=1))
+    out["exact_vs_full_rescore_mismatches"] = int(simulate(check, min(steps, 600), seed=seed, check=True)["mismatches"])
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Event-driven fire-target replanning.")
+    ap.add_argument("mission", nargs="?", help="sprint-0 mission yaml, e.g. scenario_1_open_area.yaml")
+    ap.add_argument("--steps", type=int, default=3600, help="Simulated seconds (1 s steps)")
+    ap.add_argument("--experiment", default=None, help="config-v2 instance/experiment-*.yaml whose runtime.replanning overrides the mission")
+    ap.add_argument("--bench", type=int, default=None, metavar="FIRES", help="Benchmark with FIRES random fires")
+    args = ap.parse_args()
+
+    if args.bench is not None:
+        print(json.dumps(benchmark(args.bench), indent=2))
+        return
+    if not args.mission:
+        ap.error("mission yaml is required (or --bench)")
+    runtime = load_experiment(Path(args.experiment)).experiment.runtime if args.experiment else None
+    engine = ReplanningEngine.from_mission(Path(args.mission), runtime=runtime)
+    initial = engine.targets()
+    log: List[Dict[str, Any]] = []
+    simulate(engine, args.steps, log=log)
+    print(json.dumps({"origin": engine.origin, "initial": initial, "changes": log, "stats": engine.stats}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+import argparse
+import json
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+WGS84_A = 6_378_137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_B = WGS84_A * (1.0 - WGS84_F)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)
+
+# Mean Earth radius (IUGG), used by the spherical tier.
+EARTH_RADIUS_M = 6_371_008.8
+
+Array = np.ndarray
+
+
+def _f64(*xs: object) -> Tuple[Array, ...]:
+    return tuple(np.asarray(x, dtype=np.float64) for x in xs)
+
+
+# ---------------------------------------------------------------------------
+# Radii of curvature / local scale
+# ---------------------------------------------------------------------------
+
+
+def meridian_radius_m(lat_deg: object) -> Array:
+    """M: radius of curvature in the meridian (north-south)."""
+    s = np.sin(np.radians(np.asarray(lat_deg, dtype=np.float64)))
+    return WGS84_A * (1.0 - WGS84_E2) / (1.0 - WGS84_E2 * s * s) ** 1.5
+
+
+def normal_radius_m(lat_deg: object) -> Array:
+    """N: radius of curvature in the prime vertical (east-west)."""
+    s = np.sin(np.radians(np.asarray(lat_deg, dtype=np.float64)))
+    return WGS84_A / np.sqrt(1.0 - WGS84_E2 * s * s)
+
+
+def deg_per_meter_lat(lat_deg: object) -> Array:
+    return 1.0 / np.radians(meridian_radius_m(lat_deg))
+
+
+def deg_per_meter_lon(lat_deg: object) -> Array:
+    lat = np.asarray(lat_deg, dtype=np.float64)
+    return 1.0 / np.radians(normal_radius_m(lat) * np.maximum(1e-12, np.abs(np.cos(np.radians(lat)))))
+
+
+# ---------------------------------------------------------------------------
+# Exact tier: ECEF / ENU / NED
+# ---------------------------------------------------------------------------
+
+
+def geodetic_to_ecef(lat_deg: object, lon_deg: object, alt_m: object = 0.0) -> Tuple[Array, Array, Array]:
+    lat, lon, alt = _f64(lat_deg, lon_deg, alt_m)
+    phi, lam = np.radians(lat), np.radians(lon)
+    sp, cp = np.sin(phi), np.cos(phi)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sp * sp)
+    x = (n + alt) * cp * np.cos(lam)
+    y = (n + alt) * cp * np.sin(lam)
+    z = (n * (1.0 - WGS84_E2) + alt) * sp
+    return x, y, z
+
+
+def ecef_to_geodetic(x: object, y: object, z: object) -> Tuple[Array, Array, Array]:
+    """Bowring's parametric-latitude start plus one refinement; sub-millimetre from -10 km to LEO."""
+    x, y, z = _f64(x, y, z)
+    p = np.hypot(x, y)
+    lon = np.arctan2(y, x)
+    beta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    for _ in range(2):
+        sb, cb = np.sin(beta), np.cos(beta)
+        phi = np.arctan2(z + WGS84_EP2 * WGS84_B * sb**3, p - WGS84_E2 * WGS84_A * cb**3)
+        beta = np.arctan2((1.0 - WGS84_F) * np.sin(phi), np.cos(phi))
+    sp, cp = np.sin(phi), np.cos(phi)
+    # Stable at the poles, unlike p / cos(phi) - N.
+    alt = p * cp + z * sp - WGS84_A * np.sqrt(1.0 - WGS84_E2 * sp * sp)
+    return np.degrees(phi), np.degrees(lon), alt
+
+
+def _enu_rotation(lat0: Array, lon0: Array) -> Tuple[Array, Array, Array, Array]:
+    phi, lam = np.radians(lat0), np.radians(lon0)
+    return np.sin(phi), np.cos(phi), np.sin(lam), np.cos(lam)
+
+
+def ecef_to_enu(
+    x: object, y: object, z: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    x, y, z = _f64(x, y, z)
+    x0, y0, z0 = geodetic_to_ecef(lat0, lon0, alt0)
+    dx, dy, dz = x - x0, y - y0, z - z0
+    sp, cp, sl, cl = _enu_rotation(np.float64(lat0), np.float64(lon0))
+    east = -sl * dx + cl * dy
+    north = -sp * cl * dx - sp * sl * dy + cp * dz
+    up = cp * cl * dx + cp * sl * dy + sp * dz
+    return east, north, up
+
+
+def enu_to_ecef(
+    east: object, north: object, up: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    e, n, u = _f64(east, north, up)
+    x0, y0, z0 = geodetic_to_ecef(lat0, lon0, alt0)
+    sp, cp, sl, cl = _enu_rotation(np.float64(lat0), np.float64(lon0))
+    x = x0 - sl * e - sp * cl * n + cp * cl * u
+    y = y0 + cl * e - sp * sl * n + cp * sl * u
+    z = z0 + cp * n + sp * u
+    return x, y, z
+
+
+def geodetic_to_enu(
+    lat_deg: object, lon_deg: object, alt_m: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    return ecef_to_enu(*geodetic_to_ecef(lat_deg, lon_deg, alt_m), lat0, lon0, alt0)
+
+
+def enu_to_geodetic(
+    east: object, north: object, up: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    return ecef_to_geodetic(*enu_to_ecef(east, north, up, lat0, lon0, alt0))
+
+
+def geodetic_to_ned(
+    lat_deg: object, lon_deg: object, alt_m: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    e, n, u = geodetic_to_enu(lat_deg, lon_deg, alt_m, lat0, lon0, alt0)
+    return n, e, -u
+
+
+def ned_to_geodetic(
+    north: object, east: object, down: object, lat0: float, lon0: float, alt0: float = 0.0
+) -> Tuple[Array, Array, Array]:
+    return enu_to_geodetic(east, north, -np.asarray(down, dtype=np.float64), lat0, lon0, alt0)
+
+
+# ---------------------------------------------------------------------------
+# Exact tier: Vincenty on the ellipsoid
+# ---------------------------------------------------------------------------
+
+
+def vincenty_inverse(
+    lat1: object, lon1: object, lat2: object, lon2: object, tol: float = 1e-12, max_iter: int = 200
+) -> Tuple[Array, Array, Array]:
+    """(distance m, initial azimuth deg, final azimuth deg); NaN where it does not converge (near-antipodal)."""
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*_f64(lat1, lon1, lat2, lon2))
+    f = WGS84_F
+    u1 = np.arctan((1.0 - f) * np.tan(np.radians(lat1)))
+    u2 = np.arctan((1.0 - f) * np.tan(np.radians(lat2)))
+    big_l = np.radians(lon2 - lon1)
+    su1, cu1, su2, cu2 = np.sin(u1), np.cos(u1), np.sin(u2), np.cos(u2)
+
+    lam = big_l.copy()
+    active = np.ones(lam.shape, dtype=bool)
+    sin_sigma = cos_sigma = sigma = cos2_alpha = cos_2sm = np.zeros(lam.shape)
+    for _ in range(max_iter):
+        sl, cl = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cu2 * sl, cu1 * su2 - su1 * cu2 * cl)
+        cos_sigma = su1 * su2 + cu1 * cu2 * cl
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sin_alpha = np.where(sin_sigma > 0, cu1 * cu2 * sl / sin_sigma, 0.0)
+            cos2_alpha = 1.0 - sin_alpha**2
+            cos_2sm = np.where(cos2_alpha > 0, cos_sigma - 2.0 * su1 * su2 / cos2_alpha, 0.0)
+        c = f / 16.0 * cos2_alpha * (4.0 + f * (4.0 - 3.0 * cos2_alpha))
+        lam_new = big_l + (1.0 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1.0 + 2.0 * cos_2sm**2))
+        )
+        delta = np.abs(lam_new - lam)
+        lam = np.where(active, lam_new, lam)
+        active &= delta > tol
+        if not active.any():
+            break
+
+    u_sq = cos2_alpha * (WGS84_A**2 - WGS84_B**2) / WGS84_B**2
+    a_k = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    b_k = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+    d_sigma = b_k * sin_sigma * (
+        cos_2sm
+        + b_k / 4.0 * (cos_sigma * (-1.0 + 2.0 * cos_2sm**2) - b_k / 6.0 * cos_2sm * (-3.0 + 4.0 * sin_sigma**2) * (-3.0 + 4.0 * cos_2sm**2))
+    )
+    dist = WGS84_B * a_k * (sigma - d_sigma)
+    sl, cl = np.sin(lam), np.cos(lam)
+    az1 = (np.degrees(np.arctan2(cu2 * sl, cu1 * su2 - su1 * cu2 * cl)) + 360.0) % 360.0
+    az2 = (np.degrees(np.arctan2(cu1 * sl, -su1 * cu2 + cu1 * su2 * cl)) + 360.0) % 360.0
+    dist = np.where(active, np.nan, dist)
+    return dist, az1, az2
+
+
+def vincenty_direct(
+    lat_deg: object, lon_deg: object, azimuth_deg: object, distance_m: object, tol: float = 1e-12, max_iter: int = 200
+) -> Tuple[Array, Array, Array]:
+    """Destination on the ellipsoid: (lat deg, lon deg, final azimuth deg)."""
+    lat, lon, az, s = np.broadcast_arrays(*_f64(lat_deg, lon_deg, azimuth_deg, distance_m))
+    f = WGS84_F
+    alpha1 = np.radians(az)
+    sa1, ca1 = np.sin(alpha1), np.cos(alpha1)
+    tan_u1 = (1.0 - f) * np.tan(np.radians(lat))
+    cu1 = 1.0 / np.sqrt(1.0 + tan_u1**2)
+    su1 = tan_u1 * cu1
+    sigma1 = np.arctan2(tan_u1, ca1)
+    sin_alpha = cu1 * sa1
+    cos2_alpha = 1.0 - sin_alpha**2
+    u_sq = cos2_alpha * (WGS84_A**2 - WGS84_B**2) / WGS84_B**2
+    a_k = 1.0 + u_sq / 16384.0 * (4096.0 + u_sq * (-768.0 + u_sq * (320.0 - 175.0 * u_sq)))
+    b_k = u_sq / 1024.0 * (256.0 + u_sq * (-128.0 + u_sq * (74.0 - 47.0 * u_sq)))
+
+    sigma = s / (WGS84_B * a_k)
+    cos_2sm = sin_sigma = cos_sigma = np.zeros(sigma.shape)
+    for _ in range(max_iter):
+        cos_2sm = np.cos(2.0 * sigma1 + sigma)
+        sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+        d_sigma = b_k * sin_sigma * (
+            cos_2sm
+            + b_k / 4.0 * (cos_sigma * (-1.0 + 2.0 * cos_2sm**2) - b_k / 6.0 * cos_2sm * (-3.0 + 4.0 * sin_sigma**2) * (-3.0 + 4.0 * cos_2sm**2))
+        )
+        sigma_new = s / (WGS84_B * a_k) + d_sigma
+        done = np.abs(sigma_new - sigma) <= tol
+        sigma = sigma_new
+        if done.all():
+            break
+    cos_2sm = np.cos(2.0 * sigma1 + sigma)
+    sin_sigma, cos_sigma = np.sin(sigma), np.cos(sigma)
+
+    tmp = su1 * sin_sigma - cu1 * cos_sigma * ca1
+    lat2 = np.arctan2(su1 * cos_sigma + cu1 * sin_sigma * ca1, (1.0 - f) * np.hypot(sin_alpha, tmp))
+    lam = np.arctan2(sin_sigma * sa1, cu1 * cos_sigma - su1 * sin_sigma * ca1)
+    c = f / 16.0 * cos2_alpha * (4.0 + f * (4.0 - 3.0 * cos2_alpha))
+    big_l = lam - (1.0 - c) * f * sin_alpha * (sigma + c * sin_sigma * (cos_2sm + c * cos_sigma * (-1.0 + 2.0 * cos_2sm**2)))
+    lon2 = (lon + np.degrees(big_l) + 540.0) % 360.0 - 180.0
+    az2 = (np.degrees(np.arctan2(sin_alpha, -tmp)) + 360.0) % 360.0
+    return np.degrees(lat2), lon2, az2
+
+
+# ---------------------------------------------------------------------------
+# Spherical tier
+# ---------------------------------------------------------------------------
+
+
+def haversine_m(lat1: object, lon1: object, lat2: object, lon2: object) -> Array:
+    """Great-circle distance on the mean-radius sphere."""
+    lat1, lon1, lat2, lon2 = _f64(lat1, lon1, lat2, lon2)
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dphi = p2 - p1
+    dlam = np.radians(lon2 - lon1)
+    a = np.sin(dphi / 2.0) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dlam / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def bearing_deg(lat1: object, lon1: object, lat2: object, lon2: object) -> Array:
+    """Initial great-circle bearing from point 1 to point 2, clockwise from north in [0, 360)."""
+    lat1, lon1, lat2, lon2 = _f64(lat1, lon1, lat2, lon2)
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    dlam = np.radians(lon2 - lon1)
+    y = np.sin(dlam) * np.cos(p2)
+    x = np.cos(p1) * np.sin(p2) - np.sin(p1) * np.cos(p2) * np.cos(dlam)
+    return (np.degrees(np.arctan2(y, x)) + 360.0) % 360.0
+
+
+def destination_point(lat_deg: object, lon_deg: object, bearing: object, distance_m: object) -> Tuple[Array, Array]:
+    """(lat, lon) reached after ``distance_m`` along the great circle starting at ``bearing``."""
+    lat, lon, brg, d = _f64(lat_deg, lon_deg, bearing, distance_m)
+    p1, l1, th = np.radians(lat), np.radians(lon), np.radians(brg)
+    delta = d / EARTH_RADIUS_M
+    sp2 = np.sin(p1) * np.cos(delta) + np.cos(p1) * np.sin(delta) * np.cos(th)
+    p2 = np.arcsin(np.clip(sp2, -1.0, 1.0))
+    l2 = l1 + np.arctan2(np.sin(th) * np.sin(delta) * np.cos(p1), np.cos(delta) - np.sin(p1) * sp2)
+    return np.degrees(p2), (np.degrees(l2) + 540.0) % 360.0 - 180.0
+
+
+# ---------------------------------------------------------------------------
+# Local tangent (fast) tier
+# ---------------------------------------------------------------------------
+
+
+def to_local_equirect(lat_deg: object, lon_deg: object, lat0: float, lon0: float) -> Tuple[Array, Array]:
+    """(east, north) metres from (lat0, lon0), scaled by the ellipsoid radii at the origin."""
+    lat, lon = _f64(lat_deg, lon_deg)
+    north = np.radians(lat - lat0) * meridian_radius_m(lat0)
+    dlon = (lon - lon0 + 540.0) % 360.0 - 180.0
+    east = np.radians(dlon) * normal_radius_m(lat0) * np.cos(np.radians(lat0))
+    return east, north
+
+
+def from_local_equirect(east: object, north: object, lat0: float, lon0: float) -> Tuple[Array, Array]:
+    e, n = _f64(east, north)
+    lat = lat0 + n * deg_per_meter_lat(lat0)
+    lon = (lon0 + e * deg_per_meter_lon(lat0) + 540.0) % 360.0 - 180.0
+    return lat, lon
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def benchmark(n: int = 1_000_000, seed: int = 0) -> Dict[str, float]:
+    """ns/point of each function over ``n`` random points within ~200 km of (30, -40)."""
+    rng = np.random.default_rng(seed)
+    lat1 = 30.0 + rng.uniform(-2.0, 2.0, n)
+    lon1 = -40.0 + rng.uniform(-2.0, 2.0, n)
+    lat2 = 30.0 + rng.uniform(-2.0, 2.0, n)
+    lon2 = -40.0 + rng.uniform(-2.0, 2.0, n)
+    alt = rng.uniform(0.0, 3000.0, n)
+    brg = rng.uniform(0.0, 360.0, n)
+    dist = rng.uniform(0.0, 200_000.0, n)
+    x, y, z = geodetic_to_ecef(lat1, lon1, alt)
+    e, nn, u = geodetic_to_enu(lat1, lon1, alt, 30.0, -40.0)
+
+    cases = {
+        "geodetic_to_ecef": lambda: geodetic_to_ecef(lat1, lon1, alt),
+        "ecef_to_geodetic": lambda: ecef_to_geodetic(x, y, z),
+        "geodetic_to_enu": lambda: geodetic_to_enu(lat1, lon1, alt, 30.0, -40.0),
+        "enu_to_geodetic": lambda: enu_to_geodetic(e, nn, u, 30.0, -40.0),
+        "vincenty_inverse": lambda: vincenty_inverse(lat1, lon1, lat2, lon2),
+        "vincenty_direct": lambda: vincenty_direct(lat1, lon1, brg, dist),
+        "haversine_m": lambda: haversine_m(lat1, lon1, lat2, lon2),
+        "bearing_deg": lambda: bearing_deg(lat1, lon1, lat2, lon2),
+        "destination_point": lambda: destination_point(lat1, lon1, brg, dist),
+        "to_local_equirect": lambda: to_local_equirect(lat1, lon1, 30.0, -40.0),
+    }
+    out: Dict[str, float] = {}
+    for name, fn in cases.items():
+        t0 = time.perf_counter()
+        fn()
+        out[name] = round((time.perf_counter() - t0) / n * 1e9, 2)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--bench", type=int, default=1_000_000, help="Points per function")
+    args = ap.parse_args()
+    print(json.dumps({"points": args.bench, "ns_per_point": benchmark(args.bench)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,633 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config_loader import AgentSpec, load_agents
+from geodesy import to_local_equirect
+from lidar import cast_rays
+from stepping_harness import MAX_HEADING_CHANGE_DEG, Action, LatencyHistogram
+
+
+EXTRA_FEATURES = 3
+"""Observation columns after the lidar rays: sin/cos of the heading error to the playground center, distance to it."""
+
+FLUSH_REASONS = ("window", "full", "expected", "deadline", "flush")
+
+
+@dataclass(frozen=True)
+class InferenceConfig:
+    """``runtime.inference`` of an experiment."""
+
+    batch_window_ms: float = 2.0
+    """How long a worker keeps collecting after the first observation of a batch arrives."""
+    max_batch: int = 256
+    deadline_ms: Optional[float] = None
+    """Tick deadline measured from submit; defaults to ``1 / runtime.step_hz``. A batch is cut early
+    so its forward pass ends before the oldest request's deadline."""
+    pin_cpus: Tuple[int, ...] = ()
+    """CPUs for the worker threads, assigned round-robin per ``agent_ref``; empty leaves affinity alone."""
+    model_threads: int = 1
+    """Intra-op threads of torch models; keep at 1 when several agents share a few cores."""
+    hidden: int = 64
+    """Width of the stub model used when no ``.pt`` weights can be loaded."""
+
+    @classmethod
+    def from_runtime(cls, runtime: Dict[str, Any]) -> "InferenceConfig":
+        block = dict(runtime.get("inference") or {})
+        unknown = sorted(set(block) - set(cls.__dataclass_fields__))
+        if unknown:
+            raise ValueError(f"runtime.inference: unknown key(s) {unknown}")
+        if "pin_cpus" in block:
+            block["pin_cpus"] = tuple(int(c) for c in block["pin_cpus"] or ())
+        if block.get("deadline_ms") is None:
+            block["deadline_ms"] = 1e3 / float(runtime.get("step_hz") or 20)
+        cfg = cls(**block)
+        cfg.validate()
+        return cfg
+
+    def validate(self) -> None:
+        if self.batch_window_ms < 0:
+            raise ValueError("batch_window_ms must be >= 0")
+        if self.max_batch < 1 or self.model_threads < 1 or self.hidden < 1:
+            raise ValueError("max_batch, model_threads and hidden must be >= 1")
+        if self.deadline_ms is not None and self.deadline_ms <= 0:
+            raise ValueError("deadline_ms must be positive")
+        if self.pin_cpus and hasattr(os, "sched_getaffinity"):
+            missing = sorted(set(self.pin_cpus) - os.sched_getaffinity(0))
+            if missing:
+                raise ValueError(f"pin_cpus: CPU(s) {missing} are not available to this process")
+
+    @property
+    def deadline_s(self) -> float:
+        return (self.deadline_ms if self.deadline_ms is not None else 50.0) / 1e3
+
+
+# ---------------------------------------------------------------------------
+# Models
+# ---------------------------------------------------------------------------
+
+
+def observation_size(agent: AgentSpec) -> int:
+    return int(agent.hyperparameters.get("num_rays", 24)) + EXTRA_FEATURES
+
+
+def max_turn_deg(agent: AgentSpec) -> float:
+    return min(MAX_HEADING_CHANGE_DEG, float(agent.hyperparameters.get("turn_rate_deg_s", MAX_HEADING_CHANGE_DEG)))
+
+
+def holding_observations(
+    x: np.ndarray,
+    y: np.ndarray,
+    heading_deg: np.ndarray,
+    nfz_xyr: np.ndarray,
+    num_rays: int,
+    max_range: float,
+    center_xy: Tuple[float, float] = (0.0, 0.0),
+    scale_m: float = 10_000.0,
+) -> np.ndarray:
+    """(A, num_rays + 3) float32 observations: normalized lidar, then the heading error to the center and its range."""
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+    heading = np.atleast_1d(np.asarray(heading_deg, dtype=np.float64))
+    out = np.empty((x.size, num_rays + EXTRA_FEATURES), dtype=np.float32)
+    out[:, :num_rays] = cast_rays(x, y, heading, nfz_xyr, num_rays, max_range) / max_range
+    dx, dy = center_xy[0] - x, center_xy[1] - y
+    err = np.radians(np.degrees(np.arctan2(dx, dy)) - heading)
+    out[:, num_rays] = np.sin(err)
+    out[:, num_rays + 1] = np.cos(err)
+    out[:, num_rays + 2] = np.hypot(dx, dy) / scale_m
+    return out
+
+
+class StubPolicyModel:
+    """Two-layer tanh MLP standing in for a ``.pt`` policy: (B, obs_dim) float32 -> (B,) heading change.
+
+    Weights are drawn from a hash of ``weights_path`` so every process builds the same model. A fixed
+    gain on the heading-error feature keeps it flying toward the center; the random layers only add
+    the compute of a real network. ``call_overhead_s`` emulates the per-call cost of a framework
+    (dispatch, tensor wrapping), which is what batching amortizes.
+    """
+
+    def __init__(self, obs_dim: int, max_turn_deg: float, hidden: int = 64, seed: int = 0, call_overhead_s: float = 0.0) -> None:
+        rng = np.random.default_rng(seed)
+        self.obs_dim = obs_dim
+        self.max_turn_deg = float(max_turn_deg)
+        self.call_overhead_s = call_overhead_s
+        self.w1 = (rng.standard_normal((obs_dim, hidden)) / math.sqrt(obs_dim)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = (0.1 * rng.standard_normal(hidden) / math.sqrt(hidden)).astype(np.float32)
+        self.gain = np.zeros(obs_dim, dtype=np.float32)
+        if obs_dim >= EXTRA_FEATURES:
+            self.gain[obs_dim - EXTRA_FEATURES] = 3.0  # sin(heading error)
+
+    @classmethod
+    def from_agent(cls, agent: AgentSpec, hidden: int = 64, call_overhead_s: float = 0.0) -> "StubPolicyModel":
+        key = agent.weights_path or agent.id
+        seed = int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "little")
+        return cls(observation_size(agent), max_turn_deg(agent), hidden, seed, call_overhead_s)
+
+    def forward(self, obs: np.ndarray) -> np.ndarray:
+        if self.call_overhead_s > 0:
+            end = time.perf_counter() + self.call_overhead_s
+            while time.perf_counter() < end:
+                pass
+        h = np.tanh(obs @ self.w1 + self.b1)
+        return self.max_turn_deg * np.tanh(h @ self.w2 + obs @ self.gain)
+
+
+class TorchPolicyModel:
+    """A TorchScript policy on CPU; only used when torch is installed and the weights file exists."""
+
+    def __init__(self, path: Path, obs_dim: int, max_turn_deg: float, threads: int = 1) -> None:
+        import torch
+
+        torch.set_num_threads(threads)
+        self._torch = torch
+        self.module = torch.jit.load(str(path), map_location="cpu").eval()
+        self.obs_dim = obs_dim
+        self.max_turn_deg = float(max_turn_deg)
+
+    def forward(self, obs: np.ndarray) -> np.ndarray:
+        with self._torch.inference_mode():
+            out = self.module(self._torch.from_numpy(obs)).reshape(obs.shape[0], -1)[:, 0].numpy()
+        return np.clip(out, -self.max_turn_deg, self.max_turn_deg)
+
+
+def load_model(agent: AgentSpec, config: InferenceConfig, root: Optional[Path] = None) -> Any:
+    """``TorchPolicyModel`` for ``inference_info.weights_path`` (relative to ``root``) when possible, else the stub."""
+    if agent.weights_path:
+        path = Path(root or ".") / agent.weights_path
+        if path.is_file():
+            try:
+                import torch  # noqa: F401
+            except ImportError:  # optional; the stub needs only numpy
+                pass
+            else:
+                return TorchPolicyModel(path, observation_size(agent), max_turn_deg(agent), config.model_threads)
+    return StubPolicyModel.from_agent(agent, config.hidden)
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class _Request:
+    __slots__ = ("entity_id", "obs", "submitted", "deadline", "future")
+
+    def __init__(self, entity_id: str, obs: np.ndarray, submitted: float, deadline: float) -> None:
+        self.entity_id = entity_id
+        self.obs = obs
+        self.submitted = submitted
+        self.deadline = deadline
+        self.future: "Future[Action]" = Future()
+
+
+class _Worker:
+    """One ``agent_ref``: a queue, the thread that drains it in batches, and its stats."""
+
+    def __init__(self, agent_ref: str, model: Any, config: InferenceConfig, cpu: Optional[int]) -> None:
+        self.agent_ref = agent_ref
+        self.model = model
+        self.config = config
+        self.cpu = cpu
+        self.queue: Deque[_Request] = deque()
+        self.cond = threading.Condition()
+        self.expected = 0
+        self.flush_now = False
+        self.stopping = False
+        self.failed: Optional[BaseException] = None
+        """Set when the thread died; ``submit`` refuses new requests from then on."""
+        self.forward_est_s = 0.0
+        """EWMA of the forward time, reserved before the deadline when cutting a batch."""
+
+        self.queue_wait = LatencyHistogram()
+        self.forward = LatencyHistogram()
+        self.latency = LatencyHistogram()
+        self.batch_sizes: Dict[int, int] = {}
+        self.reasons = dict.fromkeys(FLUSH_REASONS, 0)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.first_submit: Optional[float] = None
+        self.last_done = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"infer-{agent_ref}", daemon=True)
+
+    def _collect(self) -> Tuple[List[_Request], str]:
+        """Blocks until a batch is due; call with ``cond`` held."""
+        cfg = self.config
+        while not self.queue and not self.stopping:
+            self.cond.wait()
+        if not self.queue:
+            return [], "flush"
+        first = self.queue[0]
+        close = min(first.submitted + cfg.batch_window_ms / 1e3, first.deadline - self.forward_est_s)
+        while True:
+            if len(self.queue) >= cfg.max_batch:
+                reason = "full"
+                break
+            if self.expected and len(self.queue) >= self.expected:
+                reason = "expected"
+                break
+            if self.flush_now or self.stopping:
+                reason = "flush"
+                break
+            remaining = close - time.perf_counter()
+            if remaining <= 0:
+                reason = "window" if close < first.deadline - self.forward_est_s else "deadline"
+                break
+            self.cond.wait(remaining)
+        n = min(len(self.queue), cfg.max_batch)
+        batch = [self.queue.popleft() for _ in range(n)]
+        if not self.queue:
+            self.flush_now = False
+        return batch, reason
+
+    def _run(self) -> None:
+        batch: List[_Request] = []
+        try:
+            if self.cpu is not None and hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, {self.cpu})  # pid 0 = the calling thread on Linux
+            while True:
+                with self.cond:
+                    batch, reason = self._collect()
+                if not batch:
+                    return
+                # Claim the futures; a caller may have cancelled while its request sat in the queue.
+                live = [r for r in batch if r.future.set_running_or_notify_cancel()]
+                self.cancelled += len(batch) - len(live)
+                batch = live
+                if batch:
+                    self._dispatch(batch, reason)
+                batch = []
+        except BaseException as exc:
+            # The thread is going away: fail everything it still owns so no caller waits forever.
+            with self.cond:
+                self.failed = exc
+                pending = list(self.queue)
+                self.queue.clear()
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_exception(exc)
+            for r in pending:
+                if r.future.set_running_or_notify_cancel():
+                    r.future.set_exception(exc)
+            raise
+
+    def _dispatch(self, batch: List[_Request], reason: str) -> None:
+        """One forward pass for ``batch``, whose futures are already claimed as running."""
+        t0 = time.perf_counter()
+        try:
+            out = self.model.forward(np.stack([r.obs for r in batch]))
+            if len(out) != len(batch):
+                # zip would drop the extra requests and leave their futures unresolved.
+                raise ValueError(f"{self.agent_ref}: model returned {len(out)} rows for a batch of {len(batch)}")
+        except Exception as exc:  # surface model errors to every waiting caller
+            self.errors += 1
+            for r in batch:
+                r.future.set_exception(exc)
+            return
+        t1 = time.perf_counter()
+        for r, a in zip(batch, out):
+            r.future.set_result(Action(r.entity_id, float(a)))
+        done = time.perf_counter()
+
+        dt = t1 - t0
+        self.forward_est_s = dt if not self.batches else 0.8 * self.forward_est_s + 0.2 * dt
+        self.forward.record(dt)
+        for r in batch:
+            self.queue_wait.record(t0 - r.submitted)
+            self.latency.record(done - r.submitted)
+        self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+        self.reasons[reason] += 1
+        self.batches += 1
+        self.requests += len(batch)
+        self.last_done = done
+
+    def stats(self) -> Dict[str, Any]:
+        span = self.last_done - self.first_submit if self.first_submit is not None else 0.0
+        return {
+            "cpu": self.cpu,
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "mean_batch": self.requests / self.batches if self.batches else 0.0,
+            "batch_sizes": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "flush_reasons": dict(self.reasons),
+            "throughput_per_s": self.requests / span if span > 0 else 0.0,
+            "queue_wait": _summary(self.queue_wait),
+            "forward": _summary(self.forward),
+            "latency": _summary(self.latency),
+        }
+
+
+def _summary(h: LatencyHistogram) -> Dict[str, Any]:
+    d = h.to_dict()
+    return {k: d[k] for k in ("count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")}
+
+
+class InferenceServer:
+    """Micro-batches per-entity policy calls: one worker thread and one forward pass per ``agent_ref`` batch.
+
+    ``submit`` is safe from any thread and returns a ``Future[Action]``. A worker holds the first
+    request of a batch for at most ``batch_window_ms``; it dispatches sooner when the batch is full,
+    when ``expect(agent_ref, n)`` requests are in, on ``flush``, or when waiting longer would push the
+    forward pass past the oldest request's deadline. ``infer`` does submit + flush + wait for one tick.
+    """
+
+    def __init__(self, config: Optional[InferenceConfig] = None) -> None:
+        self.config = config or InferenceConfig()
+        self.config.validate()
+        self._workers: Dict[str, _Worker] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def from_agents(
+        cls, agents: Iterable[AgentSpec], config: Optional[InferenceConfig] = None, root: Optional[Path] = None
+    ) -> "InferenceServer":
+        server = cls(config)
+        for agent in agents:
+            server.register(agent.id, load_model(agent, server.config, root))
+        return server
+
+    def register(self, agent_ref: str, model: Any) -> None:
+        with self._lock:
+            if self._closed:
+                raise ValueError("server is closed")
+            if agent_ref in self._workers:
+                raise ValueError(f"agent_ref {agent_ref!r} is already registered")
+            pins = self.config.pin_cpus
+            cpu = pins[len(self._workers) % len(pins)] if pins else None
+            worker = _Worker(agent_ref, model, self.config, cpu)
+            self._workers[agent_ref] = worker
+        worker.thread.start()
+
+    def __contains__(self, agent_ref: str) -> bool:
+        return agent_ref in self._workers
+
+    def _worker(self, agent_ref: str) -> _Worker:
+        try:
+            return self._workers[agent_ref]
+        except KeyError:
+            raise KeyError(f"unknown agent_ref: {agent_ref}") from None
+
+    def expect(self, agent_ref: str, n: int) -> None:
+        """Entities that submit to ``agent_ref`` each tick; a batch goes out as soon as all of them are in (0 = unknown)."""
+        w = self._worker(agent_ref)
+        with w.cond:
+            w.expected = max(0, int(n))
+            w.cond.notify()
+
+    def submit(self, agent_ref: str, entity_id: str, obs: np.ndarray, deadline: Optional[float] = None) -> "Future[Action]":
+        """``deadline`` is absolute ``time.perf_counter()`` seconds; default ``now + deadline_ms``."""
+        w = self._worker(agent_ref)
+        obs = np.asarray(obs, dtype=np.float32).reshape(-1)
+        if obs.size != getattr(w.model, "obs_dim", obs.size):
+            raise ValueError(f"{agent_ref}: observation has {obs.size} values, model expects {w.model.obs_dim}")
+        now = time.perf_counter()
+        req = _Request(entity_id, obs, now, deadline if deadline is not None else now + self.config.deadline_s)
+        with w.cond:
+            if w.stopping:
+                raise ValueError("server is closed")
+            if w.failed is not None or not w.thread.is_alive():
+                raise ValueError(f"{agent_ref}: inference worker is not running") from w.failed
+            if w.first_submit is None:
+                w.first_submit = now
+            w.queue.append(req)
+            if len(w.queue) == 1 or len(w.queue) == w.expected or len(w.queue) >= self.config.max_batch:
+                w.cond.notify()
+        return req.future
+
+    def flush(self, agent_ref: Optional[str] = None) -> None:
+        """Dispatch whatever is queued without waiting out the batch window."""
+        for ref in [agent_ref] if agent_ref is not None else list(self._workers):
+            w = self._worker(ref)
+            with w.cond:
+                if w.queue:
+                    w.flush_now = True
+                    w.cond.notify()
+
+    def infer(self, requests: Iterable[Tuple[str, str, np.ndarray]], timeout: Optional[float] = None) -> Dict[str, Action]:
+        """One tick of ``(agent_ref, entity_id, observation)`` -> entity id -> action."""
+        deadline = time.perf_counter() + self.config.deadline_s
+        futures = [(entity_id, self.submit(ref, entity_id, obs, deadline)) for ref, entity_id, obs in requests]
+        self.flush()
+        return {entity_id: f.result(timeout) for entity_id, f in futures}
+
+    def stats(self) -> Dict[str, Any]:
+        return {ref: w.stats() for ref, w in self._workers.items()}
+
+    def close(self) -> None:
+        """Drains the queues and joins the workers."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers.values())
+        for w in workers:
+            with w.cond:
+                w.stopping = True
+                w.cond.notify()
+        for w in workers:
+            w.thread.join()
+
+    def __enter__(self) -> "InferenceServer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# evaluation_runner policy
+# ---------------------------------------------------------------------------
+
+_shared: Optional[InferenceServer] = None
+_shared_lock = threading.Lock()
+
+
+def shared_server(config: Optional[InferenceConfig] = None) -> InferenceServer:
+    """The process-wide server; ``config`` only applies on first use."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = InferenceServer(config)
+        return _shared
+
+
+class BatchedPolicy:
+    """``evaluation_runner --policy inference_server:BatchedPolicy``: lidar observations through the shared server.
+
+    Each aircraft is submitted as its own request, as an agent per entity would; the server turns
+    them into one forward pass per tick.
+    """
+
+    def __init__(self, agent: AgentSpec, ctx: Any) -> None:
+        self.server = shared_server()
+        with _shared_lock:
+            if agent.id not in self.server:
+                self.server.register(agent.id, load_model(agent, self.server.config))
+        self.agent_ref = agent.id
+        self.num_rays = int(agent.hyperparameters.get("num_rays", 24))
+        self.range_m = float(agent.hyperparameters.get("max_lidar_range", 2000.0))
+        self.origin = ctx.center
+        ze, zn = to_local_equirect(ctx.nfz_lat, ctx.nfz_lon, *ctx.center)
+        self.nfz_xyr = np.column_stack([ze, zn, ctx.nfz_radius_m]) if len(ctx.nfz_ids) else np.zeros((0, 3))
+
+    def act(self, state: Any, active: np.ndarray) -> List[Action]:
+        ids = list(state.entities)
+        if not ids:
+            return []
+        ents = [state.entities[uid] for uid in ids]
+        lat = np.array([e.position.latitude for e in ents])
+        lon = np.array([e.position.longitude for e in ents])
+        heading = np.array([e.attitude.yaw for e in ents])
+        x, y = to_local_equirect(lat, lon, *self.origin)
+        obs = holding_observations(x, y, heading, self.nfz_xyr[active], self.num_rays, self.range_m)
+        out = self.server.infer((self.agent_ref, uid, obs[i]) for i, uid in enumerate(ids))
+        return [out[uid] for uid in ids]
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def _bench_agent(agent_id: str = "bench-holding", num_rays: int = 24) -> AgentSpec:
+    hyper = {"num_rays": num_rays, "turn_rate_deg_s": 30.0, "max_lidar_range": 2000.0}
+    return AgentSpec(agent_id, agent_id, "aircraft", None, f"{agent_id}.pt", None, 0, hyper, {})
+
+
+def benchmark(
+    aircraft: int = 64, agents: int = 2, ticks: int = 200, hidden: int = 256, call_overhead_us: float = 100.0, window_ms: float = 2.0
+) -> Dict[str, Any]:
+    """Per-entity forward calls vs the server, for ``aircraft`` entities split over ``agents`` policies.
+
+    ``call_overhead_us`` emulates the fixed per-call cost of a torch module on CPU.
+    """
+    specs = [_bench_agent(f"bench-{k}") for k in range(agents)]
+    models = {a.id: StubPolicyModel.from_agent(a, hidden, call_overhead_us / 1e6) for a in specs}
+    rng = np.random.default_rng(0)
+    nfz = np.column_stack([rng.uniform(-8000, 8000, (30, 2)), rng.uniform(300, 1500, 30)])
+    refs = [specs[i % agents].id for i in range(aircraft)]
+    ids = [f"ac-{i}" for i in range(aircraft)]
+
+    def tick_obs(k: int) -> np.ndarray:
+        r = np.random.default_rng(k)
+        return holding_observations(
+            r.uniform(-10000, 10000, aircraft), r.uniform(-10000, 10000, aircraft), r.uniform(0, 360, aircraft), nfz, 24, 2000.0
+        )
+
+    frames = [tick_obs(k) for k in range(min(ticks, 32))]
+
+    per_entity = LatencyHistogram()
+    expected: Dict[str, float] = {}
+    for k in range(ticks):
+        obs = frames[k % len(frames)]
+        t0 = time.perf_counter()
+        for i, uid in enumerate(ids):
+            expected[uid] = float(models[refs[i]].forward(obs[i : i + 1])[0])
+        per_entity.record(time.perf_counter() - t0)
+
+    batched = LatencyHistogram()
+    config = InferenceConfig(batch_window_ms=window_ms, max_batch=max(aircraft, 1), deadline_ms=50.0)
+    mismatch = 0.0
+    with InferenceServer(config) as server:
+        for a in specs:
+            server.register(a.id, models[a.id])
+        for k in range(ticks):
+            obs = frames[k % len(frames)]
+            t0 = time.perf_counter()
+            out = server.infer((refs[i], uid, obs[i]) for i, uid in enumerate(ids))
+            batched.record(time.perf_counter() - t0)
+            if k % len(frames) == (ticks - 1) % len(frames):
+                mismatch = max(mismatch, max(abs(out[uid].heading_change_deg - expected[uid]) for uid in ids))
+        stats = server.stats()
+
+    # Entities on their own threads, each submitting independently; ``expect`` closes the batch.
+    threaded = LatencyHistogram()
+    with InferenceServer(config) as server:
+        for a in specs:
+            server.register(a.id, models[a.id])
+            server.expect(a.id, refs.count(a.id))
+        barrier = threading.Barrier(aircraft + 1)
+
+        def client(i: int) -> None:
+            for k in range(ticks):
+                barrier.wait()
+                server.submit(refs[i], ids[i], frames[k % len(frames)][i]).result()
+                barrier.wait()
+
+        threads = [threading.Thread(target=client, args=(i,), daemon=True) for i in range(aircraft)]
+        for t in threads:
+            t.start()
+        for _ in range(ticks):
+            t0 = time.perf_counter()
+            barrier.wait()
+            barrier.wait()
+            threaded.record(time.perf_counter() - t0)
+        for t in threads:
+            t.join()
+        threaded_stats = server.stats()
+
+    return {
+        "aircraft": aircraft,
+        "agents": agents,
+        "ticks": ticks,
+        "hidden": hidden,
+        "call_overhead_us": call_overhead_us,
+        "per_entity_tick": _summary(per_entity),
+        "server_tick": _summary(batched),
+        "server_threaded_clients_tick": _summary(threaded),
+        "speedup_mean": per_entity.total_s / batched.total_s if batched.total_s else 0.0,
+        "max_action_diff_deg": mismatch,
+        "server": stats,
+        "server_threaded_clients": threaded_stats,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--agents", help="spec/agents.yaml; runs one tick of random observations through every agent")
+    ap.add_argument("--aircraft", type=int, default=8, help="Entities per agent for --agents")
+    ap.add_argument("--window-ms", type=float, default=InferenceConfig.batch_window_ms)
+    ap.add_argument("--pin", type=int, nargs="*", default=[], help="CPUs to pin worker threads to")
+    ap.add_argument("--bench", type=int, metavar="AIRCRAFT", help="Compare per-entity calls with the server")
+    ap.add_argument("--bench-agents", type=int, default=2)
+    ap.add_argument("--ticks", type=int, default=200)
+    ap.add_argument("--overhead-us", type=float, default=100.0, help="Emulated per-call framework cost of the stub model")
+    args = ap.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark(args.bench, args.bench_agents, args.ticks, call_overhead_us=args.overhead_us, window_ms=args.window_ms), indent=2))
+        return
+    if not args.agents:
+        ap.error("--agents or --bench is required")
+
+    path = Path(args.agents)
+    specs = load_agents(path)
+    config = InferenceConfig(batch_window_ms=args.window_ms, pin_cpus=tuple(args.pin))
+    rng = np.random.default_rng(0)
+    with InferenceServer.from_agents(specs, config, root=path.parent) as server:
+        requests: List[Tuple[str, str, np.ndarray]] = []
+        for a in specs:
+            n = observation_size(a)
+            requests.extend((a.id, f"{a.id}/{i}", rng.random(n, dtype=np.float32)) for i in range(args.aircraft))
+        actions = server.infer(requests)
+        print(json.dumps({"actions": {k: v.heading_change_deg for k, v in actions.items()}, "stats": server.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
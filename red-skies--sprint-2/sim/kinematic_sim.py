@@ -0,0 +1,228 @@
+import argparse
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geodesy import deg_per_meter_lat, deg_per_meter_lon
+from schema import Attitude, EntityState, EntityType, LocalVelocity, Position, SimulationState
+from simulator_interface import SimulatorInterface
+from stepping_harness import MAX_HEADING_CHANGE_DEG, Action
+
+_STATE_ARRAYS = ("lat", "lon", "alt", "heading", "target", "speed", "turn_rate")
+
+
+class KinematicSimulator(SimulatorInterface):
+    """Point-mass, constant-speed aircraft stepped as NumPy arrays.
+
+    Each aircraft holds a commanded heading and turns toward it at no more than ``turn_rate_deg_s``;
+    positions advance along the heading with the WGS84 meridian / prime-vertical radii at the
+    current latitude. No wind, climb or speed dynamics -- a stand-in for smoke tests and
+    throughput runs, not for flight-model fidelity.
+    """
+
+    def __init__(
+        self,
+        aircraft_id: str = "HOLD1",
+        turn_rate_deg_s: float = 30.0,
+        dt: float = 1.0,
+        max_heading_change_deg: float = MAX_HEADING_CHANGE_DEG,
+    ) -> None:
+        self.aircraft_id = aircraft_id
+        self.turn_rate_deg_s = float(turn_rate_deg_s)
+        self.dt = float(dt)
+        self.max_heading_change_deg = float(max_heading_change_deg)
+        self.time = 0.0
+        self.frame = 0
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.lat = np.zeros(0)
+        self.lon = np.zeros(0)
+        self.alt = np.zeros(0)
+        self.heading = np.zeros(0)
+        self.target = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.turn_rate = np.zeros(0)
+
+    # -- SimulatorInterface -------------------------------------------------
+
+    def reset(self, **kwargs: Any) -> None:
+        """Single aircraft with the env's kwargs, or many with ``aircraft=[{id, lat, lon, alt, heading, speed}]``."""
+        fleet = kwargs.get("aircraft")
+        if fleet is None:
+            fleet = [
+                {
+                    "id": kwargs.get("aircraft_id", self.aircraft_id),
+                    "lat": kwargs.get("aircraft_initial_lat", 0.0),
+                    "lon": kwargs.get("aircraft_initial_lon", 0.0),
+                    "alt": kwargs.get("aircraft_alt", 0.0),
+                    "heading": kwargs.get("aircraft_initial_hdg", 0.0),
+                    "speed": kwargs.get("speed", 0.0),
+                }
+            ]
+        self.load_fleet(fleet, turn_rate_deg_s=kwargs.get("turn_rate_deg_s"))
+
+    def step(self, dt: Optional[float] = None) -> None:
+        dt = self.dt if dt is None else float(dt)
+        err = (self.target - self.heading + 180.0) % 360.0 - 180.0
+        limit = self.turn_rate * dt
+        self.heading = (self.heading + np.clip(err, -limit, limit)) % 360.0
+
+        rad = np.radians(self.heading)
+        dist = self.speed * dt
+        self.lat = self.lat + dist * np.cos(rad) * deg_per_meter_lat(self.lat)
+        self.lon = (self.lon + dist * np.sin(rad) * deg_per_meter_lon(self.lat) + 540.0) % 360.0 - 180.0
+        self.time += dt
+        self.frame += 1
+
+    def get_aircraft_position(self, aircraft_id: str) -> Tuple[float, float, float]:
+        i = self._i(aircraft_id)
+        return float(self.lat[i]), float(self.lon[i]), float(self.alt[i])
+
+    def get_aircraft_heading(self, aircraft_id: str) -> float:
+        return float(self.heading[self._i(aircraft_id)])
+
+    def get_aircraft_speed(self, aircraft_id: str) -> float:
+        return float(self.speed[self._i(aircraft_id)])
+
+    def set_heading_change(self, aircraft_id: str, heading_change_deg: float) -> None:
+        i = self._i(aircraft_id)
+        change = max(-self.max_heading_change_deg, min(self.max_heading_change_deg, float(heading_change_deg)))
+        self.target[i] = (self.heading[i] + change) % 360.0
+
+    def close(self) -> None:
+        self.load_fleet([])
+
+    # -- Batch API ----------------------------------------------------------
+
+    def load_fleet(self, fleet: Iterable[Dict[str, Any]], turn_rate_deg_s: Optional[float] = None) -> None:
+        fleet = list(fleet)
+        ids = [str(a["id"]) for a in fleet]
+        if len(set(ids)) != len(ids):
+            raise ValueError("duplicate aircraft id in fleet")
+        self.ids = ids
+        self.index = {uid: i for i, uid in enumerate(ids)}
+
+        def col(key: str, default: float = 0.0) -> np.ndarray:
+            return np.array([float(a.get(key, default)) for a in fleet], dtype=np.float64)
+
+        self.lat, self.lon, self.alt = col("lat"), col("lon"), col("alt")
+        self.heading = col("heading") % 360.0
+        self.target = self.heading.copy()
+        self.speed = col("speed")
+        rate = self.turn_rate_deg_s if turn_rate_deg_s is None else float(turn_rate_deg_s)
+        self.turn_rate = col("turn_rate_deg_s", rate)
+        self.time = 0.0
+        self.frame = 0
+
+    def set_heading_changes(self, changes: Sequence[float], indices: Optional[np.ndarray] = None) -> None:
+        """Vectorized ``set_heading_change`` for all aircraft (or the rows in ``indices``)."""
+        sel = slice(None) if indices is None else np.asarray(indices)
+        change = np.clip(np.asarray(changes, dtype=np.float64), -self.max_heading_change_deg, self.max_heading_change_deg)
+        self.target[sel] = (self.heading[sel] + change) % 360.0
+
+    def positions(self) -> np.ndarray:
+        """(N, 3) lat, lon, alt."""
+        return np.stack([self.lat, self.lon, self.alt], axis=1)
+
+    # -- Snapshots ------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copies of the fleet arrays and clock; ``restore`` puts them back without rebuilding the fleet."""
+        return {
+            "ids": self.ids,
+            "index": self.index,
+            "time": self.time,
+            "frame": self.frame,
+            "arrays": {name: getattr(self, name).copy() for name in _STATE_ARRAYS},
+        }
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        """Resets to ``snap``; same-sized fleets are copied into the existing arrays."""
+        if snap["ids"] is not self.ids:
+            # The id list and index are never mutated after load_fleet, so they are shared, not copied.
+            self.ids, self.index = snap["ids"], snap["index"]
+        for name, arr in snap["arrays"].items():
+            cur = getattr(self, name)
+            if cur.shape == arr.shape:
+                np.copyto(cur, arr)
+            else:
+                setattr(self, name, arr.copy())
+        self.time = snap["time"]
+        self.frame = snap["frame"]
+
+    # -- Harness / evaluation-runner adapter ----------------------------------
+
+    def apply_action(self, action: Action) -> None:
+        if action.entity_id not in self.index:
+            raise KeyError(f"entity_id not found: {action.entity_id}")
+        self.set_heading_change(action.entity_id, action.heading_change_deg)
+
+    def entity_states(self) -> Dict[str, EntityState]:
+        """``models.py`` entities; built on demand because it costs more than stepping."""
+        rad = np.radians(self.heading)
+        north = (self.speed * np.cos(rad)).tolist()
+        east = (self.speed * np.sin(rad)).tolist()
+        out: Dict[str, EntityState] = {}
+        for uid, lat, lon, alt, hdg, spd, vn, ve in zip(
+            self.ids, self.lat.tolist(), self.lon.tolist(), self.alt.tolist(), self.heading.tolist(), self.speed.tolist(), north, east
+        ):
+            out[uid] = EntityState(
+                uid=uid,
+                type=EntityType.AIRCRAFT,
+                position=Position(lat, lon, alt),
+                attitude=Attitude(yaw=hdg),
+                local_velocity=LocalVelocity(north=vn, east=ve, down=0.0),
+                speed=spd,
+            )
+        return out
+
+    def world_state(self) -> SimulationState:
+        return SimulationState(time=self.time, frame=self.frame, entities=self.entity_states())
+
+    def _i(self, aircraft_id: str) -> int:
+        try:
+            return self.index[aircraft_id]
+        except KeyError:
+            raise KeyError(f"aircraft_id not found: {aircraft_id}") from None
+
+
+def benchmark(n_aircraft: int = 10_000, steps: int = 1_000, dt: float = 0.05, seed: int = 0) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    sim = KinematicSimulator(turn_rate_deg_s=30.0, dt=dt)
+    sim.load_fleet(
+        {"id": f"ac-{i}", "lat": 30.0 + rng.uniform(-1, 1), "lon": -40.0 + rng.uniform(-1, 1), "alt": 1500.0, "heading": rng.uniform(0, 360), "speed": 90.0}
+        for i in range(n_aircraft)
+    )
+    changes = rng.uniform(-30.0, 30.0, (steps, n_aircraft))
+
+    t0 = time.perf_counter()
+    for k in range(steps):
+        sim.set_heading_changes(changes[k])
+        sim.step()
+    step_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    sim.world_state()
+    state_s = time.perf_counter() - t0
+    return {
+        "aircraft": n_aircraft,
+        "steps": steps,
+        "step_us": round(step_s / steps * 1e6, 2),
+        "aircraft_steps_per_s": round(n_aircraft * steps / step_s),
+        "world_state_ms": round(state_s * 1e3, 3),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--aircraft", type=int, default=10_000)
+    ap.add_argument("--steps", type=int, default=1_000)
+    ap.add_argument("--dt", type=float, default=0.05)
+    args = ap.parse_args()
+    print(json.dumps(benchmark(args.aircraft, args.steps, args.dt), indent=2))
+
+
+if __name__ == "__main__":
+    main()
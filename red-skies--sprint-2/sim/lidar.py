@@ -0,0 +1,97 @@
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+
+def ray_angles_deg(num_rays: int) -> np.ndarray:
+    """Body-frame ray angles, 0 = straight ahead, clockwise, evenly over 360 deg."""
+    return np.arange(num_rays, dtype=np.float64) * (360.0 / num_rays)
+
+
+def cast_rays(
+    x: np.ndarray,
+    y: np.ndarray,
+    heading_deg: np.ndarray,
+    nfz_xyr: np.ndarray,
+    num_rays: int = 24,
+    max_range: float = 2000.0,
+) -> np.ndarray:
+    """Ray-circle lidar of ``HoldingAgentLidarEnv`` (README-michal.md) for many aircraft at once.
+
+    ``x``/``y`` are local east/north metres, ``heading_deg`` clockwise from north, all shape (A,)
+    (or scalars); ``nfz_xyr`` is (N, 3) circle centers and radii in the same frame. Returns (A, R)
+    distances to the closest NFZ edge along each ray, 0 inside an NFZ, ``max_range`` on no hit.
+    """
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+    heading = np.atleast_1d(np.asarray(heading_deg, dtype=np.float64))
+    out = np.full((x.size, num_rays), float(max_range))
+    if nfz_xyr.size == 0:
+        return out
+
+    ang = np.radians(heading[:, None] + ray_angles_deg(num_rays)[None, :])
+    dx, dy = np.sin(ang), np.cos(ang)  # (A, R), aviation convention: 0 = north, 90 = east
+
+    # Cull zones that cannot be reached by any ray before the quadratic: (A, N).
+    ox = x[:, None] - nfz_xyr[None, :, 0]
+    oy = y[:, None] - nfz_xyr[None, :, 1]
+    r = nfz_xyr[None, :, 2]
+    dist = np.hypot(ox, oy)
+    reach = dist - r < max_range
+    if not reach.any():
+        return out
+    inside = dist <= r
+    out[inside.any(axis=1)] = 0.0
+
+    a_idx, n_idx = np.nonzero(reach & ~inside)
+    if a_idx.size == 0:
+        return out
+    # Unit rays: a = 1, b = 2 (o . d), c = |o|^2 - r^2; entry t1 = (-b - sqrt(b^2 - 4c)) / 2.
+    oxs, oys = ox[a_idx, n_idx][:, None], oy[a_idx, n_idx][:, None]
+    b = 2.0 * (oxs * dx[a_idx] + oys * dy[a_idx])
+    c = (oxs * oxs + oys * oys - r[0, n_idx][:, None] ** 2)
+    disc = b * b - 4.0 * c
+    with np.errstate(invalid="ignore"):
+        t1 = (-b - np.sqrt(disc)) / 2.0
+    hit = (disc >= 0.0) & (t1 > 0.0)
+    t1 = np.where(hit, np.minimum(t1, max_range), max_range)
+    np.minimum.at(out, a_idx, t1)
+    return out
+
+
+def cast_rays_reference(
+    x: float, y: float, heading_deg: float, nfzs: List[Tuple[float, float, float]], num_rays: int = 24, max_range: float = 2000.0
+) -> List[float]:
+    """Per-ray, per-NFZ loop exactly as written in README-michal.md; the baseline ``cast_rays`` is checked against."""
+    out = [max_range] * num_rays
+    for i in range(num_rays):
+        a = math.radians((heading_deg + i * 360.0 / num_rays) % 360.0)
+        dx, dy = math.sin(a), math.cos(a)
+        for cx, cy, radius in nfzs:
+            ox, oy = x - cx, y - cy
+            b = 2.0 * (ox * dx + oy * dy)
+            c = ox * ox + oy * oy - radius * radius
+            disc = b * b - 4.0 * c
+            if disc < 0:
+                continue
+            t1 = (-b - math.sqrt(disc)) / 2.0
+            t2 = (-b + math.sqrt(disc)) / 2.0
+            if t1 > 0:
+                d = t1
+            elif t2 > 0:
+                d = 0.0
+            else:
+                continue
+            out[i] = min(out[i], d)
+    return out
+
+
+def inside_any(x: np.ndarray, y: np.ndarray, nfz_xyr: np.ndarray) -> np.ndarray:
+    """(A,) True where a point lies in at least one circle."""
+    x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+    y = np.atleast_1d(np.asarray(y, dtype=np.float64))
+    if nfz_xyr.size == 0:
+        return np.zeros(x.size, dtype=bool)
+    d2 = (x[:, None] - nfz_xyr[None, :, 0]) ** 2 + (y[:, None] - nfz_xyr[None, :, 1]) ** 2
+    return (d2 <= nfz_xyr[None, :, 2] ** 2).any(axis=1)
@@ -0,0 +1,733 @@
+import argparse
+import json
+import math
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config_loader import Scenario, load_experiment
+from geodesy import deg_per_meter_lat, deg_per_meter_lon
+from schema import SimulationState
+from stepping_harness import LatencyHistogram
+
+_RENDERER = Path(__file__).resolve().parents[2] / "red-skies--sprint-1" / "sim" / "customer_mission_definition"
+if str(_RENDERER) not in sys.path:
+    sys.path.append(str(_RENDERER))
+
+import render_wgs84  # noqa: E402
+
+
+@dataclass(frozen=True)
+class LiveViewConfig:
+    display_hz: float = 20.0
+    """Deltas are computed and pushed at most this often; sim frames in between are coalesced."""
+    size_px: int = 1200
+    move_px: float = 0.5
+    """Entities that moved less than this on screen (and turned less than ``turn_deg``) are not resent."""
+    turn_deg: float = 2.0
+    max_backlog: int = 40
+    """Messages queued for one browser; a client that falls further behind is resynced with a keyframe."""
+
+    def validate(self) -> None:
+        if self.display_hz <= 0 or self.size_px < 1 or self.max_backlog < 1:
+            raise ValueError("display_hz, size_px and max_backlog must be positive")
+        if self.move_px < 0 or self.turn_deg < 0:
+            raise ValueError("move_px and turn_deg must be >= 0")
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+
+
+class Projection:
+    """``render_wgs84._render_html``'s lat/lon -> SVG pixel mapping (same bounds and axes), vectorized."""
+
+    def __init__(self, bounds: Tuple[float, float, float, float], size_px: int = 1200) -> None:
+        self.min_lat, self.max_lat, self.min_lon, self.max_lon = bounds
+        self.size_px = size_px
+        self._sx = size_px / (self.max_lon - self.min_lon)
+        self._sy = size_px / (self.max_lat - self.min_lat)
+
+    @classmethod
+    def from_circles(
+        cls, playground: Tuple[str, float, float, float], nfzs: List[Tuple[str, float, float, float]], size_px: int = 1200
+    ) -> "Projection":
+        return cls(render_wgs84._view_bounds(playground, nfzs), size_px)
+
+    def xy(self, lat: Any, lon: Any) -> Tuple[np.ndarray, np.ndarray]:
+        x = (np.asarray(lon, dtype=np.float64) - self.min_lon) * self._sx
+        y = (self.max_lat - np.asarray(lat, dtype=np.float64)) * self._sy
+        return x, y
+
+    def circle(self, lat: float, lon: float, r_m: float) -> Tuple[float, float, float, float]:
+        x, y = self.xy(lat, lon)
+        return float(x), float(y), r_m * float(deg_per_meter_lon(lat)) * self._sx, r_m * float(deg_per_meter_lat(lat)) * self._sy
+
+    def px_per_m(self, lat: Any) -> Tuple[np.ndarray, np.ndarray]:
+        return np.asarray(deg_per_meter_lon(lat)) * self._sx, np.asarray(deg_per_meter_lat(lat)) * self._sy
+
+
+def scenario_layer(scenario: Scenario, size_px: int = 1200) -> Tuple[Projection, Dict[str, Any]]:
+    """Projection framing the playground and NFZs, plus the static map layer sent in every keyframe."""
+    from evaluation_runner import _bounding_circle
+
+    playground = next((o for o in scenario.objects if o.id == "playground" or o.id.startswith("playground-")), None)
+    nfz_objs = [o for o in scenario.objects if o.behavior == "no_fly_zone"]
+    circles = {o.id: _bounding_circle(o) for o in [*nfz_objs, *([playground] if playground else [])]}
+    nfz_circles = [(o.id, *circles[o.id]) for o in nfz_objs if circles[o.id] is not None]
+    if playground is not None and circles[playground.id] is not None:
+        pg = (playground.id, *circles[playground.id])
+    elif nfz_circles:
+        lat, lon = np.mean([c[1] for c in nfz_circles]), np.mean([c[2] for c in nfz_circles])
+        pg = ("playground", float(lat), float(lon), 1.0)
+    else:
+        raise ValueError(f"{scenario.id}: no playground or NFZ to frame the view")
+    proj = Projection.from_circles(pg, nfz_circles, size_px)
+
+    def shape(o: Any) -> Optional[Dict[str, Any]]:
+        rings = o.rings()
+        if rings:
+            x, y = proj.xy([p[0] for p in rings[0]], [p[1] for p in rings[0]])
+            return {"id": o.id, "poly": np.round(np.column_stack([x, y]).ravel(), 1).tolist()}
+        c = circles.get(o.id)
+        return {"id": o.id, "ellipse": [round(v, 1) for v in proj.circle(*c)]} if c else None
+
+    zones = [s for s in (shape(o) for o in nfz_objs) if s is not None]
+    layer = {
+        "size": size_px,
+        "playground": {"id": pg[0], "ellipse": [round(v, 1) for v in proj.circle(*pg[1:])]},
+        "zones": zones,
+    }
+    return proj, layer
+
+
+# ---------------------------------------------------------------------------
+# Frames and deltas
+# ---------------------------------------------------------------------------
+
+
+class _Frame:
+    """What the view needs from one ``SimulationState``, copied out on the publishing thread."""
+
+    __slots__ = ("time", "frame", "ids", "types", "lat", "lon", "heading", "detections", "zones")
+
+    def __init__(
+        self,
+        time_s: float,
+        frame: int,
+        ids: List[str],
+        types: List[int],
+        lat: np.ndarray,
+        lon: np.ndarray,
+        heading: np.ndarray,
+        detections: List[Tuple[str, str, float, float]],
+        zones: Optional[Set[str]],
+    ) -> None:
+        self.time = time_s
+        self.frame = frame
+        self.ids = ids
+        self.types = types
+        self.lat = lat
+        self.lon = lon
+        self.heading = heading
+        self.detections = detections
+        """(reporter uid, detected uid, distance m, azimuth deg)."""
+        self.zones = zones
+
+    @classmethod
+    def from_state(cls, state: SimulationState, zones: Optional[Iterable[str]] = None) -> "_Frame":
+        ents = list(state.entities.values())
+        n = len(ents)
+        lat, lon, hdg = np.empty(n), np.empty(n), np.empty(n)
+        detections: List[Tuple[str, str, float, float]] = []
+        for i, e in enumerate(ents):
+            p = e.position
+            lat[i], lon[i], hdg[i] = p.latitude, p.longitude, e.attitude.yaw
+            dets = e.report.detections
+            if dets:
+                detections.extend((e.uid, uid, d.distance, d.azimuth) for uid, d in dets.items())
+        return cls(
+            float(state.time), int(state.frame), [e.uid for e in ents], [int(e.type) for e in ents], lat, lon, hdg, detections,
+            set(zones) if zones is not None else None,
+        )
+
+
+class DeltaEncoder:
+    """Keeps the view every connected browser currently shows and turns new frames into deltas against it.
+
+    A delta lists entities that moved past ``move_px`` / ``turn_deg`` (``m``: flat ``[i, x, y, h, ...]``
+    with x/y in 0.1 px and h in whole degrees), entities added (``a``) and removed (``r``), detections
+    gained (``d``) and lost (``dl``), and NFZs switched on (``zon``) or off (``zoff``). Entities are
+    referred to by a small index assigned when they first appear. ``keyframe`` serializes the shown
+    view itself, so a browser that starts from it stays in sync with every later delta.
+    """
+
+    def __init__(self, projection: Projection, layer: Dict[str, Any], config: Optional[LiveViewConfig] = None) -> None:
+        self.projection = projection
+        self.layer = layer
+        self.config = config or LiveViewConfig()
+        self.index: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.types: List[int] = []
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.h = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self.detections: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self.zones: Set[str] = set()
+        self.time = 0.0
+        self.frame = -1
+
+    def _grow(self, n: int) -> None:
+        if n <= self.x.size:
+            return
+        extra = n - self.x.size
+        self.x = np.concatenate([self.x, np.zeros(extra)])
+        self.y = np.concatenate([self.y, np.zeros(extra)])
+        self.h = np.concatenate([self.h, np.zeros(extra)])
+        self.alive = np.concatenate([self.alive, np.zeros(extra, dtype=bool)])
+
+    def delta(self, f: _Frame) -> Optional[Dict[str, Any]]:
+        """Delta from the shown view to ``f``, applied to the shown view; None when nothing visible changed."""
+        cfg = self.config
+        idx = np.empty(len(f.ids), dtype=np.int64)
+        added: List[int] = []
+        for k, uid in enumerate(f.ids):
+            i = self.index.get(uid)
+            if i is None:
+                i = self.index[uid] = len(self.ids)
+                self.ids.append(uid)
+                self.types.append(f.types[k])
+            idx[k] = i
+        self._grow(len(self.ids))
+
+        x, y = self.projection.xy(f.lat, f.lon)
+        present = np.zeros(self.x.size, dtype=bool)
+        present[idx] = True
+        new = ~self.alive[idx]
+        turn = np.abs((f.heading - self.h[idx] + 180.0) % 360.0 - 180.0)
+        moved = ~new & ((np.abs(x - self.x[idx]) >= cfg.move_px) | (np.abs(y - self.y[idx]) >= cfg.move_px) | (turn >= cfg.turn_deg))
+        send = new | moved
+        si = idx[send]
+        self.x[si], self.y[si], self.h[si] = x[send], y[send], f.heading[send]
+        removed = np.flatnonzero(self.alive & ~present)
+        self.alive[removed] = False
+        self.alive[idx] = True
+
+        out: Dict[str, Any] = {"f": f.frame, "t": round(f.time, 3)}
+        if moved.any():
+            mi = idx[moved]
+            out["m"] = np.column_stack(
+                [mi, np.round(self.x[mi] * 10), np.round(self.y[mi] * 10), np.round(self.h[mi]) % 360]
+            ).astype(np.int64).ravel().tolist()
+        if new.any():
+            added = idx[new].tolist()
+            out["a"] = [self._entity(i) for i in added]
+        if removed.size:
+            out["r"] = removed.tolist()
+
+        cur: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        if f.detections:
+            at = {uid: k for k, uid in enumerate(f.ids)}
+            for reporter, target, dist, az in f.detections:
+                k = at.get(reporter)
+                if k is None:
+                    continue
+                kx, ky = self.projection.px_per_m(f.lat[k])
+                rad = math.radians(az)
+                cur[(reporter, target)] = (float(x[k] + dist * math.sin(rad) * kx), float(y[k] - dist * math.cos(rad) * ky))
+        gained = [key for key in cur if key not in self.detections]
+        lost = [key for key in self.detections if key not in cur]
+        if gained:
+            out["d"] = [[self.index[r], t, round(cur[(r, t)][0], 1), round(cur[(r, t)][1], 1)] for r, t in gained]
+        if lost:
+            out["dl"] = [[self.index[r], t] for r, t in lost if r in self.index]
+        for key in lost:
+            del self.detections[key]
+        for key in gained:
+            self.detections[key] = cur[key]
+
+        if f.zones is not None:
+            on, off = sorted(f.zones - self.zones), sorted(self.zones - f.zones)
+            if on:
+                out["zon"] = on
+            if off:
+                out["zoff"] = off
+            self.zones = set(f.zones)
+
+        self.time, self.frame = f.time, f.frame
+        return out if len(out) > 2 else None
+
+    def _entity(self, i: int) -> List[Any]:
+        return [i, self.ids[i], self.types[i], int(round(self.x[i] * 10)), int(round(self.y[i] * 10)), int(round(self.h[i])) % 360]
+
+    def keyframe(self) -> Dict[str, Any]:
+        return {
+            "f": self.frame,
+            "t": round(self.time, 3),
+            "layer": self.layer,
+            "a": [self._entity(i) for i in np.flatnonzero(self.alive).tolist()],
+            "d": [[self.index[r], t, round(px, 1), round(py, 1)] for (r, t), (px, py) in self.detections.items()],
+            "zon": sorted(self.zones),
+        }
+
+
+def _sse(event: str, payload: Dict[str, Any]) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+class _Client:
+    __slots__ = ("queue", "cond", "closed")
+
+    def __init__(self) -> None:
+        self.queue: Deque[bytes] = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+
+
+class LiveViewServer:
+    """Local HTTP server streaming ``SimulationState`` deltas to browsers over Server-Sent Events.
+
+    ``publish(state, active_zones)`` is called from the sim thread at any rate; it copies the few
+    fields the view draws, so the caller may keep mutating its state. A broadcaster thread wakes at
+    ``display_hz``, diffs the newest frame against what the browsers show, JSON-encodes the delta
+    once and fans the bytes out. ``GET /`` is the map page, ``/events`` the stream (a keyframe, then
+    deltas), ``/keyframe`` and ``/stats`` are JSON.
+    """
+
+    def __init__(
+        self,
+        projection: Projection,
+        layer: Dict[str, Any],
+        config: Optional[LiveViewConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+    ) -> None:
+        self.config = config or LiveViewConfig()
+        self.config.validate()
+        self.encoder = DeltaEncoder(projection, layer, self.config)
+        self._pending: Optional[_Frame] = None
+        self._pending_lock = threading.Lock()
+        self._lock = threading.Lock()
+        """Guards the encoder and the client list."""
+        self._clients: List[_Client] = []
+        self._stop = threading.Event()
+        self.published = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.resyncs = 0
+        self.bytes_out = 0
+        self._bytes_lock = threading.Lock()
+        self.encode = LatencyHistogram()
+        self.httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.httpd.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self.httpd.serve_forever, name="live-view-http", daemon=True),
+            threading.Thread(target=self._broadcast_loop, name="live-view-push", daemon=True),
+        ]
+
+    @classmethod
+    def for_scenario(cls, scenario: Scenario, config: Optional[LiveViewConfig] = None, host: str = "127.0.0.1", port: int = 8765) -> "LiveViewServer":
+        config = config or LiveViewConfig()
+        projection, layer = scenario_layer(scenario, config.size_px)
+        return cls(projection, layer, config, host, port)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "LiveViewServer":
+        for t in self._threads:
+            t.start()
+        return self
+
+    def publish(self, state: SimulationState, active_zones: Optional[Iterable[str]] = None) -> None:
+        """``active_zones`` is the full set of active NFZ ids (None leaves zone state unchanged)."""
+        frame = _Frame.from_state(state, active_zones)
+        with self._pending_lock:
+            if self._pending is not None:
+                self.coalesced += 1
+                if frame.zones is None:
+                    # The merged-away frame may carry the only copy of a zone change.
+                    frame.zones = self._pending.zones
+            self._pending = frame
+            self.published += 1
+
+    def tick(self) -> Optional[bytes]:
+        """One broadcast step: encode the newest pending frame and queue it for every client."""
+        with self._pending_lock:
+            frame, self._pending = self._pending, None
+        if frame is None:
+            return None
+        t0 = time.perf_counter()
+        with self._lock:
+            delta = self.encoder.delta(frame)
+            msg = _sse("delta", delta) if delta is not None else None
+            keyframe: Optional[bytes] = None
+            if msg is not None:
+                for c in self._clients:
+                    with c.cond:
+                        if len(c.queue) >= self.config.max_backlog:
+                            if keyframe is None:
+                                keyframe = _sse("key", self.encoder.keyframe())
+                            c.queue.clear()
+                            c.queue.append(keyframe)
+                            self.resyncs += 1
+                        else:
+                            c.queue.append(msg)
+                        c.cond.notify()
+                self.sent += 1
+        self.encode.record(time.perf_counter() - t0)
+        return msg
+
+    def _broadcast_loop(self) -> None:
+        period = 1.0 / self.config.display_hz
+        due = time.monotonic()
+        while not self._stop.wait(max(0.0, due - time.monotonic())):
+            due += period
+            now = time.monotonic()
+            if due < now:  # fell behind: skip the missed ticks instead of bursting
+                due = now + period
+            self.tick()
+
+    def _count_out(self, n: int) -> None:
+        # Called from every client's handler thread.
+        with self._bytes_lock:
+            self.bytes_out += n
+
+    def _connect(self) -> _Client:
+        c = _Client()
+        with self._lock:
+            c.queue.append(_sse("key", self.encoder.keyframe()))
+            self._clients.append(c)
+        return c
+
+    def _disconnect(self, c: _Client) -> None:
+        with self._lock:
+            if c in self._clients:
+                self._clients.remove(c)
+        with c.cond:
+            c.closed = True
+            c.cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        d = self.encode.to_dict()
+        return {
+            "clients": len(self._clients),
+            "published": self.published,
+            "sent": self.sent,
+            "coalesced": self.coalesced,
+            "resyncs": self.resyncs,
+            "bytes_out": self.bytes_out,
+            "encode": {k: d[k] for k in ("count", "mean_ms", "p50_ms", "p99_ms", "max_ms")},
+        }
+
+    def close(self) -> None:
+        self._stop.set()
+        with self._lock:
+            clients = list(self._clients)
+        for c in clients:
+            self._disconnect(c)
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        for t in self._threads:
+            if t.is_alive():
+                t.join()
+
+    def __enter__(self) -> "LiveViewServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _handler_for(live: LiveViewServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - quiet by default
+            pass
+
+        def _send(self, body: bytes, content_type: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            path = self.path.split("?", 1)[0]
+            if path == "/":
+                self._send(_PAGE.replace("__SIZE__", str(live.config.size_px)).encode("utf-8"), "text/html; charset=utf-8")
+            elif path == "/keyframe":
+                with live._lock:
+                    body = json.dumps(live.encoder.keyframe())
+                self._send(body.encode("utf-8"), "application/json")
+            elif path == "/stats":
+                self._send(json.dumps(live.stats()).encode("utf-8"), "application/json")
+            elif path == "/events":
+                self._stream()
+            else:
+                self.send_error(404)
+
+        def _stream(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-store")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            client = live._connect()
+            try:
+                while True:
+                    with client.cond:
+                        if not client.queue and not client.closed:
+                            client.cond.wait(15.0)
+                        if client.closed:
+                            return
+                        batch = list(client.queue)
+                        client.queue.clear()
+                    data = b"".join(batch) if batch else b": ping\n\n"
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                    live._count_out(len(data))
+            except (BrokenPipeError, ConnectionResetError, OSError):
+                pass
+            finally:
+                live._disconnect(client)
+
+    return Handler
+
+
+_PAGE = """<!doctype html>
+<html>
+<head>
+  <meta charset="utf-8" />
+  <title>Red Skies live view</title>
+  <style>
+    body { margin: 0; background: #ffffff; font-family: ui-sans-serif, system-ui; color: #111827; }
+    .wrap { width: __SIZE__px; margin: 0 auto; }
+    svg { width: __SIZE__px; height: __SIZE__px; background: #f8fafc; border: 1px solid #e5e7eb; }
+    .zone { fill: rgba(239,68,68,0.10); stroke: rgba(239,68,68,0.95); stroke-width: 2; }
+    .zone.off { fill: none; stroke: rgba(156,163,175,0.8); stroke-dasharray: 6 4; }
+    .pg { fill: rgba(59,130,246,0.08); stroke: rgba(59,130,246,0.9); stroke-width: 2; }
+    .det { fill: #f59e0b; }
+  </style>
+</head>
+<body>
+  <div class="wrap">
+    <div style="padding: 10px"><b>frame</b> <span id="frame">-</span> <b>t</b> <span id="time">-</span>s
+      <b>entities</b> <span id="count">0</span> <span id="status">connecting</span></div>
+    <svg id="map" viewBox="0 0 __SIZE__ __SIZE__" xmlns="http://www.w3.org/2000/svg">
+      <defs>
+        <pattern id="grid" width="50" height="50" patternUnits="userSpaceOnUse">
+          <path d="M 50 0 L 0 0 0 50" fill="none" stroke="#e5e7eb" stroke-width="1" />
+        </pattern>
+      </defs>
+      <rect width="100%" height="100%" fill="url(#grid)" />
+      <g id="static"></g><g id="dets"></g><g id="ents"></g>
+    </svg>
+  </div>
+<script>
+const NS = "http://www.w3.org/2000/svg";
+const COLORS = {1: "#111827", 2: "#2563eb", 3: "#059669"};
+let ents = new Map(), dets = new Map(), zones = new Map();
+const $ = (id) => document.getElementById(id);
+function el(tag, attrs) { const e = document.createElementNS(NS, tag); for (const k in attrs) e.setAttribute(k, attrs[k]); return e; }
+function shape(z, cls) {
+  if (z.poly) { const p = []; for (let i = 0; i < z.poly.length; i += 2) p.push(z.poly[i] + "," + z.poly[i + 1]); return el("polygon", {points: p.join(" "), class: cls}); }
+  const [cx, cy, rx, ry] = z.ellipse; return el("ellipse", {cx, cy, rx, ry, class: cls});
+}
+function place(g, x, y, h) { g.setAttribute("transform", `translate(${x / 10} ${y / 10}) rotate(${h})`); }
+function add(a) {
+  const [i, uid, type, x, y, h] = a; let g = ents.get(i);
+  if (!g) { g = el("g", {}); const t = el("title", {}); t.textContent = uid; g.appendChild(t);
+    g.appendChild(el("path", {d: "M0,-9 L6,7 L0,3 L-6,7 Z", fill: COLORS[type] || "#6b7280"})); ents.set(i, g); }
+  $("ents").appendChild(g); place(g, x, y, h);
+}
+function det(d) { const [i, uid, x, y] = d; const k = i + "/" + uid; if (dets.has(k)) return;
+  const c = el("circle", {cx: x, cy: y, r: 4, class: "det"}); dets.set(k, c); $("dets").appendChild(c); }
+function zoneState(ids, on) { for (const id of ids) { const z = zones.get(id); if (z) z.classList.toggle("off", !on); } }
+function header(m) { $("frame").textContent = m.f; $("time").textContent = m.t.toFixed(1); $("count").textContent = $("ents").childNodes.length; }
+function key(m) {
+  const s = $("static"); s.replaceChildren(); zones.clear(); ents.clear(); dets.clear(); $("ents").replaceChildren(); $("dets").replaceChildren();
+  s.appendChild(shape(m.layer.playground, "pg"));
+  for (const z of m.layer.zones) { const e = shape(z, "zone off"); zones.set(z.id, e); s.appendChild(e); }
+  zoneState(m.zon, true); m.a.forEach(add); m.d.forEach(det); header(m);
+}
+function delta(m) {
+  const mv = m.m || [];
+  for (let k = 0; k < mv.length; k += 4) { const g = ents.get(mv[k]); if (g) place(g, mv[k + 1], mv[k + 2], mv[k + 3]); }
+  (m.a || []).forEach(add);
+  for (const i of m.r || []) { const g = ents.get(i); if (g) g.remove(); }
+  (m.d || []).forEach(det);
+  for (const [i, uid] of m.dl || []) { const k = i + "/" + uid; const c = dets.get(k); if (c) { c.remove(); dets.delete(k); } }
+  zoneState(m.zon || [], true); zoneState(m.zoff || [], false); header(m);
+}
+const src = new EventSource("/events");
+src.addEventListener("key", (e) => { key(JSON.parse(e.data)); $("status").textContent = ""; });
+src.addEventListener("delta", (e) => delta(JSON.parse(e.data)));
+src.onerror = () => { $("status").textContent = "reconnecting"; };
+</script>
+</body>
+</html>
+"""
+
+
+# ---------------------------------------------------------------------------
+# Demo / replay / benchmark
+# ---------------------------------------------------------------------------
+
+
+def _demo_fleet(scenario: Scenario, n: int, seed: int = 0) -> Any:
+    from kinematic_sim import KinematicSimulator
+
+    proj, layer = scenario_layer(scenario)
+    pg = layer["playground"]["ellipse"]
+    rng = np.random.default_rng(seed)
+    # Uniform in the playground ellipse, converted back from pixels.
+    r, a = np.sqrt(rng.random(n)) * 0.8, rng.uniform(0, 2 * np.pi, n)
+    px, py = pg[0] + r * pg[2] * np.cos(a), pg[1] + r * pg[3] * np.sin(a)
+    lon = proj.min_lon + px / proj._sx
+    lat = proj.max_lat - py / proj._sy
+    sim = KinematicSimulator(dt=1.0 / 20.0)
+    sim.load_fleet(
+        {"id": f"aircraft-{i + 1}", "lat": float(lat[i]), "lon": float(lon[i]), "alt": 1500.0, "heading": float(rng.uniform(0, 360)), "speed": 90.0}
+        for i in range(n)
+    )
+    return sim
+
+
+def run_demo(server: LiveViewServer, scenario: Scenario, n: int, step_hz: float, duration_s: float, seed: int = 0) -> None:
+    """Kinematic fleet wandering over the scenario at ``step_hz`` with the NFZ schedule applied."""
+    from dynamic_zones import DynamicZoneSchedule
+
+    sim = _demo_fleet(scenario, n, seed)
+    schedule = DynamicZoneSchedule.from_objects([o for o in scenario.objects if o.behavior == "no_fly_zone"], seed=seed)
+    cursor = schedule.cursor(0.0)
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / step_hz
+    t, due = 0.0, time.monotonic()
+    while duration_s <= 0 or t < duration_s:
+        sim.set_heading_changes(rng.normal(0.0, 5.0, n))
+        sim.step(dt)
+        t += dt
+        cursor.advance(t)
+        server.publish(sim.world_state(), cursor.active)
+        due += dt
+        time.sleep(max(0.0, due - time.monotonic()))
+
+
+def run_replay(server: LiveViewServer, scenario: Scenario, path: Path, speed: float = 1.0, seed: int = 0) -> None:
+    """Streams a recording at ``speed`` x real time with the scenario's NFZ schedule at each frame's time."""
+    from dynamic_zones import DynamicZoneSchedule
+    from replay import open_recording
+
+    schedule = DynamicZoneSchedule.from_objects([o for o in scenario.objects if o.behavior == "no_fly_zone"], seed=seed)
+    reader = open_recording(path)
+    wall0, t0 = time.monotonic(), None
+    cursor = None
+    for state in reader.window():
+        t0 = state.time if t0 is None else t0
+        wait = (state.time - t0) / speed - (time.monotonic() - wall0)
+        if wait > 0:
+            time.sleep(wait)
+        if cursor is None or state.time < cursor.time:
+            cursor = schedule.cursor(state.time)
+        else:
+            cursor.advance(state.time)
+        server.publish(state, cursor.active)
+    reader.close()
+
+
+def benchmark(scenario: Scenario, aircraft: Sequence[int] = (100, 300, 1000), frames: int = 200) -> Dict[str, Any]:
+    """Per-frame cost of publish + delta + JSON at 20 Hz sim steps, against re-sending the full state."""
+    from dynamic_zones import DynamicZoneSchedule
+
+    out: Dict[str, Any] = {}
+    schedule = DynamicZoneSchedule.from_objects([o for o in scenario.objects if o.behavior == "no_fly_zone"])
+    for n in aircraft:
+        sim = _demo_fleet(scenario, n)
+        proj, layer = scenario_layer(scenario)
+        enc = DeltaEncoder(proj, layer)
+        rng = np.random.default_rng(0)
+        publish = LatencyHistogram()
+        encode = LatencyHistogram()
+        delta_bytes = full_bytes = 0
+        for k in range(frames):
+            sim.set_heading_changes(rng.normal(0.0, 5.0, n))
+            sim.step(0.05)
+            state = sim.world_state()
+            t0 = time.perf_counter()
+            f = _Frame.from_state(state, schedule.active_ids(k * 0.05))
+            t1 = time.perf_counter()
+            d = enc.delta(f)
+            msg = _sse("delta", d) if d is not None else b""
+            t2 = time.perf_counter()
+            publish.record(t1 - t0)
+            encode.record(t2 - t1)
+            if k:
+                delta_bytes += len(msg)
+                full_bytes += len(_sse("key", enc.keyframe()))
+        budget_ms = 1e3 / 20.0
+        cost_ms = (publish.total_s + encode.total_s) / frames * 1e3
+        out[str(n)] = {
+            "publish_ms": publish.total_s / frames * 1e3,
+            "delta_encode_ms": encode.total_s / frames * 1e3,
+            "core_share_at_20hz": cost_ms / budget_ms,
+            "delta_kb_per_frame": delta_bytes / max(1, frames - 1) / 1024,
+            "keyframe_kb_per_frame": full_bytes / max(1, frames - 1) / 1024,
+        }
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("experiment", help="config-v2 instance/experiment-*.yaml (map layer and NFZ schedule)")
+    ap.add_argument("--replay", default=None, help="Stream a recording (telemetry.jsonl, frame log or chunked telemetry)")
+    ap.add_argument("--speed", type=float, default=1.0, help="Replay speed factor")
+    ap.add_argument("--demo", type=int, default=0, metavar="AIRCRAFT", help="Stream a kinematic demo fleet of this size")
+    ap.add_argument("--step-hz", type=float, default=20.0)
+    ap.add_argument("--duration", type=float, default=0.0, help="Demo length in sim seconds (0 = until interrupted)")
+    ap.add_argument("--display-hz", type=float, default=LiveViewConfig.display_hz)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--bench", action="store_true")
+    args = ap.parse_args()
+
+    scenario = load_experiment(Path(args.experiment)).scenario
+    if args.bench:
+        print(json.dumps(benchmark(scenario), indent=2))
+        return
+    if not args.replay and not args.demo:
+        ap.error("--replay, --demo or --bench is required")
+
+    with LiveViewServer.for_scenario(scenario, LiveViewConfig(display_hz=args.display_hz), args.host, args.port) as server:
+        print(f"live view: {server.url}", flush=True)
+        try:
+            if args.replay:
+                run_replay(server, scenario, Path(args.replay), args.speed)
+            else:
+                run_demo(server, scenario, args.demo, args.step_hz, args.duration)
+        except KeyboardInterrupt:
+            pass
+        print(json.dumps(server.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
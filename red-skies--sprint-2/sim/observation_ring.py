@@ -0,0 +1,451 @@
+import argparse
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from action_mailbox import READ_TIMEOUT_S, attach_untracked
+from schema import (
+    Attitude,
+    BodyVelocity,
+    Detection,
+    DetectionReport,
+    EntityState,
+    EntityType,
+    LocalVelocity,
+    Position,
+    SimulationState,
+)
+from state_codec import UID_BYTES, decode_state, encode_state
+
+
+RING_MAGIC = b"RSOBSRNG"
+
+# Fixed-layout frame: header, then an entity table of ``max_entities`` rows, then a detection
+# table of ``max_detections`` rows. Entity rows point into the detection table, so every table
+# is a plain numpy view over shared memory.
+FRAME_HEADER_DTYPE = np.dtype([("time", "<f8"), ("frame", "<i8"), ("n_entities", "<u4"), ("n_detections", "<u4")])
+ENTITY_DTYPE = np.dtype(
+    [
+        ("uid", f"S{UID_BYTES}"),
+        ("type", "u1"),
+        ("position", "<f8", 3),
+        ("attitude", "<f8", 3),
+        ("body_velocity", "<f8", 3),
+        ("local_velocity", "<f8", 3),
+        ("speed", "<f8"),
+        ("first_detection", "<u4"),
+        ("n_detections", "<u2"),
+    ]
+)
+DETECTION_DTYPE = np.dtype([("uid", f"S{UID_BYTES}"), ("distance", "<f8"), ("azimuth", "<f8")])
+
+_RING_HEADER = struct.Struct("<8sIIIQ")  # magic, slots, max_entities, max_detections, slot_bytes
+_RING_HEADER_BYTES = 64
+_SLOT_META_BYTES = 16  # seq u64 | publish count u64
+
+
+def _uid_column(uids: List[str]) -> List[bytes]:
+    """UTF-8 UIDs for an ``S{UID_BYTES}`` column, which would otherwise truncate long ones silently."""
+    raw = [u.encode("utf-8") for u in uids]
+    for u, r in zip(uids, raw):
+        if len(r) > UID_BYTES:
+            raise ValueError(f"uid longer than {UID_BYTES} bytes: {u!r}")
+    return raw
+
+
+def _align64(n: int) -> int:
+    return (n + 63) // 64 * 64
+
+
+def _frame_bytes(max_entities: int, max_detections: int) -> int:
+    return FRAME_HEADER_DTYPE.itemsize + max_entities * ENTITY_DTYPE.itemsize + max_detections * DETECTION_DTYPE.itemsize
+
+
+@dataclass
+class RingFrame:
+    """One frame read from the ring; arrays are copies unless obtained through ``latest_view``."""
+
+    time: float
+    frame: int
+    entities: np.ndarray
+    detections: np.ndarray
+    count: int
+    """Publish counter of this frame (1-based, monotonically increasing)."""
+
+    def to_state(self) -> SimulationState:
+        e, d = self.entities, self.detections
+        # Bulk-convert columns to Python values once; per-element numpy scalar access is far slower.
+        d_uid = [u.decode("utf-8") for u in d["uid"].tolist()]
+        d_dist = d["distance"].tolist()
+        d_az = d["azimuth"].tolist()
+        ents: Dict[str, EntityState] = {}
+        for uid_b, typ, p, a, b, v, speed, first, n in zip(
+            e["uid"].tolist(),
+            e["type"].tolist(),
+            e["position"].tolist(),
+            e["attitude"].tolist(),
+            e["body_velocity"].tolist(),
+            e["local_velocity"].tolist(),
+            e["speed"].tolist(),
+            e["first_detection"].tolist(),
+            e["n_detections"].tolist(),
+        ):
+            uid = uid_b.decode("utf-8")
+            report = {d_uid[j]: Detection(d_uid[j], d_dist[j], d_az[j]) for j in range(first, first + n)}
+            ents[uid] = EntityState(
+                uid=uid,
+                type=EntityType(typ),
+                position=Position(*p),
+                attitude=Attitude(*a),
+                body_velocity=BodyVelocity(*b),
+                local_velocity=LocalVelocity(*v),
+                speed=speed,
+                report=DetectionReport(detections=report),
+            )
+        return SimulationState(time=self.time, frame=self.frame, entities=ents)
+
+
+class ObservationRing:
+    """Same-host ring of fixed-layout ``SimulationState`` frames in shared memory.
+
+    One writer (the sim adapter) publishes into slot ``count % slots`` behind a per-slot
+    seqlock; any number of readers (agents) read the latest frame, or a recent one, without
+    serialization. A reader that falls more than ``slots`` frames behind sees ``None`` for
+    the overwritten frames rather than torn data.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._owner = owner
+        magic, slots, max_e, max_d, slot_bytes = _RING_HEADER.unpack_from(shm.buf, 0)
+        if magic != RING_MAGIC:
+            raise ValueError(f"not an observation ring: {shm.name}")
+        self.slots, self.max_entities, self.max_detections = slots, max_e, max_d
+        self._slot_bytes = slot_bytes
+        self._count = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=_RING_HEADER_BYTES - 8)
+        self._meta: List[np.ndarray] = []
+        self._hdr: List[np.ndarray] = []
+        self._ents: List[np.ndarray] = []
+        self._dets: List[np.ndarray] = []
+        for s in range(slots):
+            base = _RING_HEADER_BYTES + s * slot_bytes
+            self._meta.append(np.ndarray((2,), dtype=np.uint64, buffer=shm.buf, offset=base))
+            off = base + _SLOT_META_BYTES
+            self._hdr.append(np.ndarray((), dtype=FRAME_HEADER_DTYPE, buffer=shm.buf, offset=off))
+            off += FRAME_HEADER_DTYPE.itemsize
+            self._ents.append(np.ndarray((max_e,), dtype=ENTITY_DTYPE, buffer=shm.buf, offset=off))
+            off += max_e * ENTITY_DTYPE.itemsize
+            self._dets.append(np.ndarray((max_d,), dtype=DETECTION_DTYPE, buffer=shm.buf, offset=off))
+        self.read_retries = 0
+        self.read_timeouts = 0
+        self.read_timeout_s = READ_TIMEOUT_S
+        # Last frame this reader copied, served while a slot stays torn past ``read_timeout_s``.
+        self._last: Optional[RingFrame] = None
+        # Slots that timed out, and the seq they were stuck at; skipped without spinning until seq moves.
+        self._stuck: Dict[int, int] = {}
+
+    @classmethod
+    def create(
+        cls,
+        max_entities: int,
+        max_detections: int = 0,
+        slots: int = 8,
+        name: Optional[str] = None,
+    ) -> "ObservationRing":
+        if slots < 2:
+            raise ValueError("slots must be >= 2")
+        slot_bytes = _align64(_SLOT_META_BYTES + _frame_bytes(max_entities, max_detections))
+        size = _RING_HEADER_BYTES + slots * slot_bytes
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        _RING_HEADER.pack_into(shm.buf, 0, RING_MAGIC, slots, max_entities, max_detections, slot_bytes)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "ObservationRing":
+        return cls(attach_untracked(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def count(self) -> int:
+        """Number of frames published so far."""
+        return int(self._count[0])
+
+    def publish(self, state: SimulationState) -> int:
+        entities = list(state.entities.values())
+        n = len(entities)
+        if n > self.max_entities:
+            raise ValueError(f"{n} entities exceed ring capacity {self.max_entities}")
+        # Column-wise packing: one float matrix and a few flat lists instead of per-row tuples.
+        ents = np.zeros(n, dtype=ENTITY_DTYPE)
+        values = np.array(
+            [
+                (
+                    e.position.latitude,
+                    e.position.longitude,
+                    e.position.altitude,
+                    e.attitude.roll,
+                    e.attitude.pitch,
+                    e.attitude.yaw,
+                    e.body_velocity.forward,
+                    e.body_velocity.right,
+                    e.body_velocity.down,
+                    e.local_velocity.north,
+                    e.local_velocity.east,
+                    e.local_velocity.down,
+                    e.speed,
+                )
+                for e in entities
+            ],
+            dtype=np.float64,
+        ).reshape(n, 13)
+        ents["uid"] = _uid_column([e.uid for e in entities])
+        ents["type"] = [int(e.type) for e in entities]
+        ents["position"] = values[:, 0:3]
+        ents["attitude"] = values[:, 3:6]
+        ents["body_velocity"] = values[:, 6:9]
+        ents["local_velocity"] = values[:, 9:12]
+        ents["speed"] = values[:, 12]
+        counts = [len(e.report.detections) for e in entities]
+        ents["n_detections"] = counts
+        ents["first_detection"] = np.cumsum([0] + counts[:-1]) if n else []
+
+        total = sum(counts)
+        if total > self.max_detections:
+            raise ValueError(f"{total} detections exceed ring capacity {self.max_detections}")
+        dets = np.zeros(total, dtype=DETECTION_DTYPE)
+        if total:
+            flat = [d for e in entities for d in e.report.detections.values()]
+            dets["uid"] = _uid_column([d.uid for d in flat])
+            dets["distance"] = [d.distance for d in flat]
+            dets["azimuth"] = [d.azimuth for d in flat]
+        return self.publish_arrays(state.time, state.frame, ents, dets)
+
+    def publish_arrays(self, time_s: float, frame: int, entities: np.ndarray, detections: np.ndarray) -> int:
+        """Publishes pre-packed ``ENTITY_DTYPE`` / ``DETECTION_DTYPE`` rows; returns the publish count."""
+        count = self.count + 1
+        s = (count - 1) % self.slots
+        meta = self._meta[s]
+        seq = int(meta[0])
+        meta[0] = seq + 1  # odd: write in progress
+        self._hdr[s][()] = (time_s, frame, entities.shape[0], detections.shape[0])
+        self._ents[s][: entities.shape[0]] = entities
+        self._dets[s][: detections.shape[0]] = detections
+        meta[1] = count
+        meta[0] = seq + 2
+        self._count[0] = count
+        return count
+
+    def _fallback(self, count: int, latest: bool) -> Optional[RingFrame]:
+        last = self._last
+        return last if last is not None and (latest or last.count == count) else None
+
+    def _read(self, count: int, copy: bool, latest: bool = False) -> Optional[RingFrame]:
+        """Consistent read of frame ``count``; the last good copy (or None) if the writer died mid-write.
+
+        ``latest`` callers accept the last frame read instead of ``count`` itself.
+        """
+        s = (count - 1) % self.slots
+        meta = self._meta[s]
+        if s in self._stuck:
+            if int(meta[0]) == self._stuck[s]:
+                return self._fallback(count, latest)
+            del self._stuck[s]
+        deadline: Optional[float] = None
+        while True:
+            s1 = int(meta[0])
+            if not s1 & 1:
+                if int(meta[1]) != count:
+                    return None  # overwritten by a newer lap (or not yet written)
+                hdr = self._hdr[s]
+                t, fr, n, nd = float(hdr["time"]), int(hdr["frame"]), int(hdr["n_entities"]), int(hdr["n_detections"])
+                ents = self._ents[s][:n]
+                dets = self._dets[s][:nd]
+                if copy:
+                    ents = ents.copy()
+                    dets = dets.copy()
+                if int(meta[0]) == s1:
+                    frame = RingFrame(t, fr, ents, dets, count)
+                    if copy:
+                        self._last = frame
+                    return frame
+            self.read_retries += 1
+            if deadline is None:
+                deadline = time.monotonic() + self.read_timeout_s
+            elif time.monotonic() > deadline:
+                # The writer died or stalled mid-write; later reads skip the slot until its seq moves.
+                self.read_timeouts += 1
+                self._stuck[s] = int(meta[0])
+                return self._fallback(count, latest)
+            time.sleep(0)  # let a preempted writer finish
+
+    def read(self, count: int) -> Optional[RingFrame]:
+        """Copies frame number ``count`` if it is still in the ring."""
+        if count < 1 or count > self.count:
+            return None
+        return self._read(count, copy=True)
+
+    def latest(self) -> Optional[RingFrame]:
+        count = self.count
+        return self._read(count, copy=True, latest=True) if count else None
+
+    def latest_view(self) -> Optional[RingFrame]:
+        """Zero-copy views of the latest frame; confirm with ``still_valid`` after using them."""
+        count = self.count
+        return self._read(count, copy=False, latest=True) if count else None
+
+    def still_valid(self, frame: RingFrame) -> bool:
+        meta = self._meta[(frame.count - 1) % self.slots]
+        return int(meta[1]) == frame.count and not int(meta[0]) & 1
+
+    def wait_next(self, after: int, timeout_s: float = 1.0, spin: int = 200) -> Optional[RingFrame]:
+        """Waits for a frame newer than publish count ``after``: spin briefly, then back off."""
+        deadline = time.monotonic() + timeout_s
+        delay = 0.0
+        i = 0
+        while self.count <= after:
+            i += 1
+            if i > spin:
+                if time.monotonic() > deadline:
+                    return None
+                delay = min(max(delay * 2, 20e-6), 1e-3)
+                time.sleep(delay)
+        return self.latest()
+
+    def close(self) -> None:
+        self._meta = self._hdr = self._ents = self._dets = []
+        self._count = None  # type: ignore[assignment]
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def __enter__(self) -> "ObservationRing":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_LEN = struct.Struct("<I")
+
+
+def _recv_exact(sock: socket.socket, n: int, buf: bytearray) -> memoryview:
+    view = memoryview(buf)[:n]
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if not k:
+            raise ConnectionError("socket closed")
+        got += k
+    return view
+
+
+class SocketObservationChannel:
+    """Fallback transport: length-prefixed ``state_codec`` frames over a stream socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self._buf = bytearray(1 << 16)
+
+    def send(self, state: SimulationState) -> None:
+        payload = encode_state(state)
+        self.sock.sendall(_LEN.pack(len(payload)) + payload)
+
+    def recv(self) -> SimulationState:
+        (n,) = _LEN.unpack(_recv_exact(self.sock, _LEN.size, self._buf))
+        if n > len(self._buf):
+            self._buf = bytearray(n)
+        return decode_state(bytes(_recv_exact(self.sock, n, self._buf)))
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def _bench_state(n_entities: int, detections_per_entity: int) -> SimulationState:
+    ents: Dict[str, EntityState] = {}
+    for i in range(n_entities):
+        uid = f"aircraft-{i + 1}"
+        dets = {
+            f"aircraft-{j + 1}": Detection(f"aircraft-{j + 1}", 1000.0 + j, 45.0)
+            for j in range(detections_per_entity)
+        }
+        ents[uid] = EntityState(
+            uid=uid,
+            type=EntityType.AIRCRAFT,
+            position=Position(30.0 + i * 1e-3, -40.0, 1500.0),
+            speed=90.0,
+            report=DetectionReport(detections=dets),
+        )
+    return SimulationState(time=0.0, frame=0, entities=ents)
+
+
+def _rate(fn: Callable[[], None], frames: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        fn()
+    return frames / (time.perf_counter() - t0)
+
+
+def benchmark(n_entities: int = 100, detections_per_entity: int = 2, frames: int = 2000) -> Dict[str, float]:
+    """Frames/s for one publish + one consume on each path (same process, so this is per-frame cost)."""
+    state = _bench_state(n_entities, detections_per_entity)
+    out: Dict[str, float] = {}
+
+    with ObservationRing.create(n_entities, n_entities * detections_per_entity, slots=8) as ring:
+        reader = ObservationRing.attach(ring.name)
+        ring.publish(state)
+        packed = ring.latest()
+        assert packed is not None
+        ents, dets = packed.entities, packed.detections
+
+        def shm_arrays() -> None:
+            ring.publish_arrays(0.0, 0, ents, dets)
+            f = reader.latest_view()
+            assert f is not None and reader.still_valid(f)
+
+        def shm_state() -> None:
+            ring.publish(state)
+            f = reader.latest()
+            assert f is not None
+            f.to_state()
+
+        out["shm_prepacked_zero_copy_fps"] = _rate(shm_arrays, frames)
+        out["shm_state_roundtrip_fps"] = _rate(shm_state, frames)
+        reader.close()
+
+    a, b = socket.socketpair()
+    a.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 22)
+    b.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+    tx, rx = SocketObservationChannel(a), SocketObservationChannel(b)
+
+    def sock_state() -> None:
+        tx.send(state)
+        rx.recv()
+
+    out["socket_state_roundtrip_fps"] = _rate(sock_state, frames)
+    tx.close()
+    rx.close()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entities", type=int, default=100)
+    ap.add_argument("--detections", type=int, default=2, help="Detections per entity")
+    ap.add_argument("--frames", type=int, default=2000)
+    args = ap.parse_args()
+
+    for k, v in benchmark(args.entities, args.detections, args.frames).items():
+        print(f"{k:<32} {v:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
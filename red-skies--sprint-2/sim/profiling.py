@@ -0,0 +1,431 @@
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+from stepping_harness import LatencyHistogram
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass(frozen=True)
+class ProfilingConfig:
+    """``runtime.profiling`` of an experiment; everything is off unless ``enabled``."""
+
+    enabled: bool = False
+    ring_size: int = 4096
+    """Per-tick rows kept in memory (``Profiler.recent``)."""
+    budget_s: float = 0.05
+    """Tick budget; defaults to ``1 / runtime.step_hz``."""
+    export: Tuple[str, ...] = ("prometheus", "jsonl")
+    prometheus_path: Optional[str] = None
+    jsonl_path: Optional[str] = None
+    jsonl_every: int = 20
+    """Write every Nth tick to the JSONL export (1 = all of them)."""
+    flush_every: int = 1000
+    """Ticks between exports."""
+
+    @classmethod
+    def from_runtime(cls, runtime: Dict[str, Any], default_dir: Path) -> "ProfilingConfig":
+        """Reads ``runtime.profiling``; relative export paths resolve against ``default_dir``."""
+        block = runtime.get("profiling") or {}
+        if not isinstance(block, dict):
+            raise ValueError("runtime.profiling must be a mapping")
+        step_hz = float(runtime.get("step_hz") or 20)
+        export = block.get("export", cls.export)
+        export = (export,) if isinstance(export, str) else tuple(export)
+        unknown = sorted(set(export) - {"prometheus", "jsonl"})
+        if unknown:
+            raise ValueError(f"runtime.profiling.export: unknown exporter(s) {unknown}; expected prometheus, jsonl")
+
+        def path_of(key: str, default: str) -> str:
+            return str(Path(default_dir) / str(block.get(key, default)))
+
+        cfg = cls(
+            enabled=bool(block.get("enabled", False)),
+            ring_size=int(block.get("ring_size", cls.ring_size)),
+            budget_s=float(block["budget_ms"]) / 1e3 if "budget_ms" in block else 1.0 / step_hz,
+            export=export,
+            prometheus_path=path_of("prometheus_file", "metrics.prom") if "prometheus" in export else None,
+            jsonl_path=path_of("jsonl_file", "profile.jsonl") if "jsonl" in export else None,
+            jsonl_every=int(block.get("jsonl_every", cls.jsonl_every)),
+            flush_every=int(block.get("flush_every", cls.flush_every)),
+        )
+        if cfg.ring_size < 1 or cfg.jsonl_every < 1 or cfg.flush_every < 1:
+            raise ValueError("runtime.profiling: ring_size, jsonl_every and flush_every must be >= 1")
+        return cfg
+
+    @classmethod
+    def from_experiment(cls, experiment: Any) -> "ProfilingConfig":
+        """Exports go next to ``outputs.telemetry`` (else ``runtime.logging.artifacts_path``, else ``./artifacts``)."""
+        runtime = experiment.runtime
+        telemetry = (experiment.outputs or {}).get("telemetry")
+        if telemetry:
+            default_dir = Path(telemetry).parent
+        else:
+            default_dir = Path(((runtime.get("logging") or {}).get("artifacts_path")) or "./artifacts")
+        return cls.from_runtime(runtime, default_dir)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class NullProfiler:
+    """Disabled profiler: every call is a constant-time no-op, so hooks can stay in the hot loop."""
+
+    enabled = False
+
+    def span(self, name: str) -> _NullSpan:
+        return _NULL_SPAN
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        return lambda fn: fn
+
+    def record(self, name: str, seconds: float) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def begin_tick(self) -> None:
+        pass
+
+    def end_tick(self, sim_time: Optional[float] = None) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Span:
+    """Reusable timer for one span name; not re-entrant for the same name (distinct names nest fine)."""
+
+    __slots__ = ("prof", "col", "t0")
+
+    def __init__(self, prof: "Profiler", col: int) -> None:
+        self.prof = prof
+        self.col = col
+        self.t0 = 0.0
+
+    def __enter__(self) -> None:
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.prof._add(self.col, time.perf_counter() - self.t0)
+
+
+class Profiler:
+    """Named spans and counters with a ring buffer of per-tick span times.
+
+    Every span feeds a ``LatencyHistogram`` (whole run) and the current tick's row; ``end_tick`` moves
+    the row into the ring, checks it against the budget and, every ``flush_every`` ticks, exports.
+    Spans recorded outside ``begin_tick``/``end_tick`` (config load, result writes) only reach the
+    histograms.
+    """
+
+    enabled = True
+
+    def __init__(self, config: ProfilingConfig, labels: Optional[Dict[str, str]] = None) -> None:
+        self.config = config
+        self.labels = dict(labels or {})
+        self.names: List[str] = []
+        self.hist: List[LatencyHistogram] = []
+        self._spans: Dict[str, _Span] = {}
+        self.counters: Dict[str, int] = {}
+        self.tick_hist = LatencyHistogram()
+        self.ticks = 0
+        self.budget_misses = 0
+
+        self._ring_ticks = 0
+        self._row: List[float] = []
+        self._in_tick = False
+        self._t_tick = 0.0
+        self._ring = np.zeros((config.ring_size, 0))
+        self._ring_meta = np.zeros((config.ring_size, 3))  # tick, sim time, tick seconds
+        self._exported = 0
+        self._jsonl = None
+
+    # -- recording ------------------------------------------------------------
+
+    def _col(self, name: str) -> int:
+        span = self._spans.get(name)
+        if span is not None:
+            return span.col
+        col = len(self.names)
+        self.names.append(name)
+        self.hist.append(LatencyHistogram())
+        self._row.append(0.0)
+        self._ring = np.pad(self._ring, ((0, 0), (0, 1)))
+        self._spans[name] = _Span(self, col)
+        return col
+
+    def _add(self, col: int, seconds: float) -> None:
+        self.hist[col].record(seconds)
+        if self._in_tick:
+            self._row[col] += seconds
+
+    def span(self, name: str) -> _Span:
+        span = self._spans.get(name)
+        if span is None:
+            span = self._spans[self.names[self._col(name)]]
+        return span
+
+    def timed(self, name: str) -> Callable[[F], F]:
+        """Decorator form of ``span``."""
+        span = self.span(name)
+
+        def wrap(fn: F) -> F:
+            def inner(*args: Any, **kwargs: Any) -> Any:
+                with span:
+                    return fn(*args, **kwargs)
+
+            inner.__name__ = getattr(fn, "__name__", "timed")
+            inner.__doc__ = fn.__doc__
+            return inner  # type: ignore[return-value]
+
+        return wrap
+
+    def record(self, name: str, seconds: float) -> None:
+        """Adds an externally measured duration, e.g. config load timed before the profiler existed."""
+        self._add(self._col(name), float(seconds))
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def begin_tick(self) -> None:
+        self._in_tick = True
+        self._t_tick = time.perf_counter()
+
+    def end_tick(self, sim_time: Optional[float] = None) -> None:
+        elapsed = time.perf_counter() - self._t_tick
+        self._in_tick = False
+        self.tick_hist.record(elapsed)
+        if elapsed > self.config.budget_s:
+            self.budget_misses += 1
+        slot = self._ring_ticks % self.config.ring_size
+        self._ring[slot] = self._row
+        self._ring_meta[slot] = (self.ticks, np.nan if sim_time is None else sim_time, elapsed)
+        self._row = [0.0] * len(self.names)
+        self.ticks += 1
+        self._ring_ticks += 1
+        # Never let the ring wrap over rows that were not exported yet.
+        if self._ring_ticks - self._exported >= min(self.config.flush_every, self.config.ring_size):
+            self.flush()
+
+    # -- reading ----------------------------------------------------------------
+
+    def recent(self, n: Optional[int] = None) -> Dict[str, Any]:
+        """The last ``n`` ticks still in the ring (oldest first): ``tick``, ``sim_time``, ``tick_s`` and one array per span."""
+        kept = min(self._ring_ticks, self.config.ring_size)
+        n = kept if n is None else min(n, kept)
+        rows = np.arange(self._ring_ticks - n, self._ring_ticks) % self.config.ring_size
+        meta = self._ring_meta[rows]
+        out: Dict[str, Any] = {"tick": meta[:, 0].astype(np.int64), "sim_time": meta[:, 1], "tick_s": meta[:, 2]}
+        out["spans"] = {name: self._ring[rows, j] for j, name in enumerate(self.names)}
+        return out
+
+    def summary(self) -> Dict[str, Any]:
+        """Run totals in milliseconds; ``budget_share`` is each span's mean over the tick budget."""
+        budget_ms = self.config.budget_s * 1e3
+        spans = {}
+        for name, h in zip(self.names, self.hist):
+            d = h.to_dict()
+            spans[name] = {k: d[k] for k in ("count", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")}
+            spans[name]["total_ms"] = h.total_s * 1e3
+            spans[name]["budget_share"] = d["mean_ms"] / budget_ms if budget_ms else None
+        tick = self.tick_hist.to_dict()
+        return {
+            "ticks": self.ticks,
+            "budget_ms": budget_ms,
+            "budget_misses": self.budget_misses,
+            "tick": {k: tick[k] for k in ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")},
+            "spans": spans,
+            "counters": dict(self.counters),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Picklable histograms and counters, for ``merge`` in another process."""
+        return {
+            "spans": {name: h for name, h in zip(self.names, self.hist) if h.count},
+            "tick": self.tick_hist,
+            "ticks": self.ticks,
+            "budget_misses": self.budget_misses,
+            "counters": dict(self.counters),
+        }
+
+    def drain(self) -> Dict[str, Any]:
+        """``snapshot`` and reset histograms, counters and the tick count; ring and exporters carry on.
+
+        Workers drain once per episode and ship the result to the parent, which ``merge``s it.
+        """
+        snap = self.snapshot()
+        self.hist = [LatencyHistogram() for _ in self.names]
+        self.tick_hist = LatencyHistogram()
+        self.counters = {}
+        self.ticks = 0
+        self.budget_misses = 0
+        return snap
+
+    def merge(self, snap: Dict[str, Any]) -> None:
+        for name, h in snap["spans"].items():
+            self.hist[self._col(name)].merge(h)
+        self.tick_hist.merge(snap["tick"])
+        self.ticks += snap["ticks"]
+        self.budget_misses += snap["budget_misses"]
+        for name, n in snap["counters"].items():
+            self.count(name, n)
+
+    # -- export -------------------------------------------------------------------
+
+    def flush(self) -> None:
+        """Appends the ticks recorded since the last flush to the JSONL export and rewrites the Prometheus file."""
+        cfg = self.config
+        if cfg.jsonl_path:
+            new = self._ring_ticks - self._exported
+            if new > 0:
+                if self._jsonl is None:
+                    Path(cfg.jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+                    self._jsonl = open(cfg.jsonl_path, "a", encoding="utf-8")
+                rec = self.recent(min(new, cfg.ring_size))
+                lines = []
+                for i, tick in enumerate(rec["tick"].tolist()):
+                    if tick % cfg.jsonl_every:
+                        continue
+                    row: Dict[str, Any] = {"tick": tick}
+                    if np.isfinite(rec["sim_time"][i]):
+                        row["sim_time"] = float(rec["sim_time"][i])
+                    row["tick_ms"] = round(float(rec["tick_s"][i]) * 1e3, 4)
+                    row["spans_ms"] = {name: round(float(v[i]) * 1e3, 4) for name, v in rec["spans"].items() if v[i]}
+                    row.update(self.labels)
+                    lines.append(json.dumps(row))
+                if lines:
+                    self._jsonl.write("\n".join(lines) + "\n")
+                    self._jsonl.flush()
+        self._exported = self._ring_ticks
+        if cfg.prometheus_path:
+            write_prometheus(Path(cfg.prometheus_path), self)
+
+    def close(self) -> None:
+        self.flush()
+        if self._jsonl is not None:
+            self._jsonl.close()
+            self._jsonl = None
+
+
+def make_profiler(config: ProfilingConfig, labels: Optional[Dict[str, str]] = None) -> Any:
+    """A ``Profiler`` when enabled, else the shared ``NULL_PROFILER``."""
+    return Profiler(config, labels) if config.enabled else NULL_PROFILER
+
+
+def _label_str(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in sorted(labels.items()))
+    return "{" + body + "}"
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name).lower()
+
+
+def prometheus_text(prof: Profiler, prefix: str = "redskies") -> str:
+    """Prometheus text exposition (0.0.4): span / tick summaries, budget, and counters."""
+    base = dict(prof.labels)
+    out: List[str] = []
+
+    def summary(metric: str, help_text: str, items: List[tuple]) -> None:
+        out.append(f"# HELP {metric} {help_text}")
+        out.append(f"# TYPE {metric} summary")
+        for labels, h in items:
+            for q in QUANTILES:
+                out.append(f"{metric}{_label_str({**labels, 'quantile': str(q)})} {h.percentile(q * 100):.9g}")
+            out.append(f"{metric}_sum{_label_str(labels)} {h.total_s:.9g}")
+            out.append(f"{metric}_count{_label_str(labels)} {h.count}")
+
+    summary(f"{prefix}_span_seconds", "Wall time per span call.", [({**base, "span": n}, h) for n, h in zip(prof.names, prof.hist)])
+    summary(f"{prefix}_tick_seconds", "Wall time per sim/agent tick.", [(base, prof.tick_hist)])
+    out.append(f"# HELP {prefix}_tick_budget_seconds Configured tick budget.")
+    out.append(f"# TYPE {prefix}_tick_budget_seconds gauge")
+    out.append(f"{prefix}_tick_budget_seconds{_label_str(base)} {prof.config.budget_s:.9g}")
+    out.append(f"# HELP {prefix}_tick_budget_misses_total Ticks slower than the budget.")
+    out.append(f"# TYPE {prefix}_tick_budget_misses_total counter")
+    out.append(f"{prefix}_tick_budget_misses_total{_label_str(base)} {prof.budget_misses}")
+    for name, n in sorted(prof.counters.items()):
+        metric = f"{prefix}_{_metric_name(name)}_total"
+        out.append(f"# TYPE {metric} counter")
+        out.append(f"{metric}{_label_str(base)} {n}")
+    return "\n".join(out) + "\n"
+
+
+def write_prometheus(path: Path, prof: Profiler) -> None:
+    """Atomic replace, so a node_exporter textfile collector never reads half a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(prometheus_text(prof), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def overhead(ticks: int = 200_000, spans: int = 5) -> Dict[str, float]:
+    """Added cost per span (ns) over a bare loop, for a disabled and an enabled profiler with exports off."""
+    out = {}
+
+    def loop(prof: Any) -> float:
+        hooks = [prof.span(f"s{i}") for i in range(spans)]  # hoisted, as in the episode loop
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            prof.begin_tick()
+            for h in hooks:
+                with h:
+                    pass
+            prof.end_tick()
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(ticks):
+        for _h in range(spans):
+            pass
+    bare = time.perf_counter() - t0
+    for label, prof in (("disabled", NULL_PROFILER), ("enabled", Profiler(ProfilingConfig(enabled=True, export=())))):
+        out[f"{label}_ns_per_span"] = round((loop(prof) - bare) / (ticks * spans) * 1e9, 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Profiling config of an experiment, or the instrumentation overhead.")
+    ap.add_argument("experiment", nargs="?", help="config-v2 instance/experiment-*.yaml")
+    ap.add_argument("--overhead", action="store_true", help="Measure per-span overhead (disabled vs enabled)")
+    args = ap.parse_args()
+    if args.overhead or not args.experiment:
+        print(json.dumps(overhead(), indent=2))
+        return
+    from config_loader import load_experiment
+
+    cfg = ProfilingConfig.from_experiment(load_experiment(Path(args.experiment)).experiment)
+    print(json.dumps(cfg.__dict__, indent=2, default=list))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,358 @@
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from schema import SimulationState
+from state_codec import FRAME_HEADER, decode_state_from, encode_state, state_from_dict, state_to_dict
+
+
+FRAME_LOG_MAGIC = b"RSFRMLOG"
+FRAME_LOG_VERSION = 1
+_FILE_HEADER = struct.Struct("<8sI")
+_RECORD_LEN = struct.Struct("<I")
+
+INDEX_SUFFIX = ".idx.npz"
+
+_TIME_RE = re.compile(rb'"time"\s*:\s*([-+0-9.eEinfINFaN]+)')
+_FRAME_RE = re.compile(rb'"frame"\s*:\s*(-?\d+)')
+
+
+class FrameLogWriter:
+    """Appends length-prefixed binary ``SimulationState`` frames (see ``state_codec``) to a file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not self.path.exists() or self.path.stat().st_size == 0
+        self._f: BinaryIO = self.path.open("ab")
+        if fresh:
+            self._f.write(_FILE_HEADER.pack(FRAME_LOG_MAGIC, FRAME_LOG_VERSION))
+
+    def write(self, state: SimulationState) -> None:
+        payload = encode_state(state)
+        self._f.write(_RECORD_LEN.pack(len(payload)))
+        self._f.write(payload)
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "FrameLogWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def write_jsonl(path: Path, states: Iterator[SimulationState]) -> None:
+    with Path(path).open("w", encoding="utf-8") as f:
+        for s in states:
+            f.write(json.dumps(state_to_dict(s), separators=(",", ":")))
+            f.write("\n")
+
+
+def _detect_kind(path: Path) -> str:
+    with path.open("rb") as f:
+        head = f.read(len(FRAME_LOG_MAGIC))
+    return "frames" if head == FRAME_LOG_MAGIC else "jsonl"
+
+
+def _scan_jsonl(mm: Any, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    """Indexes the newline-terminated lines in ``[start, end)``; also returns where the unterminated tail begins."""
+    frames, times, offsets, lengths = [], [], [], []
+    pos = start
+    while pos < end:
+        nl = mm.find(b"\n", pos, end)
+        if nl < 0:
+            break  # partial last line (writer still running or crashed mid-line); rescanned on the next open
+        if nl > pos:
+            line = mm[pos:nl]
+            if line.strip():
+                tm = _TIME_RE.search(line)
+                fm = _FRAME_RE.search(line)
+                if tm and fm:
+                    t, fr = float(tm.group(1)), int(fm.group(1))
+                else:
+                    d = json.loads(line)
+                    t, fr = float(d.get("time", 0.0)), int(d.get("frame", 0))
+                frames.append(fr)
+                times.append(t)
+                offsets.append(pos)
+                lengths.append(nl - pos)
+        pos = nl + 1
+    return (
+        np.asarray(frames, dtype=np.int64),
+        np.asarray(times, dtype=np.float64),
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(lengths, dtype=np.int64),
+        pos,
+    )
+
+
+def _scan_frames(mm: Any, start: int, end: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+    frames, times, offsets, lengths = [], [], [], []
+    pos = max(start, _FILE_HEADER.size)
+    # Only the record prefix and frame header are read; entity payloads are skipped.
+    while pos + _RECORD_LEN.size + FRAME_HEADER.size <= end:
+        (n,) = _RECORD_LEN.unpack_from(mm, pos)
+        body = pos + _RECORD_LEN.size
+        if body + n > end:
+            break  # truncated tail (writer still running or crashed mid-record)
+        t, fr, _ = FRAME_HEADER.unpack_from(mm, body)
+        frames.append(fr)
+        times.append(t)
+        offsets.append(body)
+        lengths.append(n)
+        pos = body + n
+    return (
+        np.asarray(frames, dtype=np.int64),
+        np.asarray(times, dtype=np.float64),
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(lengths, dtype=np.int64),
+        pos,
+    )
+
+
+class ReplayReader:
+    """Random-access reader over a recorded run (``telemetry.jsonl`` or a binary frame log).
+
+    The frame/time index is built on first open and cached next to the recording
+    (``<file>.idx.npz``). A cache for a shorter prefix of the same file is extended
+    instead of rebuilt, so reopening a run that is still being written stays cheap.
+    """
+
+    def __init__(self, path: Path, use_cache: bool = True) -> None:
+        self.path = Path(path)
+        self.kind = _detect_kind(self.path)
+        self._f = self.path.open("rb")
+        size = os.fstat(self._f.fileno()).st_size
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._size = size
+        self._load_index(use_cache)
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.name + INDEX_SUFFIX)
+
+    def _scan(self, start: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]:
+        if self.kind == "frames":
+            return _scan_frames(self._mm, start, self._size)
+        return _scan_jsonl(self._mm, start, self._size)
+
+    def _load_index(self, use_cache: bool) -> None:
+        cached = self._read_cache() if use_cache else None
+        if cached is not None:
+            frames, times, offsets, lengths, scanned = cached
+            if scanned < self._size:
+                *more, scanned = self._scan(scanned)
+                frames, times, offsets, lengths = (np.concatenate(p) for p in zip((frames, times, offsets, lengths), more))
+        else:
+            frames, times, offsets, lengths, scanned = self._scan(0)
+
+        if frames.size > 1 and (np.any(np.diff(frames) < 0) or np.any(np.diff(times) < 0)):
+            raise ValueError(f"{self.path}: frames/time must be non-decreasing")
+
+        self._frames, self._times, self._offsets, self._lengths = frames, times, offsets, lengths
+        # Offset of the first byte not covered by a complete record; a partial tail is rescanned next time.
+        self._scanned = scanned
+        if use_cache and (cached is None or cached[4] != scanned):
+            self._write_cache()
+
+    def _read_cache(self) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, int]]:
+        try:
+            with np.load(self.index_path) as z:
+                kind = str(z["kind"])
+                scanned = int(z["scanned"])
+                frames, times, offsets, lengths = z["frames"], z["times"], z["offsets"], z["lengths"]
+        except (OSError, KeyError, ValueError):
+            return None
+        if kind != self.kind or scanned > self._size:
+            return None
+        if frames.size:
+            # The last indexed record must still be where the cache says it is.
+            end = int(offsets[-1] + lengths[-1])
+            if end > self._size or self._scan_one(int(offsets[-1]), int(lengths[-1])) != int(frames[-1]):
+                return None
+            if self.kind == "jsonl":
+                # A line indexed before it was terminated has a stale length.
+                if self._mm[end : end + 1] != b"\n":
+                    return None
+                end += 1
+            scanned = end
+        return frames, times, offsets, lengths, scanned
+
+    def _scan_one(self, offset: int, length: int) -> Optional[int]:
+        if self.kind == "frames":
+            return int(FRAME_HEADER.unpack_from(self._mm, offset)[1])
+        m = _FRAME_RE.search(self._mm[offset : offset + length])
+        return int(m.group(1)) if m else None
+
+    def _write_cache(self) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with tmp.open("wb") as f:
+                np.savez(
+                    f,
+                    kind=np.asarray(self.kind),
+                    scanned=np.asarray(self._scanned),
+                    frames=self._frames,
+                    times=self._times,
+                    offsets=self._offsets,
+                    lengths=self._lengths,
+                )
+            os.replace(tmp, self.index_path)
+        except OSError:
+            # Read-only recordings still replay; they just re-index on the next open.
+            pass
+
+    def __len__(self) -> int:
+        return int(self._frames.size)
+
+    @property
+    def frames(self) -> np.ndarray:
+        return self._frames
+
+    @property
+    def times(self) -> np.ndarray:
+        return self._times
+
+    @property
+    def duration_s(self) -> float:
+        return float(self._times[-1] - self._times[0]) if len(self) else 0.0
+
+    def seek_frame(self, frame: int) -> int:
+        """Index of the last record with ``frame <= frame`` (clamped to the first record)."""
+        i = int(np.searchsorted(self._frames, frame, side="right")) - 1
+        return min(max(i, 0), len(self) - 1)
+
+    def seek_time(self, t: float) -> int:
+        """Index of the last record with ``time <= t`` (clamped to the first record)."""
+        i = int(np.searchsorted(self._times, t, side="right")) - 1
+        return min(max(i, 0), len(self) - 1)
+
+    def state_at(self, i: int) -> SimulationState:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        off = int(self._offsets[i])
+        if self.kind == "frames":
+            return decode_state_from(self._mm, off)[0]
+        return state_from_dict(json.loads(self._mm[off : off + int(self._lengths[i])]))
+
+    def state_at_frame(self, frame: int) -> SimulationState:
+        return self.state_at(self.seek_frame(frame))
+
+    def state_at_time(self, t: float) -> SimulationState:
+        return self.state_at(self.seek_time(t))
+
+    def window(
+        self,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        stride: int = 1,
+    ) -> Iterator[SimulationState]:
+        """Lazily yields states with ``start_time <= time <= end_time``; decodes one frame per step."""
+        if not len(self):
+            return
+        lo = 0 if start_time is None else int(np.searchsorted(self._times, start_time, side="left"))
+        hi = len(self) if end_time is None else int(np.searchsorted(self._times, end_time, side="right"))
+        for i in range(lo, hi, max(1, stride)):
+            yield self.state_at(i)
+
+    def play(
+        self,
+        speed: float = 1.0,
+        start_time: Optional[float] = None,
+        end_time: Optional[float] = None,
+        drop_late: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> Iterator[SimulationState]:
+        """Yields states paced at ``speed`` x real time.
+
+        With ``drop_late`` the player jumps to the frame that is due instead of
+        replaying every frame it fell behind on.
+        """
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        if not len(self):
+            return
+        times = self.times
+        i = 0 if start_time is None else self.seek_time(start_time)
+        hi = len(self) if end_time is None else int(np.searchsorted(times, end_time, side="right"))
+        t0 = float(times[i])
+        wall0 = clock()
+        while i < hi:
+            due = t0 + (clock() - wall0) * speed
+            t = float(times[i])
+            if t > due:
+                sleep((t - due) / speed)
+            elif drop_late:
+                i = max(i, min(self.seek_time(due), hi - 1))
+            yield self.state_at(i)
+            i += 1
+
+    def close(self) -> None:
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._f.close()
+
+    def __enter__(self) -> "ReplayReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_recording(path: Path, use_cache: bool = True) -> Any:
+    """``TelemetryReader`` for chunked telemetry logs, ``ReplayReader`` for JSONL and frame logs."""
+    from telemetry_sink import TelemetryReader, is_chunk_log
+
+    if is_chunk_log(Path(path)):
+        return TelemetryReader(Path(path))
+    return ReplayReader(Path(path), use_cache=use_cache)
+
+
+def _summary(reader: Any) -> Dict[str, Any]:
+    return {
+        "path": str(reader.path),
+        "kind": reader.kind,
+        "records": len(reader),
+        "first_frame": int(reader.frames[0]) if len(reader) else None,
+        "last_frame": int(reader.frames[-1]) if len(reader) else None,
+        "duration_s": reader.duration_s,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("recording", help="telemetry.jsonl, binary frame log or chunked telemetry (telemetry_sink.py)")
+    ap.add_argument("--frame", type=int, default=None, help="Print the state at this frame")
+    ap.add_argument("--time", type=float, default=None, help="Print the state at this simulation time")
+    ap.add_argument("--play", type=float, default=None, help="Play back at N x real time, printing frame/time")
+    ap.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args()
+
+    with open_recording(Path(args.recording), use_cache=not args.no_cache) as reader:
+        if args.frame is not None:
+            print(json.dumps(state_to_dict(reader.state_at_frame(args.frame)), indent=2))
+        elif args.time is not None:
+            print(json.dumps(state_to_dict(reader.state_at_time(args.time)), indent=2))
+        elif args.play is not None:
+            for s in reader.play(speed=args.play):
+                print(f"frame={s.frame} time={s.time:.3f}")
+        else:
+            print(json.dumps(_summary(reader), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,758 @@
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config_loader import Scenario, default_cache_dir, load_scenario
+from dynamic_zones import DynamicZoneSchedule, may_toggle
+from geodesy import from_local_equirect, to_local_equirect
+
+GRAPH_VERSION = 1
+_EPS = 1e-6
+_PAIR_BLOCK = 2_000_000
+"""Segment x obstacle distance tests per vectorized block."""
+
+
+@dataclass(frozen=True)
+class PlannerConfig:
+    margin_m: float = 250.0
+    """Clearance added around every NFZ before the graph is built."""
+    circle_sides: int = 12
+    """Circles become circumscribed regular polygons with this many sides (12: <= 3.5 % extra radius)."""
+
+
+@dataclass
+class Obstacle:
+    zone: str
+    """Scenario object id; a multi-polygon zone yields several obstacles."""
+    dynamic: bool
+    poly: np.ndarray
+    """(K, 2) convex, counter-clockwise east/north metres, already inflated."""
+
+
+@dataclass
+class RoutePlan:
+    xy: np.ndarray
+    """(W, 2) east/north metres in the planner frame, start and goal included."""
+    latlon: np.ndarray
+    """(W, 2) lat, lon of the same waypoints."""
+    length_m: float
+    expanded: int
+    """A* node expansions."""
+
+    def distance_to_go(self, east: np.ndarray, north: np.ndarray) -> np.ndarray:
+        """Route length left from the closest point on the route, e.g. as a shaping potential."""
+        p = np.stack([np.atleast_1d(east), np.atleast_1d(north)], axis=-1).astype(np.float64)
+        a, b = self.xy[:-1], self.xy[1:]
+        seg = b - a
+        seg_len = np.hypot(seg[:, 0], seg[:, 1])
+        remaining = np.concatenate([np.cumsum(seg_len[::-1])[::-1], [0.0]])
+        if seg_len.size == 0:
+            return np.hypot(*(p - self.xy[0]).T)
+        rel = p[:, None, :] - a[None, :, :]
+        t = np.clip((rel * seg[None]).sum(-1) / np.maximum(seg_len**2, 1e-12)[None], 0.0, 1.0)
+        closest = a[None] + t[..., None] * seg[None]
+        off = np.hypot(*(p[:, None, :] - closest).transpose(2, 0, 1))
+        k = off.argmin(axis=1)
+        rows = np.arange(p.shape[0])
+        return off[rows, k] + (1.0 - t[rows, k]) * seg_len[k] + remaining[k + 1]
+
+
+# ---------------------------------------------------------------------------
+# Geometry
+# ---------------------------------------------------------------------------
+
+
+def _cross(ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray) -> np.ndarray:
+    return ax * by - ay * bx
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """Counter-clockwise hull (monotone chain), no repeated closing point."""
+    pts = sorted(set(map(tuple, np.asarray(points, dtype=np.float64).tolist())))
+    if len(pts) < 3:
+        return np.asarray(pts, dtype=np.float64)
+
+    def half(seq: Iterable[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        out: List[Tuple[float, float]] = []
+        for p in seq:
+            while len(out) >= 2 and (out[-1][0] - out[-2][0]) * (p[1] - out[-2][1]) - (out[-1][1] - out[-2][1]) * (p[0] - out[-2][0]) <= 0:
+                out.pop()
+            out.append(p)
+        return out
+
+    lower, upper = half(pts), half(reversed(pts))
+    return np.asarray(lower[:-1] + upper[:-1], dtype=np.float64)
+
+
+def offset_convex(poly: np.ndarray, d: float) -> np.ndarray:
+    """Moves every edge of a CCW convex polygon outward by ``d`` (mitred corners, so it contains the true offset)."""
+    if d <= 0:
+        return poly
+    e = np.roll(poly, -1, axis=0) - poly
+    n = np.stack([e[:, 1], -e[:, 0]], axis=1) / np.hypot(e[:, 0], e[:, 1])[:, None]  # outward for CCW
+    n_prev = np.roll(n, 1, axis=0)
+    return poly + d * (n_prev + n) / (1.0 + (n_prev * n).sum(axis=1))[:, None]
+
+
+def circle_polygon(cx: float, cy: float, r: float, sides: int) -> np.ndarray:
+    """Regular polygon circumscribing the circle, CCW."""
+    ang = np.arange(sides) * (2.0 * math.pi / sides)
+    big = r / math.cos(math.pi / sides)
+    return np.stack([cx + big * np.cos(ang), cy + big * np.sin(ang)], axis=1)
+
+
+def scenario_origin(scenario: Scenario) -> Tuple[float, float]:
+    """Playground center, else the mean NFZ center: the tangent point of the planner's local frame."""
+    for o in scenario.objects:
+        if (o.id == "playground" or o.id.startswith("playground-")) and o.center() is not None:
+            return o.center()
+    centers = [o.center() for o in scenario.objects if o.behavior == "no_fly_zone" and o.center() is not None]
+    if not centers:
+        raise ValueError(f"{scenario.id}: no playground or NFZ to anchor the planner frame")
+    return float(np.mean([c[0] for c in centers])), float(np.mean([c[1] for c in centers]))
+
+
+def obstacles_from_scenario(scenario: Scenario, origin: Tuple[float, float], config: PlannerConfig = PlannerConfig()) -> List[Obstacle]:
+    """Inflated convex obstacles of every NFZ: circles as circumscribed polygons, polygons as their hull."""
+    out: List[Obstacle] = []
+    for o in scenario.objects:
+        if o.behavior != "no_fly_zone":
+            continue
+        dynamic = may_toggle(o.parameters)
+        center, radius = o.center(), o.radius_m()
+        if center is not None and radius is not None:
+            x, y = to_local_equirect(center[0], center[1], *origin)
+            out.append(Obstacle(o.id, dynamic, circle_polygon(float(x), float(y), radius + config.margin_m, config.circle_sides)))
+            continue
+        for ring in o.rings():
+            lat, lon = np.asarray(ring, dtype=np.float64).T
+            x, y = to_local_equirect(lat, lon, *origin)
+            hull = convex_hull(np.stack([x, y], axis=1))
+            if len(hull) >= 3:
+                out.append(Obstacle(o.id, dynamic, offset_convex(hull, config.margin_m)))
+    return out
+
+
+class _Obstacles:
+    """Obstacles padded to a common vertex count for vectorized tests."""
+
+    def __init__(self, polys: Sequence[np.ndarray]) -> None:
+        n = len(polys)
+        k = max((len(p) for p in polys), default=3)
+        self.pad = np.zeros((n, k, 2))
+        for i, p in enumerate(polys):
+            self.pad[i, : len(p)] = p
+            self.pad[i, len(p) :] = p[-1]  # degenerate edges never cross anything
+        self.count = np.array([len(p) for p in polys], dtype=np.int64)
+        self.center = np.array([p.mean(axis=0) for p in polys]).reshape(-1, 2)
+        self.radius = np.array([np.hypot(*(p - c).T).max() for p, c in zip(polys, self.center)])
+        # Edge k runs pad[k] -> pad[k + 1], wrapping at the real vertex count.
+        nxt = np.arange(1, k + 1)[None, :] % np.maximum(self.count, 1)[:, None]
+        nxt = np.where(np.arange(k)[None, :] < self.count[:, None], nxt, np.arange(k)[None, :])
+        self.nxt = self.pad[np.arange(n)[:, None], nxt]
+
+    def __len__(self) -> int:
+        return int(self.count.size)
+
+    def contains(self, px: np.ndarray, py: np.ndarray, obs: np.ndarray) -> np.ndarray:
+        """Strictly inside obstacle ``obs[i]`` for each point ``i``."""
+        a, b = self.pad[obs], self.nxt[obs]
+        c = _cross(b[..., 0] - a[..., 0], b[..., 1] - a[..., 1], px[:, None] - a[..., 0], py[:, None] - a[..., 1])
+        scale = np.hypot(b[..., 0] - a[..., 0], b[..., 1] - a[..., 1])
+        degenerate = scale < _EPS
+        return np.all(degenerate | (c > _EPS * np.maximum(scale, 1.0)), axis=1)
+
+    def near(self, ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray, cand: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(segment, obstacle) pairs among ``cand`` obstacles whose bounding circle the segment touches."""
+        seg_idx, obs_idx = [], []
+        m = ax.size
+        if m == 0 or cand.size == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        step = max(1, _PAIR_BLOCK // cand.size)
+        cx, cy, r = self.center[cand, 0], self.center[cand, 1], self.radius[cand]
+        for s in range(0, m, step):
+            sl = slice(s, min(m, s + step))
+            dx, dy = (bx[sl] - ax[sl])[:, None], (by[sl] - ay[sl])[:, None]
+            rx, ry = cx[None] - ax[sl][:, None], cy[None] - ay[sl][:, None]
+            t = np.clip((rx * dx + ry * dy) / np.maximum(dx * dx + dy * dy, 1e-12), 0.0, 1.0)
+            hit = np.hypot(rx - t * dx, ry - t * dy) < r[None]
+            i, j = np.nonzero(hit)
+            seg_idx.append(i + s)
+            obs_idx.append(cand[j])
+        return np.concatenate(seg_idx), np.concatenate(obs_idx)
+
+    def crosses(self, ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray, obs: np.ndarray) -> np.ndarray:
+        """Segment ``i`` enters the interior of obstacle ``obs[i]`` (proper edge crossing, or midpoint inside)."""
+        p, q = self.pad[obs], self.nxt[obs]
+        dx, dy = (bx - ax)[:, None], (by - ay)[:, None]
+        o1 = _cross(dx, dy, p[..., 0] - ax[:, None], p[..., 1] - ay[:, None])
+        o2 = _cross(dx, dy, q[..., 0] - ax[:, None], q[..., 1] - ay[:, None])
+        ex, ey = q[..., 0] - p[..., 0], q[..., 1] - p[..., 1]
+        o3 = _cross(ex, ey, ax[:, None] - p[..., 0], ay[:, None] - p[..., 1])
+        o4 = _cross(ex, ey, bx[:, None] - p[..., 0], by[:, None] - p[..., 1])
+        tol = _EPS * (np.hypot(dx, dy) * np.hypot(ex, ey) + 1.0)
+        proper = ((o1 * o2) < -tol * tol) & ((o3 * o4) < -tol * tol)
+        return proper.any(axis=1) | self.contains((ax + bx) / 2.0, (ay + by) / 2.0, obs)
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.add.at(indptr, rows + 1, 1)
+    return np.cumsum(indptr), cols[order].astype(np.int64)
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+
+class VisibilityGraph:
+    """Tangent visibility graph over convex obstacles; immutable once built.
+
+    Only bitangent edges are kept (both endpoints see the segment as a supporting line of their
+    own obstacle), which is sufficient for shortest paths. Static obstacles remove what they block;
+    dynamic obstacles are recorded per edge / vertex so a ``RoutePlanner`` can switch them.
+    """
+
+    def __init__(self, zones: List[str], obstacles: List[Obstacle], arrays: Dict[str, np.ndarray]) -> None:
+        self.zones = zones
+        self.zone_index = {z: i for i, z in enumerate(zones)}
+        self.obstacles = obstacles
+        self.geom = _Obstacles([o.poly for o in obstacles])
+        self.obs_zone = np.array([self.zone_index[o.zone] for o in obstacles], dtype=np.int64)
+        self.obs_dynamic = np.array([o.dynamic for o in obstacles], dtype=bool)
+        for k, v in arrays.items():
+            setattr(self, k, v)
+        # Adjacency (both directions) for A*.
+        n = self.xy.shape[0]
+        rows = np.concatenate([self.edge_i, self.edge_j])
+        cols = np.concatenate([self.edge_j, self.edge_i])
+        eid = np.concatenate([np.arange(self.edge_i.size), np.arange(self.edge_i.size)])
+        order = np.argsort(rows, kind="stable")
+        self.adj_ptr = np.searchsorted(rows[order], np.arange(n + 1)).astype(np.int64)
+        self.adj_to = cols[order]
+        self.adj_edge = eid[order]
+
+    @property
+    def n_vertices(self) -> int:
+        return int(self.xy.shape[0])
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.edge_i.size)
+
+    @classmethod
+    def build(cls, obstacles: List[Obstacle]) -> "VisibilityGraph":
+        zones = list(dict.fromkeys(o.zone for o in obstacles))
+        geom = _Obstacles([o.poly for o in obstacles])
+        n_obs = len(obstacles)
+        obs_dynamic = np.array([o.dynamic for o in obstacles], dtype=bool)
+        obs_zone = np.array([zones.index(o.zone) for o in obstacles], dtype=np.int64) if obstacles else np.zeros(0, dtype=np.int64)
+
+        xy = np.concatenate([o.poly for o in obstacles]) if obstacles else np.zeros((0, 2))
+        v_obs = np.repeat(np.arange(n_obs), [len(o.poly) for o in obstacles]).astype(np.int64)
+        starts = np.concatenate([[0], np.cumsum([len(o.poly) for o in obstacles])]).astype(np.int64)
+        local = np.arange(xy.shape[0]) - starts[v_obs]
+        k = geom.count[v_obs]
+        prev = starts[v_obs] + (local - 1) % k
+        nxt = starts[v_obs] + (local + 1) % k
+
+        # Vertices inside another obstacle: dead if it is static, conditional if it is dynamic.
+        v_idx, o_idx = geom.near(xy[:, 0], xy[:, 1], xy[:, 0], xy[:, 1], np.arange(n_obs))
+        keep = o_idx != v_obs[v_idx]
+        v_idx, o_idx = v_idx[keep], o_idx[keep]
+        inside = geom.contains(xy[v_idx, 0], xy[v_idx, 1], o_idx) if v_idx.size else np.zeros(0, dtype=bool)
+        v_idx, o_idx = v_idx[inside], o_idx[inside]
+        dead = np.zeros(xy.shape[0], dtype=bool)
+        dead[v_idx[~obs_dynamic[o_idx]]] = True
+        cond = obs_dynamic[o_idx]
+        vb_ptr, vb_zone = _csr(v_idx[cond], obs_zone[o_idx[cond]], xy.shape[0])
+
+        # Candidate pairs: bitangent between different obstacles, plus each obstacle's own edges.
+        ei_parts, ej_parts = [], []
+        alive = np.nonzero(~dead)[0]
+        rows_per_block = max(1, _PAIR_BLOCK // max(1, alive.size))
+        for s in range(0, alive.size, rows_per_block):
+            I = alive[s : s + rows_per_block][:, None]
+            J = alive[None, :]
+            mask = (J > I) & (v_obs[I] != v_obs[J])
+            i, j = np.broadcast_to(I, mask.shape)[mask], np.broadcast_to(J, mask.shape)[mask]
+            dx, dy = xy[j, 0] - xy[i, 0], xy[j, 1] - xy[i, 1]
+            tan_i = _cross(dx, dy, xy[prev[i], 0] - xy[i, 0], xy[prev[i], 1] - xy[i, 1]) * _cross(dx, dy, xy[nxt[i], 0] - xy[i, 0], xy[nxt[i], 1] - xy[i, 1]) >= 0
+            tan_j = _cross(dx, dy, xy[prev[j], 0] - xy[j, 0], xy[prev[j], 1] - xy[j, 1]) * _cross(dx, dy, xy[nxt[j], 0] - xy[j, 0], xy[nxt[j], 1] - xy[j, 1]) >= 0
+            ok = tan_i & tan_j
+            ei_parts.append(i[ok])
+            ej_parts.append(j[ok])
+        own = ~dead & ~dead[nxt]
+        ei_parts.append(np.minimum(np.arange(xy.shape[0]), nxt)[own])
+        ej_parts.append(np.maximum(np.arange(xy.shape[0]), nxt)[own])
+        ei = np.concatenate(ei_parts).astype(np.int64) if ei_parts else np.zeros(0, dtype=np.int64)
+        ej = np.concatenate(ej_parts).astype(np.int64) if ej_parts else np.zeros(0, dtype=np.int64)
+
+        # Blockers: any obstacle other than the endpoints' own whose interior the segment enters.
+        s_idx, o_idx = geom.near(xy[ei, 0], xy[ei, 1], xy[ej, 0], xy[ej, 1], np.arange(n_obs))
+        keep = (o_idx != v_obs[ei[s_idx]]) & (o_idx != v_obs[ej[s_idx]])
+        s_idx, o_idx = s_idx[keep], o_idx[keep]
+        hit = np.zeros(s_idx.size, dtype=bool)
+        step = max(1, _PAIR_BLOCK // max(1, geom.pad.shape[1]))
+        for s in range(0, s_idx.size, step):
+            sl = slice(s, s + step)
+            a, b = ei[s_idx[sl]], ej[s_idx[sl]]
+            hit[sl] = geom.crosses(xy[a, 0], xy[a, 1], xy[b, 0], xy[b, 1], o_idx[sl])
+        s_idx, o_idx = s_idx[hit], o_idx[hit]
+        static_block = np.zeros(ei.size, dtype=bool)
+        static_block[s_idx[~obs_dynamic[o_idx]]] = True
+        keep_edge = ~static_block
+        remap = np.cumsum(keep_edge) - 1
+        dyn = obs_dynamic[o_idx] & keep_edge[s_idx]
+        eb_rows, eb_zone = remap[s_idx[dyn]], obs_zone[o_idx[dyn]]
+        pairs = np.unique(np.stack([eb_rows, eb_zone], axis=1), axis=0) if eb_rows.size else np.zeros((0, 2), dtype=np.int64)
+        ei, ej = ei[keep_edge], ej[keep_edge]
+        eb_ptr, eb_zone = _csr(pairs[:, 0], pairs[:, 1], ei.size)
+
+        arrays = {
+            "xy": xy,
+            "v_obs": v_obs,
+            "dead": dead,
+            "vb_ptr": vb_ptr,
+            "vb_zone": vb_zone,
+            "edge_i": ei,
+            "edge_j": ej,
+            "edge_w": np.hypot(xy[ej, 0] - xy[ei, 0], xy[ej, 1] - xy[ei, 1]),
+            "eb_ptr": eb_ptr,
+            "eb_zone": eb_zone,
+        }
+        return cls(zones, obstacles, arrays)
+
+    # -- persistence ---------------------------------------------------------------
+
+    _ARRAYS = ("xy", "v_obs", "dead", "vb_ptr", "vb_zone", "edge_i", "edge_j", "edge_w", "eb_ptr", "eb_zone")
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        meta = {"version": GRAPH_VERSION, "zones": self.zones, "obstacles": [(o.zone, o.dynamic, len(o.poly)) for o in self.obstacles]}
+        polys = np.concatenate([o.poly for o in self.obstacles]) if self.obstacles else np.zeros((0, 2))
+        with tmp.open("wb") as f:
+            np.savez(f, meta=np.asarray(json.dumps(meta)), polys=polys, **{k: getattr(self, k) for k in self._ARRAYS})
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "VisibilityGraph":
+        with np.load(path) as z:
+            meta = json.loads(str(z["meta"]))
+            if meta.get("version") != GRAPH_VERSION:
+                raise ValueError(f"{path}: graph version {meta.get('version')} != {GRAPH_VERSION}")
+            polys = z["polys"]
+            arrays = {k: z[k] for k in cls._ARRAYS}
+        obstacles, pos = [], 0
+        for zone, dynamic, n in meta["obstacles"]:
+            obstacles.append(Obstacle(zone, bool(dynamic), polys[pos : pos + n]))
+            pos += n
+        return cls(meta["zones"], obstacles, arrays)
+
+
+def graph_key(obstacles: List[Obstacle], origin: Tuple[float, float], config: PlannerConfig) -> str:
+    """Content hash of everything the graph depends on; the cache key per scenario geometry."""
+    h = hashlib.sha256()
+    h.update(json.dumps({"v": GRAPH_VERSION, "origin": [round(origin[0], 9), round(origin[1], 9)], "config": asdict(config)}, sort_keys=True).encode())
+    for o in obstacles:
+        h.update(o.zone.encode("utf-8") + b"\0" + (b"d" if o.dynamic else b"s"))
+        h.update(np.round(o.poly, 3).astype("<f8").tobytes())
+    return h.hexdigest()[:32]
+
+
+_GRAPHS: "OrderedDict[str, VisibilityGraph]" = OrderedDict()
+_GRAPHS_MAX = 16
+
+
+def cached_graph(obstacles: List[Obstacle], origin: Tuple[float, float], config: PlannerConfig, cache_dir: Optional[Path] = None) -> Tuple[VisibilityGraph, str]:
+    """Graph for these obstacles from memory, then ``<cache_dir>/<key>.npz``, else built and stored in both.
+
+    Returns (graph, "memory" | "disk" | "built").
+    """
+    key = graph_key(obstacles, origin, config)
+    if key in _GRAPHS:
+        _GRAPHS.move_to_end(key)
+        return _GRAPHS[key], "memory"
+    source = "built"
+    path = Path(cache_dir) / f"{key}.npz" if cache_dir is not None else None
+    graph = None
+    if path is not None and path.exists():
+        try:
+            graph, source = VisibilityGraph.load(path), "disk"
+        except (OSError, ValueError, KeyError):
+            graph = None
+    if graph is None:
+        graph = VisibilityGraph.build(obstacles)
+        if path is not None:
+            try:
+                graph.save(path)
+            except OSError:
+                pass  # read-only cache: planning still works, it just rebuilds next process
+    _GRAPHS[key] = graph
+    while len(_GRAPHS) > _GRAPHS_MAX:
+        _GRAPHS.popitem(last=False)
+    return graph, source
+
+
+def default_graph_cache_dir() -> Path:
+    return default_cache_dir().parent / "visgraph"
+
+
+# ---------------------------------------------------------------------------
+# Planner
+# ---------------------------------------------------------------------------
+
+
+class RoutePlanner:
+    """A* over a scenario's cached visibility graph, with per-zone activation.
+
+    The graph is shared (see ``cached_graph``); activation counters are per planner, so a new
+    planner or ``reset`` costs O(vertices + edges) array copies, not a rebuild. Dynamic zones start
+    active (the conservative choice) until ``set_active`` / ``sync`` says otherwise.
+    """
+
+    def __init__(
+        self,
+        scenario: Scenario,
+        config: PlannerConfig = PlannerConfig(),
+        origin: Optional[Tuple[float, float]] = None,
+        cache_dir: Optional[Path] = None,
+        use_cache: bool = True,
+    ) -> None:
+        self.scenario = scenario
+        self.config = config
+        self.origin = origin or scenario_origin(scenario)
+        obstacles = obstacles_from_scenario(scenario, self.origin, config)
+        self.key = graph_key(obstacles, self.origin, config)  # content hash of the planner's geometry
+        if use_cache:
+            self.graph, self.graph_source = cached_graph(obstacles, self.origin, config, cache_dir or default_graph_cache_dir())
+        else:
+            self.graph, self.graph_source = VisibilityGraph.build(obstacles), "built"
+        g = self.graph
+        n_zones = len(g.zones)
+        # Zone -> edges it blocks / vertices it covers / vertices it owns (for O(affected) toggles).
+        self._zone_edges = _csr(g.eb_zone, np.repeat(np.arange(g.n_edges), np.diff(g.eb_ptr)), n_zones)
+        self._zone_covers = _csr(g.vb_zone, np.repeat(np.arange(g.n_vertices), np.diff(g.vb_ptr)), n_zones)
+        self._zone_owns = _csr(g.obs_zone[g.v_obs], np.arange(g.n_vertices), n_zones)
+        self.dynamic_zones = sorted({g.zones[z] for z in g.obs_zone[g.obs_dynamic].tolist()})
+        self.reset()
+
+    def reset(self) -> None:
+        """All zones active."""
+        g = self.graph
+        self.active = np.ones(len(g.zones), dtype=bool)
+        self._edge_block = np.diff(g.eb_ptr).astype(np.int64)
+        self._node_block = np.diff(g.vb_ptr).astype(np.int64) + g.dead.astype(np.int64)
+
+    def set_active(self, zone_id: str, active: bool) -> bool:
+        """Switches one zone; returns False if it was already in that state. O(edges/vertices it touches)."""
+        g = self.graph
+        z = g.zone_index.get(zone_id)
+        if z is None:
+            raise KeyError(f"zone not in planner graph: {zone_id}")
+        if bool(self.active[z]) == bool(active):
+            return False
+        self.active[z] = bool(active)
+        d = 1 if active else -1
+        ptr, idx = self._zone_edges
+        np.add.at(self._edge_block, idx[ptr[z] : ptr[z + 1]], d)
+        ptr, idx = self._zone_covers
+        np.add.at(self._node_block, idx[ptr[z] : ptr[z + 1]], d)
+        ptr, idx = self._zone_owns
+        np.add.at(self._node_block, idx[ptr[z] : ptr[z + 1]], -d)
+        return True
+
+    def sync(self, active_ids: Iterable[str]) -> int:
+        """Makes exactly the dynamic zones in ``active_ids`` active; returns how many toggled."""
+        want = set(active_ids)
+        return sum(self.set_active(z, z in want) for z in self.dynamic_zones)
+
+    def sync_schedule(self, schedule: DynamicZoneSchedule, t: float) -> int:
+        return self.sync(schedule.active_ids(t))
+
+    # -- queries --------------------------------------------------------------------
+
+    def to_xy(self, lat: Any, lon: Any) -> Tuple[np.ndarray, np.ndarray]:
+        return to_local_equirect(lat, lon, *self.origin)
+
+    def _active_obstacles(self) -> np.ndarray:
+        return np.nonzero(self.active[self.graph.obs_zone])[0]
+
+    def blocked(self, ax: np.ndarray, ay: np.ndarray, bx: np.ndarray, by: np.ndarray, skip_obs: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per segment: enters an active obstacle (``skip_obs[i]``: an obstacle to ignore for segment i, or -1)."""
+        geom = self.graph.geom
+        s_idx, o_idx = geom.near(ax, ay, bx, by, self._active_obstacles())
+        if skip_obs is not None:
+            keep = o_idx != skip_obs[s_idx]
+            s_idx, o_idx = s_idx[keep], o_idx[keep]
+        out = np.zeros(ax.size, dtype=bool)
+        if s_idx.size:
+            hit = geom.crosses(ax[s_idx], ay[s_idx], bx[s_idx], by[s_idx], o_idx)
+            out[s_idx[hit]] = True
+        return out
+
+    def inside(self, x: float, y: float) -> List[str]:
+        """Active zones containing the point."""
+        geom = self.graph.geom
+        obs = self._active_obstacles()
+        if obs.size == 0:
+            return []
+        hit = geom.contains(np.full(obs.size, float(x)), np.full(obs.size, float(y)), obs)
+        return sorted({self.graph.zones[self.graph.obs_zone[o]] for o in obs[hit]})
+
+    def _visible_from(self, x: float, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Enabled vertices visible from a free point and tangent there, with their distances."""
+        g = self.graph
+        v = np.nonzero(self._node_block == 0)[0]
+        if v.size == 0:
+            return v, np.zeros(0)
+        px, py = g.xy[v, 0], g.xy[v, 1]
+        dx, dy = px - x, py - y
+        start = np.concatenate([[0], np.cumsum(g.geom.count)])
+        local = v - start[g.v_obs[v]]
+        k = g.geom.count[g.v_obs[v]]
+        prev = start[g.v_obs[v]] + (local - 1) % k
+        nxt = start[g.v_obs[v]] + (local + 1) % k
+        tangent = _cross(dx, dy, g.xy[prev, 0] - px, g.xy[prev, 1] - py) * _cross(dx, dy, g.xy[nxt, 0] - px, g.xy[nxt, 1] - py) >= 0
+        v = v[tangent]
+        ok = ~self.blocked(np.full(v.size, float(x)), np.full(v.size, float(y)), g.xy[v, 0], g.xy[v, 1], g.v_obs[v])
+        v = v[ok]
+        return v, np.hypot(g.xy[v, 0] - x, g.xy[v, 1] - y)
+
+    def _neighbors(self, u: int) -> Tuple[List[int], List[float]]:
+        """Enabled graph neighbours of vertex ``u`` and the edge lengths."""
+        g = self.graph
+        lo, hi = g.adj_ptr[u], g.adj_ptr[u + 1]
+        nb, eid = g.adj_to[lo:hi], g.adj_edge[lo:hi]
+        ok = (self._edge_block[eid] == 0) & (self._node_block[nb] == 0)
+        return nb[ok].tolist(), g.edge_w[eid[ok]].tolist()
+
+    def _dijkstra(self, sources: np.ndarray, source_d: np.ndarray) -> np.ndarray:
+        """Shortest distance to every graph vertex from seeded ``sources`` (inf where unreachable)."""
+        dist = [math.inf] * self.graph.n_vertices
+        done = [False] * self.graph.n_vertices
+        heap = [(float(d), int(v)) for v, d in zip(sources.tolist(), source_d.tolist())]
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            dist[u] = d
+            for v, w in zip(*self._neighbors(u)):
+                if not done[v] and d + w < dist[v]:
+                    dist[v] = d + w
+                    heapq.heappush(heap, (d + w, v))
+        return np.asarray(dist)
+
+    def distance_matrix(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Shortest NFZ-free distances between all planner-frame points.
+
+        Returns ((N, N) metres, (N, N) True where the straight leg is blocked). Straight legs are
+        tested in one vectorized pass; only points with a blocked leg run a Dijkstra over the graph,
+        whose vertex distances are then joined to every target's visible vertices at once.
+        """
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        n = xy.shape[0]
+        for k in range(n):
+            zones = self.inside(*xy[k])
+            if zones:
+                raise ValueError(f"point {k} ({xy[k, 0]:.0f}, {xy[k, 1]:.0f}) m lies inside active NFZ(s) {zones}")
+        dist = np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1])
+        i, j = np.triu_indices(n, 1)
+        blocked = np.zeros((n, n), dtype=bool)
+        if i.size:
+            hit = self.blocked(xy[i, 0], xy[i, 1], xy[j, 0], xy[j, 1])
+            blocked[i[hit], j[hit]] = blocked[j[hit], i[hit]] = True
+        rows = np.nonzero(blocked.any(axis=1))[0]
+        if rows.size == 0:
+            return dist, blocked
+        visible = {int(k): self._visible_from(*xy[k]) for k in rows}
+        for a in rows.tolist():
+            targets = [b for b in np.nonzero(blocked[a])[0].tolist() if b > a]
+            if not targets:
+                continue
+            reach = self._dijkstra(*visible[a])
+            for b in targets:
+                vb, db = visible[b]
+                dist[a, b] = dist[b, a] = float((reach[vb] + db).min()) if vb.size else math.inf
+        return dist, blocked
+
+    def plan_xy(self, start: Tuple[float, float], goal: Tuple[float, float]) -> Optional[RoutePlan]:
+        """Shortest route in planner-frame metres; None if the goal is unreachable."""
+        g = self.graph
+        for name, (x, y) in (("start", start), ("goal", goal)):
+            zones = self.inside(x, y)
+            if zones:
+                raise ValueError(f"{name} ({x:.0f}, {y:.0f}) m lies inside active NFZ(s) {zones} (incl. {self.config.margin_m} m margin)")
+        sx, sy = map(float, start)
+        gx, gy = map(float, goal)
+        n = g.n_vertices
+        S, G = n, n + 1
+        direct = not self.blocked(np.array([sx]), np.array([sy]), np.array([gx]), np.array([gy]))[0]
+        if direct:
+            xy = np.array([[sx, sy], [gx, gy]])
+            return RoutePlan(xy, self._latlon(xy), float(math.hypot(gx - sx, gy - sy)), 0)
+
+        from_start, d_start = self._visible_from(sx, sy)
+        to_goal, d_goal = self._visible_from(gx, gy)
+        goal_leg = dict(zip(to_goal.tolist(), d_goal.tolist()))
+        hx, hy = g.xy[:, 0] - gx, g.xy[:, 1] - gy
+        h = np.hypot(hx, hy)
+
+        best = {S: 0.0}
+        parent: Dict[int, int] = {}
+        heap: List[Tuple[float, float, int]] = [(math.hypot(sx - gx, sy - gy), 0.0, S)]
+        closed = set()
+        expanded = 0
+        while heap:
+            _, cost, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == G:
+                break
+            closed.add(u)
+            expanded += 1
+            if u == S:
+                nbrs = zip(from_start.tolist(), d_start.tolist())
+            else:
+                nbrs = zip(*self._neighbors(u))
+                if u in goal_leg:
+                    nbrs = list(nbrs) + [(G, goal_leg[u])]
+            for v, w in nbrs:
+                c = cost + w
+                if c < best.get(v, math.inf):
+                    best[v] = c
+                    parent[v] = u
+                    heapq.heappush(heap, (c + (0.0 if v == G else float(h[v])), c, v))
+        if G not in best:
+            return None
+        path = [G]
+        while path[-1] != S:
+            path.append(parent[path[-1]])
+        pts = [(sx, sy) if p == S else (gx, gy) if p == G else (float(g.xy[p, 0]), float(g.xy[p, 1])) for p in reversed(path)]
+        xy = np.asarray(pts)
+        return RoutePlan(xy, self._latlon(xy), float(best[G]), expanded)
+
+    def plan(self, start_latlon: Tuple[float, float], goal_latlon: Tuple[float, float]) -> Optional[RoutePlan]:
+        sx, sy = self.to_xy(*start_latlon)
+        gx, gy = self.to_xy(*goal_latlon)
+        return self.plan_xy((float(sx), float(sy)), (float(gx), float(gy)))
+
+    def _latlon(self, xy: np.ndarray) -> np.ndarray:
+        lat, lon = from_local_equirect(xy[:, 0], xy[:, 1], *self.origin)
+        return np.stack([lat, lon], axis=1)
+
+
+def _free_point(planner: RoutePlanner, rng: np.random.Generator, half_m: float) -> Tuple[float, float]:
+    for _ in range(10_000):
+        x, y = rng.uniform(-half_m, half_m, 2)
+        if not planner.inside(x, y):
+            return float(x), float(y)
+    raise ValueError("no free point found")
+
+
+def benchmark_scenario(n_nfzs: int, seed: int = 0) -> Tuple[Scenario, float]:
+    """Generated scenario with ~``n_nfzs`` zones (a quarter dynamic) and the half-width of its playground in metres."""
+    import tempfile
+
+    from scenario_generator import ComplexityTarget, GeneratorConfig, dump_yaml, generate_scenario
+
+    km = max(400.0, 60.0 * math.sqrt(n_nfzs))
+    cfg = GeneratorConfig(target=ComplexityTarget(mean_fixed_nfzs=0.75 * n_nfzs, mean_dynamic_nfzs=0.25 * n_nfzs), playground_km=km, suppression_km=0.0)
+    doc, _ = generate_scenario(cfg, seed=seed, index=n_nfzs)
+    with tempfile.TemporaryDirectory(prefix="planner-bench-") as tmp:
+        # Lazy geometry keeps the member text in memory, so the file is not needed after the load.
+        path = Path(tmp) / "scenario.yaml"
+        path.write_text(dump_yaml(doc), encoding="utf-8")
+        scenario = load_scenario(path)
+    return scenario, km * 500.0 * 0.95
+
+
+def benchmark(n_nfzs: int = 100, queries: int = 200, seed: int = 0) -> Dict[str, Any]:
+    """Build (cold, no cache), planner construction (warm memory cache), and A* queries on a generated scenario."""
+    scenario, half = benchmark_scenario(n_nfzs, seed)
+    t0 = time.perf_counter()
+    planner = RoutePlanner(scenario, use_cache=False)
+    build_s = time.perf_counter() - t0
+    _GRAPHS.clear()
+    cached_graph(obstacles_from_scenario(scenario, planner.origin, planner.config), planner.origin, planner.config, None)
+    t0 = time.perf_counter()
+    RoutePlanner(scenario, cache_dir=None)
+    warm_s = time.perf_counter() - t0
+
+    rng = np.random.default_rng(seed)
+    pairs = [(_free_point(planner, rng, half), _free_point(planner, rng, half)) for _ in range(queries)]
+    t0 = time.perf_counter()
+    found = sum(planner.plan_xy(a, b) is not None for a, b in pairs)
+    query_s = time.perf_counter() - t0
+
+    schedule = DynamicZoneSchedule.from_objects(scenario.objects, seed=seed)
+    t0 = time.perf_counter()
+    toggles = sum(planner.sync_schedule(schedule, t) for t in np.linspace(0.0, scenario.duration_s, 50))
+    sync_s = time.perf_counter() - t0
+    return {
+        "nfzs": sum(o.behavior == "no_fly_zone" for o in scenario.objects),
+        "vertices": planner.graph.n_vertices,
+        "edges": planner.graph.n_edges,
+        "build_s": round(build_s, 3),
+        "planner_from_cache_ms": round(warm_s * 1e3, 2),
+        "query_ms": round(query_s / queries * 1e3, 3),
+        "routes_found": f"{found}/{queries}",
+        "zone_toggles": toggles,
+        "sync_us_per_call": round(sync_s / 50 * 1e6, 1),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Shortest NFZ-free route between two points of a scenario.")
+    ap.add_argument("scenario", nargs="?", help="config-v2 scenario-*.yaml")
+    ap.add_argument("--from", dest="start", default=None, help="lat,lon")
+    ap.add_argument("--to", dest="goal", default=None, help="lat,lon")
+    ap.add_argument("--time", type=float, default=None, help="Use the dynamic NFZ state at this time (else all NFZs active)")
+    ap.add_argument("--seed", type=int, default=0, help="Schedule realization seed for --time")
+    ap.add_argument("--margin", type=float, default=PlannerConfig.margin_m)
+    ap.add_argument("--bench", type=int, default=None, metavar="NFZS", help="Benchmark on a generated scenario with ~NFZS zones")
+    args = ap.parse_args()
+
+    if args.bench is not None:
+        print(json.dumps(benchmark(args.bench), indent=2))
+        return
+    if not (args.scenario and args.start and args.goal):
+        ap.error("scenario, --from and --to are required (or --bench)")
+    scenario = load_scenario(Path(args.scenario))
+    planner = RoutePlanner(scenario, PlannerConfig(margin_m=args.margin))
+    if args.time is not None:
+        planner.sync_schedule(DynamicZoneSchedule.from_objects(scenario.objects, seed=args.seed), args.time)
+    start = tuple(float(v) for v in args.start.split(","))
+    goal = tuple(float(v) for v in args.goal.split(","))
+    plan = planner.plan(start, goal)  # type: ignore[arg-type]
+    if plan is None:
+        print(json.dumps({"route": None, "graph": planner.graph_source}))
+        return
+    print(
+        json.dumps(
+            {
+                "length_m": round(plan.length_m, 1),
+                "graph": planner.graph_source,
+                "waypoints": [{"lat": round(a, 7), "lon": round(b, 7)} for a, b in plan.latlon.tolist()],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config_loader import load_agents
+from dynamic_zones import may_toggle
+from geodesy import EARTH_RADIUS_M
+
+
+@dataclass(frozen=True)
+class ComplexityTarget:
+    """Mean scenario complexity, as in ``training_info.validation_set.mean_complexity`` of ``spec/agents.yaml``."""
+
+    mean_fixed_nfzs: float = 18.0
+    mean_dynamic_nfzs: float = 0.0
+    mean_aircraft: float = 2.0
+    mean_duration: float = 1800.0
+
+
+@dataclass(frozen=True)
+class GeneratorConfig:
+    target: ComplexityTarget = ComplexityTarget()
+    center_lat: float = 30.0
+    center_lon: float = -40.0
+    playground_km: float = 400.0
+    suppression_km: float = 200.0
+    playground_uid: Optional[str] = None
+    """Id of the playground region; defaults to ``playground-<tag>``. Must match the agent's ``playground_uid`` to resolve."""
+    agent_ref: str = "holding-20260129-1143"
+    task_name: str = "hold"
+    min_radius_m: float = 5_000.0
+    max_radius_m: float = 25_000.0
+    polygon_fraction: float = 0.25
+    """Share of NFZs emitted as ``type: polygon`` (GeoJSON FeatureCollection) instead of ``type: circle``."""
+    nfz_gap_m: float = 2_000.0
+    """Minimum clearance between any two NFZ bounding circles."""
+    aircraft_clearance_m: float = 3_000.0
+    aircraft_separation_m: float = 2_000.0
+    altitude_m: float = 1500.0
+    speed_ms: float = 90.0
+    duration_jitter: float = 0.25
+    """``duration_s`` is uniform in ``mean_duration * (1 +- duration_jitter)``."""
+    max_attempts: int = 200
+    """Placement attempts per NFZ / aircraft before it is dropped."""
+
+
+# ---------------------------------------------------------------------------
+# Spatial index
+# ---------------------------------------------------------------------------
+
+
+class GridIndex:
+    """Uniform-grid spatial hash of circles in local metres; queries touch only the neighbouring cells."""
+
+    def __init__(self, cell_m: float) -> None:
+        self.cell_m = float(cell_m)
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        self.xs: List[float] = []
+        self.ys: List[float] = []
+        self.rs: List[float] = []
+        self.max_r = 0.0
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell_m)), int(math.floor(y / self.cell_m))
+
+    def insert(self, x: float, y: float, r: float) -> int:
+        i = len(self.xs)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.rs.append(r)
+        self.max_r = max(self.max_r, r)
+        self.cells.setdefault(self._cell(x, y), []).append(i)
+        return i
+
+    def intersects(self, x: float, y: float, r: float, gap: float = 0.0) -> bool:
+        """True if the circle (x, y, r) is closer than ``gap`` to any indexed circle."""
+        reach = r + self.max_r + gap
+        span = int(math.ceil(reach / self.cell_m))
+        cx, cy = self._cell(x, y)
+        for i in range(cx - span, cx + span + 1):
+            for j in range(cy - span, cy + span + 1):
+                for k in self.cells.get((i, j), ()):
+                    lim = r + self.rs[k] + gap
+                    dx = self.xs[k] - x
+                    dy = self.ys[k] - y
+                    if dx * dx + dy * dy < lim * lim:
+                        return True
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, int(round(rng.gauss(lam, math.sqrt(lam)))))
+    limit = math.exp(-lam)
+    k, p = 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _to_lonlat(cfg: GeneratorConfig, x: float, y: float) -> Tuple[float, float]:
+    """Local east/north metres around the playground center -> (lon, lat); equirectangular is plenty at 400 km."""
+    lat = cfg.center_lat + math.degrees(y / EARTH_RADIUS_M)
+    lon = cfg.center_lon + math.degrees(x / (EARTH_RADIUS_M * math.cos(math.radians(cfg.center_lat))))
+    return round(lon, 9), round(lat, 9)
+
+
+def _point(lon: float, lat: float, alt: float) -> Dict[str, Any]:
+    return {"type": "Feature", "properties": {}, "geometry": {"type": "Point", "coordinates": [lon, lat, alt]}}
+
+
+def _box_region(cfg: GeneratorConfig, uid: str, size_km: float) -> Dict[str, Any]:
+    h = size_km * 500.0
+    ring = [list(_to_lonlat(cfg, x, y)) for x, y in ((-h, -h), (h, -h), (h, h), (-h, h), (-h, -h))]
+    return {
+        "id": uid,
+        "type": "region",
+        "description": "",
+        "centroid": _point(cfg.center_lon, cfg.center_lat, 0),
+        "region": [
+            {
+                "type": "Feature",
+                "properties": {
+                    "name": uid,
+                    "box": f"{size_km:g}km",
+                    "width_km": size_km,
+                    "height_km": size_km,
+                    "center": {"lat": cfg.center_lat, "lon": cfg.center_lon},
+                },
+                "geometry": {"type": "Polygon", "coordinates": [ring]},
+            }
+        ],
+        "behavior": "",
+        "parameters": {"initial_state": 1, "probability": 0.0, "time": math.inf},
+    }
+
+
+def _nfz_parameters(rng: random.Random, dynamic: bool, duration_s: float) -> Dict[str, Any]:
+    if not dynamic:
+        return {"initial_state": 1, "probability": 0.0, "time": math.inf}
+    # Appears (or disappears) once, somewhere inside the run.
+    return {
+        "initial_state": rng.choice((0, 1)),
+        "probability": round(rng.uniform(0.5, 1.0), 3),
+        "time": round(rng.uniform(0.1, 0.9) * duration_s, 1),
+    }
+
+
+def _nfz_object(
+    cfg: GeneratorConfig, rng: random.Random, uid: str, x: float, y: float, r: float, dynamic: bool, duration_s: float
+) -> Dict[str, Any]:
+    lon, lat = _to_lonlat(cfg, x, y)
+    base: Dict[str, Any] = {"id": uid}
+    if rng.random() < cfg.polygon_fraction:
+        # Star-shaped polygon inscribed in the bounding circle, so circle overlap tests stay conservative.
+        n = rng.randint(5, 9)
+        angles = sorted(rng.uniform(0.0, 2.0 * math.pi) for _ in range(n))
+        ring = [list(_to_lonlat(cfg, x + r * rng.uniform(0.6, 1.0) * math.cos(a), y + r * rng.uniform(0.6, 1.0) * math.sin(a))) for a in angles]
+        ring.append(ring[0])
+        base.update(
+            {
+                "type": "polygon",
+                "description": "",
+                "centroid": _point(lon, lat, cfg.altitude_m),
+                "polygon": {
+                    "type": "FeatureCollection",
+                    "features": [{"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [ring]}}],
+                },
+            }
+        )
+    else:
+        base.update(
+            {
+                "type": "circle",
+                "description": "",
+                "geolocation": [_point(lon, lat, cfg.altitude_m)],
+                "centroid": _point(lon, lat, cfg.altitude_m),
+                "radius": [round(r, 1)],
+            }
+        )
+    base["behavior"] = "no_fly_zone"
+    # Same shape as the config-v2 instance scenarios: toggling is described by ``parameters``.
+    base["schedule_on"] = "always"
+    base["parameters"] = _nfz_parameters(rng, dynamic, duration_s)
+    return base
+
+
+def generate_scenario(cfg: GeneratorConfig, seed: int, index: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Samples one config-v2 scenario; returns (scenario document, realized complexity).
+
+    Deterministic in (seed, index), independent of how the indices are split across workers.
+    """
+    rng = random.Random(f"{seed}/{index}")
+    tag = f"gen{seed}-{index:06d}"
+    t = cfg.target
+
+    duration_s = round(t.mean_duration * rng.uniform(1.0 - cfg.duration_jitter, 1.0 + cfg.duration_jitter), 1)
+    n_fixed = _poisson(rng, t.mean_fixed_nfzs)
+    n_dynamic = _poisson(rng, t.mean_dynamic_nfzs)
+    # At least one aircraft, without biasing the mean: 1 + Poisson(mean - 1).
+    n_aircraft = 1 + _poisson(rng, t.mean_aircraft - 1.0) if t.mean_aircraft > 0 else 0
+
+    playground_uid = cfg.playground_uid or f"playground-{tag}"
+    half = cfg.playground_km * 500.0
+    objects: List[Dict[str, Any]] = [_box_region(cfg, playground_uid, cfg.playground_km)]
+    if cfg.suppression_km > 0:
+        objects.append(_box_region(cfg, f"suppression_zone-{tag}", cfg.suppression_km))
+
+    zones = GridIndex(2.0 * cfg.max_radius_m + cfg.nfz_gap_m)
+    nfzs: List[Dict[str, Any]] = []
+    dropped = 0
+    log_lo, log_hi = math.log(cfg.min_radius_m), math.log(cfg.max_radius_m)
+    for k, dynamic in enumerate([False] * n_fixed + [True] * n_dynamic):
+        for _ in range(cfg.max_attempts):
+            r = math.exp(rng.uniform(log_lo, log_hi))
+            x = rng.uniform(-half + r, half - r)
+            y = rng.uniform(-half + r, half - r)
+            if not zones.intersects(x, y, r, cfg.nfz_gap_m):
+                zones.insert(x, y, r)
+                nfzs.append(_nfz_object(cfg, rng, f"nfz-{k + 1}-{tag}", x, y, r, dynamic, duration_s))
+                break
+        else:
+            dropped += 1
+
+    aircraft = GridIndex(max(cfg.aircraft_separation_m, 1.0))
+    margin = cfg.aircraft_clearance_m
+    placed = 0
+    for a in range(n_aircraft):
+        for _ in range(cfg.max_attempts):
+            x = rng.uniform(-half + margin, half - margin)
+            y = rng.uniform(-half + margin, half - margin)
+            if zones.intersects(x, y, 0.0, margin) or aircraft.intersects(x, y, 0.0, cfg.aircraft_separation_m):
+                continue
+            aircraft.insert(x, y, 0.0)
+            lon, lat = _to_lonlat(cfg, x, y)
+            uid = f"aircraft-{a + 1}-{tag}"
+            objects.append(
+                {
+                    "id": uid,
+                    "type": "aircraft",
+                    "description": "",
+                    "initial_position": _point(lon, lat, cfg.altitude_m),
+                    "autonomous_tasks": [{"unique_id": f"task-{cfg.task_name}-{uid}", "name": cfg.task_name, "agent_ref": cfg.agent_ref}],
+                    "behavior": "",
+                    "parameters": {
+                        "initial_state": {
+                            "position": _point(lon, lat, cfg.altitude_m),
+                            "heading": round(rng.uniform(0.0, 360.0), 3),
+                            "speed": cfg.speed_ms,
+                        }
+                    },
+                }
+            )
+            placed += 1
+            break
+        else:
+            dropped += 1
+
+    objects.extend(nfzs)
+    doc = {
+        "scenario": {
+            "id": f"scenario-{tag}",
+            "description": f"Generated scenario (seed {seed}, index {index})",
+            "duration_s": duration_s,
+            "objects": objects,
+        }
+    }
+    realized = {
+        "fixed_nfzs": sum(1 for o in nfzs if not may_toggle(o["parameters"])),
+        "dynamic_nfzs": sum(1 for o in nfzs if may_toggle(o["parameters"])),
+        "aircraft": placed,
+        "duration": duration_s,
+        "dropped": dropped,
+    }
+    return doc, realized
+
+
+# ---------------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------------
+
+_PLAIN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-]*")
+_YAML_WORDS = frozenset({"y", "n", "yes", "no", "true", "false", "on", "off", "null", "~"})
+
+
+def _scalar(v: Any) -> str:
+    if v is None:
+        return "null"
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        if math.isnan(v):
+            return ".nan"
+        if math.isinf(v):
+            return ".inf" if v > 0 else "-.inf"
+        s = repr(v)
+        if "e" in s and "." not in s:  # YAML 1.1 floats need a dot before the exponent
+            s = s.replace("e", ".0e", 1)
+        return s
+    s = str(v)
+    if _PLAIN_RE.fullmatch(s) and s.lower() not in _YAML_WORDS:
+        return s
+    return json.dumps(s)
+
+
+def _emit(value: Any, indent: int, out: List[str]) -> None:
+    pad = " " * indent
+    if isinstance(value, dict):
+        for k, v in value.items():
+            if isinstance(v, dict) and v:
+                out.append(f"{pad}{k}:")
+                _emit(v, indent + 2, out)
+            elif isinstance(v, list) and v:
+                out.append(f"{pad}{k}:")
+                _emit(v, indent, out)
+            else:
+                out.append(f"{pad}{k}: {_block_empty(v)}")
+    else:
+        for item in value:
+            if isinstance(item, (dict, list)) and item:
+                start = len(out)
+                _emit(item, indent + 2, out)
+                out[start] = f"{pad}- {out[start][indent + 2:]}"
+            else:
+                out.append(f"{pad}- {_block_empty(item)}")
+
+
+def _block_empty(v: Any) -> str:
+    if isinstance(v, dict):
+        return "{}"
+    if isinstance(v, list):
+        return "[]"
+    return _scalar(v)
+
+
+def dump_yaml(doc: Dict[str, Any]) -> str:
+    """Block-style YAML in the layout of the hand-authored scenario files.
+
+    Only handles the plain dict/list/str/number documents built here, but is several times faster
+    than ``yaml.dump`` even with libyaml, which matters when writing thousands of files.
+    """
+    out: List[str] = []
+    _emit(doc, 0, out)
+    out.append("")
+    return "\n".join(out)
+
+
+def _write_range(cfg: GeneratorConfig, seed: int, start: int, stop: int, out_dir: str) -> List[Dict[str, Any]]:
+    out = Path(out_dir)
+    rows = []
+    for index in range(start, stop):
+        doc, realized = generate_scenario(cfg, seed, index)
+        path = out / f"{doc['scenario']['id']}.yaml"
+        path.write_text(dump_yaml(doc), encoding="utf-8")
+        realized["path"] = path.name
+        rows.append(realized)
+    return rows
+
+
+def generate_set(
+    cfg: GeneratorConfig, count: int, out_dir: Path, seed: int = 0, workers: Optional[int] = None, chunk: int = 250
+) -> Dict[str, Any]:
+    """Writes ``count`` scenarios into ``out_dir`` plus ``manifest.jsonl``; returns realized-vs-target statistics."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    ranges = [(s, min(count, s + chunk)) for s in range(0, count, chunk)]
+
+    t0 = time.perf_counter()
+    if workers == 1 or len(ranges) == 1:
+        parts = [_write_range(cfg, seed, a, b, str(out_dir)) for a, b in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = [ex.submit(_write_range, cfg, seed, a, b, str(out_dir)) for a, b in ranges]
+            parts = [f.result() for f in futures]
+    rows = [r for part in parts for r in part]
+    elapsed = time.perf_counter() - t0
+
+    with (out_dir / "manifest.jsonl").open("w", encoding="utf-8") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+    n = max(1, len(rows))
+    return {
+        "count": len(rows),
+        "seed": seed,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "scenarios_per_s": round(len(rows) / elapsed, 1) if elapsed > 0 else None,
+        "target": asdict(cfg.target),
+        "realized": {
+            "mean_fixed_nfzs": sum(r["fixed_nfzs"] for r in rows) / n,
+            "mean_dynamic_nfzs": sum(r["dynamic_nfzs"] for r in rows) / n,
+            "mean_aircraft": sum(r["aircraft"] for r in rows) / n,
+            "mean_duration": sum(r["duration"] for r in rows) / n,
+        },
+        "dropped_placements": sum(r["dropped"] for r in rows),
+    }
+
+
+def target_from_agent(agents_path: Path, agent_id: str) -> Tuple[ComplexityTarget, Dict[str, Any]]:
+    """Complexity target and hyperparameters of one agent's validation set in ``spec/agents.yaml``."""
+    for a in load_agents(agents_path):
+        if a.id != agent_id:
+            continue
+        mc = ((a.raw.get("training_info") or {}).get("validation_set") or {}).get("mean_complexity") or {}
+        target = ComplexityTarget(**{k: float(v) for k, v in mc.items() if k in ComplexityTarget.__dataclass_fields__})
+        return target, a.hyperparameters
+    raise ValueError(f"{agents_path}: unknown agent id {agent_id!r}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", required=True, help="Output folder for scenario-*.yaml and manifest.jsonl")
+    ap.add_argument("--count", type=int, default=None, help="Defaults to the agent's validation_set.size, else 100")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--agents", default=str(Path(__file__).resolve().parent.parent / "config-v2" / "spec" / "agents.yaml"))
+    ap.add_argument("--agent", default=None, help="Take the complexity target from this agent's validation_set")
+    ap.add_argument("--fixed-nfzs", type=float, default=None)
+    ap.add_argument("--dynamic-nfzs", type=float, default=None)
+    ap.add_argument("--aircraft", type=float, default=None)
+    ap.add_argument("--duration", type=float, default=None)
+    args = ap.parse_args()
+
+    cfg = GeneratorConfig()
+    count = args.count
+    if args.agent:
+        target, hyper = target_from_agent(Path(args.agents), args.agent)
+        cfg = replace(cfg, target=target, agent_ref=args.agent, playground_uid=hyper.get("playground_uid"))
+        if count is None:
+            count = next(a.validation_set_size for a in load_agents(Path(args.agents)) if a.id == args.agent)
+    overrides = {
+        "mean_fixed_nfzs": args.fixed_nfzs,
+        "mean_dynamic_nfzs": args.dynamic_nfzs,
+        "mean_aircraft": args.aircraft,
+        "mean_duration": args.duration,
+    }
+    cfg = replace(cfg, target=replace(cfg.target, **{k: v for k, v in overrides.items() if v is not None}))
+
+    stats = generate_set(cfg, count or 100, Path(args.out), seed=args.seed, workers=args.workers)
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
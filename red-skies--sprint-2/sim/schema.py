@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+# The dev schema lives with the sprint-0 training artifacts; expose it here so the sim modules
+# share one set of dataclasses instead of carrying copies.
+_DEV_SCHEMAS = Path(__file__).resolve().parents[2] / "red-skies--sprint-0" / "schemas" / "dev"
+if str(_DEV_SCHEMAS) not in sys.path:
+    sys.path.insert(0, str(_DEV_SCHEMAS))
+
+from models import (  # noqa: E402
+    Attitude,
+    BodyVelocity,
+    Detection,
+    DetectionReport,
+    EntityConfig,
+    EntityState,
+    EntityType,
+    LocalVelocity,
+    Position,
+    SimulationState,
+)
+
+__all__ = [
+    "Attitude",
+    "BodyVelocity",
+    "Detection",
+    "DetectionReport",
+    "EntityConfig",
+    "EntityState",
+    "EntityType",
+    "LocalVelocity",
+    "Position",
+    "SimulationState",
+]
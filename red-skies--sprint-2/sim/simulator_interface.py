@@ -0,0 +1,39 @@
+from abc import ABC, abstractmethod
+from typing import Any, Tuple
+
+
+class SimulatorInterface(ABC):
+    """Simulator contract of ``HoldingAgentLidarEnv`` (sprint-1 ``ai/README-michal.md``).
+
+    Mirrors ``envs/simulators/base.py`` so backends written here (kinematic stand-in, ...) drop
+    into the env next to the BlueSky / JSBSim implementations.
+    """
+
+    @abstractmethod
+    def reset(self, **kwargs: Any) -> None:
+        """Resets the simulation; kwargs as in the env (``aircraft_initial_lat``, ``aircraft_initial_lon``,
+        ``aircraft_initial_hdg``, ``aircraft_alt``, ``speed``, ``aircraft_type``)."""
+
+    @abstractmethod
+    def step(self, dt: float) -> None:
+        """Advances the simulation by ``dt`` seconds."""
+
+    @abstractmethod
+    def get_aircraft_position(self, aircraft_id: str) -> Tuple[float, float, float]:
+        """(lat deg, lon deg, alt m)."""
+
+    @abstractmethod
+    def get_aircraft_heading(self, aircraft_id: str) -> float:
+        """Degrees clockwise from true north."""
+
+    @abstractmethod
+    def get_aircraft_speed(self, aircraft_id: str) -> float:
+        """Metres per second."""
+
+    @abstractmethod
+    def set_heading_change(self, aircraft_id: str, heading_change_deg: float) -> None:
+        """Commands a heading change relative to the current heading."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Releases simulator resources."""
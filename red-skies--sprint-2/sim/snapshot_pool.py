@@ -0,0 +1,355 @@
+import argparse
+import copy
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+import numpy as np
+
+from config_loader import AgentSpec, Scenario, load_experiment, load_scenario
+from dynamic_zones import DynamicZoneSchedule
+from evaluation_runner import SIMULATORS, EpisodeContext, HoldingStubPolicy, build_context, run_episode
+from geodesy import destination_point, haversine_m
+from schema import Position, SimulationState
+from stepping_harness import LatencyHistogram
+
+
+@dataclass(frozen=True)
+class SnapshotConfig:
+    """``runtime.snapshots`` of an experiment."""
+
+    size: int = 8
+    """Snapshots kept ready; the worker refills as soon as one is taken."""
+    randomize: bool = True
+    """Re-sample aircraft positions and headings in the playground, as the holding env's ``reset`` does."""
+    spawn_fraction: float = 0.8
+    """Spawn radius as a fraction of the playground radius (bounding radius for polygons)."""
+
+    @classmethod
+    def from_runtime(cls, runtime: Dict[str, Any]) -> "SnapshotConfig":
+        block = dict(runtime.get("snapshots") or {})
+        unknown = sorted(set(block) - set(cls.__dataclass_fields__))
+        if unknown:
+            raise ValueError(f"runtime.snapshots: unknown key(s) {unknown}")
+        cfg = cls(**block)
+        cfg.validate()
+        return cfg
+
+    def validate(self) -> None:
+        if self.size < 1:
+            raise ValueError("size must be >= 1")
+        if not 0.0 < self.spawn_fraction <= 1.0:
+            raise ValueError("spawn_fraction must be in (0, 1]")
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A scenario loaded, randomized and put into a simulator, ready to be restored."""
+
+    seed: int
+    ctx: EpisodeContext
+    sim: Dict[str, Any]
+    """``simulator.snapshot()`` right after the reset."""
+    state: SimulationState
+    """The initial world state (a private copy)."""
+    build_s: float
+
+
+# ---------------------------------------------------------------------------
+# Building snapshots
+# ---------------------------------------------------------------------------
+
+
+def randomize_aircraft(ctx: EpisodeContext, rng: np.random.Generator, spawn_fraction: float = 0.8) -> Dict[str, Tuple[Position, float, float]]:
+    """Uniform-over-area positions and uniform headings inside the playground (README-michal.md, reset step 3).
+
+    Altitude and speed keep their scenario values.
+    """
+    lat0, lon0 = ctx.center
+    radius = ctx.playground_radius_m
+    if radius is None and ctx.playground_ring is not None:
+        radius = float(haversine_m(lat0, lon0, ctx.playground_ring[:, 0], ctx.playground_ring[:, 1]).min())
+    if not radius:
+        raise ValueError(f"{ctx.scenario.id}: playground has no radius to sample in")
+    n = len(ctx.aircraft)
+    r = radius * spawn_fraction * np.sqrt(rng.uniform(0.0, 1.0, n))
+    lat, lon = destination_point(lat0, lon0, rng.uniform(0.0, 360.0, n), r)
+    heading = rng.uniform(0.0, 360.0, n)
+    return {
+        uid: (Position(float(la), float(lo), p.altitude), float(h), spd)
+        for (uid, (p, _, spd)), la, lo, h in zip(ctx.aircraft.items(), lat, lon, heading)
+    }
+
+
+class ScenarioSnapshotter:
+    """Builds snapshots of one scenario; the YAML load and context build happen once, up front.
+
+    Per snapshot only the seed-dependent parts are redone: aircraft placement, the dynamic-zone
+    schedule and the simulator reset.
+    """
+
+    def __init__(
+        self,
+        scenario: Scenario,
+        agent: AgentSpec,
+        simulator: str = "kinematic",
+        dt: float = 0.05,
+        max_duration_s: Optional[float] = None,
+        config: SnapshotConfig = SnapshotConfig(),
+    ) -> None:
+        if simulator not in SIMULATORS:
+            raise ValueError(f"unknown simulator {simulator!r}; expected one of {sorted(SIMULATORS)}")
+        config.validate()
+        self.config = config
+        self.simulator = simulator
+        self.base = build_context(scenario, agent, dt, max_duration_s)
+        self._nfz_objects = [o for o in scenario.objects if o.behavior == "no_fly_zone"]
+
+    def build(self, seed: int) -> Snapshot:
+        t0 = time.perf_counter()
+        ctx = replace(self.base, schedule=DynamicZoneSchedule.from_objects(self._nfz_objects, seed=seed))
+        if self.config.randomize:
+            ctx = replace(ctx, aircraft=randomize_aircraft(ctx, np.random.default_rng(seed), self.config.spawn_fraction))
+        sim = SIMULATORS[self.simulator](ctx)
+        state = copy.deepcopy(sim.world_state())
+        return Snapshot(seed=seed, ctx=ctx, sim=sim.snapshot(), state=state, build_s=time.perf_counter() - t0)
+
+    def restore(self, snap: Snapshot, sim: Any = None) -> Any:
+        """Resets ``sim`` to ``snap`` in place, or builds the simulator on the first call."""
+        if sim is None:
+            sim = SIMULATORS[self.simulator](snap.ctx)
+        sim.restore(snap.sim)
+        return sim
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+class SnapshotPool:
+    """Keeps ``size`` snapshots ready and refills them on a background thread.
+
+    ``take`` pops a ready snapshot; if the worker fell behind it builds one inline and counts a
+    miss. Seeds are handed out in order from ``seed``, so a run is reproducible as long as the
+    consumer does not depend on which snapshot came from the worker.
+    """
+
+    def __init__(self, build: Callable[[int], Snapshot], size: int = 8, seed: int = 0) -> None:
+        if size < 1:
+            raise ValueError("size must be >= 1")
+        self.size = size
+        self._build = build
+        self._ready: Deque[Snapshot] = deque()
+        self._cond = threading.Condition()
+        self._next_seed = seed
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.hits = 0
+        self.misses = 0
+        self.built = 0
+        self.build_s = 0.0
+        self.take_latency = LatencyHistogram()
+        self._thread = threading.Thread(target=self._run, name="snapshot-pool", daemon=True)
+        self._thread.start()
+
+    def _seed(self) -> int:
+        seed = self._next_seed
+        self._next_seed += 1
+        return seed
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed and len(self._ready) >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                seed = self._seed()
+            try:
+                snap = self._build(seed)
+            except BaseException as exc:  # surfaced to the consumer on its next take
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._ready.append(snap)
+                self.built += 1
+                self.build_s += snap.build_s
+                self._cond.notify_all()
+
+    def warm(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the pool is full; False on timeout."""
+        with self._cond:
+            ok = self._cond.wait_for(lambda: len(self._ready) >= self.size or self._error is not None, timeout)
+            if self._error is not None:
+                raise self._error
+            return ok
+
+    def take(self) -> Snapshot:
+        t0 = time.perf_counter()
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            if self._closed:
+                raise ValueError("snapshot pool is closed")
+            if self._ready:
+                snap = self._ready.popleft()
+                self.hits += 1
+                self._cond.notify_all()
+                self.take_latency.record(time.perf_counter() - t0)
+                return snap
+            seed = self._seed()
+            self.misses += 1
+        snap = self._build(seed)
+        self.take_latency.record(time.perf_counter() - t0)
+        return snap
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            lat = self.take_latency.to_dict()
+            return {
+                "ready": len(self._ready),
+                "hits": self.hits,
+                "misses": self.misses,
+                "built": self.built,
+                "build_ms_mean": self.build_s / self.built * 1e3 if self.built else 0.0,
+                "take_ms": {k: lat[k] for k in ("count", "mean_ms", "p50_ms", "p99_ms", "max_ms")},
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._ready.clear()
+            self._cond.notify_all()
+        self._thread.join()
+
+    def __enter__(self) -> "SnapshotPool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def open_pool(
+    scenario_path: Path,
+    agent: AgentSpec,
+    simulator: str = "kinematic",
+    dt: float = 0.05,
+    max_duration_s: Optional[float] = None,
+    config: SnapshotConfig = SnapshotConfig(),
+    seed: int = 0,
+) -> Tuple[ScenarioSnapshotter, SnapshotPool]:
+    snapshotter = ScenarioSnapshotter(load_scenario(Path(scenario_path)), agent, simulator, dt, max_duration_s, config)
+    return snapshotter, SnapshotPool(snapshotter.build, config.size, seed)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def benchmark(
+    experiment: Path,
+    episodes: int = 200,
+    episode_steps: int = 20,
+    simulator: str = "kinematic",
+    config: SnapshotConfig = SnapshotConfig(),
+) -> Dict[str, Any]:
+    """Short episodes with a full reset (scenario load, context, simulator) vs a pooled restore."""
+    cfg = load_experiment(Path(experiment))
+    refs = [t.agent_ref for o in cfg.scenario.objects for t in o.autonomous_tasks]
+    if not refs:
+        raise ValueError(f"{experiment}: scenario assigns no agent")
+    agent = cfg.agent(refs[0])
+    dt = 1.0 / float(cfg.experiment.runtime.get("step_hz", 20))
+    horizon = episode_steps * dt
+    scenario_path = Path(cfg.experiment.scenario_file)
+
+    def cold(seed: int) -> Tuple[EpisodeContext, Any]:
+        ctx = build_context(load_scenario(scenario_path), agent, dt, horizon, seed)
+        if config.randomize:
+            ctx = replace(ctx, aircraft=randomize_aircraft(ctx, np.random.default_rng(seed), config.spawn_fraction))
+        return ctx, SIMULATORS[simulator](ctx)
+
+    reset_s = 0.0
+    t0 = time.perf_counter()
+    for k in range(episodes):
+        r0 = time.perf_counter()
+        ctx, sim = cold(k)
+        reset_s += time.perf_counter() - r0
+        run_episode(ctx, HoldingStubPolicy, simulator, sim=sim)
+    cold_s = time.perf_counter() - t0
+    cold_reset_s = reset_s
+
+    snapshotter, pool = open_pool(scenario_path, agent, simulator, dt, horizon, config)
+    with pool:
+        pool.warm()
+        sim = None
+        reset_s = 0.0
+        t0 = time.perf_counter()
+        for _ in range(episodes):
+            r0 = time.perf_counter()
+            snap = pool.take()
+            sim = snapshotter.restore(snap, sim)
+            reset_s += time.perf_counter() - r0
+            run_episode(snap.ctx, HoldingStubPolicy, simulator, sim=sim)
+        pooled_s = time.perf_counter() - t0
+        stats = pool.stats()
+
+    return {
+        "simulator": simulator,
+        "aircraft": len(snapshotter.base.aircraft),
+        "episodes": episodes,
+        "episode_steps": episode_steps,
+        "cold_reset_ms": cold_reset_s / episodes * 1e3,
+        "cold_reset_share": cold_reset_s / cold_s,
+        "cold_episodes_per_s": episodes / cold_s,
+        "pooled_reset_ms": reset_s / episodes * 1e3,
+        "pooled_reset_share": reset_s / pooled_s,
+        "pooled_episodes_per_s": episodes / pooled_s,
+        "pool": stats,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("experiment", help="config-v2 instance/experiment-*.yaml")
+    ap.add_argument("--sim", default="kinematic", choices=sorted(SIMULATORS))
+    ap.add_argument("--episodes", type=int, default=200)
+    ap.add_argument("--steps", type=int, default=20, help="Steps per (short) episode")
+    ap.add_argument("--size", type=int, default=None, help="Pool size; defaults to runtime.snapshots.size")
+    ap.add_argument("--bench", action="store_true")
+    args = ap.parse_args()
+
+    cfg = load_experiment(Path(args.experiment))
+    config = SnapshotConfig.from_runtime(cfg.experiment.runtime)
+    if args.size is not None:
+        config = replace(config, size=args.size)
+        config.validate()
+    if args.bench:
+        print(json.dumps(benchmark(Path(args.experiment), args.episodes, args.steps, args.sim, config), indent=2))
+        return
+
+    refs = [t.agent_ref for o in cfg.scenario.objects for t in o.autonomous_tasks]
+    if not refs:
+        ap.error("scenario assigns no agent")
+    dt = 1.0 / float(cfg.experiment.runtime.get("step_hz", 20))
+    snapshotter, pool = open_pool(Path(cfg.experiment.scenario_file), cfg.agent(refs[0]), args.sim, dt, args.steps * dt, config)
+    with pool:
+        sim = None
+        for _ in range(args.episodes):
+            snap = pool.take()
+            sim = snapshotter.restore(snap, sim)
+            row = run_episode(snap.ctx, HoldingStubPolicy, args.sim, sim=sim)
+            print(json.dumps({"seed": snap.seed, **row}))
+        print(json.dumps(pool.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import struct
+from typing import Any, Dict, Tuple
+
+from schema import (
+    Attitude,
+    BodyVelocity,
+    Detection,
+    DetectionReport,
+    EntityState,
+    EntityType,
+    LocalVelocity,
+    Position,
+    SimulationState,
+)
+
+
+UID_BYTES = 32
+
+# Binary layout (little-endian, no padding):
+#   frame:     time f64 | frame i64 | n_entities u32 | entity * n_entities
+#   entity:    uid 32s | type u8 | position 3*f64 | attitude 3*f64 | body_velocity 3*f64
+#              | local_velocity 3*f64 | speed f64 | n_detections u16 | detection * n_detections
+#   detection: uid 32s | distance f64 | azimuth f64
+FRAME_HEADER = struct.Struct("<dqI")
+ENTITY = struct.Struct(f"<{UID_BYTES}sB13dH")
+DETECTION = struct.Struct(f"<{UID_BYTES}s2d")
+
+
+def _uid_bytes(uid: str) -> bytes:
+    raw = uid.encode("utf-8")
+    if len(raw) > UID_BYTES:
+        raise ValueError(f"uid longer than {UID_BYTES} bytes: {uid!r}")
+    return raw
+
+
+def _uid_str(raw: bytes) -> str:
+    return raw.rstrip(b"\x00").decode("utf-8")
+
+
+def state_to_dict(state: SimulationState) -> Dict[str, Any]:
+    entities: Dict[str, Any] = {}
+    for uid, e in state.entities.items():
+        p, a, b, v = e.position, e.attitude, e.body_velocity, e.local_velocity
+        entities[uid] = {
+            "uid": e.uid,
+            "type": int(e.type),
+            "position": {"latitude": p.latitude, "longitude": p.longitude, "altitude": p.altitude},
+            "attitude": {"roll": a.roll, "pitch": a.pitch, "yaw": a.yaw},
+            "body_velocity": {"forward": b.forward, "right": b.right, "down": b.down},
+            "local_velocity": {"north": v.north, "east": v.east, "down": v.down},
+            "speed": e.speed,
+            "report": {
+                "detections": {
+                    k: {"uid": d.uid, "distance": d.distance, "azimuth": d.azimuth}
+                    for k, d in e.report.detections.items()
+                }
+            },
+        }
+    # time/frame first: replay indexing reads them without parsing the whole line.
+    return {"time": state.time, "frame": state.frame, "entities": entities}
+
+
+def state_from_dict(data: Dict[str, Any]) -> SimulationState:
+    entities: Dict[str, EntityState] = {}
+    for uid, e in (data.get("entities") or {}).items():
+        detections = (e.get("report") or {}).get("detections") or {}
+        entities[uid] = EntityState(
+            uid=e.get("uid", uid),
+            type=EntityType(int(e.get("type", 0))),
+            position=Position(**(e.get("position") or {})),
+            attitude=Attitude(**(e.get("attitude") or {})),
+            body_velocity=BodyVelocity(**(e.get("body_velocity") or {})),
+            local_velocity=LocalVelocity(**(e.get("local_velocity") or {})),
+            speed=float(e.get("speed", 0.0)),
+            report=DetectionReport(detections={k: Detection(**d) for k, d in detections.items()}),
+        )
+    return SimulationState(time=float(data.get("time", 0.0)), frame=int(data.get("frame", 0)), entities=entities)
+
+
+def encoded_size(state: SimulationState) -> int:
+    n = FRAME_HEADER.size
+    for e in state.entities.values():
+        n += ENTITY.size + DETECTION.size * len(e.report.detections)
+    return n
+
+
+def encode_state_into(state: SimulationState, buf: Any, offset: int = 0) -> int:
+    """Packs ``state`` into a writable buffer at ``offset``; returns the offset past the frame."""
+    FRAME_HEADER.pack_into(buf, offset, state.time, state.frame, len(state.entities))
+    offset += FRAME_HEADER.size
+    for e in state.entities.values():
+        p, a, b, v = e.position, e.attitude, e.body_velocity, e.local_velocity
+        dets = e.report.detections
+        ENTITY.pack_into(
+            buf,
+            offset,
+            _uid_bytes(e.uid),
+            int(e.type),
+            p.latitude,
+            p.longitude,
+            p.altitude,
+            a.roll,
+            a.pitch,
+            a.yaw,
+            b.forward,
+            b.right,
+            b.down,
+            v.north,
+            v.east,
+            v.down,
+            e.speed,
+            len(dets),
+        )
+        offset += ENTITY.size
+        for d in dets.values():
+            DETECTION.pack_into(buf, offset, _uid_bytes(d.uid), d.distance, d.azimuth)
+            offset += DETECTION.size
+    return offset
+
+
+def encode_state(state: SimulationState) -> bytes:
+    buf = bytearray(encoded_size(state))
+    encode_state_into(state, buf)
+    return bytes(buf)
+
+
+def decode_state_from(buf: Any, offset: int = 0) -> Tuple[SimulationState, int]:
+    """Unpacks one frame from ``buf`` at ``offset``; returns the state and the offset past it."""
+    time_s, frame, n_entities = FRAME_HEADER.unpack_from(buf, offset)
+    offset += FRAME_HEADER.size
+    entities: Dict[str, EntityState] = {}
+    for _ in range(n_entities):
+        f = ENTITY.unpack_from(buf, offset)
+        offset += ENTITY.size
+        detections: Dict[str, Detection] = {}
+        for _ in range(f[15]):
+            duid, dist, az = DETECTION.unpack_from(buf, offset)
+            offset += DETECTION.size
+            uid = _uid_str(duid)
+            detections[uid] = Detection(uid=uid, distance=dist, azimuth=az)
+        uid = _uid_str(f[0])
+        entities[uid] = EntityState(
+            uid=uid,
+            type=EntityType(f[1]),
+            position=Position(f[2], f[3], f[4]),
+            attitude=Attitude(f[5], f[6], f[7]),
+            body_velocity=BodyVelocity(f[8], f[9], f[10]),
+            local_velocity=LocalVelocity(f[11], f[12], f[13]),
+            speed=f[14],
+            report=DetectionReport(detections=detections),
+        )
+    return SimulationState(time=time_s, frame=frame, entities=entities), offset
+
+
+def decode_state(buf: Any) -> SimulationState:
+    return decode_state_from(buf, 0)[0]
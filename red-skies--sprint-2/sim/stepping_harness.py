@@ -0,0 +1,401 @@
+import argparse
+import bisect
+import copy
+import json
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from schema import Attitude, EntityState, EntityType, LocalVelocity, Position, SimulationState
+from state_codec import decode_state, encode_state
+
+
+METERS_PER_DEG = 111_319.9
+MAX_HEADING_CHANGE_DEG = 30.0
+
+PHASES = ("observation_encode", "agent_inference", "action_apply", "step")
+
+
+@dataclass(frozen=True)
+class Action:
+    entity_id: str
+    heading_change_deg: float
+
+
+class LatencyHistogram:
+    """Log-spaced latency histogram (1 us .. ~10 s) with constant-time ``record``."""
+
+    def __init__(self, min_s: float = 1e-6, max_s: float = 10.0, buckets_per_decade: int = 10) -> None:
+        decades = math.log10(max_s / min_s)
+        n = int(round(decades * buckets_per_decade))
+        self.edges: List[float] = [min_s * 10 ** (i / buckets_per_decade) for i in range(n + 1)]
+        self.counts: List[int] = [0] * (n + 2)  # underflow + buckets + overflow
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_right(self.edges, seconds)] += 1
+        self.count += 1
+        self.total_s += seconds
+        if seconds > self.max_s:
+            self.max_s = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.edges != self.edges:
+            raise ValueError("cannot merge histograms with different bucket edges")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_s += other.total_s
+        self.max_s = max(self.max_s, other.max_s)
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q / 100.0 * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target and c:
+                if i == len(self.edges):
+                    return self.max_s  # overflow bucket: no upper edge, only the observed maximum
+                # The bucket's upper edge bounds every sample in it, but no sample exceeds ``max_s``.
+                return min(self.edges[i], self.max_s)
+        return self.max_s
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total_s / self.count * 1e3) if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p90_ms": self.percentile(90) * 1e3,
+            "p99_ms": self.percentile(99) * 1e3,
+            "max_ms": self.max_s * 1e3,
+            "edges_ms": [e * 1e3 for e in self.edges],
+            "counts": list(self.counts),
+        }
+
+
+class TickStats:
+    def __init__(self, deadline_s: float) -> None:
+        self.deadline_s = deadline_s
+        self.phases: Dict[str, LatencyHistogram] = {p: LatencyHistogram() for p in PHASES}
+        self.tick = LatencyHistogram()
+        self.ticks = 0
+        self.deadline_misses = 0
+        self.actions_applied = 0
+        self.unknown_entity_errors = 0
+
+    def end_tick(self, tick_s: float) -> None:
+        self.ticks += 1
+        self.tick.record(tick_s)
+        if tick_s > self.deadline_s:
+            self.deadline_misses += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "deadline_ms": self.deadline_s * 1e3,
+            "ticks": self.ticks,
+            "deadline_misses": self.deadline_misses,
+            "deadline_miss_rate": self.deadline_misses / self.ticks if self.ticks else 0.0,
+            "actions_applied": self.actions_applied,
+            "unknown_entity_errors": self.unknown_entity_errors,
+            "tick": self.tick.to_dict(),
+            "phases": {k: v.to_dict() for k, v in self.phases.items()},
+        }
+
+
+class StubSimulator:
+    """Flat-earth constant-speed simulator standing in for VR-Forces / JSBSim in the harness."""
+
+    def __init__(
+        self,
+        n_aircraft: int = 2,
+        center: Optional[Position] = None,
+        speed_ms: float = 90.0,
+        turn_rate_deg_s: float = 30.0,
+        initial: Optional[Dict[str, Tuple[Position, float, float]]] = None,
+    ) -> None:
+        """``initial`` maps aircraft id -> (position, heading deg, speed m/s) and replaces the default fan-out layout."""
+        center = center or Position(30.0, -40.0, 1500.0)
+        if initial is None:
+            initial = {
+                f"aircraft-{i + 1}": (
+                    Position(center.latitude + i * 0.01, center.longitude, center.altitude),
+                    (i * 360.0 / max(1, n_aircraft)) % 360.0,
+                    speed_ms,
+                )
+                for i in range(n_aircraft)
+            }
+        self.turn_rate_deg_s = turn_rate_deg_s
+        self.time = 0.0
+        self.frame = 0
+        self._heading: Dict[str, float] = {}
+        self._target: Dict[str, float] = {}
+        self._entities: Dict[str, EntityState] = {}
+        for uid, (pos, heading, speed) in initial.items():
+            self._heading[uid] = heading % 360.0
+            self._target[uid] = heading % 360.0
+            self._entities[uid] = EntityState(
+                uid=uid,
+                type=EntityType.AIRCRAFT,
+                position=Position(pos.latitude, pos.longitude, pos.altitude),
+                attitude=Attitude(yaw=heading % 360.0),
+                speed=speed,
+            )
+
+    def apply_action(self, action: Action) -> None:
+        if action.entity_id not in self._entities:
+            raise KeyError(f"entity_id not found: {action.entity_id}")
+        change = max(-MAX_HEADING_CHANGE_DEG, min(MAX_HEADING_CHANGE_DEG, action.heading_change_deg))
+        self._target[action.entity_id] = (self._heading[action.entity_id] + change) % 360.0
+
+    def step(self, dt: float) -> None:
+        max_turn = self.turn_rate_deg_s * dt
+        for uid, e in self._entities.items():
+            h = self._heading[uid]
+            err = (self._target[uid] - h + 180.0) % 360.0 - 180.0
+            h = (h + max(-max_turn, min(max_turn, err))) % 360.0
+            self._heading[uid] = h
+            rad = math.radians(h)
+            north = e.speed * math.cos(rad)
+            east = e.speed * math.sin(rad)
+            p = e.position
+            p.latitude += north * dt / METERS_PER_DEG
+            p.longitude += east * dt / (METERS_PER_DEG * max(1e-6, math.cos(math.radians(p.latitude))))
+            e.attitude.yaw = h
+            e.local_velocity = LocalVelocity(north=north, east=east, down=0.0)
+        self.time += dt
+        self.frame += 1
+
+    def world_state(self) -> SimulationState:
+        return SimulationState(time=self.time, frame=self.frame, entities=self._entities)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Deep copy of the entities, headings and clock; ``restore`` puts them back."""
+        return copy.deepcopy({"time": self.time, "frame": self.frame, "heading": self._heading, "target": self._target, "entities": self._entities})
+
+    def restore(self, snap: Dict[str, Any]) -> None:
+        # step mutates the entities in place, so the snapshot is copied again to stay reusable.
+        snap = copy.deepcopy(snap)
+        self.time, self.frame = snap["time"], snap["frame"]
+        self._heading, self._target, self._entities = snap["heading"], snap["target"], snap["entities"]
+
+
+class StubAgent:
+    """Steers every aircraft back toward a center point; ``inference_s`` emulates model cost."""
+
+    def __init__(self, center: Optional[Position] = None, inference_s: float = 0.0) -> None:
+        self.center = center or Position(30.0, -40.0, 1500.0)
+        self.inference_s = inference_s
+
+    def act(self, observation: bytes) -> List[Action]:
+        state = decode_state(observation)
+        actions: List[Action] = []
+        for uid, e in state.entities.items():
+            dy = self.center.latitude - e.position.latitude
+            dx = (self.center.longitude - e.position.longitude) * math.cos(math.radians(e.position.latitude))
+            bearing = math.degrees(math.atan2(dx, dy)) % 360.0
+            err = (bearing - e.attitude.yaw + 180.0) % 360.0 - 180.0
+            actions.append(Action(uid, max(-MAX_HEADING_CHANGE_DEG, min(MAX_HEADING_CHANGE_DEG, err))))
+        if self.inference_s > 0:
+            end = time.perf_counter() + self.inference_s
+            while time.perf_counter() < end:
+                pass
+        return actions
+
+
+class ActionQueue:
+    """The inference-mode queue from ``04_inference_mode_async``: enqueue everything, apply the latest."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._items: Deque[Action] = deque()
+        self.enqueued = 0
+        self.dropped = 0
+
+    def enqueue(self, action: Action) -> None:
+        with self._lock:
+            self._items.append(action)
+            self.enqueued += 1
+
+    def dequeue_latest_if_any(self) -> List[Action]:
+        with self._lock:
+            if not self._items:
+                return []
+            latest: Dict[str, Action] = {}
+            for a in self._items:
+                latest[a.entity_id] = a
+            self.dropped += len(self._items) - len(latest)
+            self._items.clear()
+        return list(latest.values())
+
+    def stats(self) -> Dict[str, int]:
+        return {"enqueued": self.enqueued, "dropped": self.dropped}
+
+
+def _apply(sim: StubSimulator, actions: List[Action], stats: TickStats) -> None:
+    for a in actions:
+        try:
+            sim.apply_action(a)
+            stats.actions_applied += 1
+        except KeyError:
+            stats.unknown_entity_errors += 1
+
+
+def run_lockstep(sim: StubSimulator, agent: StubAgent, ticks: int, dt: float, deadline_s: Optional[float] = None) -> TickStats:
+    """Training mode: step, observe, infer, apply; the next tick waits for all of it."""
+    stats = TickStats(deadline_s if deadline_s is not None else dt)
+    clock = time.perf_counter
+    h = stats.phases
+    for _ in range(ticks):
+        t0 = clock()
+        sim.step(dt)
+        t1 = clock()
+        obs = encode_state(sim.world_state())
+        t2 = clock()
+        actions = agent.act(obs)
+        t3 = clock()
+        _apply(sim, actions, stats)
+        t4 = clock()
+        h["step"].record(t1 - t0)
+        h["observation_encode"].record(t2 - t1)
+        h["agent_inference"].record(t3 - t2)
+        h["action_apply"].record(t4 - t3)
+        stats.end_tick(t4 - t0)
+    return stats
+
+
+def run_async(
+    sim: StubSimulator,
+    agent: StubAgent,
+    ticks: int,
+    dt: float,
+    deadline_s: Optional[float] = None,
+    realtime: bool = True,
+    queue_factory: Callable[[], Any] = ActionQueue,
+) -> Dict[str, Any]:
+    """Inference mode: the agent runs on its own thread; the sim applies the latest action before each step.
+
+    Agent inference latency is measured on the agent thread (observation published -> actions queued);
+    the tick deadline covers only sim-thread work.
+    """
+    stats = TickStats(deadline_s if deadline_s is not None else dt)
+    queue = queue_factory()
+    clock = time.perf_counter
+    h = stats.phases
+
+    latest_obs: List[Optional[bytes]] = [None]
+    obs_ready = threading.Condition()
+    stop = threading.Event()
+    obs_seq = [0]
+
+    def agent_loop() -> None:
+        seen = 0
+        while not stop.is_set():
+            with obs_ready:
+                while obs_seq[0] == seen and not stop.is_set():
+                    obs_ready.wait(timeout=0.1)
+                if stop.is_set():
+                    return
+                seen = obs_seq[0]
+                obs = latest_obs[0]
+            t0 = clock()
+            for a in agent.act(obs):
+                queue.enqueue(a)
+            h["agent_inference"].record(clock() - t0)
+
+    worker = threading.Thread(target=agent_loop, name="agent", daemon=True)
+    worker.start()
+
+    next_tick = clock()
+    try:
+        for _ in range(ticks):
+            t0 = clock()
+            obs = encode_state(sim.world_state())
+            t1 = clock()
+            with obs_ready:
+                latest_obs[0] = obs
+                obs_seq[0] += 1
+                obs_ready.notify()
+            t2 = clock()
+            _apply(sim, queue.dequeue_latest_if_any(), stats)
+            t3 = clock()
+            sim.step(dt)
+            t4 = clock()
+            h["observation_encode"].record(t1 - t0)
+            h["action_apply"].record(t3 - t2)
+            h["step"].record(t4 - t3)
+            stats.end_tick(t4 - t0)
+            if realtime:
+                next_tick += dt
+                delay = next_tick - clock()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = clock()
+    finally:
+        stop.set()
+        with obs_ready:
+            obs_ready.notify_all()
+        worker.join(timeout=1.0)
+
+    out = stats.to_dict()
+    out["queue"] = queue.stats()
+    close = getattr(queue, "close", None)
+    if close is not None:
+        close()
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--mode", choices=["lockstep", "async", "both"], default="both")
+    ap.add_argument("--hz", type=float, default=50.0, help="Tick rate; the deadline is 1/hz")
+    ap.add_argument("--ticks", type=int, default=1000)
+    ap.add_argument("--aircraft", type=int, default=2)
+    ap.add_argument("--inference-ms", type=float, default=1.0, help="Emulated agent compute per call")
+    ap.add_argument("--queue", choices=["queue", "mailbox"], default="queue", help="Async mode action handoff")
+    ap.add_argument("--no-realtime", action="store_true", help="Async mode: do not pace ticks to wall clock")
+    ap.add_argument("--json", default=None, help="Write the full report (with histograms) here")
+    args = ap.parse_args()
+
+    dt = 1.0 / args.hz
+    agent = StubAgent(inference_s=args.inference_ms / 1e3)
+    report: Dict[str, Any] = {"hz": args.hz, "aircraft": args.aircraft}
+
+    if args.mode in ("lockstep", "both"):
+        report["lockstep"] = run_lockstep(StubSimulator(args.aircraft), agent, args.ticks, dt).to_dict()
+    if args.mode in ("async", "both"):
+        sim = StubSimulator(args.aircraft)
+        queue_factory: Callable[[], Any] = ActionQueue
+        if args.queue == "mailbox":
+            from action_mailbox import ActionMailbox
+
+            ids = list(sim.world_state().entities)
+            queue_factory = lambda: ActionMailbox.create(ids)  # noqa: E731
+        report["async"] = run_async(sim, agent, args.ticks, dt, realtime=not args.no_realtime, queue_factory=queue_factory)
+
+    for mode in ("lockstep", "async"):
+        r = report.get(mode)
+        if not r:
+            continue
+        print(f"{mode}: ticks={r['ticks']} misses={r['deadline_misses']} (deadline {r['deadline_ms']:.1f} ms)")
+        for name in ("tick",) + PHASES:
+            hist = r["tick"] if name == "tick" else r["phases"][name]
+            print(f"  {name:<20} p50={hist['p50_ms']:.3f} ms  p99={hist['p99_ms']:.3f} ms  max={hist['max_ms']:.3f} ms")
+
+    if args.json:
+        out = Path(args.json)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config_loader import AgentSpec, AutonomousTask, ResolvedConfig, load_experiment
+
+
+@dataclass(frozen=True)
+class Dispatch:
+    """Which agent runs a task, and where the binding came from."""
+
+    task: AutonomousTask
+    agent: AgentSpec
+    owner: str
+    """Model id (``platform.yaml``) or aircraft id (scenario ``autonomous_tasks[]``) that declared the task."""
+    source: str
+    """``model`` or ``scenario``."""
+
+
+class DispatchTable:
+    """Compiled ``platform.yaml`` + scenario task bindings with O(1) lookups.
+
+    An aircraft gets the tasks of its platform model, then its own scenario ``autonomous_tasks[]`` on
+    top: a scenario task replaces the model task of the same ``name``. The model of an aircraft is its
+    ``model_ref`` (object or ``parameters``), else ``aircraft_models[id]``, else ``default_model``.
+    """
+
+    def __init__(
+        self,
+        by_model: Dict[Tuple[str, str], Dispatch],
+        by_aircraft: Dict[Tuple[str, str], Dispatch],
+        aircraft_uids: Dict[Tuple[str, str], Dispatch],
+        aircraft_model: Dict[str, Optional[str]],
+    ) -> None:
+        self.by_model = by_model
+        """(model id, task name) -> dispatch."""
+        self.by_aircraft = by_aircraft
+        """(aircraft id, task name) -> dispatch, overrides applied."""
+        self.aircraft_uids = aircraft_uids
+        """(aircraft id, task unique_id) -> dispatch; every task the aircraft can run, model tasks included.
+        The uid of a model task overridden by name maps to the overriding scenario task."""
+        self.aircraft_model = aircraft_model
+        self._names: Dict[str, List[str]] = {}
+        for aircraft_id, name in by_aircraft:
+            self._names.setdefault(aircraft_id, []).append(name)
+
+    @classmethod
+    def compile(
+        cls,
+        config: ResolvedConfig,
+        aircraft_models: Optional[Dict[str, str]] = None,
+        default_model: Optional[str] = None,
+    ) -> "DispatchTable":
+        aircraft_models = dict(aircraft_models or {})
+        problems: List[str] = []
+        for ref in [*aircraft_models.values(), *([default_model] if default_model else [])]:
+            if ref not in config.models:
+                problems.append(f"unknown model {ref!r}")
+
+        by_model: Dict[Tuple[str, str], Dispatch] = {}
+        for model in config.models.values():
+            for t in model.autonomous_tasks:
+                key = (model.id, t.name)
+                if key in by_model:
+                    problems.append(f"model {model.id}: task name {t.name!r} is declared twice")
+                    continue
+                by_model[key] = Dispatch(t, config.agent(t.agent_ref), model.id, "model")
+
+        by_aircraft: Dict[Tuple[str, str], Dispatch] = {}
+        aircraft_uids: Dict[Tuple[str, str], Dispatch] = {}
+        aircraft_model: Dict[str, Optional[str]] = {}
+        for o in config.scenario.objects:
+            if o.type != "aircraft":
+                continue
+            model_id = o.get("model_ref") or o.parameters.get("model_ref") or aircraft_models.get(o.id) or default_model
+            if model_id is not None and model_id not in config.models:
+                problems.append(f"aircraft {o.id}: model_ref {model_id!r} is not a platform model")
+                model_id = None
+            aircraft_model[o.id] = model_id
+            if model_id is not None:
+                for t in config.models[model_id].autonomous_tasks:
+                    d = by_model[(model_id, t.name)]
+                    by_aircraft[(o.id, t.name)] = d
+                    aircraft_uids[(o.id, t.unique_id)] = d
+            own = set()
+            for t in o.autonomous_tasks:
+                if t.name in own:
+                    problems.append(f"aircraft {o.id}: task name {t.name!r} is declared twice")
+                    continue
+                own.add(t.name)
+                d = Dispatch(t, config.agent(t.agent_ref), o.id, "scenario")
+                replaced = by_aircraft.get((o.id, t.name))
+                if replaced is not None and replaced.source == "model":
+                    # The overridden model task's uid now runs the scenario task too.
+                    aircraft_uids[(o.id, replaced.task.unique_id)] = d
+                by_aircraft[(o.id, t.name)] = d
+                aircraft_uids[(o.id, t.unique_id)] = d
+
+        if problems:
+            raise ValueError("task dispatch table:\n  - " + "\n  - ".join(problems))
+        return cls(by_model, by_aircraft, aircraft_uids, aircraft_model)
+
+    def for_model(self, model_id: str, name: str) -> Dispatch:
+        try:
+            return self.by_model[(model_id, name)]
+        except KeyError:
+            raise KeyError(f"model {model_id}: no task named {name!r}") from None
+
+    def for_aircraft(self, aircraft_id: str, task: str) -> Dispatch:
+        """``task`` is a ``unique_id`` or a task ``name``."""
+        d = self.aircraft_uids.get((aircraft_id, task)) or self.by_aircraft.get((aircraft_id, task))
+        if d is None:
+            raise KeyError(f"aircraft {aircraft_id}: no task {task!r}")
+        return d
+
+    def task_names(self, aircraft_id: str) -> List[str]:
+        return list(self._names.get(aircraft_id, []))
+
+    @property
+    def aircraft(self) -> List[str]:
+        return list(self.aircraft_model)
+
+    def agent_refs(self) -> List[str]:
+        return sorted({d.agent.id for d in self.by_aircraft.values()})
+
+
+def resolve_by_walking(config: ResolvedConfig, aircraft_id: str, task: str, model_id: Optional[str] = None) -> Optional[AutonomousTask]:
+    """The nested-list walk ``DispatchTable`` replaces; kept as the benchmark baseline."""
+    for o in config.scenario.objects:
+        if o.id == aircraft_id:
+            for t in o.autonomous_tasks:
+                if t.unique_id == task or t.name == task:
+                    return t
+    for sim in config.simulators.values():
+        for m in sim.models:
+            if m.id == model_id:
+                for t in m.autonomous_tasks:
+                    if t.unique_id == task or t.name == task:
+                        return t
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Warm agent instances
+# ---------------------------------------------------------------------------
+
+
+class AgentPool:
+    """One warm instance per ``agent_ref``, built by ``factory(agent)`` the first time it is needed.
+
+    Aircraft switching tasks only swap which pooled instance they use, so a switch never reloads
+    weights. ``prewarm`` builds every agent a scenario can dispatch to up front.
+    """
+
+    def __init__(self, factory: Callable[[AgentSpec], Any]) -> None:
+        self.factory = factory
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+        self.hits = 0
+        self.load_s = 0.0
+
+    def get(self, agent: AgentSpec) -> Any:
+        inst = self._instances.get(agent.id)
+        if inst is not None:
+            self.hits += 1
+            return inst
+        with self._lock:
+            inst = self._instances.get(agent.id)
+            if inst is None:
+                t0 = time.perf_counter()
+                inst = self.factory(agent)
+                self.load_s += time.perf_counter() - t0
+                self.loads += 1
+                self._instances[agent.id] = inst
+        return inst
+
+    def prewarm(self, agents: List[AgentSpec]) -> None:
+        for a in agents:
+            self.get(a)
+
+    def __contains__(self, agent_ref: str) -> bool:
+        return agent_ref in self._instances
+
+    def stats(self) -> Dict[str, Any]:
+        return {"instances": sorted(self._instances), "loads": self.loads, "hits": self.hits, "load_ms": self.load_s * 1e3}
+
+
+def default_factory(agent: AgentSpec) -> Any:
+    """The policy model of ``inference_server.load_model`` (TorchScript weights or the NumPy stub)."""
+    from inference_server import InferenceConfig, load_model
+
+    return load_model(agent, InferenceConfig())
+
+
+class TaskDispatcher:
+    """Current task of every aircraft, resolved through a ``DispatchTable`` onto pooled agent instances."""
+
+    def __init__(self, table: DispatchTable, pool: Optional[AgentPool] = None, initial_task: Optional[str] = "hold") -> None:
+        self.table = table
+        self.pool = pool or AgentPool(default_factory)
+        self.current: Dict[str, Dispatch] = {}
+        self.switches = 0
+        for aircraft_id in table.aircraft:
+            names = table.task_names(aircraft_id)
+            if not names:
+                continue
+            self.current[aircraft_id] = table.for_aircraft(aircraft_id, initial_task if initial_task in names else names[0])
+
+    @classmethod
+    def from_config(
+        cls,
+        config: ResolvedConfig,
+        factory: Optional[Callable[[AgentSpec], Any]] = None,
+        aircraft_models: Optional[Dict[str, str]] = None,
+        default_model: Optional[str] = None,
+        prewarm: bool = True,
+    ) -> "TaskDispatcher":
+        table = DispatchTable.compile(config, aircraft_models, default_model)
+        pool = AgentPool(factory or default_factory)
+        if prewarm:
+            pool.prewarm([config.agent(ref) for ref in table.agent_refs()])
+        return cls(table, pool)
+
+    def assign(self, aircraft_id: str, task: str) -> Dispatch:
+        """Switches ``aircraft_id`` to ``task`` (``unique_id`` or ``name``)."""
+        d = self.table.for_aircraft(aircraft_id, task)
+        prev = self.current.get(aircraft_id)
+        if prev is None or prev.task.unique_id != d.task.unique_id:
+            self.switches += 1
+        self.current[aircraft_id] = d
+        return d
+
+    def dispatch(self, aircraft_id: str) -> Dispatch:
+        try:
+            return self.current[aircraft_id]
+        except KeyError:
+            raise KeyError(f"aircraft {aircraft_id}: no task assigned") from None
+
+    def policy(self, aircraft_id: str) -> Any:
+        return self.pool.get(self.dispatch(aircraft_id).agent)
+
+    def by_agent(self) -> Dict[str, List[str]]:
+        """``agent_ref`` -> aircraft currently dispatched to it, e.g. one inference batch each."""
+        out: Dict[str, List[str]] = {}
+        for aircraft_id, d in self.current.items():
+            out.setdefault(d.agent.id, []).append(aircraft_id)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {"aircraft": len(self.current), "switches": self.switches, "pool": self.pool.stats()}
+
+
+# ---------------------------------------------------------------------------
+# CLI / benchmark
+# ---------------------------------------------------------------------------
+
+
+def benchmark(config: ResolvedConfig, lookups: int = 100_000, switches: int = 2_000) -> Dict[str, Any]:
+    """Table lookups vs the nested-list walk, and task switches with the warm pool vs a reload per switch."""
+    table = DispatchTable.compile(config, default_model=next(iter(config.models), None))
+    keys = [(a, name, table.aircraft_model[a]) for (a, name) in table.by_aircraft]
+    if not keys:
+        raise ValueError("scenario has no aircraft tasks")
+    queries = [keys[i % len(keys)] for i in range(lookups)]
+
+    t0 = time.perf_counter()
+    for a, name, model_id in queries:
+        resolve_by_walking(config, a, name, model_id)
+    walk_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a, name, _ in queries:
+        table.for_aircraft(a, name)
+    table_s = time.perf_counter() - t0
+
+    dispatcher = TaskDispatcher(table, AgentPool(default_factory))
+    dispatcher.pool.prewarm([config.agent(ref) for ref in table.agent_refs()])
+    plan: List[Tuple[str, str]] = []
+    for i in range(switches):
+        a = keys[i % len(keys)][0]
+        names = table.task_names(a)
+        plan.append((a, names[i % len(names)]))
+    t0 = time.perf_counter()
+    for a, name in plan:
+        dispatcher.assign(a, name)
+        dispatcher.policy(a)
+    warm_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for a, name in plan:
+        default_factory(table.for_aircraft(a, name).agent)
+    reload_s = time.perf_counter() - t0
+
+    return {
+        "aircraft": len(table.aircraft),
+        "bindings": len(table.by_aircraft),
+        "lookup_walk_us": walk_s / lookups * 1e6,
+        "lookup_table_us": table_s / lookups * 1e6,
+        "switch_warm_us": warm_s / switches * 1e6,
+        "switch_reload_us": reload_s / switches * 1e6,
+        "dispatcher": dispatcher.stats(),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("experiment", help="config-v2 instance/experiment-*.yaml")
+    ap.add_argument("--default-model", default=None, help="Platform model of aircraft without a model_ref")
+    ap.add_argument("--model", action="append", default=[], metavar="AIRCRAFT=MODEL", help="Bind an aircraft to a platform model")
+    ap.add_argument("--bench", action="store_true")
+    args = ap.parse_args()
+
+    config = load_experiment(Path(args.experiment))
+    if args.bench:
+        print(json.dumps(benchmark(config), indent=2))
+        return
+    bindings = dict(m.split("=", 1) for m in args.model)
+    table = DispatchTable.compile(config, bindings, args.default_model)
+    out = {
+        a: {
+            "model": table.aircraft_model[a],
+            "tasks": {
+                name: {"unique_id": d.task.unique_id, "agent_ref": d.agent.id, "source": d.source}
+                for name in table.task_names(a)
+                for d in [table.for_aircraft(a, name)]
+            },
+        }
+        for a in table.aircraft
+    }
+    print(json.dumps(out, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,587 @@
+import argparse
+import gzip
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from replay import ReplayReader
+from schema import SimulationState
+from state_codec import FRAME_HEADER, decode_state_from, encode_state, state_from_dict, state_to_dict
+
+try:
+    import zstandard as _zstd
+except ImportError:  # optional; gzip is always available
+    _zstd = None
+
+
+CHUNK_LOG_MAGIC = b"RSTLMCHK"
+CHUNK_LOG_VERSION = 1
+FOOTER_MAGIC = b"RSTLIDX1"
+
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}
+FORMATS = {"binary": 0, "json": 1}
+
+# Layout (little-endian):
+#   file:   header | chunk * n | index | trailer
+#   header: magic 8s | version u32 | frame format u8
+#   chunk:  b"CHNK" | codec u8 | n_frames u32 | first_frame q | last_frame q | first_time d | last_time d
+#           | raw_len u32 | comp_len u32 | crc32(payload) u32 | payload (comp_len bytes)
+#   raw payload: (len u32 | frame) * n_frames; frame is a state_codec frame or one JSON object
+#   index:  (offset Q | n_frames u32 | first_frame q | last_frame q | first_time d | last_time d) * n_chunks
+#   trailer: n_chunks u32 | index offset Q | magic 8s
+_HEADER = struct.Struct("<8sIB")
+_CHUNK = struct.Struct("<4sBIqqddIII")
+_INDEX = struct.Struct("<QIqqdd")
+_TRAILER = struct.Struct("<IQ8s")
+_LEN = struct.Struct("<I")
+_CHUNK_MAGIC = b"CHNK"
+
+_FLUSH = object()
+_STOP = object()
+_POLL_S = 0.1
+"""Slice of the waits in ``flush``, between checks that the writer thread is still alive."""
+
+
+def resolve_codec(codec: str) -> str:
+    """``auto`` -> zstd when ``zstandard`` is installed, else gzip."""
+    if codec == "auto":
+        return "zstd" if _zstd is not None else "gzip"
+    if codec not in CODECS:
+        raise ValueError(f"unknown codec {codec!r}; expected auto, {', '.join(CODECS)}")
+    if codec == "zstd" and _zstd is None:
+        raise ValueError("codec 'zstd' needs the zstandard package; use 'gzip' or 'auto'")
+    return codec
+
+
+def _compress(codec: str, data: bytes, level: Optional[int]) -> bytes:
+    if codec == "zstd":
+        return _zstd.ZstdCompressor(level=3 if level is None else level).compress(data)
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    return data
+
+
+def _decompress(codec_id: int, data: bytes) -> bytes:
+    if codec_id == CODECS["zstd"]:
+        if _zstd is None:
+            raise ValueError("recording is zstd-compressed; install zstandard to read it")
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec_id == CODECS["gzip"]:
+        return gzip.decompress(data)
+    return data
+
+
+@dataclass(frozen=True)
+class TelemetryConfig:
+    """``runtime.telemetry`` of an experiment."""
+
+    codec: str = "auto"
+    level: Optional[int] = None
+    frame_format: str = "binary"
+    chunk_frames: int = 200
+    """Frames per chunk: 10 s at 20 Hz."""
+    max_chunk_age_s: float = 2.0
+    """A partly filled chunk is sealed after this many wall seconds, bounding what a crash can lose."""
+    max_pending: int = 4096
+    """Queue bound in frames between the sim thread and the writer thread."""
+    on_full: str = "block"
+    """``block``: backpressure, ``write`` waits for room; ``drop``: the frame is counted and discarded."""
+    crash_safe: bool = False
+    """fsync every sealed chunk; the file is readable without its footer at any time."""
+    every: int = 1
+    """Record every Nth frame."""
+
+    @classmethod
+    def from_runtime(cls, runtime: Dict[str, Any]) -> "TelemetryConfig":
+        block = runtime.get("telemetry") or {}
+        if not isinstance(block, dict):
+            raise ValueError("runtime.telemetry must be a mapping")
+        unknown = sorted(set(block) - set(cls.__dataclass_fields__))
+        if unknown:
+            raise ValueError(f"runtime.telemetry: unknown key(s) {unknown}")
+        cfg = cls(**block)
+        cfg.validate()
+        return cfg
+
+    def validate(self) -> None:
+        resolve_codec(self.codec)
+        if self.frame_format not in FORMATS:
+            raise ValueError(f"frame_format must be one of {sorted(FORMATS)}")
+        if self.on_full not in ("block", "drop"):
+            raise ValueError("on_full must be 'block' or 'drop'")
+        if self.chunk_frames < 1 or self.max_pending < 1 or self.every < 1 or self.max_chunk_age_s <= 0:
+            raise ValueError("chunk_frames, max_pending, every and max_chunk_age_s must be positive")
+
+
+class TelemetryWriter:
+    """Chunked, compressed ``SimulationState`` log written by a background thread.
+
+    ``write`` only enqueues the state object; encoding, compression and disk I/O happen on the
+    writer thread, so callers must not mutate a state after handing it over. When the queue is
+    full the frame waits (``on_full="block"``) or is dropped and counted (``"drop"``).
+
+    Chunks carry their own header and CRC and the index is repeated in a footer on ``close``.
+    After a crash ``TelemetryReader`` rebuilds the index by scanning chunk headers and skips a
+    torn last chunk; with ``crash_safe`` each chunk is fsynced, so only the chunk being written
+    and frames younger than ``max_chunk_age_s`` can be lost.
+    """
+
+    def __init__(self, path: Path, config: TelemetryConfig = TelemetryConfig()) -> None:
+        config.validate()
+        self.path = Path(path)
+        self.config = config
+        self.codec = resolve_codec(config.codec)
+        self._json = config.frame_format == "json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f: BinaryIO = self.path.open("wb")
+        self._f.write(_HEADER.pack(CHUNK_LOG_MAGIC, CHUNK_LOG_VERSION, FORMATS[config.frame_format]))
+
+        self._q: "queue.Queue[Any]" = queue.Queue(maxsize=config.max_pending)
+        self._index: List[Tuple[int, int, int, int, float, float]] = []
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._seen = 0
+        self.stats: Dict[str, Any] = {
+            "frames_written": 0,
+            "frames_dropped": 0,
+            "chunks": 0,
+            "raw_bytes": 0,
+            "compressed_bytes": 0,
+            "max_queue_depth": 0,
+            "writer_busy_s": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name=f"telemetry-{self.path.name}", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_experiment(cls, experiment: Any, path: Optional[Path] = None) -> "TelemetryWriter":
+        """Writes to ``outputs.telemetry`` (or ``path``) with the options of ``runtime.telemetry``."""
+        target = path or (experiment.outputs or {}).get("telemetry")
+        if not target:
+            raise ValueError("experiment has no outputs.telemetry; pass path")
+        return cls(Path(target), TelemetryConfig.from_runtime(experiment.runtime))
+
+    # -- sim thread ---------------------------------------------------------------
+
+    def write(self, state: SimulationState) -> bool:
+        """Queues one frame; returns False if it was skipped by ``every`` or dropped on a full queue."""
+        if self._error is not None:
+            raise RuntimeError(f"telemetry writer failed: {self._error!r}") from self._error
+        if self._closed:
+            raise ValueError("telemetry writer is closed")
+        self._seen += 1
+        if (self._seen - 1) % self.config.every:
+            return False
+        if self.config.on_full == "drop":
+            try:
+                self._q.put_nowait(state)
+            except queue.Full:
+                self.stats["frames_dropped"] += 1
+                return False
+        else:
+            self._q.put(state)
+        depth = self._q.qsize()
+        if depth > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = depth
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Seals the open chunk and waits until everything queued so far is on disk."""
+        if self._error is not None:
+            raise RuntimeError(f"telemetry writer failed: {self._error!r}") from self._error
+        deadline = None if timeout is None else time.monotonic() + timeout
+        done = threading.Event()
+        # Wait in short slices: a writer that dies after the check above never sets ``done``.
+        while True:
+            try:
+                self._q.put((_FLUSH, done), timeout=self._slice(deadline))
+                break
+            except queue.Full:
+                self._check_writer(deadline)
+        while not done.wait(self._slice(deadline)):
+            self._check_writer(deadline)
+        if self._error is not None:
+            raise RuntimeError(f"telemetry writer failed: {self._error!r}") from self._error
+
+    @staticmethod
+    def _slice(deadline: Optional[float]) -> float:
+        if deadline is None:
+            return _POLL_S
+        return max(0.0, min(_POLL_S, deadline - time.monotonic()))
+
+    def _check_writer(self, deadline: Optional[float]) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"telemetry writer failed: {self._error!r}") from self._error
+        if not self._thread.is_alive():
+            raise RuntimeError("telemetry writer thread exited")
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError("telemetry flush timed out")
+
+    def close(self) -> Dict[str, Any]:
+        """Drains the queue, writes the footer index; returns ``stats``."""
+        if self._closed:
+            return self.stats
+        self._closed = True
+        self._q.put(_STOP)
+        self._thread.join()
+        if self._error is None:
+            self._write_footer()
+        self._f.close()
+        if self._error is not None:
+            raise RuntimeError(f"telemetry writer failed: {self._error!r}") from self._error
+        return self.stats
+
+    def __enter__(self) -> "TelemetryWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- writer thread ----------------------------------------------------------------
+
+    def _run(self) -> None:
+        buf = bytearray()
+        meta: List[Tuple[int, float]] = []
+        opened = 0.0
+        age = self.config.max_chunk_age_s
+        try:
+            while True:
+                timeout = None if not meta else max(0.0, opened + age - time.monotonic())
+                try:
+                    item = self._q.get(timeout=timeout)
+                except queue.Empty:
+                    item = None  # open chunk reached max age
+                if item is None or item is _STOP or isinstance(item, tuple):
+                    if meta:
+                        self._seal(buf, meta)
+                        buf, meta = bytearray(), []
+                    if item is _STOP:
+                        return
+                    if isinstance(item, tuple):
+                        self._f.flush()
+                        item[1].set()
+                    continue
+
+                t0 = time.perf_counter()
+                if not meta:
+                    opened = time.monotonic()
+                if self._json:
+                    payload = json.dumps(state_to_dict(item), separators=(",", ":")).encode("utf-8")
+                else:
+                    payload = encode_state(item)
+                buf += _LEN.pack(len(payload))
+                buf += payload
+                meta.append((item.frame, item.time))
+                self.stats["writer_busy_s"] += time.perf_counter() - t0
+                if len(meta) >= self.config.chunk_frames:
+                    self._seal(buf, meta)
+                    buf, meta = bytearray(), []
+        except BaseException as exc:  # surfaced to the sim thread on its next call
+            self._error = exc
+            # Unblock producers waiting on a full queue and flushers waiting on an event.
+            while True:
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple):
+                    item[1].set()
+
+    def _seal(self, raw: bytearray, meta: List[Tuple[int, float]]) -> None:
+        t0 = time.perf_counter()
+        data = _compress(self.codec, bytes(raw), self.config.level)
+        offset = self._f.tell()
+        entry = (offset, len(meta), meta[0][0], meta[-1][0], meta[0][1], meta[-1][1])
+        self._f.write(_CHUNK.pack(_CHUNK_MAGIC, CODECS[self.codec], *entry[1:], len(raw), len(data), zlib.crc32(data)))
+        self._f.write(data)
+        if self.config.crash_safe:
+            self._f.flush()
+            os.fsync(self._f.fileno())
+        self._index.append(entry)
+        s = self.stats
+        s["frames_written"] += len(meta)
+        s["chunks"] += 1
+        s["raw_bytes"] += len(raw)
+        s["compressed_bytes"] += len(data)
+        s["writer_busy_s"] += time.perf_counter() - t0
+
+    def _write_footer(self) -> None:
+        index_offset = self._f.tell()
+        for entry in self._index:
+            self._f.write(_INDEX.pack(*entry))
+        self._f.write(_TRAILER.pack(len(self._index), index_offset, FOOTER_MAGIC))
+        self._f.flush()
+        if self.config.crash_safe:
+            os.fsync(self._f.fileno())
+
+
+def is_chunk_log(path: Path) -> bool:
+    with Path(path).open("rb") as f:
+        return f.read(len(CHUNK_LOG_MAGIC)) == CHUNK_LOG_MAGIC
+
+
+class TelemetryReader:
+    """Random access over a ``TelemetryWriter`` file, with the ``ReplayReader`` query API.
+
+    Uses the footer index when present; otherwise (crashed or still-running writer) scans chunk
+    headers and stops at the first torn or corrupt chunk. Seeks go through the per-chunk
+    frame/time ranges and decompress a single chunk; the last one is cached.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._f: BinaryIO = self.path.open("rb")
+        magic, version, fmt = _HEADER.unpack(self._f.read(_HEADER.size))
+        if magic != CHUNK_LOG_MAGIC:
+            raise ValueError(f"{self.path}: not a chunked telemetry log")
+        if version != CHUNK_LOG_VERSION:
+            raise ValueError(f"{self.path}: unsupported version {version}")
+        self.kind = "chunks"
+        self._json = fmt == FORMATS["json"]
+        self._size = os.fstat(self._f.fileno()).st_size
+        self.recovered = False
+        index = self._read_footer()
+        if index is None:
+            index = self._scan()
+            self.recovered = True
+        self._chunks = index
+        cols = np.array(index, dtype=np.float64).reshape(-1, 6)
+        self._chunk_start = np.concatenate([[0], np.cumsum(cols[:, 1])]).astype(np.int64)
+        self._last = {"frame": cols[:, 3].astype(np.int64), "time": cols[:, 5]}
+        self._cache: Tuple[int, Any] = (-1, None)
+        self._all: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def _read_footer(self) -> Optional[List[Tuple[int, int, int, int, float, float]]]:
+        if self._size < _HEADER.size + _TRAILER.size:
+            return None
+        self._f.seek(self._size - _TRAILER.size)
+        n, index_offset, magic = _TRAILER.unpack(self._f.read(_TRAILER.size))
+        if magic != FOOTER_MAGIC or index_offset + n * _INDEX.size + _TRAILER.size != self._size:
+            return None
+        self._f.seek(index_offset)
+        raw = self._f.read(n * _INDEX.size)
+        return [_INDEX.unpack_from(raw, i * _INDEX.size) for i in range(n)]
+
+    def _scan(self) -> List[Tuple[int, int, int, int, float, float]]:
+        out = []
+        pos = _HEADER.size
+        while pos + _CHUNK.size <= self._size:
+            self._f.seek(pos)
+            magic, _, n, f0, f1, t0, t1, _, comp_len, crc = _CHUNK.unpack(self._f.read(_CHUNK.size))
+            end = pos + _CHUNK.size + comp_len
+            if magic != _CHUNK_MAGIC or end > self._size or zlib.crc32(self._f.read(comp_len)) != crc:
+                break  # torn or corrupt tail
+            out.append((pos, n, f0, f1, t0, t1))
+            pos = end
+        return out
+
+    def _chunk(self, c: int) -> Dict[str, Any]:
+        """Decompressed chunk ``c``: raw bytes, per-frame (offset, length), frame and time arrays."""
+        if self._cache[0] != c:
+            offset = self._chunks[c][0]
+            self._f.seek(offset)
+            magic, codec_id, n, _, _, _, _, raw_len, comp_len, crc = _CHUNK.unpack(self._f.read(_CHUNK.size))
+            data = self._f.read(comp_len)
+            if magic != _CHUNK_MAGIC or zlib.crc32(data) != crc:
+                raise ValueError(f"{self.path}: corrupt chunk at offset {offset}")
+            raw = _decompress(codec_id, data)
+            if len(raw) != raw_len:
+                raise ValueError(f"{self.path}: chunk at offset {offset} decompressed to {len(raw)} bytes, expected {raw_len}")
+            spans, frames, times = [], [], []
+            pos = 0
+            for _ in range(n):
+                (length,) = _LEN.unpack_from(raw, pos)
+                off = pos + _LEN.size
+                if self._json:
+                    d = json.loads(raw[off : off + length])
+                    t, fr = d["time"], d["frame"]
+                else:
+                    t, fr, _ = FRAME_HEADER.unpack_from(raw, off)
+                spans.append((off, length))
+                frames.append(fr)
+                times.append(t)
+                pos = off + length
+            chunk = {"raw": raw, "spans": spans, "frame": np.asarray(frames, dtype=np.int64), "time": np.asarray(times, dtype=np.float64)}
+            self._cache = (c, chunk)
+        return self._cache[1]
+
+    def _searchsorted(self, key: str, value: float, side: str) -> int:
+        """``np.searchsorted`` over all frames' ``key`` ("frame" / "time"), decompressing one chunk."""
+        c = int(np.searchsorted(self._last[key], value, side=side))
+        if c >= len(self._chunks):
+            return len(self)
+        return int(self._chunk_start[c]) + int(np.searchsorted(self._chunk(c)[key], value, side=side))
+
+    def __len__(self) -> int:
+        return int(self._chunk_start[-1])
+
+    def _load_all(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._all is None:
+            parts = [self._chunk(c) for c in range(len(self._chunks))]
+            self._all = (
+                np.concatenate([p["frame"] for p in parts]) if parts else np.zeros(0, dtype=np.int64),
+                np.concatenate([p["time"] for p in parts]) if parts else np.zeros(0),
+            )
+        return self._all
+
+    @property
+    def frames(self) -> np.ndarray:
+        """All frame numbers; decompresses the whole file on first use."""
+        return self._load_all()[0]
+
+    @property
+    def times(self) -> np.ndarray:
+        """All frame times; decompresses the whole file on first use."""
+        return self._load_all()[1]
+
+    @property
+    def chunks(self) -> List[Tuple[int, int, int, int, float, float]]:
+        """(offset, n_frames, first_frame, last_frame, first_time, last_time) per chunk."""
+        return list(self._chunks)
+
+    @property
+    def duration_s(self) -> float:
+        return float(self._chunks[-1][5] - self._chunks[0][4]) if self._chunks else 0.0
+
+    def seek_frame(self, frame: int) -> int:
+        """Index of the last record with ``frame <= frame`` (clamped to the first record)."""
+        return min(max(self._searchsorted("frame", frame, "right") - 1, 0), len(self) - 1)
+
+    def seek_time(self, t: float) -> int:
+        """Index of the last record with ``time <= t`` (clamped to the first record)."""
+        return min(max(self._searchsorted("time", t, "right") - 1, 0), len(self) - 1)
+
+    def state_at(self, i: int) -> SimulationState:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        c = int(np.searchsorted(self._chunk_start, i, side="right")) - 1
+        chunk = self._chunk(c)
+        off, length = chunk["spans"][i - int(self._chunk_start[c])]
+        if self._json:
+            return state_from_dict(json.loads(chunk["raw"][off : off + length]))
+        return decode_state_from(chunk["raw"], off)[0]
+
+    def state_at_frame(self, frame: int) -> SimulationState:
+        return self.state_at(self.seek_frame(frame))
+
+    def state_at_time(self, t: float) -> SimulationState:
+        return self.state_at(self.seek_time(t))
+
+    def window(self, start_time: Optional[float] = None, end_time: Optional[float] = None, stride: int = 1) -> Iterator[SimulationState]:
+        """Lazily yields states with ``start_time <= time <= end_time``."""
+        if not len(self):
+            return
+        lo = 0 if start_time is None else self._searchsorted("time", start_time, "left")
+        hi = len(self) if end_time is None else self._searchsorted("time", end_time, "right")
+        for i in range(lo, hi, max(1, stride)):
+            yield self.state_at(i)
+
+    # Paced playback only needs times / seek_time / state_at, which this class shares.
+    play = ReplayReader.play
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "TelemetryReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def benchmark(
+    n_frames: int = 2_000, n_aircraft: int = 50, config: TelemetryConfig = TelemetryConfig(), out: Optional[Path] = None
+) -> Dict[str, Any]:
+    """Sim-thread cost of ``write`` vs synchronous ``telemetry.jsonl`` lines, on kinematic-sim frames."""
+    import tempfile
+
+    from kinematic_sim import KinematicSimulator
+
+    rng = np.random.default_rng(0)
+    sim = KinematicSimulator(dt=0.05)
+    sim.load_fleet(
+        {"id": f"ac-{i}", "lat": 30.0 + rng.uniform(-1, 1), "lon": -40.0 + rng.uniform(-1, 1), "alt": 1500.0, "heading": rng.uniform(0, 360), "speed": 90.0}
+        for i in range(n_aircraft)
+    )
+    states = []
+    for _ in range(n_frames):
+        sim.step()
+        states.append(sim.world_state())
+
+    folder = Path(out) if out else Path(tempfile.mkdtemp(prefix="telemetry-bench-"))
+    folder.mkdir(parents=True, exist_ok=True)
+    jsonl = folder / "telemetry.jsonl"
+    t0 = time.perf_counter()
+    with jsonl.open("w", encoding="utf-8") as f:
+        for s in states:
+            f.write(json.dumps(state_to_dict(s), separators=(",", ":")) + "\n")
+    sync_s = time.perf_counter() - t0
+
+    chunked = folder / "telemetry.rstl"
+    writer = TelemetryWriter(chunked, config)
+    worst = 0.0
+    t0 = time.perf_counter()
+    for s in states:
+        t1 = time.perf_counter()
+        writer.write(s)
+        worst = max(worst, time.perf_counter() - t1)
+    enqueue_s = time.perf_counter() - t0
+    stats = writer.close()
+    total_s = time.perf_counter() - t0
+    return {
+        "frames": n_frames,
+        "aircraft": n_aircraft,
+        "codec": writer.codec,
+        "jsonl_sync_us_per_frame": round(sync_s / n_frames * 1e6, 1),
+        "write_us_per_frame": round(enqueue_s / n_frames * 1e6, 2),
+        "write_worst_us": round(worst * 1e6, 1),
+        "writer_drain_s": round(total_s, 3),
+        "jsonl_bytes": jsonl.stat().st_size,
+        "chunked_bytes": chunked.stat().st_size,
+        "stats": stats,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Chunked telemetry: inspect a recording or benchmark the writer.")
+    ap.add_argument("recording", nargs="?", help="Chunked telemetry file to summarize")
+    ap.add_argument("--bench", action="store_true")
+    ap.add_argument("--frames", type=int, default=2_000)
+    ap.add_argument("--aircraft", type=int, default=50)
+    ap.add_argument("--codec", default="auto")
+    ap.add_argument("--format", default="binary", choices=sorted(FORMATS))
+    ap.add_argument("--crash-safe", action="store_true")
+    args = ap.parse_args()
+
+    if args.bench or not args.recording:
+        cfg = TelemetryConfig(codec=args.codec, frame_format=args.format, crash_safe=args.crash_safe)
+        print(json.dumps(benchmark(args.frames, args.aircraft, cfg), indent=2))
+        return
+    with TelemetryReader(Path(args.recording)) as r:
+        print(
+            json.dumps(
+                {
+                    "path": str(r.path),
+                    "records": len(r),
+                    "chunks": len(r.chunks),
+                    "recovered_without_footer": r.recovered,
+                    "first_frame": int(r.chunks[0][2]) if len(r) else None,
+                    "last_frame": int(r.chunks[-1][3]) if len(r) else None,
+                    "duration_s": r.duration_s,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+import argparse
+import glob
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from geodesy import haversine_m
+
+# A fixed first waypoint is modelled as a closed tour through a dummy depot that is free to
+# reach from the start and costs BIG from anywhere else; every tour pays BIG exactly once.
+_BIG_FACTOR = 4.0
+
+
+@dataclass
+class OrderResult:
+    order: List[int]
+    """Waypoint indices in visiting order."""
+    length_m: float
+    iterations: int
+    """Improving 2-opt / Or-opt moves applied."""
+
+
+def load_agent_order(path: Path) -> np.ndarray:
+    """``path_Episode*_agentOrder.json`` -> (N, 3) lat, lon, alt in the agent's visiting order."""
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    keys = sorted(data.keys(), key=int)
+    return np.array([[data[k]["lat"], data[k]["lon"], data[k].get("alt", 0.0)] for k in keys], dtype=np.float64).reshape(-1, 3)
+
+
+def haversine_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """(N, N) great-circle distances in metres, one broadcast call."""
+    return haversine_m(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def route_length(dist: np.ndarray, order: List[int], closed: bool = False) -> float:
+    idx = np.asarray(order, dtype=np.int64)
+    total = float(dist[idx[:-1], idx[1:]].sum())
+    if closed and idx.size > 1:
+        total += float(dist[idx[-1], idx[0]])
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Heuristics (closed tours over a symmetric matrix; open paths go through a depot)
+# ---------------------------------------------------------------------------
+
+
+def _tour_matrix(dist: np.ndarray, closed: bool, start: Optional[int]) -> Tuple[np.ndarray, Optional[int]]:
+    """Matrix whose optimal closed tour answers the requested problem; returns it and the depot index."""
+    if closed:
+        return dist, None
+    n = dist.shape[0]
+    big = _BIG_FACTOR * (float(dist[np.isfinite(dist)].max(initial=0.0)) * n + 1.0)
+    out = np.zeros((n + 1, n + 1))
+    out[:n, :n] = dist
+    if start is not None:
+        out[n, :n] = out[:n, n] = big
+        out[n, start] = out[start, n] = 0.0
+    return out, n
+
+
+def nearest_neighbour(dist: np.ndarray, start: int) -> List[int]:
+    n = dist.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    order = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[order[-1]])
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        visited[nxt] = True
+    return order
+
+
+def two_opt(dist: np.ndarray, tour: np.ndarray) -> Tuple[np.ndarray, int]:
+    """Best-improvement 2-opt; each pass scores all (i, j) reversals at once."""
+    n = tour.size
+    moves = 0
+    if n < 4:
+        return tour, moves
+    upper = np.triu(np.ones((n, n), dtype=bool), 2)
+    upper[0, n - 1] = False  # reversing everything but one node is the same tour
+    while True:
+        a, b = tour, np.roll(tour, -1)
+        d_ab = dist[a, b]
+        delta = dist[a[:, None], a[None, :]] + dist[b[:, None], b[None, :]] - d_ab[:, None] - d_ab[None, :]
+        delta = np.where(upper, delta, 0.0)
+        k = int(np.argmin(delta))
+        i, j = divmod(k, n)
+        if not delta[i, j] < -1e-9:
+            return tour, moves
+        tour = np.concatenate([tour[: i + 1], tour[i + 1 : j + 1][::-1], tour[j + 1 :]])
+        moves += 1
+
+
+def or_opt(dist: np.ndarray, tour: np.ndarray, max_segment: int = 3) -> Tuple[np.ndarray, int]:
+    """Moves a run of 1..``max_segment`` nodes elsewhere (optionally reversed); best move per pass."""
+    n = tour.size
+    moves = 0
+    while n >= 5:
+        best = (-1e-9, None)
+        for seg in range(1, min(max_segment, n - 3) + 1):
+            s = np.arange(n)
+            first, last = tour[s], tour[(s + seg - 1) % n]
+            before, after = tour[(s - 1) % n], tour[(s + seg) % n]
+            removal = dist[before, first] + dist[last, after] - dist[before, after]  # (n,)
+            c, d = tour, np.roll(tour, -1)  # insertion edge k: c_k -> d_k
+            gap = dist[c, d]
+            fwd = dist[c[None, :], first[:, None]] + dist[last[:, None], d[None, :]] - gap[None, :]
+            rev = dist[c[None, :], last[:, None]] + dist[first[:, None], d[None, :]] - gap[None, :]
+            # Edge k must lie outside the segment and not be the edge the segment leaves behind.
+            offset = (np.arange(n)[None, :] - s[:, None]) % n
+            valid = (offset >= seg) & (offset != n - 1)
+            for reverse, add in ((False, fwd), (True, rev)):
+                delta = np.where(valid, add - removal[:, None], np.inf)
+                k = int(np.argmin(delta))
+                i, e = divmod(k, n)
+                if delta[i, e] < best[0]:
+                    best = (float(delta[i, e]), (i, seg, e, reverse))
+        if best[1] is None:
+            break
+        i, seg, e, reverse = best[1]
+        rolled = np.roll(tour, -i)  # segment now at the front
+        segment, rest = rolled[:seg], rolled[seg:]
+        pos = int(np.nonzero(rest == tour[e])[0][0]) + 1
+        tour = np.concatenate([rest[:pos], segment[::-1] if reverse else segment, rest[pos:]])
+        moves += 1
+    return tour, moves
+
+
+def _local_search(dist: np.ndarray, tour: np.ndarray) -> Tuple[np.ndarray, int]:
+    moves = 0
+    while True:
+        tour, m2 = two_opt(dist, tour)
+        tour, m3 = or_opt(dist, tour)
+        moves += m2 + m3
+        if m3 == 0:
+            return tour, moves
+
+
+def solve_order(
+    dist: np.ndarray, start: Optional[int] = None, closed: bool = False, restarts: int = 8, seed: int = 0
+) -> OrderResult:
+    """Nearest neighbour from several starts, each polished with 2-opt + Or-opt; the shortest wins.
+
+    ``dist`` is a symmetric (N, N) matrix. ``closed`` asks for a tour; otherwise an open path,
+    starting at ``start`` when given.
+    """
+    dist = np.asarray(dist, dtype=np.float64)
+    n = dist.shape[0]
+    if dist.shape != (n, n):
+        raise ValueError(f"distance matrix must be square, got {dist.shape}")
+    if start is not None and not 0 <= start < n:
+        raise ValueError(f"start {start} out of range for {n} waypoints")
+    if n <= 2:
+        order = list(range(n)) if start in (None, 0) else [start] + [k for k in range(n) if k != start]
+        return OrderResult(order, route_length(dist, order, closed), 0)
+
+    finite_max = float(dist[np.isfinite(dist)].max(initial=0.0))
+    work = np.where(np.isfinite(dist), dist, 10.0 * (finite_max * n + 1.0))  # unreachable pairs: last resort
+    tour_dist, depot = _tour_matrix(work, closed, start)
+    m = tour_dist.shape[0]
+    rng = np.random.default_rng(seed)
+    seeds = [depot if depot is not None else (start or 0)]
+    seeds += rng.choice(m, size=min(m, max(0, restarts - 1)), replace=False).tolist()
+
+    best_tour, best_len, total_moves = None, np.inf, 0
+    for s in dict.fromkeys(seeds):
+        tour, moves = _local_search(tour_dist, np.asarray(nearest_neighbour(tour_dist, int(s)), dtype=np.int64))
+        total_moves += moves
+        length = float(tour_dist[tour, np.roll(tour, -1)].sum())
+        if length < best_len - 1e-9:
+            best_tour, best_len = tour, length
+
+    tour = best_tour.tolist()
+    if depot is not None:
+        k = tour.index(depot)
+        order = tour[k + 1 :] + tour[:k]
+        if start is not None and order[0] != start:
+            order = order[::-1]
+    else:
+        order = tour
+        if start is not None:
+            k = order.index(start)  # a closed tour has no end; just begin it at ``start``
+            order = order[k:] + order[:k]
+    return OrderResult(order, route_length(dist, order, closed), total_moves)
+
+
+# ---------------------------------------------------------------------------
+# Agent comparison
+# ---------------------------------------------------------------------------
+
+
+def compare_order(
+    points: np.ndarray,
+    planner: Optional[Any] = None,
+    fix_start: bool = False,
+    closed: bool = False,
+    restarts: int = 8,
+) -> Dict[str, Any]:
+    """Agent's visiting order (row order of ``points``) vs the heuristic baseline on the same waypoints.
+
+    Without a planner, distances are great-circle; with a ``route_planner.RoutePlanner`` they are
+    shortest NFZ-free distances in its frame, and ``blocked_legs`` counts agent legs cutting a zone.
+    """
+    n = points.shape[0]
+    blocked = None
+    if planner is None:
+        dist = haversine_matrix(points[:, 0], points[:, 1])
+    else:
+        x, y = planner.to_xy(points[:, 0], points[:, 1])
+        dist, blocked = planner.distance_matrix(np.stack([x, y], axis=1))
+    agent = list(range(n))
+    agent_len = route_length(dist, agent, closed)
+    best = solve_order(dist, start=0 if fix_start else None, closed=closed, restarts=restarts)
+    out: Dict[str, Any] = {
+        "waypoints": n,
+        "agent_length_m": round(agent_len, 1),
+        "baseline_length_m": round(best.length_m, 1),
+        "gap_pct": round(100.0 * (agent_len - best.length_m) / best.length_m, 2) if best.length_m > 0 else 0.0,
+        "agent_is_optimal_order": bool(agent_len <= best.length_m + 1e-6),
+        "baseline_order": best.order,
+    }
+    if blocked is not None:
+        out["blocked_legs"] = int(blocked[np.arange(n - 1), np.arange(1, n)].sum()) if n > 1 else 0
+    return out
+
+
+def _expand(patterns: List[str]) -> List[Path]:
+    out: List[Path] = []
+    for pat in patterns:
+        matches = sorted(glob.glob(pat))
+        out.extend(Path(m) for m in (matches or [pat]))
+    return out
+
+
+def benchmark(n: int = 200, nfzs: int = 40, seed: int = 0) -> Dict[str, Any]:
+    """Random free waypoints in a generated scenario: matrix and solver timings."""
+    from route_planner import RoutePlanner, _free_point, benchmark_scenario
+
+    scenario, half_m = benchmark_scenario(nfzs, seed)
+    planner = RoutePlanner(scenario, use_cache=False)
+    rng = np.random.default_rng(seed)
+    xy = np.array([_free_point(planner, rng, half_m) for _ in range(n)])
+    t0 = time.perf_counter()
+    dist, blocked = planner.distance_matrix(xy)
+    matrix_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    nn = nearest_neighbour(dist, 0)
+    nn_len = route_length(dist, nn)
+    best = solve_order(dist)
+    solve_s = time.perf_counter() - t0
+    return {
+        "waypoints": n,
+        "vertices": planner.graph.n_vertices,
+        "blocked_pairs": int(blocked.sum() // 2),
+        "matrix_s": round(matrix_s, 3),
+        "solve_s": round(solve_s, 3),
+        "nearest_neighbour_m": round(nn_len, 1),
+        "baseline_m": round(best.length_m, 1),
+        "improvement_pct": round(100.0 * (nn_len - best.length_m) / nn_len, 2),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Compare agent waypoint orders with a 2-opt / Or-opt baseline.")
+    ap.add_argument("--orders", nargs="*", default=[], help="path_Episode*_agentOrder.json files or globs")
+    ap.add_argument("--scenario", default=None, help="config-v2 scenario-*.yaml; distances then avoid its NFZs")
+    ap.add_argument("--time", type=float, default=None, help="Dynamic NFZ state at this time (else all active)")
+    ap.add_argument("--seed", type=int, default=0, help="Schedule realization seed for --time")
+    ap.add_argument("--fix-start", action="store_true", help="Baseline must start at the agent's first waypoint")
+    ap.add_argument("--closed", action="store_true", help="Compare closed tours (return to the first waypoint)")
+    ap.add_argument("--restarts", type=int, default=8)
+    ap.add_argument("--bench", type=int, default=None, metavar="N", help="Benchmark with N random waypoints")
+    ap.add_argument("--out", default=None, help="Write the report JSON here")
+    args = ap.parse_args()
+
+    if args.bench is not None:
+        print(json.dumps(benchmark(args.bench), indent=2))
+        return
+    if not args.orders:
+        ap.error("--orders is required (or --bench)")
+
+    planner = None
+    if args.scenario:
+        from config_loader import load_scenario
+        from dynamic_zones import DynamicZoneSchedule
+        from route_planner import RoutePlanner
+
+        scenario = load_scenario(Path(args.scenario))
+        planner = RoutePlanner(scenario)
+        if args.time is not None:
+            planner.sync_schedule(DynamicZoneSchedule.from_objects(scenario.objects, seed=args.seed), args.time)
+
+    t0 = time.perf_counter()
+    episodes = []
+    for p in _expand(args.orders):
+        row = {"file": p.name}
+        row.update(compare_order(load_agent_order(p), planner, args.fix_start, args.closed, args.restarts))
+        episodes.append(row)
+    gaps = [e["gap_pct"] for e in episodes]
+    report = {
+        "episodes": episodes,
+        "summary": {
+            "count": len(episodes),
+            "mean_gap_pct": round(float(np.mean(gaps)), 2) if gaps else None,
+            "optimal_orders": sum(e["agent_is_optimal_order"] for e in episodes),
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
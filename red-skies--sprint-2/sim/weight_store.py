@@ -0,0 +1,446 @@
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import multiprocessing as mp
+import os
+import shutil
+import threading
+import time
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config_loader import AgentSpec, ResolvedConfig, default_cache_dir, load_agents
+
+
+STORE_VERSION = 1
+MANIFEST = "MANIFEST.json"
+
+
+def default_store_dir() -> Path:
+    return default_cache_dir().parent / "artifacts"
+
+
+def _rss() -> Dict[str, int]:
+    """RssAnon / RssFile / VmRSS of this process in bytes (Linux; empty elsewhere)."""
+    out: Dict[str, int] = {}
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "RssAnon", "RssFile"):
+                    out[key] = int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return out
+
+
+def _safe_member(name: str) -> PurePosixPath:
+    p = PurePosixPath(name)
+    if p.is_absolute() or ".." in p.parts or not p.parts:
+        raise ValueError(f"unsafe path in artifact: {name!r}")
+    return p
+
+
+# ---------------------------------------------------------------------------
+# Unpacked artifact
+# ---------------------------------------------------------------------------
+
+
+class AgentWeights:
+    """One unpacked artifact version. Arrays are read-only memmaps, so every process shares their pages.
+
+    ``.npy`` members and the arrays of ``.npz`` members are mapped by name (``policy/layer0.weight``
+    for ``policy.npz``); other members (``policy.pth``, ``data``) are available as raw read-only
+    buffers, or through ``torch.load(..., mmap=True)`` with ``torch_state`` when torch is installed.
+    """
+
+    def __init__(self, path: Path, manifest: Dict[str, Any], agent_ref: str = "") -> None:
+        self.path = Path(path)
+        self.manifest = manifest
+        self.agent_ref = agent_ref
+        self.digest: str = manifest["digest"]
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._raw: Dict[str, mmap.mmap] = {}
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self.manifest["arrays"])
+
+    @property
+    def members(self) -> List[str]:
+        return sorted(self.manifest["files"])
+
+    @property
+    def nbytes(self) -> int:
+        return sum(int(a["nbytes"]) for a in self.manifest["arrays"].values())
+
+    def array(self, name: str) -> np.ndarray:
+        a = self._arrays.get(name)
+        if a is None:
+            try:
+                entry = self.manifest["arrays"][name]
+            except KeyError:
+                raise KeyError(f"{self.agent_ref or self.digest[:12]}: no array {name!r}") from None
+            a = np.load(self.path / entry["file"], mmap_mode="r", allow_pickle=False)
+            self._arrays[name] = a
+        return a
+
+    def arrays(self, prefix: str = "") -> Dict[str, np.ndarray]:
+        return {n: self.array(n) for n in self.names if n.startswith(prefix)}
+
+    def raw(self, member: str) -> memoryview:
+        m = self._raw.get(member)
+        if m is None:
+            if member not in self.manifest["files"]:
+                raise KeyError(f"{self.agent_ref or self.digest[:12]}: no member {member!r}")
+            with open(self.path / "files" / member, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return memoryview(b"")
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._raw[member] = m
+        return memoryview(m)
+
+    def torch_state(self, member: str = "policy.pth") -> Any:
+        """``torch.load`` of a member with ``mmap=True``: tensor storage stays in the shared page cache."""
+        import torch
+
+        if member not in self.manifest["files"]:
+            raise KeyError(f"{self.agent_ref or self.digest[:12]}: no member {member!r}")
+        return torch.load(str(self.path / "files" / member), map_location="cpu", mmap=True, weights_only=True)
+
+    def close(self) -> None:
+        self._arrays.clear()
+        for m in self._raw.values():
+            try:
+                m.close()
+            except BufferError:  # a caller still holds a view; the map goes with it
+                pass
+        self._raw.clear()
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class ArtifactStore:
+    """Content-addressed cache of unpacked agent artifacts (``artifact.path`` zips).
+
+    Layout under ``root``::
+
+        objects/<sha256>/MANIFEST.json, files/<member>, arrays/<n>.npy
+        refs/<hash of source path>.json   size + mtime -> sha256, so unchanged zips are not re-hashed
+
+    An artifact is unpacked into a private temp directory and renamed into place, so concurrent
+    workers never see a half-written object; the loser of a race just drops its copy.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = Path(root) if root is not None else default_store_dir()
+        self._lock = threading.Lock()
+        self._open: Dict[str, AgentWeights] = {}
+
+    def object_dir(self, digest: str) -> Path:
+        return self.root / "objects" / digest
+
+    def digest(self, artifact: Path) -> str:
+        artifact = Path(artifact).resolve()
+        st = artifact.stat()
+        ref = self.root / "refs" / f"{hashlib.sha256(str(artifact).encode('utf-8')).hexdigest()[:32]}.json"
+        try:
+            cached = json.loads(ref.read_text(encoding="utf-8"))
+            if cached.get("size") == st.st_size and cached.get("mtime_ns") == st.st_mtime_ns:
+                return str(cached["digest"])
+        except (OSError, ValueError, KeyError):
+            pass
+        h = hashlib.sha256()
+        with artifact.open("rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        try:
+            ref.parent.mkdir(parents=True, exist_ok=True)
+            tmp = ref.with_name(f"{ref.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"path": str(artifact), "size": st.st_size, "mtime_ns": st.st_mtime_ns, "digest": digest}), encoding="utf-8")
+            os.replace(tmp, ref)
+        except OSError:
+            pass
+        return digest
+
+    def unpack(self, artifact: Path) -> Tuple[Path, Dict[str, Any]]:
+        """Object directory and manifest of ``artifact``, unpacking it on first use."""
+        artifact = Path(artifact)
+        digest = self.digest(artifact)
+        final = self.object_dir(digest)
+        manifest = self._read_manifest(final)
+        if manifest is not None:
+            return final, manifest
+
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp = final.parent / f".{digest}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        try:
+            manifest = _unpack_zip(artifact, tmp, digest)
+            try:
+                os.rename(tmp, final)
+            except OSError:
+                # Another process finished first; its copy has the same content.
+                manifest = self._read_manifest(final)
+                if manifest is None:
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        return final, manifest
+
+    @staticmethod
+    def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            manifest = json.loads((path / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == STORE_VERSION else None
+
+    def open(self, artifact: Path, agent_ref: str = "") -> AgentWeights:
+        """Mapped weights of ``artifact``; one ``AgentWeights`` per content digest and process."""
+        path, manifest = self.unpack(artifact)
+        with self._lock:
+            w = self._open.get(manifest["digest"])
+            if w is None:
+                w = AgentWeights(path, manifest, agent_ref)
+                self._open[manifest["digest"]] = w
+        return w
+
+    def objects(self) -> List[str]:
+        base = self.root / "objects"
+        return sorted(p.name for p in base.iterdir() if p.is_dir() and not p.name.startswith(".")) if base.is_dir() else []
+
+
+def _unpack_zip(artifact: Path, dest: Path, digest: str) -> Dict[str, Any]:
+    files: Dict[str, Dict[str, Any]] = {}
+    arrays: Dict[str, Dict[str, Any]] = {}
+    (dest / "files").mkdir(parents=True)
+    (dest / "arrays").mkdir()
+
+    def add_array(name: str, a: np.ndarray) -> None:
+        if a.dtype.hasobject:
+            raise ValueError(f"{artifact}: array {name!r} has dtype object and cannot be memory-mapped")
+        rel = f"arrays/{len(arrays)}.npy"
+        np.save(dest / rel, np.ascontiguousarray(a), allow_pickle=False)
+        arrays[name] = {"file": rel, "dtype": a.dtype.str, "shape": list(a.shape), "nbytes": int(a.nbytes)}
+
+    with zipfile.ZipFile(artifact) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            member = _safe_member(info.filename)
+            out = dest / "files" / Path(*member.parts)
+            out.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(info) as src, out.open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+            files[str(member)] = {"size": info.file_size}
+            stem = str(member.with_suffix(""))
+            if member.suffix == ".npy":
+                add_array(stem, np.load(out, allow_pickle=False))
+            elif member.suffix == ".npz":
+                with np.load(out, allow_pickle=False) as npz:
+                    for key in npz.files:
+                        add_array(f"{stem}/{key}", npz[key])
+
+    manifest = {"version": STORE_VERSION, "digest": digest, "source": str(artifact), "files": files, "arrays": arrays}
+    (dest / MANIFEST).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# Lazy per-agent access
+# ---------------------------------------------------------------------------
+
+
+class AgentWeightRegistry:
+    """``agent_ref`` -> ``AgentWeights``, unpacked and mapped the first time a task dispatches to that agent.
+
+    Tasks of different platform models (c310/c172/f16) that share an ``agent_ref`` share one mapping,
+    and agents no task dispatches to are never touched.
+    """
+
+    def __init__(
+        self,
+        agents: Dict[str, AgentSpec],
+        store: Optional[ArtifactStore] = None,
+        artifact_root: Optional[Path] = None,
+        task_agents: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.agents = dict(agents)
+        self.store = store or ArtifactStore()
+        self.artifact_root = Path(artifact_root) if artifact_root is not None else Path(".")
+        self.task_agents = dict(task_agents or {})
+        """Task ``unique_id`` -> ``agent_ref``."""
+        self._loaded: Dict[str, AgentWeights] = {}
+        self._load_s: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls, config: ResolvedConfig, store: Optional[ArtifactStore] = None, artifact_root: Optional[Path] = None
+    ) -> "AgentWeightRegistry":
+        """``artifact.path`` resolves against ``artifact_root``, default the directory of ``agents.yaml``."""
+        root = artifact_root if artifact_root is not None else Path(config.experiment.agents_file).parent
+        tasks = {uid: task.agent_ref for uid, (_, task) in config.tasks.items()}
+        return cls(config.agents, store, root, tasks)
+
+    def artifact(self, agent_ref: str) -> Path:
+        try:
+            agent = self.agents[agent_ref]
+        except KeyError:
+            raise KeyError(f"unknown agent_ref: {agent_ref}") from None
+        if not agent.artifact_path:
+            raise ValueError(f"{agent_ref}: agent has no artifact.path")
+        return self.artifact_root / agent.artifact_path
+
+    def get(self, agent_ref: str) -> AgentWeights:
+        w = self._loaded.get(agent_ref)
+        if w is not None:
+            return w
+        with self._lock:
+            lock = self._locks.setdefault(agent_ref, threading.Lock())
+        with lock:
+            w = self._loaded.get(agent_ref)
+            if w is None:
+                path = self.artifact(agent_ref)
+                if not path.is_file():
+                    raise ValueError(f"{agent_ref}: artifact not found: {path}")
+                t0 = time.perf_counter()
+                w = self.store.open(path, agent_ref)
+                self._load_s[agent_ref] = time.perf_counter() - t0
+                self._loaded[agent_ref] = w
+        return w
+
+    def for_task(self, unique_id: str) -> AgentWeights:
+        try:
+            agent_ref = self.task_agents[unique_id]
+        except KeyError:
+            raise KeyError(f"unknown task unique_id: {unique_id}") from None
+        return self.get(agent_ref)
+
+    @property
+    def loaded(self) -> List[str]:
+        return sorted(self._loaded)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            ref: {"digest": w.digest, "arrays": len(w.manifest["arrays"]), "mapped_bytes": w.nbytes, "load_ms": self._load_s[ref] * 1e3}
+            for ref, w in sorted(self._loaded.items())
+        }
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+
+def write_synthetic_artifact(path: Path, size_bytes: int = 8_421_376, layers: int = 6, seed: int = 0) -> Path:
+    """A ``*_final.zip``-shaped artifact: ``policy.npz`` float32 layers totalling ~``size_bytes``, plus ``data``."""
+    rng = np.random.default_rng(seed)
+    per = max(1, size_bytes // 4 // layers)
+    width = max(1, int(per**0.5))
+    arrays = {f"layer{i}.weight": rng.standard_normal((width, per // width)).astype(np.float32) for i in range(layers)}
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".npz.tmp")
+    with tmp.open("wb") as f:
+        np.savez(f, **arrays)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.write(tmp, "policy.npz")
+        zf.writestr("data", json.dumps({"policy_class": "MlpPolicy", "layers": layers}))
+    tmp.unlink()
+    return path
+
+
+def _load_private(artifact: str) -> Dict[str, np.ndarray]:
+    """What each worker does without the store: inflate the zip and read every array into its own memory."""
+    with zipfile.ZipFile(artifact) as zf:
+        with zf.open("policy.npz") as f:
+            data = f.read()
+    with np.load(io.BytesIO(data), allow_pickle=False) as npz:
+        return {k: npz[k] for k in npz.files}
+
+
+def _bench_worker(args: Tuple[str, str, str]) -> Dict[str, float]:
+    mode, artifact, store_root = args
+    before = _rss()
+    t0 = time.perf_counter()
+    if mode == "private":
+        arrays = _load_private(artifact)
+    else:
+        arrays = ArtifactStore(Path(store_root)).open(Path(artifact)).arrays("policy/")
+    load_s = time.perf_counter() - t0
+    checksum = float(sum(float(a.sum(dtype=np.float64)) for a in arrays.values()))
+    after = _rss()
+    return {
+        "load_ms": load_s * 1e3,
+        "anon_mb": (after.get("RssAnon", 0) - before.get("RssAnon", 0)) / 2**20,
+        "file_mb": (after.get("RssFile", 0) - before.get("RssFile", 0)) / 2**20,
+        "checksum": checksum,
+    }
+
+
+def benchmark(workers: int = 8, size_bytes: int = 8_421_376) -> Dict[str, Any]:
+    """``workers`` fresh (spawned) processes load the same artifact, privately vs through a shared store."""
+    import tempfile
+
+    tmp = Path(tempfile.mkdtemp(prefix="weight-store-bench-"))
+    try:
+        artifact = write_synthetic_artifact(tmp / "holding_agent_final.zip", size_bytes)
+        store = ArtifactStore(tmp / "store")
+        t0 = time.perf_counter()
+        store.unpack(artifact)
+        unpack_s = time.perf_counter() - t0
+        ctx = mp.get_context("spawn")
+        out: Dict[str, Any] = {"workers": workers, "artifact_mb": artifact.stat().st_size / 2**20, "unpack_once_ms": unpack_s * 1e3}
+        checks = set()
+        for mode in ("private", "store"):
+            with ctx.Pool(workers) as pool:
+                rows = pool.map(_bench_worker, [(mode, str(artifact), str(store.root))] * workers)
+            checks.update(round(r["checksum"], 3) for r in rows)
+            out[mode] = {k: float(np.mean([r[k] for r in rows])) for k in ("load_ms", "anon_mb", "file_mb")}
+            # Anonymous pages are private to each worker; mapped file pages are shared through the page cache.
+            out[mode]["total_unique_mb"] = out[mode]["anon_mb"] * workers + (out[mode]["file_mb"] if mode == "store" else 0.0)
+        out["checksums_match"] = len(checks) == 1
+        return out
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--agents", help="spec/agents.yaml; unpacks and maps the given agents' artifacts")
+    ap.add_argument("--agent", nargs="*", default=None, help="Agent ids (default: all with an artifact present)")
+    ap.add_argument("--artifacts", default=None, help="Directory artifact.path resolves against (default: next to agents.yaml)")
+    ap.add_argument("--store", default=None, help=f"Store root (default: {default_store_dir()})")
+    ap.add_argument("--bench", type=int, metavar="WORKERS", help="Per-worker load time and RSS, private vs shared store")
+    args = ap.parse_args()
+
+    if args.bench:
+        print(json.dumps(benchmark(args.bench), indent=2))
+        return
+    if not args.agents:
+        ap.error("--agents or --bench is required")
+
+    agents_path = Path(args.agents)
+    specs = {a.id: a for a in load_agents(agents_path)}
+    root = Path(args.artifacts) if args.artifacts else agents_path.parent
+    registry = AgentWeightRegistry(specs, ArtifactStore(Path(args.store)) if args.store else None, root)
+    refs = args.agent if args.agent is not None else [r for r in specs if specs[r].artifact_path and registry.artifact(r).is_file()]
+    for ref in refs:
+        registry.get(ref)
+    print(json.dumps({"store": str(registry.store.root), "agents": registry.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()